@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AccountingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounting"
+
+    def ready(self):
+        """Import signals when Django starts"""
+        try:
+            import accounting.signals
+        except ImportError as e:
+            import logging
+
+            logger = logging.getLogger(__name__)
+            logger.error(f"Error importing accounting signals: {e}")
@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from accounting.services.quickbooks_mock import run_mock_server
+from accounting.services.quickbooks_transport import QuickBooksTransport
+import threading
+import time
+import uuid
+
+import requests
+
+
+class Command(BaseCommand):
+    help = "Measures QuickBooks transport throughput and retries against the mock server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument("--latency", type=float, default=0.02)
+        parser.add_argument("--error-rate", type=float, default=0.05)
+        parser.add_argument("--per-minute", type=int, default=500)
+        parser.add_argument(
+            "--url", type=str, help="Use a running mock server instead of starting one"
+        )
+        parser.add_argument(
+            "--baseline",
+            action="store_true",
+            help="Also run bare requests.post calls without pooling or retries",
+        )
+
+    def handle(self, *args, **options):
+        server = None
+        base = options.get("url")
+        if not base:
+            server = run_mock_server(
+                port=0,
+                latency=options["latency"],
+                error_rate=options["error_rate"],
+                per_minute=options["per_minute"],
+            )
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+
+        realm_id = f"bench-{uuid.uuid4().hex[:8]}"
+        url = f"{base}/v3/company/{realm_id}/vendor"
+        headers = {"Authorization": "Bearer benchmark", "Accept": "application/json"}
+
+        try:
+            if options["baseline"]:
+                self.report("baseline", *self.run_baseline(url, headers, options))
+
+            transport = QuickBooksTransport(realm_id)
+            self.report("transport", *self.run_transport(transport, url, headers, options))
+            self.stdout.write(f"  transport stats: {transport.stats}")
+            if server:
+                self.stdout.write(f"  server stats: {server.state.stats}")
+        finally:
+            if server:
+                server.shutdown()
+                server.server_close()
+
+    def run_baseline(self, url, headers, options):
+        def call(index):
+            response = requests.post(
+                url, headers=headers, json={"DisplayName": f"Vendor {index}"}
+            )
+            return response.status_code == 200
+
+        return self.run(call, options)
+
+    def run_transport(self, transport, url, headers, options):
+        def call(index):
+            response = transport.request(
+                "POST", url, lambda: headers, json={"DisplayName": f"Vendor {index}"}
+            )
+            return response.status_code == 200
+
+        return self.run(call, options)
+
+    def run(self, call, options):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(call, range(options["requests"])))
+        return time.perf_counter() - started, sum(results), len(results)
+
+    def report(self, label, elapsed, succeeded, total):
+        self.stdout.write(
+            f"{label}: {succeeded}/{total} succeeded in {elapsed:.2f}s "
+            f"({total / elapsed:.1f} req/s)"
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from accounting.services.reconciliation import QuickBooksReconciler
+
+
+class Command(BaseCommand):
+    help = "Syncs records changed since the last reconciliation and reports QuickBooks drift"
+
+    def handle(self, *args, **options):
+        report, sync_log = QuickBooksReconciler().run()
+
+        self.stdout.write(f"Reconciliation log: {sync_log.id}")
+        self.stdout.write(f"  Window: {report['local_since'] or 'first run'} -> {report['until']}")
+        self.stdout.write(f"  QuickBooks mode: {report.get('remote_mode')}")
+        for key, result in report["synced"].items():
+            self.stdout.write(f"  {key}: {result['message']}")
+
+        for drift in report["local_drift"] + report["remote_drift"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"  {drift['type']} {drift['reference']} "
+                    f"(QuickBooks {drift['quickbooks_reference']}): {drift['reason']}"
+                )
+            )
+
+        if not report["local_drift"] and not report["remote_drift"]:
+            self.stdout.write(self.style.SUCCESS("  No drift detected"))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from accounting.services.quickbooks_mock import run_mock_server
+
+
+class Command(BaseCommand):
+    help = "Runs a local mock QuickBooks API for offline sync testing and benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", type=str, default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--latency", type=float, default=0.05, help="Mean response latency in seconds"
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503"
+        )
+        parser.add_argument("--per-minute", type=int, default=500)
+        parser.add_argument("--max-concurrency", type=int, default=10)
+
+    def handle(self, *args, **options):
+        server = run_mock_server(
+            options["host"],
+            options["port"],
+            latency=options["latency"],
+            error_rate=options["error_rate"],
+            per_minute=options["per_minute"],
+            max_concurrency=options["max_concurrency"],
+        )
+        base = f"http://{options['host']}:{options['port']}"
+        self.stdout.write(f"Mock QuickBooks listening on {base}")
+        self.stdout.write(f"  QUICKBOOKS_BASE_URL={base}/v3/company")
+        self.stdout.write(f"  QUICKBOOKS_TOKEN_URL={base}/oauth2/v1/tokens/bearer")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"Stats: {server.state.stats}")
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payrollsyncstatus",
+            name="detail_references",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("accounting", "0002_payrollsyncstatus_detail_references"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("changed_since", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Sync Cursor",
+                "verbose_name_plural": "Sync Cursors",
+                "db_table": "accounting_sync_cursors",
+            },
+        ),
+        migrations.CreateModel(
+            name="VendorReference",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("quickbooks_vendor_id", models.CharField(max_length=255)),
+                ("display_name", models.CharField(max_length=255)),
+                ("sync_token", models.CharField(default="0", max_length=50)),
+                ("quickbooks_updated_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "employee",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="quickbooks_vendor",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Vendor Reference",
+                "verbose_name_plural": "Vendor References",
+                "db_table": "accounting_vendor_references",
+                "indexes": [
+                    models.Index(
+                        fields=["quickbooks_vendor_id"],
+                        name="accounting_vendor_qb_id_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.16 on 2026-10-18 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0003_vendorreference_synccursor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="synclog",
+            name="queue_depth",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="synclog",
+            name="throughput_per_minute",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="synclog",
+            name="progress_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
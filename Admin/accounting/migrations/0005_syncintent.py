@@ -0,0 +1,77 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:00
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0004_synclog_progress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncIntent",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "entity_type",
+                    models.CharField(
+                        choices=[
+                            ("PAYROLL_PERIOD", "Payroll Period"),
+                            ("EXPENSE", "Expense"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("entity_id", models.CharField(max_length=255)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pending"),
+                            ("PROCESSING", "Processing"),
+                            ("FAILED", "Failed"),
+                        ],
+                        default="PENDING",
+                        max_length=20,
+                    ),
+                ),
+                ("reason", models.CharField(blank=True, max_length=100)),
+                ("request_count", models.PositiveIntegerField(default=1)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, null=True)),
+                ("due_at", models.DateTimeField()),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Sync Intent",
+                "verbose_name_plural": "Sync Intents",
+                "db_table": "accounting_sync_intents",
+                "ordering": ["due_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "due_at"], name="accounting_intent_due_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "PENDING")),
+                        fields=("entity_type", "entity_id"),
+                        name="unique_pending_sync_intent",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0005_syncintent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payrollsyncstatus",
+            name="quickbooks_sync_token",
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name="payrollsyncstatus",
+            name="source_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="expensesyncstatus",
+            name="quickbooks_entity",
+            field=models.CharField(blank=True, default="", max_length=50),
+        ),
+        migrations.AddField(
+            model_name="expensesyncstatus",
+            name="quickbooks_sync_token",
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name="expensesyncstatus",
+            name="source_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="expensesyncstatus",
+            index=models.Index(
+                fields=["quickbooks_reference"], name="accounting_expense_qb_ref_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payrollsyncstatus",
+            index=models.Index(
+                fields=["quickbooks_reference"], name="accounting_payroll_qb_ref_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="synclog",
+            name="sync_type",
+            field=models.CharField(
+                choices=[
+                    ("PAYROLL", "Payroll"),
+                    ("EXPENSE", "Expense"),
+                    ("PAYROLL_PERIOD", "Payroll Period"),
+                    ("DEPARTMENT_SUMMARY", "Department Summary"),
+                    ("EXPENSE_CATEGORY", "Expense Category"),
+                    ("FULL_SYNC", "Full Sync"),
+                    ("RECONCILIATION", "Reconciliation"),
+                ],
+                max_length=50,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0006_reconciliation_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="synclog",
+            name="metrics",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
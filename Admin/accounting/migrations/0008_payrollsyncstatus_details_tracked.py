@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 22:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0007_synclog_metrics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payrollsyncstatus",
+            name="details_tracked",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.16 on 2026-10-18 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0008_payrollsyncstatus_details_tracked"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payrollsyncstatus",
+            name="journal_total",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=15, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounting", "0009_payrollsyncstatus_journal_total"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="syncconfiguration",
+            name="realtime_sync_enabled",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -149,7 +149,7 @@ class SyncConfiguration(models.Model):
     sync_frequency = models.CharField(
         max_length=20, choices=SYNC_FREQUENCIES, default="MINUTES_15"
     )
-    realtime_sync_enabled = models.BooleanField(default=True)
+    realtime_sync_enabled = models.BooleanField(default=False)
     scheduled_sync_enabled = models.BooleanField(default=True)
     max_retries = models.PositiveIntegerField(default=3)
     retry_delay_minutes = models.PositiveIntegerField(default=15)
@@ -195,6 +195,7 @@ class SyncLog(models.Model):
         ("DEPARTMENT_SUMMARY", "Department Summary"),
         ("EXPENSE_CATEGORY", "Expense Category"),
         ("FULL_SYNC", "Full Sync"),
+        ("RECONCILIATION", "Reconciliation"),
     ]
 
     STATUS_CHOICES = [
@@ -220,6 +221,10 @@ class SyncLog(models.Model):
     error_details = models.JSONField(default=dict, blank=True)
     retry_count = models.PositiveIntegerField(default=0)
     next_retry_at = models.DateTimeField(null=True, blank=True)
+    queue_depth = models.PositiveIntegerField(default=0)
+    throughput_per_minute = models.FloatField(default=0)
+    progress_updated_at = models.DateTimeField(null=True, blank=True)
+    metrics = models.JSONField(default=dict, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -281,6 +286,16 @@ class SyncLog(models.Model):
             update_fields=["status", "completed_at", "error_message", "error_details"]
         )
 
+    def update_progress(self, queue_depth, throughput_per_minute):
+        self.queue_depth = queue_depth
+        self.throughput_per_minute = throughput_per_minute
+        self.progress_updated_at = timezone.now()
+        SyncLog.objects.filter(pk=self.pk).update(
+            queue_depth=self.queue_depth,
+            throughput_per_minute=self.throughput_per_minute,
+            progress_updated_at=self.progress_updated_at,
+        )
+
     def schedule_retry(self, delay_minutes=None):
         config = SyncConfiguration.get_active_config()
 
@@ -317,6 +332,13 @@ class PayrollSyncStatus(models.Model):
         blank=True,
         related_name="payroll_sync_statuses",
     )
+    detail_references = models.JSONField(default=dict, blank=True)
+    details_tracked = models.BooleanField(default=False)
+    journal_total = models.DecimalField(
+        max_digits=15, decimal_places=2, null=True, blank=True
+    )
+    quickbooks_sync_token = models.CharField(max_length=50, null=True, blank=True)
+    source_updated_at = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -334,6 +356,9 @@ class PayrollSyncStatus(models.Model):
             models.Index(fields=["year", "month"]),
             models.Index(fields=["is_synced"]),
             models.Index(fields=["is_active"]),
+            models.Index(
+                fields=["quickbooks_reference"], name="accounting_payroll_qb_ref_idx"
+            ),
         ]
         unique_together = [["year", "month"]]
 
@@ -354,6 +379,9 @@ class ExpenseSyncStatus(models.Model):
     is_synced = models.BooleanField(default=False)
     last_sync_at = models.DateTimeField(null=True, blank=True)
     quickbooks_reference = models.CharField(max_length=255, null=True, blank=True)
+    quickbooks_entity = models.CharField(max_length=50, blank=True, default="")
+    quickbooks_sync_token = models.CharField(max_length=50, null=True, blank=True)
+    source_updated_at = models.DateTimeField(null=True, blank=True)
     sync_log = models.ForeignKey(
         SyncLog,
         on_delete=models.SET_NULL,
@@ -380,7 +408,105 @@ class ExpenseSyncStatus(models.Model):
             models.Index(fields=["expense_date"]),
             models.Index(fields=["is_synced"]),
             models.Index(fields=["is_active"]),
+            models.Index(
+                fields=["quickbooks_reference"], name="accounting_expense_qb_ref_idx"
+            ),
         ]
 
     def __str__(self):
         return f"Expense {self.expense_reference} - {'Synced' if self.is_synced else 'Not Synced'}"
+
+
+class VendorReference(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    employee = models.OneToOneField(
+        CustomUser, on_delete=models.CASCADE, related_name="quickbooks_vendor"
+    )
+    quickbooks_vendor_id = models.CharField(max_length=255)
+    display_name = models.CharField(max_length=255)
+    sync_token = models.CharField(max_length=50, default="0")
+    quickbooks_updated_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "accounting_vendor_references"
+        verbose_name = "Vendor Reference"
+        verbose_name_plural = "Vendor References"
+        indexes = [
+            models.Index(fields=["quickbooks_vendor_id"], name="accounting_vendor_qb_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.display_name} → Vendor {self.quickbooks_vendor_id}"
+
+    def as_entity_ref(self):
+        return {"value": self.quickbooks_vendor_id, "name": self.display_name, "type": "Vendor"}
+
+
+class SyncCursor(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    changed_since = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "accounting_sync_cursors"
+        verbose_name = "Sync Cursor"
+        verbose_name_plural = "Sync Cursors"
+
+    def __str__(self):
+        return f"{self.name} @ {self.changed_since}"
+
+    @classmethod
+    def get(cls, name):
+        cursor, _ = cls.objects.get_or_create(name=name)
+        return cursor
+
+    def advance(self, changed_since):
+        self.changed_since = changed_since
+        self.save(update_fields=["changed_since", "updated_at"])
+
+
+class SyncIntent(models.Model):
+    ENTITY_TYPES = [
+        ("PAYROLL_PERIOD", "Payroll Period"),
+        ("EXPENSE", "Expense"),
+    ]
+
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("PROCESSING", "Processing"),
+        ("FAILED", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    entity_type = models.CharField(max_length=50, choices=ENTITY_TYPES)
+    entity_id = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING")
+    reason = models.CharField(max_length=100, blank=True)
+    request_count = models.PositiveIntegerField(default=1)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    due_at = models.DateTimeField()
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "accounting_sync_intents"
+        verbose_name = "Sync Intent"
+        verbose_name_plural = "Sync Intents"
+        ordering = ["due_at"]
+        indexes = [
+            models.Index(fields=["status", "due_at"], name="accounting_intent_due_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["entity_type", "entity_id"],
+                condition=models.Q(status="PENDING"),
+                name="unique_pending_sync_intent",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} {self.entity_id} - {self.status}"
@@ -0,0 +1,219 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+from decimal import Decimal
+from accounting.models import AccountMapping, DepartmentMapping
+from payroll.models import Payslip
+from typing import Any, Dict, List
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_PAYLOAD_VERSION = 1
+
+PAYSLIP_STATUSES = ["CALCULATED", "APPROVED", "PAID"]
+
+# (aggregate, mapping type, mapping source, posting type, description, split by department)
+JOURNAL_LINES = [
+    ("gross_salary", "PAYROLL_COMPONENT", "SALARY_EXPENSE", "DEBIT", "Gross Salary", True),
+    ("employer_epf", "PAYROLL_COMPONENT", "EPF_EMPLOYER", "DEBIT", "Employer EPF Contribution", True),
+    ("etf", "PAYROLL_COMPONENT", "ETF_CONTRIBUTION", "DEBIT", "ETF Contribution", True),
+    ("employee_epf", "PAYROLL_DEDUCTION", "EPF_EMPLOYEE", "CREDIT", "Employee EPF Contribution", False),
+    ("employer_epf", "PAYROLL_COMPONENT", "EPF_EMPLOYER", "CREDIT", "Employer EPF Liability", False),
+    ("etf", "PAYROLL_COMPONENT", "ETF_CONTRIBUTION", "CREDIT", "ETF Liability", False),
+    ("net_salary", "PAYROLL_COMPONENT", "SALARY_PAYABLE", "CREDIT", "Net Salary Payable", False),
+]
+
+REQUIRED_MAPPINGS = {"SALARY_EXPENSE", "SALARY_PAYABLE"}
+
+
+class PayrollJournalBuilder:
+    """
+    Builds the payroll period journal entry from one grouped aggregate over
+    the period's payslips. Payloads are cached under a version derived from
+    the period, its payslips and the account/department mappings, so any
+    change to those produces a fresh build.
+    """
+
+    CACHE_TTL = getattr(settings, "ACCOUNTING_JOURNAL_CACHE_TTL", 86400)
+
+    @staticmethod
+    def get_version(payroll_period) -> str:
+        payslips = Payslip.objects.filter(
+            payroll_period=payroll_period, status__in=PAYSLIP_STATUSES
+        ).aggregate(updated=Max("updated_at"), count=Count("id"))
+        accounts = AccountMapping.active.aggregate(updated=Max("updated_at"), count=Count("id"))
+        departments = DepartmentMapping.active.aggregate(
+            updated=Max("updated_at"), count=Count("id")
+        )
+
+        parts = [
+            JOURNAL_PAYLOAD_VERSION,
+            payroll_period.updated_at,
+            payslips["updated"],
+            payslips["count"],
+            accounts["updated"],
+            accounts["count"],
+            departments["updated"],
+            departments["count"],
+        ]
+        return hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def get_cache_key(payroll_period, version: str) -> str:
+        return f"accounting:payroll_journal:{payroll_period.id}:{version}"
+
+    @staticmethod
+    def get_payload(payroll_period, refresh: bool = False) -> Dict[str, Any]:
+        version = PayrollJournalBuilder.get_version(payroll_period)
+        key = PayrollJournalBuilder.get_cache_key(payroll_period, version)
+
+        if not refresh:
+            payload = cache.get(key)
+            if payload is not None:
+                payload["cached"] = True
+                return payload
+
+        payload = PayrollJournalBuilder.build(payroll_period)
+        payload["version"] = version
+        try:
+            cache.set(key, payload, PayrollJournalBuilder.CACHE_TTL)
+        except Exception as e:
+            logger.error(f"Failed to cache journal for payroll period {payroll_period.id}: {e}")
+        payload["cached"] = False
+        return payload
+
+    @staticmethod
+    def get_department_totals(payroll_period) -> List[Dict[str, Any]]:
+        return list(
+            Payslip.objects.filter(payroll_period=payroll_period, status__in=PAYSLIP_STATUSES)
+            .values("employee__department_id", "employee__department__name")
+            .annotate(
+                employees=Count("id"),
+                gross_salary=Sum("gross_salary"),
+                employee_epf=Sum("employee_epf_contribution"),
+                employer_epf=Sum("employer_epf_contribution"),
+                etf=Sum("etf_contribution"),
+                net_salary=Sum("net_salary"),
+            )
+            .order_by("employee__department__name")
+        )
+
+    @staticmethod
+    def build(payroll_period) -> Dict[str, Any]:
+        period_name = payroll_period.period_name
+        departments = PayrollJournalBuilder.get_department_totals(payroll_period)
+
+        account_mappings = {
+            (mapping.mapping_type, mapping.source_id): mapping
+            for mapping in AccountMapping.active.filter(
+                mapping_type__in=["PAYROLL_COMPONENT", "PAYROLL_DEDUCTION"],
+                source_id__in={source for _, _, source, _, _, _ in JOURNAL_LINES},
+            )
+        }
+        department_mappings = {}
+        for mapping in DepartmentMapping.active.filter(
+            department_id__in=[row["employee__department_id"] for row in departments]
+        ).order_by("-updated_at"):
+            department_mappings.setdefault(mapping.department_id, mapping)
+
+        missing = REQUIRED_MAPPINGS - {source for _, source in account_mappings}
+        if missing:
+            labels = ", ".join(sorted(source.replace("_", " ").lower() for source in missing))
+            raise Exception(f"Account mapping not found: {labels}")
+
+        totals = {key: Decimal("0.00") for key, *_ in JOURNAL_LINES}
+        for row in departments:
+            for key in totals:
+                row[key] = row[key] or Decimal("0.00")
+                totals[key] += row[key]
+
+        lines = []
+        for key, mapping_type, source, posting_type, description, split in JOURNAL_LINES:
+            mapping = account_mappings.get((mapping_type, source))
+            if not mapping:
+                continue
+
+            if not split:
+                lines.append(
+                    PayrollJournalBuilder.build_line(
+                        f"{description} for {period_name}", totals[key],
+                        posting_type, mapping
+                    )
+                )
+                continue
+
+            for row in departments:
+                department_name = row["employee__department__name"] or "Unassigned"
+                lines.append(
+                    PayrollJournalBuilder.build_line(
+                        f"{description} for {department_name} - {period_name}",
+                        row[key], posting_type, mapping,
+                        department_mappings.get(row["employee__department_id"])
+                    )
+                )
+
+        lines = [line for line in lines if line["Amount"]]
+        for line_id, line in enumerate(lines, start=1):
+            line["Id"] = str(line_id)
+        debits = sum(
+            Decimal(str(line["Amount"])) for line in lines
+            if line["JournalEntryLineDetail"]["PostingType"] == "DEBIT"
+        )
+        credits = sum(
+            Decimal(str(line["Amount"])) for line in lines
+            if line["JournalEntryLineDetail"]["PostingType"] == "CREDIT"
+        )
+
+        return {
+            "journal_entry": {
+                "DocNumber": f"PR-{payroll_period.year}{payroll_period.month:02d}",
+                "TxnDate": payroll_period.end_date.strftime("%Y-%m-%d"),
+                "PrivateNote": f"Payroll for {period_name}",
+                "Line": lines,
+            },
+            "departments": [
+                {
+                    "department_id": row["employee__department_id"],
+                    "department_name": row["employee__department__name"] or "Unassigned",
+                    "employees": row["employees"],
+                    **{key: str(row[key]) for key in totals},
+                }
+                for row in departments
+            ],
+            "totals": {key: str(value) for key, value in totals.items()},
+            "debit_total": str(debits),
+            "credit_total": str(credits),
+            "balanced": debits == credits,
+            "built_at": timezone.now().isoformat(),
+        }
+
+    @staticmethod
+    def build_line(description, amount, posting_type, mapping, department_mapping=None):
+        detail = {
+            "PostingType": posting_type,
+            "AccountRef": {
+                "value": mapping.quickbooks_account_id,
+                "name": mapping.quickbooks_account_name,
+            },
+        }
+
+        if department_mapping:
+            detail["DepartmentRef"] = {
+                "value": department_mapping.quickbooks_department_id,
+                "name": department_mapping.quickbooks_department_name,
+            }
+            if department_mapping.quickbooks_class_id:
+                detail["ClassRef"] = {
+                    "value": department_mapping.quickbooks_class_id,
+                    "name": department_mapping.quickbooks_class_name,
+                }
+
+        return {
+            "Description": description,
+            "Amount": float(amount),
+            "DetailType": "JournalEntryLineDetail",
+            "JournalEntryLineDetail": detail,
+        }
@@ -1,6 +1,8 @@
 import requests
 import json
 import base64
+import re
+import threading
 import uuid
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -17,11 +19,13 @@ from accounting.models import (
     SyncLog,
     PayrollSyncStatus,
     ExpenseSyncStatus,
+    VendorReference,
+    SyncCursor,
 )
+from accounts.models import CustomUser
 from payroll.models import (
     PayrollPeriod,
     Payslip,
-    PayrollDepartmentSummary,
     SalaryAdvance,
     PayrollBankTransfer,
 )
@@ -35,8 +39,21 @@ from expenses.models import (
 
 from employees.models import EmployeeProfile
 
+from .journal_builder import PayrollJournalBuilder
+from .sync_metrics import track_sync
+from .sync_scheduler import SyncScheduler
+from .quickbooks_transport import (
+    QuickBooksAPIError,
+    QuickBooksTokenCache,
+    QuickBooksTransport,
+)
+
 
 class QuickBooksConnector:
+    BATCH_SIZE = 30
+    CDC_MAX_AGE = timedelta(days=29)
+    VENDOR_CODE_PATTERN = re.compile(r"\(([^()]+)\)$")
+
     def __init__(self, credentials=None):
         if credentials:
             self.credentials = credentials
@@ -49,19 +66,29 @@ class QuickBooksConnector:
         self.base_url = "https://sandbox-quickbooks.api.intuit.com/v3/company"
         if self.credentials.environment == "production":
             self.base_url = "https://quickbooks.api.intuit.com/v3/company"
+        self.base_url = getattr(settings, "QUICKBOOKS_BASE_URL", "") or self.base_url
 
         self.company_endpoint = f"{self.base_url}/{self.credentials.realm_id}"
-        self.token_endpoint = (
+        self.token_endpoint = getattr(settings, "QUICKBOOKS_TOKEN_URL", "") or (
             "https://oauth.platform.intuit.com/oauth2/v1/tokens/bearer"
         )
 
+        self.transport = QuickBooksTransport(self.credentials.realm_id)
+        self.token_cache = QuickBooksTokenCache(self.credentials, self.request_token)
+        self.vendor_refs = {}
+        self.vendor_lock = threading.RLock()
+        self.account_mappings = None
+        self.department_mappings = None
+
         self.refresh_token_if_needed()
 
     def refresh_token_if_needed(self):
-        if self.credentials.is_token_expired():
-            self.refresh_token()
+        return self.token_cache.get_access_token()
 
     def refresh_token(self):
+        return self.token_cache.refresh(stale_token=self.credentials.access_token)
+
+    def request_token(self):
         auth_header = base64.b64encode(
             f"{self.credentials.client_id}:{self.credentials.client_secret}".encode()
         ).decode()
@@ -69,6 +96,7 @@ class QuickBooksConnector:
         headers = {
             "Authorization": f"Basic {auth_header}",
             "Content-Type": "application/x-www-form-urlencoded",
+            "Accept": "application/json",
         }
 
         data = {
@@ -76,53 +104,59 @@ class QuickBooksConnector:
             "refresh_token": self.credentials.refresh_token,
         }
 
-        response = requests.post(self.token_endpoint, headers=headers, data=data)
+        response = self.transport.request(
+            "POST",
+            self.token_endpoint,
+            lambda: headers,
+            data=data,
+            rate_limited=False,
+            # A retried POST could spend the rotating refresh token twice.
+            max_retries=0,
+        )
 
         if response.status_code != 200:
             raise Exception(f"Failed to refresh token: {response.text}")
 
-        token_data = response.json()
-
-        self.credentials.access_token = token_data["access_token"]
-        self.credentials.refresh_token = token_data.get(
-            "refresh_token", self.credentials.refresh_token
-        )
-        self.credentials.token_expires_at = timezone.now() + timedelta(
-            seconds=token_data["expires_in"]
-        )
-        self.credentials.save(
-            update_fields=["access_token", "refresh_token", "token_expires_at"]
-        )
+        return response.json()
 
     def get_headers(self):
-        self.refresh_token_if_needed()
         return {
-            "Authorization": f"Bearer {self.credentials.access_token}",
+            "Authorization": f"Bearer {self.token_cache.get_access_token()}",
             "Accept": "application/json",
             "Content-Type": "application/json",
         }
 
+    def reauthorize(self):
+        stale_token = self.token_cache.token
+        self.token_cache.invalidate()
+        self.token_cache.refresh(stale_token=stale_token)
+
     def make_api_request(self, method, endpoint, data=None, params=None):
         url = f"{self.company_endpoint}/{endpoint}"
-        headers = self.get_headers()
 
-        try:
-            if method.upper() == "GET":
-                response = requests.get(url, headers=headers, params=params)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=headers, json=data)
-            elif method.upper() == "PUT":
-                response = requests.put(url, headers=headers, json=data)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+        if method.upper() not in ("GET", "POST", "PUT"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
 
+        try:
+            response = self.transport.request(
+                method,
+                url,
+                self.get_headers,
+                json=data if method.upper() != "GET" else None,
+                params=params,
+                on_unauthorized=self.reauthorize,
+            )
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             error_message = f"API request failed: {str(e)}"
-            if hasattr(e, "response") and e.response:
+            if hasattr(e, "response") and e.response is not None:
                 error_message += f" - {e.response.text}"
-            raise Exception(error_message)
+            raise QuickBooksAPIError(
+                error_message,
+                status_code=getattr(e.response, "status_code", None),
+                response=e.response,
+            )
 
     def get_account_by_id(self, account_id):
         return self.make_api_request("GET", f"account/{account_id}")
@@ -132,13 +166,11 @@ class QuickBooksConnector:
         if account_type:
             params["account_type"] = account_type
 
-        response = self.make_api_request(
-            "GET",
-            "query",
-            params={
-                "query": f"SELECT * FROM Account {f'WHERE AccountType = \'{account_type}\'' if account_type else ''}"
-            },
-        )
+        query = "SELECT * FROM Account"
+        if account_type:
+            query += f" WHERE AccountType = '{account_type}'"
+
+        response = self.make_api_request("GET", "query", params={"query": query})
 
         if "QueryResponse" in response and "Account" in response["QueryResponse"]:
             return response["QueryResponse"]["Account"]
@@ -201,9 +233,28 @@ class QuickBooksConnector:
         return self.make_api_request("POST", "vendor", data=vendor_data)
 
     def update_vendor(self, vendor_id, vendor_data):
+        reference = VendorReference.objects.filter(quickbooks_vendor_id=vendor_id).first()
+
         vendor_data["Id"] = vendor_id
-        vendor_data["SyncToken"] = self.get_vendor_sync_token(vendor_id)
-        return self.make_api_request("POST", "vendor", data=vendor_data)
+        if reference:
+            vendor_data["SyncToken"] = reference.sync_token
+        else:
+            vendor_data["SyncToken"] = self.get_vendor_sync_token(vendor_id)
+
+        try:
+            response = self.make_api_request("POST", "vendor", data=vendor_data)
+        except QuickBooksAPIError as e:
+            # The vendor changed since our last CDC pass; retry with a fresh token.
+            if not reference or "Stale" not in str(e):
+                raise
+            vendor_data["SyncToken"] = self.get_vendor_sync_token(vendor_id)
+            response = self.make_api_request("POST", "vendor", data=vendor_data)
+
+        if reference and "Vendor" in response:
+            reference.sync_token = response["Vendor"]["SyncToken"]
+            reference.save(update_fields=["sync_token", "updated_at"])
+
+        return response
 
     def get_vendor_sync_token(self, vendor_id):
         vendor = self.make_api_request("GET", f"vendor/{vendor_id}")
@@ -211,21 +262,82 @@ class QuickBooksConnector:
             return vendor["Vendor"]["SyncToken"]
         return "0"
 
-    def get_account_mapping(self, mapping_type, source_id):
+    def batch_item(self, batch_id, entity, data, operation="create"):
+        return {"bId": batch_id, "operation": operation, entity: data}
+
+    def execute_batch(self, items, scheduler=None):
+        chunks = [
+            items[start:start + self.BATCH_SIZE]
+            for start in range(0, len(items), self.BATCH_SIZE)
+        ]
+
+        results = {}
+        if scheduler:
+            futures = [scheduler.submit(None, self.execute_batch_chunk, chunk) for chunk in chunks]
+            for future in futures:
+                results.update(future.result())
+        else:
+            for chunk in chunks:
+                results.update(self.execute_batch_chunk(chunk))
+
+        return results
+
+    def execute_batch_chunk(self, chunk):
         try:
-            return AccountMapping.active.get(
-                mapping_type=mapping_type, source_id=source_id, is_active=True
+            response = self.make_api_request(
+                "POST", "batch", data={"BatchItemRequest": chunk}
             )
-        except AccountMapping.DoesNotExist:
-            return None
+        except Exception as e:
+            return {item["bId"]: {"success": False, "error": str(e)} for item in chunk}
 
-    def get_department_mapping(self, department_id):
-        try:
-            return DepartmentMapping.active.get(
-                department_id=department_id, is_active=True
+        responses = {
+            item.get("bId"): item for item in response.get("BatchItemResponse", [])
+        }
+        return {
+            item["bId"]: self.parse_batch_item(responses.get(item["bId"])) for item in chunk
+        }
+
+    def parse_batch_item(self, item):
+        if item is None:
+            return {"success": False, "error": "No response for batch item"}
+
+        if "Fault" in item:
+            errors = item["Fault"].get("Error", [])
+            message = "; ".join(
+                f"{error.get('Message', '')} {error.get('Detail', '')}".strip()
+                for error in errors
             )
-        except DepartmentMapping.DoesNotExist:
-            return None
+            return {
+                "success": False,
+                "error": message or "Batch item failed",
+                "code": errors[0].get("code") if errors else None,
+            }
+
+        for key, value in item.items():
+            if key != "bId" and isinstance(value, dict):
+                return {"success": True, "type": key, "entity": value, "id": value.get("Id")}
+
+        return {"success": False, "error": "Empty batch item response"}
+
+    def load_mappings(self):
+        self.account_mappings = {
+            (mapping.mapping_type, str(mapping.source_id)): mapping
+            for mapping in AccountMapping.active.all()
+        }
+
+        self.department_mappings = {}
+        for mapping in DepartmentMapping.active.order_by("-updated_at"):
+            self.department_mappings.setdefault(str(mapping.department_id), mapping)
+
+    def get_account_mapping(self, mapping_type, source_id):
+        if self.account_mappings is None:
+            self.load_mappings()
+        return self.account_mappings.get((mapping_type, str(source_id)))
+
+    def get_department_mapping(self, department_id):
+        if self.department_mappings is None:
+            self.load_mappings()
+        return self.department_mappings.get(str(department_id))
 
     def format_decimal(self, value):
         if isinstance(value, Decimal):
@@ -282,81 +394,315 @@ class QuickBooksConnector:
 
         return journal_entry
 
-    def create_or_update_employee_vendor(self, employee):
-        try:
-            employee_code = employee.employee_code
-            employee_name = employee.get_full_name()
+    def get_vendor_display_name(self, employee):
+        return f"{employee.get_full_name()} ({employee.employee_code})"
 
-            existing_vendor = self.get_vendor_by_employee_code(employee_code)
+    def parse_quickbooks_datetime(self, value):
+        try:
+            return datetime.fromisoformat(value) if value else None
+        except ValueError:
+            return None
 
-            try:
-                profile = EmployeeProfile.objects.get(user=employee)
-                has_profile = True
-            except EmployeeProfile.DoesNotExist:
-                has_profile = False
-
-            vendor_data = {
-                "DisplayName": f"{employee_name} ({employee_code})",
-                "PrintOnCheckName": employee_name,
-                "Active": employee.is_active,
-                "CompanyName": settings.COMPANY_NAME if hasattr(settings, 'COMPANY_NAME') else "",
-                "PrimaryEmailAddr": {
-                    "Address": employee.email or ""
-                },
-                "PrimaryPhone": {
-                    "FreeFormNumber": employee.phone_number or ""
-                },
-                "BillAddr": {
-                    "Line1": employee.address_line1 or "",
-                    "Line2": employee.address_line2 or "",
-                    "City": employee.city or "",
-                    "CountrySubDivisionCode": employee.state or "",
-                    "PostalCode": employee.postal_code or "",
-                    "Country": employee.country or ""
-                },
-                "VendorType": "Employee"
+    def remember_vendor(self, employee, vendor):
+        reference, _ = VendorReference.objects.update_or_create(
+            employee=employee,
+            defaults={
+                "quickbooks_vendor_id": vendor["Id"],
+                "display_name": vendor["DisplayName"],
+                "sync_token": vendor.get("SyncToken", "0"),
+                "quickbooks_updated_at": self.parse_quickbooks_datetime(
+                    vendor.get("MetaData", {}).get("LastUpdatedTime")
+                ),
             }
+        )
+        self.vendor_refs[employee.id] = reference
+        return reference
 
-            if has_profile:
-                if profile.bank_name:
-                    vendor_data["APAccountRef"] = {
-                        "value": self.get_account_mapping("PAYMENT_METHOD", "BANK_TRANSFER").quickbooks_account_id
-                    }
-
-                vendor_data["TaxIdentifier"] = profile.tax_identification_number or ""
+    def load_vendor_references(self, employees):
+        missing = {employee.id for employee in employees if employee.id not in self.vendor_refs}
+        if missing:
+            for reference in VendorReference.objects.filter(employee_id__in=missing):
+                self.vendor_refs[reference.employee_id] = reference
 
-                if profile.bank_account_number:
-                    vendor_data["GSTIN"] = profile.bank_account_number
+    def create_or_update_employee_vendor(self, employee):
+        try:
+            vendor_data = self.build_vendor_data(employee)
 
-                vendor_data["Notes"] = f"Job Title: {employee.job_title or ''}\nDepartment: {employee.department.name if employee.department else ''}"
+            self.load_vendor_references([employee])
+            reference = self.vendor_refs.get(employee.id)
 
-            if existing_vendor:
-                return self.update_vendor(existing_vendor["Id"], vendor_data)
+            if reference:
+                response = self.update_vendor(reference.quickbooks_vendor_id, vendor_data)
             else:
-                return self.create_vendor(vendor_data)
+                existing_vendor = self.get_vendor_by_employee_code(employee.employee_code)
+                if existing_vendor:
+                    response = self.update_vendor(existing_vendor["Id"], vendor_data)
+                else:
+                    response = self.create_vendor(vendor_data)
+
+            if "Vendor" in response:
+                self.remember_vendor(employee, response["Vendor"])
+            return response
 
         except Exception as e:
             raise Exception(f"Failed to create/update employee vendor: {str(e)}")
 
+    def build_vendor_data(self, employee):
+        employee_name = employee.get_full_name()
+
+        try:
+            profile = EmployeeProfile.objects.get(user=employee)
+            has_profile = True
+        except EmployeeProfile.DoesNotExist:
+            has_profile = False
+
+        vendor_data = {
+            "DisplayName": self.get_vendor_display_name(employee),
+            "PrintOnCheckName": employee_name,
+            "Active": employee.is_active,
+            "CompanyName": settings.COMPANY_NAME if hasattr(settings, 'COMPANY_NAME') else "",
+            "PrimaryEmailAddr": {
+                "Address": employee.email or ""
+            },
+            "PrimaryPhone": {
+                "FreeFormNumber": employee.phone_number or ""
+            },
+            "BillAddr": {
+                "Line1": employee.address_line1 or "",
+                "Line2": employee.address_line2 or "",
+                "City": employee.city or "",
+                "CountrySubDivisionCode": employee.state or "",
+                "PostalCode": employee.postal_code or "",
+                "Country": employee.country or ""
+            },
+            "VendorType": "Employee"
+        }
+
+        if has_profile:
+            if profile.bank_name:
+                vendor_data["APAccountRef"] = {
+                    "value": self.get_account_mapping("PAYMENT_METHOD", "BANK_TRANSFER").quickbooks_account_id
+                }
+
+            vendor_data["TaxIdentifier"] = profile.tax_identification_number or ""
+
+            if profile.bank_account_number:
+                vendor_data["GSTIN"] = profile.bank_account_number
+
+            vendor_data["Notes"] = f"Job Title: {employee.job_title or ''}\nDepartment: {employee.department.name if employee.department else ''}"
+
+        return vendor_data
+
     def get_employee_entity_ref(self, employee):
-        vendor = self.get_vendor_by_employee_code(employee.employee_code)
-        if vendor:
-            return {
-                "value": vendor["Id"],
-                "name": vendor["DisplayName"],
-                "type": "Vendor"
-            }
+        self.load_vendor_references([employee])
+        if employee.id in self.vendor_refs:
+            return self.vendor_refs[employee.id].as_entity_ref()
 
-        vendor_response = self.create_or_update_employee_vendor(employee)
-        if "Vendor" in vendor_response:
-            return {
-                "value": vendor_response["Vendor"]["Id"],
-                "name": vendor_response["Vendor"]["DisplayName"],
-                "type": "Vendor"
-            }
+        with self.vendor_lock:
+            if employee.id in self.vendor_refs:
+                return self.vendor_refs[employee.id].as_entity_ref()
+
+            vendor = self.get_vendor_by_employee_code(employee.employee_code)
+            if not vendor:
+                vendor = self.create_vendor(self.build_vendor_data(employee)).get("Vendor")
+
+            if not vendor:
+                raise Exception(f"Failed to get or create vendor for employee {employee.employee_code}")
+
+            return self.remember_vendor(employee, vendor).as_entity_ref()
+
+    def prefetch_employee_vendors(self, employees):
+        # Concurrent sync jobs share this connector; one resolves vendors at a time
+        # so the same employee is never created twice.
+        with self.vendor_lock:
+            self.resolve_employee_vendors(employees)
+
+    def resolve_employee_vendors(self, employees):
+        employees = list({employee.id: employee for employee in employees}.values())
+        self.load_vendor_references(employees)
+
+        pending = {}
+        for employee in employees:
+            if employee.id not in self.vendor_refs:
+                pending.setdefault(self.get_vendor_display_name(employee), employee)
+
+        if not pending:
+            return
+
+        names = list(pending)
+        queries = []
+        for start in range(0, len(names), 100):
+            quoted = ", ".join(
+                "'" + name.replace("'", "\\'") + "'" for name in names[start:start + 100]
+            )
+            queries.append({
+                "bId": f"vendors:{start}",
+                "Query": (
+                    "SELECT * FROM Vendor WHERE Active IN (true, false) "
+                    f"AND DisplayName IN ({quoted}) MAXRESULTS 1000"
+                )
+            })
+
+        for result in self.execute_batch(queries).values():
+            if not result["success"]:
+                continue
+            for vendor in result["entity"].get("Vendor", []):
+                employee = pending.pop(vendor["DisplayName"], None)
+                if employee:
+                    self.remember_vendor(employee, vendor)
+
+        creates = [
+            self.batch_item(f"vendor:{employee.id}", "Vendor", self.build_vendor_data(employee))
+            for employee in pending.values()
+        ]
+        results = self.execute_batch(creates)
+
+        # Anything left (e.g. a renamed vendor clashing on DisplayName) falls
+        # back to the one-by-one lookup in get_employee_entity_ref.
+        for employee in pending.values():
+            result = results[f"vendor:{employee.id}"]
+            if result["success"]:
+                self.remember_vendor(employee, result["entity"])
+
+    def get_all_vendors(self):
+        # Queries return only active vendors unless told otherwise, and
+        # terminated employees keep their (inactive) vendor.
+        vendors = []
+        start = 1
+        while True:
+            response = self.make_api_request(
+                "GET",
+                "query",
+                params={
+                    "query": (
+                        "SELECT * FROM Vendor WHERE Active IN (true, false) "
+                        f"STARTPOSITION {start} MAXRESULTS 1000"
+                    )
+                }
+            )
+            page = response.get("QueryResponse", {}).get("Vendor", [])
+            vendors.extend(page)
+            if len(page) < 1000:
+                return vendors
+            start += 1000
+
+    def get_changed_entities(self, entity, changed_since):
+        response = self.make_api_request(
+            "GET",
+            "cdc",
+            params={"entities": entity, "changedSince": changed_since.isoformat()}
+        )
+
+        entities = []
+        for cdc in response.get("CDCResponse", []):
+            for query_response in cdc.get("QueryResponse", []):
+                entities.extend(query_response.get(entity, []))
+        return entities
+
+    def get_entities_by_id(self, entity, ids):
+        ids = list(ids)
+        queries = []
+        for start in range(0, len(ids), 100):
+            quoted = ", ".join(f"'{entity_id}'" for entity_id in ids[start:start + 100])
+            queries.append({
+                "bId": f"{entity}:{start}",
+                "Query": f"SELECT * FROM {entity} WHERE Id IN ({quoted}) MAXRESULTS 1000"
+            })
 
-        raise Exception(f"Failed to get or create vendor for employee {employee.employee_code}")
+        entities = []
+        for result in self.execute_batch(queries).values():
+            if not result["success"]:
+                raise QuickBooksAPIError(f"Failed to load {entity} records: {result['error']}")
+            entities.extend(result["entity"].get(entity, []))
+        return entities
+
+    def refresh_vendor_references(self):
+        cursor = SyncCursor.get("quickbooks_vendor_cdc")
+        started_at = timezone.now()
+
+        # CDC only reaches back 30 days; older cursors need a full pass.
+        full = not cursor.changed_since or started_at - cursor.changed_since > self.CDC_MAX_AGE
+        if full:
+            vendors = self.get_all_vendors()
+        else:
+            vendors = self.get_changed_entities("Vendor", cursor.changed_since)
+
+        result = self.apply_vendor_changes(vendors, full)
+        cursor.advance(started_at)
+        result["mode"] = "full" if full else "cdc"
+        return result
+
+    def apply_vendor_changes(self, vendors, full=False):
+        references = VendorReference.objects.all()
+        if not full:
+            references = references.filter(
+                quickbooks_vendor_id__in=[vendor["Id"] for vendor in vendors]
+            )
+        references = {reference.quickbooks_vendor_id: reference for reference in references}
+
+        updated = []
+        removed = []
+        seen = set()
+        unmatched = {}
+
+        for vendor in vendors:
+            reference = references.get(vendor["Id"])
+            if vendor.get("status") == "Deleted":
+                if reference:
+                    removed.append(reference.id)
+                continue
 
+            seen.add(vendor["Id"])
+            if reference:
+                reference.sync_token = vendor.get("SyncToken", reference.sync_token)
+                reference.display_name = vendor.get("DisplayName", reference.display_name)
+                reference.quickbooks_updated_at = self.parse_quickbooks_datetime(
+                    vendor.get("MetaData", {}).get("LastUpdatedTime")
+                )
+                updated.append(reference)
+                continue
+
+            match = self.VENDOR_CODE_PATTERN.search(vendor.get("DisplayName", ""))
+            if match:
+                unmatched[match.group(1)] = vendor
+
+        if full:
+            # Only vendors missing from a pass that includes inactive ones
+            # are gone; a reference is never dropped for being inactive.
+            removed.extend(
+                reference.id
+                for vendor_id, reference in references.items()
+                if vendor_id not in seen
+            )
+
+        with transaction.atomic():
+            VendorReference.objects.bulk_update(
+                updated,
+                ["sync_token", "display_name", "quickbooks_updated_at"],
+                batch_size=500
+            )
+            VendorReference.objects.filter(id__in=removed).delete()
+
+            employees = CustomUser.objects.filter(
+                employee_code__in=list(unmatched), quickbooks_vendor__isnull=True
+            )
+            linked = VendorReference.objects.bulk_create([
+                VendorReference(
+                    employee=employee,
+                    quickbooks_vendor_id=unmatched[employee.employee_code]["Id"],
+                    display_name=unmatched[employee.employee_code]["DisplayName"],
+                    sync_token=unmatched[employee.employee_code].get("SyncToken", "0"),
+                    quickbooks_updated_at=self.parse_quickbooks_datetime(
+                        unmatched[employee.employee_code].get("MetaData", {}).get("LastUpdatedTime")
+                    )
+                )
+                for employee in employees
+            ])
+
+        self.vendor_refs = {}
+        return {"updated": len(updated), "removed": len(removed), "linked": len(linked)}
+
+    @track_sync
     def sync_payroll_period(self, payroll_period_id, user=None):
         try:
             payroll_period = PayrollPeriod.objects.get(id=payroll_period_id)
@@ -387,26 +733,37 @@ class QuickBooksConnector:
                 payroll_sync_status.total_amount = payroll_period.total_net_salary
                 payroll_sync_status.save(update_fields=["total_amount"])
 
-            if payroll_sync_status.is_synced:
+            # Periods synced before detail references were tracked already had their details posted.
+            if payroll_sync_status.is_synced and not payroll_sync_status.details_tracked:
                 sync_log.mark_as_completed(1, 1, 0)
                 return True, "Payroll period already synced", sync_log
 
-            journal_entry = self.create_payroll_journal_entry(payroll_period)
+            if payroll_sync_status.is_synced:
+                details = self.sync_payroll_details(payroll_period, user, payroll_sync_status)
+                self.complete_payroll_sync_log(sync_log, details)
+                return True, "Payroll period already synced", sync_log
 
-            qb_response = self.create_journal_entry(journal_entry)
+            payload = PayrollJournalBuilder.get_payload(payroll_period)
+
+            qb_response = self.create_journal_entry(payload["journal_entry"])
 
             if qb_response and "JournalEntry" in qb_response:
                 qb_id = qb_response["JournalEntry"]["Id"]
                 payroll_sync_status.is_synced = True
                 payroll_sync_status.last_sync_at = timezone.now()
                 payroll_sync_status.quickbooks_reference = qb_id
+                payroll_sync_status.quickbooks_sync_token = qb_response["JournalEntry"].get("SyncToken")
+                payroll_sync_status.source_updated_at = payroll_period.updated_at
+                payroll_sync_status.details_tracked = True
+                # QuickBooks reports a journal's TotalAmt as its debit total, not the net salary.
+                payroll_sync_status.journal_total = Decimal(payload["debit_total"])
                 payroll_sync_status.sync_log = sync_log
                 payroll_sync_status.save()
 
                 sync_log.quickbooks_reference = qb_id
-                sync_log.mark_as_completed(1, 1, 0)
 
-                self.sync_payroll_details(payroll_period, user)
+                details = self.sync_payroll_details(payroll_period, user, payroll_sync_status)
+                self.complete_payroll_sync_log(sync_log, details)
 
                 return True, f"Payroll period synced successfully. QuickBooks ID: {qb_id}", sync_log
             else:
@@ -418,42 +775,89 @@ class QuickBooksConnector:
             sync_log.mark_as_failed(error_message)
             return False, f"Error syncing payroll period: {error_message}", sync_log
 
-    def sync_payroll_details(self, payroll_period, user=None):
-        payslips = Payslip.objects.filter(
-            payroll_period=payroll_period,
-            status__in=["CALCULATED", "APPROVED", "PAID"]
+    def complete_payroll_sync_log(self, sync_log, details):
+        sync_log.mark_as_completed(
+            1 + details["processed"],
+            1 + details["succeeded"],
+            details["failed"]
         )
 
-        for payslip in payslips:
-            try:
-                self.sync_payslip(payslip, user)
-            except Exception as e:
-                continue
+        if details["errors"]:
+            sync_log.error_details = {"details": details["errors"]}
+            sync_log.save(update_fields=["error_details"])
+
+    def sync_payroll_details(self, payroll_period, user=None, sync_status=None):
+        references = dict(sync_status.detail_references) if sync_status else {}
 
-        salary_advances = SalaryAdvance.objects.filter(
+        payslips = list(Payslip.objects.filter(
+            payroll_period=payroll_period,
+            status__in=["CALCULATED", "APPROVED", "PAID"]
+        ).select_related("employee", "employee__department", "payroll_period"))
+
+        salary_advances = list(SalaryAdvance.objects.filter(
             status__in=["APPROVED", "ACTIVE"],
             disbursement_date__gte=payroll_period.start_date,
             disbursement_date__lte=payroll_period.end_date
-        )
+        ).select_related("employee", "employee__department"))
 
-        for advance in salary_advances:
-            try:
-                self.sync_salary_advance(advance, user)
-            except Exception as e:
-                continue
-
-        bank_transfers = PayrollBankTransfer.objects.filter(
+        bank_transfers = list(PayrollBankTransfer.objects.filter(
             payroll_period=payroll_period,
             status__in=["GENERATED", "SENT", "PROCESSED", "COMPLETED"]
+        ).select_related("payroll_period"))
+
+        sources = [
+            ("payslip", payslips, self.build_payslip_journal_entry),
+            ("advance", salary_advances, self.build_salary_advance_journal_entry),
+            ("transfer", bank_transfers, self.build_bank_transfer_journal_entry),
+        ]
+
+        # Items posted by an earlier, partially failed run are not sent again.
+        pending = [
+            (f"{prefix}:{record.id}", record, builder)
+            for prefix, records, builder in sources
+            for record in records
+            if f"{prefix}:{record.id}" not in references
+        ]
+
+        self.prefetch_employee_vendors(
+            record.employee for _, record, _ in pending if hasattr(record, "employee")
         )
 
-        for transfer in bank_transfers:
+        items = []
+        errors = {}
+        for batch_id, record, builder in pending:
             try:
-                self.sync_bank_transfer(transfer, user)
+                items.append(self.batch_item(batch_id, "JournalEntry", builder(record)))
             except Exception as e:
-                continue
+                errors[batch_id] = str(e)
+
+        for batch_id, result in self.execute_batch(items).items():
+            if result["success"]:
+                references[batch_id] = result["id"]
+            else:
+                errors[batch_id] = result["error"]
+
+        if sync_status is not None:
+            sync_status.detail_references = references
+            sync_status.save(update_fields=["detail_references"])
+
+        return {
+            "processed": len(pending),
+            "succeeded": len(pending) - len(errors),
+            "failed": len(errors),
+            "errors": errors,
+        }
 
     def sync_payslip(self, payslip, user=None):
+        return self.create_journal_entry(self.build_payslip_journal_entry(payslip))
+
+    def sync_salary_advance(self, advance, user=None):
+        return self.create_journal_entry(self.build_salary_advance_journal_entry(advance))
+
+    def sync_bank_transfer(self, transfer, user=None):
+        return self.create_journal_entry(self.build_bank_transfer_journal_entry(transfer))
+
+    def build_payslip_journal_entry(self, payslip):
         doc_number = f"PS-{payslip.reference_number}"
         txn_date = payslip.payroll_period.end_date
         memo = f"Payslip for {payslip.employee.get_full_name()} - {payslip.payroll_period.period_name}"
@@ -690,10 +1094,9 @@ class QuickBooksConnector:
         if payslip.employee.department:
             department_id = payslip.employee.department.id
 
-        journal_entry = self.prepare_journal_entry(txn_date, doc_number, memo, line_items, department_id)
-        return self.create_journal_entry(journal_entry)
+        return self.prepare_journal_entry(txn_date, doc_number, memo, line_items, department_id)
 
-    def sync_salary_advance(self, advance, user=None):
+    def build_salary_advance_journal_entry(self, advance):
         doc_number = f"ADV-{advance.reference_number}"
         txn_date = advance.disbursement_date or advance.approved_date or timezone.now().date()
         memo = f"Salary Advance for {advance.employee.get_full_name()} - {advance.purpose_details or advance.reason}"
@@ -731,10 +1134,9 @@ class QuickBooksConnector:
         if advance.employee.department:
             department_id = advance.employee.department.id
 
-        journal_entry = self.prepare_journal_entry(txn_date, doc_number, memo, line_items, department_id)
-        return self.create_journal_entry(journal_entry)
+        return self.prepare_journal_entry(txn_date, doc_number, memo, line_items, department_id)
 
-    def sync_bank_transfer(self, transfer, user=None):
+    def build_bank_transfer_journal_entry(self, transfer):
         doc_number = f"BT-{transfer.batch_reference}"
         txn_date = transfer.sent_at.date() if transfer.sent_at else timezone.now().date()
         memo = f"Bank Transfer for {transfer.payroll_period.period_name}"
@@ -765,125 +1167,10 @@ class QuickBooksConnector:
             "account_name": bank_mapping.quickbooks_account_name
         })
 
-        journal_entry = self.prepare_journal_entry(txn_date, doc_number, memo, line_items)
-        return self.create_journal_entry(journal_entry)
-
-    def create_payroll_journal_entry(self, payroll_period):
-        period_name = payroll_period.period_name
-        doc_number = f"PR-{payroll_period.year}{payroll_period.month:02d}"
-        txn_date = payroll_period.end_date
-        memo = f"Payroll for {period_name}"
-
-        line_items = []
-
-        salary_mapping = self.get_account_mapping("PAYROLL_COMPONENT", "SALARY_EXPENSE")
-        if not salary_mapping:
-            raise Exception("Salary expense account mapping not found")
-
-        line_items.append({
-            "description": f"Gross Salary for {period_name}",
-            "amount": payroll_period.total_gross_salary,
-            "posting_type": "DEBIT",
-            "account_id": salary_mapping.quickbooks_account_id,
-            "account_name": salary_mapping.quickbooks_account_name
-        })
-
-        epf_employer_mapping = self.get_account_mapping("PAYROLL_COMPONENT", "EPF_EMPLOYER")
-        if epf_employer_mapping:
-            line_items.append({
-                "description": f"Employer EPF Contribution for {period_name}",
-                "amount": payroll_period.total_epf_employer,
-                "posting_type": "DEBIT",
-                "account_id": epf_employer_mapping.quickbooks_account_id,
-                "account_name": epf_employer_mapping.quickbooks_account_name
-            })
-
-        etf_mapping = self.get_account_mapping("PAYROLL_COMPONENT", "ETF_CONTRIBUTION")
-        if etf_mapping:
-            line_items.append({
-                "description": f"ETF Contribution for {period_name}",
-                "amount": payroll_period.total_etf_contribution,
-                "posting_type": "DEBIT",
-                "account_id": etf_mapping.quickbooks_account_id,
-                "account_name": etf_mapping.quickbooks_account_name
-            })
-
-        epf_employee_mapping = self.get_account_mapping("PAYROLL_DEDUCTION", "EPF_EMPLOYEE")
-        if epf_employee_mapping:
-            line_items.append({
-                "description": f"Employee EPF Contribution for {period_name}",
-                "amount": payroll_period.total_epf_employee,
-                "posting_type": "CREDIT",
-                "account_id": epf_employee_mapping.quickbooks_account_id,
-                "account_name": epf_employee_mapping.quickbooks_account_name
-            })
-
-        if epf_employer_mapping:
-            line_items.append({
-                "description": f"Employer EPF Liability for {period_name}",
-                "amount": payroll_period.total_epf_employer,
-                "posting_type": "CREDIT",
-                "account_id": epf_employer_mapping.quickbooks_account_id,
-                "account_name": epf_employer_mapping.quickbooks_account_name
-            })
-
-        if etf_mapping:
-            line_items.append({
-                "description": f"ETF Liability for {period_name}",
-                "amount": payroll_period.total_etf_contribution,
-                "posting_type": "CREDIT",
-                "account_id": etf_mapping.quickbooks_account_id,
-                "account_name": etf_mapping.quickbooks_account_name
-            })
-
-        salary_payable_mapping = self.get_account_mapping("PAYROLL_COMPONENT", "SALARY_PAYABLE")
-        if not salary_payable_mapping:
-            raise Exception("Salary payable account mapping not found")
-
-        line_items.append({
-            "description": f"Net Salary Payable for {period_name}",
-            "amount": payroll_period.total_net_salary,
-            "posting_type": "CREDIT",
-            "account_id": salary_payable_mapping.quickbooks_account_id,
-            "account_name": salary_payable_mapping.quickbooks_account_name
-        })
-
-        self.add_department_payroll_entries(payroll_period, line_items)
-
         return self.prepare_journal_entry(txn_date, doc_number, memo, line_items)
 
-    def add_department_payroll_entries(self, payroll_period, line_items):
-        department_summaries = PayrollDepartmentSummary.objects.filter(
-            payroll_period=payroll_period,
-            is_active=True
-        )
-
-        if not department_summaries.exists():
-            return
-
-        salary_mapping = self.get_account_mapping("PAYROLL_COMPONENT", "SALARY_EXPENSE")
-        if not salary_mapping:
-            return
-
-        for dept_summary in department_summaries:
-            dept_mapping = self.get_department_mapping(dept_summary.department.id)
-            if not dept_mapping:
-                continue
-
-            dept_line = {
-                "description": f"Gross Salary for {dept_summary.department.name}",
-                "amount": dept_summary.total_gross_salary,
-                "posting_type": "DEBIT",
-                "account_id": salary_mapping.quickbooks_account_id,
-                "account_name": salary_mapping.quickbooks_account_name,
-                "include_department": True
-            }
-
-            if dept_mapping.quickbooks_class_id:
-                dept_line["class_id"] = dept_mapping.quickbooks_class_id
-                dept_line["class_name"] = dept_mapping.quickbooks_class_name
-
-            line_items.append(dept_line)
+    def create_payroll_journal_entry(self, payroll_period):
+        return PayrollJournalBuilder.get_payload(payroll_period)["journal_entry"]
 
     def create_expense_journal_entry(self, expense):
         doc_number = f"EXP-{expense.reference}"
@@ -1362,6 +1649,78 @@ class QuickBooksConnector:
             raise Exception(f"Error creating installment payment: {str(e)}")
 
 
+    def new_expense_sync_status(self, expense):
+        return ExpenseSyncStatus(
+            expense_id=str(expense.id),
+            expense_reference=expense.reference,
+            employee_id=str(expense.employee.id),
+            employee_name=expense.employee.get_full_name(),
+            amount=expense.total_amount,
+            expense_date=expense.date_incurred
+        )
+
+    def get_expense_sync_statuses(self, expenses):
+        statuses = {}
+        for status in ExpenseSyncStatus.objects.filter(
+            expense_id__in=[str(expense.id) for expense in expenses]
+        ):
+            statuses.setdefault(status.expense_id, status)
+
+        missing = [
+            self.new_expense_sync_status(expense)
+            for expense in expenses
+            if str(expense.id) not in statuses
+        ]
+        for status in ExpenseSyncStatus.objects.bulk_create(missing):
+            statuses[status.expense_id] = status
+
+        return statuses
+
+    def sync_expense_related_records(self, expense):
+        try:
+            purchase_items = PurchaseItem.objects.filter(expense=expense, is_active=True)
+            has_returns = purchase_items.filter(return_status="RETURNED").exists()
+
+            if has_returns:
+                self.sync_purchase_return(expense, purchase_items.filter(return_status="RETURNED"))
+        except:
+            pass
+
+        try:
+            installment_plans = ExpenseInstallmentPlan.objects.filter(expense=expense, is_active=True)
+            if installment_plans.exists():
+                for plan in installment_plans:
+                    self.sync_expense_installment_plan(plan)
+
+                    installments = ExpenseInstallment.objects.filter(plan=plan, is_active=True)
+                    for installment in installments:
+                        if installment.is_processed:
+                            self.sync_expense_installment(installment)
+        except:
+            pass
+
+    def prepare_expense_batch_item(self, expense):
+        # Returns and installment plans post before the expense itself, in order.
+        self.sync_expense_related_records(expense)
+        entity, qb_data = self.build_expense_payload(expense)
+        return self.batch_item(str(expense.id), entity, qb_data)
+
+    def build_expense_payload(self, expense):
+        if expense.is_reimbursable:
+            return "Purchase", self.create_reimbursable_expense(expense)
+        return "JournalEntry", self.create_expense_journal_entry(expense)
+
+    def mark_expense_synced(self, expense_sync_status, expense, entity, qb_entity, sync_log):
+        expense_sync_status.is_synced = True
+        expense_sync_status.last_sync_at = timezone.now()
+        expense_sync_status.updated_at = expense_sync_status.last_sync_at
+        expense_sync_status.quickbooks_reference = qb_entity["Id"]
+        expense_sync_status.quickbooks_entity = entity
+        expense_sync_status.quickbooks_sync_token = qb_entity.get("SyncToken")
+        expense_sync_status.source_updated_at = expense.updated_at
+        expense_sync_status.sync_log = sync_log
+
+    @track_sync
     def sync_expense(self, expense_id, user=None):
         try:
             expense = Expense.objects.get(id=expense_id)
@@ -1378,18 +1737,9 @@ class QuickBooksConnector:
         try:
             sync_log.mark_as_started()
             
-            expense_sync_status, created = ExpenseSyncStatus.objects.get_or_create(
-                expense_id=str(expense.id),
-                defaults={
-                    "expense_reference": expense.reference,
-                    "employee_id": str(expense.employee.id),
-                    "employee_name": expense.employee.get_full_name(),
-                    "amount": expense.total_amount,
-                    "expense_date": expense.date_incurred
-                }
-            )
-            
-            if not created:
+            expense_sync_status = self.get_expense_sync_statuses([expense])[str(expense.id)]
+
+            if expense_sync_status.amount != expense.total_amount:
                 expense_sync_status.amount = expense.total_amount
                 expense_sync_status.save(update_fields=["amount"])
             
@@ -1397,47 +1747,17 @@ class QuickBooksConnector:
                 sync_log.mark_as_completed(1, 1, 0)
                 return True, "Expense already synced", sync_log
             
-            try:
-                purchase_items = PurchaseItem.objects.filter(expense=expense, is_active=True)
-                has_returns = purchase_items.filter(return_status="RETURNED").exists()
-                
-                if has_returns:
-                    self.sync_purchase_return(expense, purchase_items.filter(return_status="RETURNED"))
-            except:
-                pass
-            
-            try:
-                installment_plans = ExpenseInstallmentPlan.objects.filter(expense=expense, is_active=True)
-                if installment_plans.exists():
-                    for plan in installment_plans:
-                        self.sync_expense_installment_plan(plan)
-                
-                        installments = ExpenseInstallment.objects.filter(plan=plan, is_active=True)
-                        for installment in installments:
-                            if installment.is_processed:
-                                self.sync_expense_installment(installment)
-            except:
-                pass
-            
-            if expense.is_reimbursable:
-                qb_data = self.create_reimbursable_expense(expense)
-            else:
-                qb_data = self.create_expense_journal_entry(expense)
-            
-            qb_response = None
-            if isinstance(qb_data, dict) and qb_data.get("Line"):
-                qb_response = self.create_journal_entry(qb_data)
-            elif isinstance(qb_data, dict) and qb_data.get("AccountRef"):
-                qb_response = self.create_expense(qb_data)
+            self.sync_expense_related_records(expense)
+
+            entity, qb_data = self.build_expense_payload(expense)
+            qb_response = self.make_api_request("POST", entity.lower(), data=qb_data)
             
-            if qb_response:
-                entity_type = next(iter(qb_response.keys()))
-                qb_id = qb_response[entity_type]["Id"]
+            if qb_response and entity in qb_response:
+                qb_id = qb_response[entity]["Id"]
                 
-                expense_sync_status.is_synced = True
-                expense_sync_status.last_sync_at = timezone.now()
-                expense_sync_status.quickbooks_reference = qb_id
-                expense_sync_status.sync_log = sync_log
+                self.mark_expense_synced(
+                    expense_sync_status, expense, entity, qb_response[entity], sync_log
+                )
                 expense_sync_status.save()
                 
                 sync_log.quickbooks_reference = qb_id
@@ -1453,6 +1773,7 @@ class QuickBooksConnector:
             sync_log.mark_as_failed(error_message)
             return False, f"Error syncing expense: {error_message}", sync_log
 
+    @track_sync
     def batch_sync_expenses(self, expense_ids=None, status=None, date_range=None, user=None):
         filters = Q(is_active=True)
 
@@ -1466,38 +1787,93 @@ class QuickBooksConnector:
             start_date, end_date = date_range
             filters &= Q(date_incurred__range=[start_date, end_date])
 
-        expenses = Expense.objects.filter(filters)
+        expenses = list(
+            Expense.objects.filter(filters).select_related(
+                "employee", "employee__department", "department", "expense_type", "expense_category"
+            )
+        )
 
-        if not expenses.exists():
+        if not expenses:
             return False, "No expenses found matching the criteria", None
 
         sync_log = SyncLog.objects.create(
             sync_type="EXPENSE",
-            source_reference=f"Batch sync - {expenses.count()} expenses",
+            source_reference=f"Batch sync - {len(expenses)} expenses",
             created_by=user
         )
 
         try:
             sync_log.mark_as_started()
 
-            success_count = 0
-            failed_count = 0
+            statuses = self.get_expense_sync_statuses(expenses)
+            expenses_by_id = {str(expense.id): expense for expense in expenses}
             error_details = {}
+            items = []
+            self.load_mappings()
+
+            with SyncScheduler(sync_log) as scheduler:
+                vendors = scheduler.submit(
+                    "vendors",
+                    self.prefetch_employee_vendors,
+                    [
+                        expense.employee for expense in expenses
+                        if expense.is_reimbursable and not statuses[str(expense.id)].is_synced
+                    ]
+                )
 
-            for expense in expenses:
-                try:
-                    success, message, _ = self.sync_expense(expense.id, user)
-                    if success:
-                        success_count += 1
+                prepared = {}
+                for expense in expenses:
+                    expense_sync_status = statuses[str(expense.id)]
+                    expense_sync_status.amount = expense.total_amount
+                    if expense_sync_status.is_synced:
+                        continue
+
+                    prepared[str(expense.id)] = scheduler.submit(
+                        f"expense:{expense.id}",
+                        self.prepare_expense_batch_item,
+                        expense,
+                        after=[vendors] if expense.is_reimbursable else ()
+                    )
+
+                for expense_id, future in prepared.items():
+                    try:
+                        items.append(future.result())
+                    except Exception as e:
+                        error_details[expense_id] = str(e)
+
+                for expense_id, result in self.execute_batch(items, scheduler).items():
+                    if result["success"]:
+                        self.mark_expense_synced(
+                            statuses[expense_id],
+                            expenses_by_id[expense_id],
+                            result["type"],
+                            result["entity"],
+                            sync_log
+                        )
                     else:
-                        failed_count += 1
-                        error_details[str(expense.id)] = message
-                except Exception as e:
-                    failed_count += 1
-                    error_details[str(expense.id)] = str(e)
+                        error_details[expense_id] = result["error"]
+
+            ExpenseSyncStatus.objects.bulk_update(
+                statuses.values(),
+                [
+                    "amount",
+                    "is_synced",
+                    "last_sync_at",
+                    "quickbooks_reference",
+                    "quickbooks_entity",
+                    "quickbooks_sync_token",
+                    "source_updated_at",
+                    "sync_log",
+                    "updated_at",
+                ],
+                batch_size=500
+            )
+
+            failed_count = len(error_details)
+            success_count = len(expenses) - failed_count
 
             sync_log.mark_as_completed(
-                expenses.count(),
+                len(expenses),
                 success_count,
                 failed_count
             )
@@ -1513,6 +1889,26 @@ class QuickBooksConnector:
             sync_log.mark_as_failed(error_message)
             return False, f"Error in batch sync: {error_message}", sync_log
 
+    def get_payroll_employees(self, periods):
+        employee_ids = set(
+            Payslip.objects.filter(
+                payroll_period__in=periods,
+                status__in=["CALCULATED", "APPROVED", "PAID"]
+            ).values_list("employee_id", flat=True)
+        )
+
+        advance_dates = Q()
+        for period in periods:
+            advance_dates |= Q(disbursement_date__range=[period.start_date, period.end_date])
+        employee_ids.update(
+            SalaryAdvance.objects.filter(
+                advance_dates, status__in=["APPROVED", "ACTIVE"]
+            ).values_list("employee_id", flat=True)
+        )
+
+        return list(CustomUser.objects.filter(id__in=employee_ids).select_related("department"))
+
+    @track_sync
     def batch_sync_payroll(self, period_ids=None, year=None, month=None, user=None):
         filters = Q(is_active=True)
 
@@ -1525,14 +1921,14 @@ class QuickBooksConnector:
         if month:
             filters &= Q(month=month)
 
-        periods = PayrollPeriod.objects.filter(filters)
+        periods = list(PayrollPeriod.objects.filter(filters))
 
-        if not periods.exists():
+        if not periods:
             return False, "No payroll periods found matching the criteria", None
 
         sync_log = SyncLog.objects.create(
             sync_type="PAYROLL",
-            source_reference=f"Batch sync - {periods.count()} payroll periods",
+            source_reference=f"Batch sync - {len(periods)} payroll periods",
             created_by=user
         )
 
@@ -1542,21 +1938,37 @@ class QuickBooksConnector:
             success_count = 0
             failed_count = 0
             error_details = {}
+            self.load_mappings()
 
-            for period in periods:
+            with SyncScheduler(sync_log) as scheduler:
+                vendors = scheduler.submit(
+                    "vendors", self.prefetch_employee_vendors, self.get_payroll_employees(periods)
+                )
+                futures = {
+                    str(period.id): scheduler.submit(
+                        f"payroll:{period.id}",
+                        self.sync_payroll_period,
+                        period.id,
+                        user,
+                        after=[vendors]
+                    )
+                    for period in periods
+                }
+
+            for period_id, future in futures.items():
                 try:
-                    success, message, _ = self.sync_payroll_period(period.id, user)
+                    success, message, _ = future.result()
                     if success:
                         success_count += 1
                     else:
                         failed_count += 1
-                        error_details[str(period.id)] = message
+                        error_details[period_id] = message
                 except Exception as e:
                     failed_count += 1
-                    error_details[str(period.id)] = str(e)
+                    error_details[period_id] = str(e)
 
             sync_log.mark_as_completed(
-                periods.count(),
+                len(periods),
                 success_count,
                 failed_count
             )
@@ -1572,6 +1984,7 @@ class QuickBooksConnector:
             sync_log.mark_as_failed(error_message)
             return False, f"Error in batch sync: {error_message}", sync_log
 
+    @track_sync
     def full_sync(self, user=None):
         sync_log = SyncLog.objects.create(
             sync_type="FULL_SYNC",
@@ -1588,6 +2001,7 @@ class QuickBooksConnector:
             total_succeeded = 0
             total_failed = 0
             error_details = {}
+            jobs = {}
 
             if config.payroll_sync_enabled:
                 unsynced_periods = PayrollPeriod.objects.filter(
@@ -1599,18 +2013,9 @@ class QuickBooksConnector:
                     ).values_list("payroll_period_id", flat=True)
                 )
 
-                if unsynced_periods.exists():
-                    success, message, payroll_log = self.batch_sync_payroll(
-                        period_ids=[p.id for p in unsynced_periods],
-                        user=user
-                    )
-
-                    total_processed += payroll_log.records_processed
-                    total_succeeded += payroll_log.records_succeeded
-                    total_failed += payroll_log.records_failed
-
-                    if payroll_log.error_details:
-                        error_details["payroll"] = payroll_log.error_details
+                period_ids = list(unsynced_periods.values_list("id", flat=True))
+                if period_ids:
+                    jobs["payroll"] = (self.batch_sync_payroll, period_ids)
 
             if config.expense_sync_enabled:
                 unsynced_expenses = Expense.objects.filter(
@@ -1622,18 +2027,33 @@ class QuickBooksConnector:
                     ).values_list("expense_id", flat=True)
                 )
 
-                if unsynced_expenses.exists():
-                    success, message, expense_log = self.batch_sync_expenses(
-                        expense_ids=[e.id for e in unsynced_expenses],
-                        user=user
-                    )
+                expense_ids = list(unsynced_expenses.values_list("id", flat=True))
+                if expense_ids:
+                    jobs["expenses"] = (self.batch_sync_expenses, expense_ids)
+
+            # Payroll and expenses run side by side; each fans out further.
+            with SyncScheduler(sync_log, workers=len(jobs) or 1) as scheduler:
+                futures = {
+                    name: scheduler.submit(name, method, ids, user=user)
+                    for name, (method, ids) in jobs.items()
+                }
+
+            for name, future in futures.items():
+                try:
+                    _, message, child_log = future.result()
+                except Exception as e:
+                    error_details[name] = str(e)
+                    continue
+
+                if child_log is None:
+                    continue
 
-                    total_processed += expense_log.records_processed
-                    total_succeeded += expense_log.records_succeeded
-                    total_failed += expense_log.records_failed
+                total_processed += child_log.records_processed
+                total_succeeded += child_log.records_succeeded
+                total_failed += child_log.records_failed
 
-                    if expense_log.error_details:
-                        error_details["expenses"] = expense_log.error_details
+                if child_log.error_details:
+                    error_details[name] = child_log.error_details
 
             sync_log.mark_as_completed(
                 total_processed,
@@ -0,0 +1,259 @@
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+BATCH_LIMIT = 30
+
+ENTITY_NAMES = {
+    "account": "Account",
+    "bill": "Bill",
+    "class": "Class",
+    "department": "Department",
+    "employee": "Employee",
+    "journalentry": "JournalEntry",
+    "purchase": "Purchase",
+    "vendor": "Vendor",
+}
+
+
+class MockQuickBooksState:
+    def __init__(self, latency=0.0, error_rate=0.0, per_minute=500, max_concurrency=10):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.per_minute = per_minute
+        self.max_concurrency = max_concurrency
+        self.lock = threading.Lock()
+        self.entities = {}
+        self.changed_at = {}
+        self.requests_seen = {}
+        self.windows = {}
+        self.inflight = {}
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0, "duplicates": 0}
+
+    def enter(self, realm_id):
+        """Returns a status code to reject with, or None to serve the request."""
+        with self.lock:
+            self.stats["requests"] += 1
+            window = (realm_id, int(time.time() // 60))
+            self.windows[window] = self.windows.get(window, 0) + 1
+            if self.windows[window] > self.per_minute:
+                self.stats["throttled"] += 1
+                return 429
+            if self.inflight.get(realm_id, 0) >= self.max_concurrency:
+                self.stats["throttled"] += 1
+                return 429
+            if random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return 503
+            self.inflight[realm_id] = self.inflight.get(realm_id, 0) + 1
+            return None
+
+    def leave(self, realm_id):
+        with self.lock:
+            self.inflight[realm_id] -= 1
+
+    def save(self, realm_id, name, payload):
+        with self.lock:
+            store = self.entities.setdefault((realm_id, name), {})
+            entity = dict(payload)
+            if entity.get("Id") in store:
+                entity["SyncToken"] = str(int(store[entity["Id"]]["SyncToken"]) + 1)
+            else:
+                entity["Id"] = str(len(store) + 1)
+                entity["SyncToken"] = "0"
+            entity["MetaData"] = {"LastUpdatedTime": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+            store[entity["Id"]] = entity
+            self.changed_at[(realm_id, name, entity["Id"])] = time.time()
+            return entity
+
+    def get(self, realm_id, name, entity_id):
+        with self.lock:
+            return self.entities.get((realm_id, name), {}).get(entity_id)
+
+    def changes(self, realm_id, name, changed_since):
+        with self.lock:
+            return [
+                entity
+                for entity_id, entity in self.entities.get((realm_id, name), {}).items()
+                if self.changed_at.get((realm_id, name, entity_id), 0) >= changed_since
+            ]
+
+    def query(self, realm_id, statement):
+        match = re.search(r"from\s+(\w+)", statement, re.IGNORECASE)
+        name = ENTITY_NAMES.get(match.group(1).lower(), match.group(1)) if match else ""
+        with self.lock:
+            rows = list(self.entities.get((realm_id, name), {}).values())
+
+        # Every stored entity is returned regardless of Active.
+        statement = re.sub(
+            r"where\s+active\s+in\s*\(\s*true\s*,\s*false\s*\)\s*(and\b)?",
+            lambda match: "WHERE" if match.group(1) else "",
+            statement,
+            flags=re.IGNORECASE,
+        )
+        values = re.search(r"where\s+(\w+)\s+in\s*\((.*)\)", statement, re.IGNORECASE)
+        condition = re.search(r"where\s+(\w+)\s*(=|like)\s*'([^']*)'", statement, re.IGNORECASE)
+        if values:
+            field = values.group(1)
+            wanted = {
+                value.replace("\\'", "'")
+                for value in re.findall(r"'((?:[^'\\]|\\.)*)'", values.group(2))
+            }
+            rows = [row for row in rows if str(row.get(field, "")) in wanted]
+        elif condition:
+            field, operator, value = condition.groups()
+            if operator.lower() == "like":
+                pattern = re.escape(value).replace("%", ".*")
+                rows = [row for row in rows if re.fullmatch(pattern, str(row.get(field, "")))]
+            else:
+                rows = [row for row in rows if str(row.get(field, "")) == value]
+
+        return {"QueryResponse": {name: rows} if rows else {}, "time": time.time()}
+
+
+class MockQuickBooksHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: MockQuickBooksState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = self.read_body()
+
+        if url.path == "/__stats":
+            return self.send_json(200, self.state.stats)
+
+        if url.path.endswith("/oauth2/v1/tokens/bearer"):
+            return self.send_json(
+                200,
+                {
+                    "access_token": uuid.uuid4().hex,
+                    "refresh_token": uuid.uuid4().hex,
+                    "token_type": "bearer",
+                    "expires_in": 3600,
+                },
+            )
+
+        match = re.match(r"^/v3/company/([^/]+)/(\w+)(?:/([^/]+))?$", url.path)
+        if not match:
+            return self.send_json(404, {"Fault": {"Error": [{"Message": "Not found"}]}})
+
+        realm_id, resource, entity_id = match.groups()
+        rejected = self.state.enter(realm_id)
+        if rejected:
+            return self.send_json(
+                rejected,
+                {"Fault": {"Error": [{"Message": "Throttled" if rejected == 429 else "Unavailable"}]}},
+                {"Retry-After": "1"} if rejected == 429 else None,
+            )
+
+        try:
+            if self.state.latency:
+                time.sleep(random.uniform(0.5, 1.5) * self.state.latency)
+
+            request_id = query.get("requestid")
+            if request_id:
+                with self.state.lock:
+                    cached = self.state.requests_seen.get((realm_id, request_id))
+                if cached:
+                    self.state.stats["duplicates"] += 1
+                    return self.send_json(200, cached)
+
+            payload = self.handle_resource(method, realm_id, resource, entity_id, query, body)
+            if payload is None:
+                return self.send_json(404, {"Fault": {"Error": [{"Message": "Not found"}]}})
+
+            if request_id:
+                with self.state.lock:
+                    self.state.requests_seen[(realm_id, request_id)] = payload
+            return self.send_json(200, payload)
+        finally:
+            self.state.leave(realm_id)
+
+    def handle_resource(self, method, realm_id, resource, entity_id, query, body):
+        if resource == "query":
+            return self.state.query(realm_id, query.get("query", ""))
+
+        if resource == "cdc":
+            names = [
+                ENTITY_NAMES.get(name.lower(), name)
+                for name in query.get("entities", "").split(",")
+                if name
+            ]
+            try:
+                changed_since = datetime.fromisoformat(query["changedSince"]).timestamp()
+            except (KeyError, ValueError):
+                changed_since = 0
+            changed = [
+                {name: self.state.changes(realm_id, name, changed_since)} for name in names
+            ]
+            return {"CDCResponse": [{"QueryResponse": changed}], "time": time.time()}
+
+        if resource == "batch":
+            items = json.loads(body or b"{}").get("BatchItemRequest", [])
+            if len(items) > BATCH_LIMIT:
+                return {"Fault": {"Error": [{"Message": f"Batch exceeds {BATCH_LIMIT} items"}]}}
+            return {
+                "BatchItemResponse": [
+                    self.handle_batch_item(realm_id, item) for item in items
+                ]
+            }
+
+        name = ENTITY_NAMES.get(resource.lower(), resource)
+        if method == "GET":
+            entity = self.state.get(realm_id, name, entity_id)
+            return {name: entity} if entity else None
+
+        return {name: self.state.save(realm_id, name, json.loads(body or b"{}"))}
+
+    def handle_batch_item(self, realm_id, item):
+        response = {"bId": item.get("bId")}
+        if "Query" in item:
+            response.update(self.state.query(realm_id, item["Query"]))
+            return response
+
+        for name in ENTITY_NAMES.values():
+            if name in item:
+                response[name] = self.state.save(realm_id, name, item[name])
+                return response
+
+        response["Fault"] = {"Error": [{"Message": "Unsupported batch item"}]}
+        return response
+
+
+def run_mock_server(host="127.0.0.1", port=8765, **options) -> ThreadingHTTPServer:
+    state = MockQuickBooksState(**options)
+    handler = type("Handler", (MockQuickBooksHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    return server
@@ -0,0 +1,387 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Optional
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class QuickBooksAPIError(Exception):
+    def __init__(self, message, status_code=None, response=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RealmRateLimiter:
+    """
+    Keeps one realm under Intuit's throttles: a local token bucket smooths
+    each process, and counters in the shared cache cap the request rate and
+    the number of in-flight requests across every Celery worker.
+    """
+
+    PER_MINUTE = getattr(settings, "QUICKBOOKS_RATE_LIMIT_PER_MINUTE", 500)
+    MAX_CONCURRENCY = getattr(settings, "QUICKBOOKS_MAX_CONCURRENCY", 10)
+    BURST = getattr(settings, "QUICKBOOKS_RATE_LIMIT_BURST", 20)
+
+    _limiters: Dict[str, "RealmRateLimiter"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, realm_id: str):
+        self.realm_id = realm_id
+        self.bucket = TokenBucket(self.PER_MINUTE / 60.0, self.BURST)
+        self.slots = threading.BoundedSemaphore(self.MAX_CONCURRENCY)
+
+    @classmethod
+    def for_realm(cls, realm_id: str) -> "RealmRateLimiter":
+        with cls._registry_lock:
+            if realm_id not in cls._limiters:
+                cls._limiters[realm_id] = cls(realm_id)
+            return cls._limiters[realm_id]
+
+    def get_window_key(self) -> str:
+        return f"quickbooks:rate:{self.realm_id}:{int(time.time() // 60)}"
+
+    def get_inflight_key(self) -> str:
+        return f"quickbooks:inflight:{self.realm_id}"
+
+    def acquire(self) -> float:
+        waited = self.bucket.acquire()
+
+        while True:
+            key = self.get_window_key()
+            cache.add(key, 0, 120)
+            try:
+                count = cache.incr(key)
+            except ValueError:
+                count = 1
+            if count <= self.PER_MINUTE:
+                break
+            delay = 60 - time.time() % 60 + random.uniform(0, 1)
+            logger.warning(
+                f"QuickBooks realm {self.realm_id} reached {self.PER_MINUTE} requests/min, "
+                f"waiting {delay:.1f}s"
+            )
+            time.sleep(delay)
+            waited += delay
+
+        self.slots.acquire()
+        key = self.get_inflight_key()
+        while True:
+            cache.add(key, 0, 60)
+            try:
+                inflight = cache.incr(key)
+            except ValueError:
+                inflight = 1
+            if inflight <= self.MAX_CONCURRENCY:
+                return waited
+            cache.decr(key)
+            delay = random.uniform(0.05, 0.25)
+            time.sleep(delay)
+            waited += delay
+
+    def release(self):
+        try:
+            cache.decr(self.get_inflight_key())
+        except ValueError:
+            pass
+        finally:
+            self.slots.release()
+
+
+class QuickBooksTokenCache:
+    """
+    Shares the OAuth access token between workers through the Django cache.
+    Intuit rotates the refresh token on every refresh, so only one worker may
+    refresh at a time; the others wait for the token it publishes.
+    """
+
+    MARGIN = timedelta(seconds=getattr(settings, "QUICKBOOKS_TOKEN_MARGIN", 120))
+    # Outlives one unretried token request, so the lock cannot lapse mid-refresh.
+    LOCK_TIMEOUT = (
+        getattr(settings, "QUICKBOOKS_CONNECT_TIMEOUT", 5)
+        + getattr(settings, "QUICKBOOKS_READ_TIMEOUT", 60)
+        + 30
+    )
+
+    def __init__(self, credentials, refresher: Callable[[], Dict]):
+        self.credentials = credentials
+        self.refresher = refresher
+        self.key = f"quickbooks:token:{credentials.pk}"
+        self.lock_key = f"{self.key}:lock"
+        self.token = None
+        self.expires_at = None
+
+    def is_valid(self, expires_at) -> bool:
+        return bool(expires_at) and timezone.now() + self.MARGIN < expires_at
+
+    def get_access_token(self) -> str:
+        if self.token and self.is_valid(self.expires_at):
+            return self.token
+
+        cached = cache.get(self.key)
+        if cached and self.is_valid(cached["expires_at"]):
+            self.use(cached["access_token"], cached["expires_at"])
+            return self.token
+
+        if self.is_valid(self.credentials.token_expires_at) and self.credentials.access_token:
+            self.publish()
+            return self.token
+
+        return self.refresh()
+
+    def use(self, access_token: str, expires_at):
+        self.token = access_token
+        self.expires_at = expires_at
+        self.credentials.access_token = access_token
+        self.credentials.token_expires_at = expires_at
+
+    def publish(self):
+        self.use(self.credentials.access_token, self.credentials.token_expires_at)
+        timeout = (self.expires_at - timezone.now()).total_seconds()
+        cache.set(
+            self.key,
+            {"access_token": self.token, "expires_at": self.expires_at},
+            max(int(timeout), 1),
+        )
+
+    def invalidate(self):
+        stale = self.token
+        self.token = None
+        self.expires_at = None
+        cached = cache.get(self.key)
+        if cached and cached["access_token"] == stale:
+            cache.delete(self.key)
+
+    def refresh(self, stale_token: Optional[str] = None) -> str:
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        lock_token = uuid.uuid4().hex
+
+        while True:
+            if cache.add(self.lock_key, lock_token, self.LOCK_TIMEOUT):
+                try:
+                    # Another worker may have refreshed while we were waiting.
+                    self.credentials.refresh_from_db(
+                        fields=["access_token", "refresh_token", "token_expires_at"]
+                    )
+                    if (
+                        self.credentials.access_token
+                        and self.credentials.access_token != stale_token
+                        and self.is_valid(self.credentials.token_expires_at)
+                    ):
+                        self.publish()
+                        return self.token
+
+                    token_data = self.refresher()
+                    self.credentials.access_token = token_data["access_token"]
+                    self.credentials.refresh_token = token_data.get(
+                        "refresh_token", self.credentials.refresh_token
+                    )
+                    self.credentials.token_expires_at = timezone.now() + timedelta(
+                        seconds=token_data["expires_in"]
+                    )
+                    self.credentials.save(
+                        update_fields=["access_token", "refresh_token", "token_expires_at"]
+                    )
+                    self.publish()
+                    return self.token
+                finally:
+                    # Never release a lock that expired and was taken by another worker.
+                    if cache.get(self.lock_key) == lock_token:
+                        cache.delete(self.lock_key)
+
+            cached = cache.get(self.key)
+            if (
+                cached
+                and cached["access_token"] != stale_token
+                and self.is_valid(cached["expires_at"])
+            ):
+                self.use(cached["access_token"], cached["expires_at"])
+                return self.token
+
+            if time.monotonic() > deadline:
+                raise QuickBooksAPIError("Timed out waiting for QuickBooks token refresh")
+            time.sleep(random.uniform(0.1, 0.3))
+
+
+class QuickBooksTransport:
+    CONNECT_TIMEOUT = getattr(settings, "QUICKBOOKS_CONNECT_TIMEOUT", 5)
+    READ_TIMEOUT = getattr(settings, "QUICKBOOKS_READ_TIMEOUT", 60)
+    MAX_RETRIES = getattr(settings, "QUICKBOOKS_MAX_RETRIES", 5)
+    BACKOFF_BASE = getattr(settings, "QUICKBOOKS_BACKOFF_BASE", 0.5)
+    BACKOFF_CAP = getattr(settings, "QUICKBOOKS_BACKOFF_CAP", 30)
+    POOL_SIZE = getattr(settings, "QUICKBOOKS_POOL_SIZE", 10)
+
+    _session = None
+    _session_pid = None
+    _session_lock = threading.Lock()
+
+    def __init__(self, realm_id: str):
+        self.realm_id = realm_id
+        self.limiter = RealmRateLimiter.for_realm(realm_id)
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "waited": 0.0}
+        self.metrics = None
+        self.metrics_lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        # Celery forks its workers, so each process builds its own pool.
+        with cls._session_lock:
+            if cls._session is None or cls._session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=cls.POOL_SIZE, pool_maxsize=cls.POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                cls._session = session
+                cls._session_pid = os.getpid()
+            return cls._session
+
+    def get_backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2**attempt))
+
+    def get_retry_after(self, response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(value) - timezone.now()).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0), self.BACKOFF_CAP) + random.uniform(0, 0.5)
+
+    def observe(self, method, url, response, started, attempt, waited):
+        metrics = self.metrics
+        if metrics is None:
+            return
+
+        latency = time.monotonic() - started
+        if response is None:
+            metrics.record(method, url, None, latency, attempt, waited=waited)
+            return
+
+        body = response.request.body if response.request is not None else None
+        metrics.record(
+            method,
+            url,
+            response.status_code,
+            latency,
+            attempt,
+            request_bytes=len(body) if body else 0,
+            response_bytes=len(response.content or b""),
+            waited=waited,
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        get_headers: Callable[[], Dict],
+        json=None,
+        params=None,
+        data=None,
+        on_unauthorized: Callable[[], None] = None,
+        rate_limited: bool = True,
+        max_retries: int = None,
+    ) -> requests.Response:
+        max_retries = self.MAX_RETRIES if max_retries is None else max_retries
+        params = dict(params or {})
+        if method.upper() == "POST" and json is not None:
+            # QuickBooks de-duplicates writes by requestid, so retries are safe.
+            params.setdefault("requestid", uuid.uuid4().hex)
+
+        session = self.get_session()
+        reauthorized = False
+        attempt = 0
+
+        while True:
+            waited = self.limiter.acquire() if rate_limited else 0.0
+            self.stats["waited"] += waited
+            self.stats["requests"] += 1
+            started = time.monotonic()
+            try:
+                response = session.request(
+                    method.upper(),
+                    url,
+                    headers=get_headers(),
+                    json=json,
+                    params=params or None,
+                    data=data,
+                    timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT),
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.observe(method, url, None, started, attempt, waited)
+                if attempt >= max_retries:
+                    raise QuickBooksAPIError(f"API request failed: {str(e)}")
+                delay = self.get_backoff(attempt)
+                logger.warning(
+                    f"QuickBooks {method} {url} failed ({e}), retrying in {delay:.2f}s"
+                )
+            else:
+                self.observe(method, url, response, started, attempt, waited)
+                if response.status_code == 401 and on_unauthorized and not reauthorized:
+                    reauthorized = True
+                    on_unauthorized()
+                    continue
+
+                if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                    return response
+
+                if response.status_code == 429:
+                    self.stats["throttled"] += 1
+                delay = self.get_retry_after(response)
+                if delay is None:
+                    delay = self.get_backoff(attempt)
+                logger.warning(
+                    f"QuickBooks {method} {url} returned {response.status_code}, "
+                    f"retrying in {delay:.2f}s"
+                )
+            finally:
+                if rate_limited:
+                    self.limiter.release()
+
+            attempt += 1
+            self.stats["retries"] += 1
+            time.sleep(delay)
@@ -0,0 +1,342 @@
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from django.utils import timezone
+from accounting.models import (
+    ExpenseSyncStatus,
+    PayrollSyncStatus,
+    SyncConfiguration,
+    SyncCursor,
+    SyncLog,
+)
+from accounting.signals import SYNCABLE_PERIOD_STATUSES
+from accounting.services.sync_metrics import track_sync
+from accounting.sync_queue import SyncQueue
+from expenses.models import Expense
+from payroll.models import PayrollPeriod
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QuickBooksReconciler:
+    """
+    Reconciles only what changed since the last run: local records by their
+    updated_at, QuickBooks records through Change Data Capture. Each run
+    syncs anything new and writes a drift report to a RECONCILIATION log.
+    """
+
+    LOCAL_CURSOR = "reconcile_local"
+    REMOTE_CURSOR = "reconcile_quickbooks_cdc"
+    REMOTE_ENTITIES = ["JournalEntry", "Purchase"]
+    # Rows committed by long transactions can carry an updated_at just
+    # before the previous checkpoint.
+    OVERLAP = timedelta(minutes=5)
+
+    def __init__(self, connector=None, user=None):
+        if connector is None:
+            from .quickbooks_connector import QuickBooksConnector
+
+            connector = QuickBooksConnector()
+        self.connector = connector
+        self.user = user
+        self.config = SyncConfiguration.get_active_config()
+
+    @track_sync
+    def run(self):
+        started_at = timezone.now()
+        local_cursor = SyncCursor.get(self.LOCAL_CURSOR)
+        remote_cursor = SyncCursor.get(self.REMOTE_CURSOR)
+
+        sync_log = SyncLog.objects.create(
+            sync_type="RECONCILIATION",
+            source_reference=f"Changes since {local_cursor.changed_since or 'first run'}",
+            created_by=self.user
+        )
+
+        report = {
+            "local_since": local_cursor.changed_since.isoformat() if local_cursor.changed_since else None,
+            "remote_since": remote_cursor.changed_since.isoformat() if remote_cursor.changed_since else None,
+            "until": started_at.isoformat(),
+            "synced": {},
+            "sync_errors": {},
+            "local_drift": [],
+            "remote_drift": [],
+        }
+
+        try:
+            sync_log.mark_as_started()
+
+            checked = self.reconcile_local(local_cursor.changed_since, started_at, report)
+            checked += self.reconcile_remote(remote_cursor.changed_since, started_at, report)
+
+            local_cursor.advance(started_at)
+            remote_cursor.advance(started_at)
+
+            drift = len(report["local_drift"]) + len(report["remote_drift"])
+            failed = len(report["sync_errors"])
+            sync_log.error_details = report
+            sync_log.save(update_fields=["error_details"])
+            sync_log.mark_as_completed(checked, checked - failed, failed)
+
+            if drift:
+                logger.warning(f"QuickBooks reconciliation found {drift} drifted records")
+
+            return report, sync_log
+
+        except Exception as e:
+            logger.error(f"QuickBooks reconciliation failed: {e}")
+            sync_log.mark_as_failed(str(e), report)
+            raise
+
+    def reconcile_local(self, since, until, report):
+        periods = PayrollPeriod.objects.none()
+        expenses = Expense.objects.none()
+
+        if self.config.payroll_sync_enabled:
+            periods = PayrollPeriod.objects.filter(
+                is_active=True, status__in=SYNCABLE_PERIOD_STATUSES, updated_at__lte=until
+            )
+        if self.config.expense_sync_enabled:
+            expenses = Expense.objects.filter(
+                is_active=True, status="APPROVED", updated_at__lte=until
+            )
+
+        if since:
+            periods = periods.filter(updated_at__gt=since - self.OVERLAP)
+            expenses = expenses.filter(updated_at__gt=since - self.OVERLAP)
+
+        periods = list(periods.values("id", "period_name", "total_net_salary", "updated_at"))
+        expenses = list(expenses.values("id", "reference", "total_amount", "updated_at"))
+
+        period_statuses = {
+            status.payroll_period_id: status
+            for status in PayrollSyncStatus.objects.filter(
+                payroll_period_id__in=[str(period["id"]) for period in periods]
+            )
+        }
+        expense_statuses = {}
+        for status in ExpenseSyncStatus.objects.filter(
+            expense_id__in=[str(expense["id"]) for expense in expenses]
+        ):
+            expense_statuses.setdefault(status.expense_id, status)
+
+        pending_periods = []
+        for period in periods:
+            status = period_statuses.get(str(period["id"]))
+            if not status or not status.is_synced:
+                pending_periods.append(period["id"])
+            elif self.changed_after_sync(status, period["updated_at"], period["total_net_salary"], status.total_amount):
+                report["local_drift"].append(
+                    self.describe_local_drift(
+                        "PAYROLL_PERIOD", period["id"], period["period_name"], status,
+                        status.total_amount, period["total_net_salary"]
+                    )
+                )
+
+        pending_expenses = []
+        for expense in expenses:
+            status = expense_statuses.get(str(expense["id"]))
+            if not status or not status.is_synced:
+                pending_expenses.append(expense["id"])
+            elif self.changed_after_sync(status, expense["updated_at"], expense["total_amount"], status.amount):
+                report["local_drift"].append(
+                    self.describe_local_drift(
+                        "EXPENSE", expense["id"], expense["reference"], status,
+                        status.amount, expense["total_amount"]
+                    )
+                )
+
+        if pending_periods:
+            self.sync_pending(
+                "payroll", "PAYROLL_PERIOD", self.connector.batch_sync_payroll, pending_periods, report
+            )
+        if pending_expenses:
+            self.sync_pending(
+                "expenses", "EXPENSE", self.connector.batch_sync_expenses, pending_expenses, report
+            )
+
+        return len(periods) + len(expenses)
+
+    def changed_after_sync(self, status, updated_at, current_amount, synced_amount):
+        if status.source_updated_at and updated_at <= status.source_updated_at:
+            return False
+        return current_amount != synced_amount
+
+    def describe_local_drift(self, entity_type, entity_id, reference, status, synced_amount, current_amount):
+        return {
+            "type": entity_type,
+            "id": str(entity_id),
+            "reference": reference,
+            "quickbooks_reference": status.quickbooks_reference,
+            "reason": "amount_changed_after_sync",
+            "synced_amount": str(synced_amount),
+            "current_amount": str(current_amount),
+        }
+
+    def sync_pending(self, key, entity_type, sync, ids, report):
+        # The cursor moves past these records either way, so failures go to
+        # the sync queue to be retried with backoff.
+        try:
+            success, message, sync_log = sync(ids, user=self.user)
+        except Exception as e:
+            logger.error(f"Reconciliation failed to sync {len(ids)} {key}: {e}")
+            report["sync_errors"].update({str(entity_id): str(e) for entity_id in ids})
+            self.requeue(entity_type, ids, report)
+            return
+
+        errors = sync_log.error_details if sync_log and sync_log.error_details else {}
+        if sync_log is not None and (not success or sync_log.status == "FAILED") and not errors:
+            errors = {str(entity_id): message for entity_id in ids}
+        report["synced"][key] = {
+            "requested": len(ids),
+            "failed": len(errors),
+            "sync_log": str(sync_log.id) if sync_log else None,
+            "message": message,
+        }
+        report["sync_errors"].update({str(entity_id): str(error) for entity_id, error in errors.items()})
+        self.requeue(entity_type, list(errors), report)
+
+    def requeue(self, entity_type, ids, report):
+        for entity_id in ids:
+            if SyncQueue.request(entity_type, entity_id, "Reconciliation sync failed"):
+                report["requeued"] = report.get("requeued", 0) + 1
+
+    def reconcile_remote(self, since, until, report):
+        if since is None:
+            # Nothing to diff against yet; the next run starts from here.
+            report["remote_mode"] = "baseline"
+            return 0
+
+        if until - since > self.connector.CDC_MAX_AGE:
+            report["remote_mode"] = "references"
+            changes = self.fetch_referenced_entities()
+        else:
+            report["remote_mode"] = "cdc"
+            changes = {
+                entity: self.connector.get_changed_entities(entity, since - self.OVERLAP)
+                for entity in self.REMOTE_ENTITIES
+            }
+
+        checked = 0
+        for entity, records in changes.items():
+            references = self.get_references(entity, [record["Id"] for record in records])
+            for record in records:
+                for reference in references.get(record["Id"], []):
+                    checked += 1
+                    drift = self.compare_remote(entity, record, reference)
+                    if drift:
+                        report["remote_drift"].append(drift)
+
+        return checked
+
+    def fetch_referenced_entities(self):
+        # CDC cannot reach back this far, so re-read only the records we posted.
+        changes = {}
+        for entity in self.REMOTE_ENTITIES:
+            ids = set(
+                ExpenseSyncStatus.objects.filter(
+                    is_synced=True, quickbooks_entity__in=[entity, ""]
+                ).exclude(quickbooks_reference=None).values_list("quickbooks_reference", flat=True)
+            )
+            if entity == "JournalEntry":
+                ids.update(
+                    PayrollSyncStatus.objects.filter(is_synced=True)
+                    .exclude(quickbooks_reference=None)
+                    .values_list("quickbooks_reference", flat=True)
+                )
+                ids.update(self.get_detail_references())
+
+            found = self.connector.get_entities_by_id(entity, ids) if ids else []
+            missing = ids - {record["Id"] for record in found}
+            changes[entity] = found + [{"Id": entity_id, "status": "Deleted"} for entity_id in missing]
+        return changes
+
+    def get_detail_references(self, ids=None):
+        references = {}
+        for period_id, details in PayrollSyncStatus.objects.filter(is_synced=True).exclude(
+            detail_references={}
+        ).values_list("payroll_period_id", "detail_references"):
+            for key, qb_id in details.items():
+                if ids is None or qb_id in ids:
+                    references[qb_id] = (period_id, key)
+        return references
+
+    def get_references(self, entity, ids):
+        references = {}
+        if not ids:
+            return references
+
+        for status in ExpenseSyncStatus.objects.filter(
+            quickbooks_reference__in=ids, quickbooks_entity__in=[entity, ""], is_synced=True
+        ):
+            references.setdefault(status.quickbooks_reference, []).append({
+                "type": "EXPENSE",
+                "id": status.expense_id,
+                "reference": status.expense_reference,
+                "sync_token": status.quickbooks_sync_token,
+                "amount": status.amount,
+            })
+
+        if entity != "JournalEntry":
+            return references
+
+        for status in PayrollSyncStatus.objects.filter(quickbooks_reference__in=ids, is_synced=True):
+            references.setdefault(status.quickbooks_reference, []).append({
+                "type": "PAYROLL_PERIOD",
+                "id": status.payroll_period_id,
+                "reference": status.payroll_period_name,
+                "sync_token": status.quickbooks_sync_token,
+                "amount": status.journal_total,
+            })
+
+        for qb_id, (period_id, key) in self.get_detail_references(set(ids)).items():
+            references.setdefault(qb_id, []).append({
+                "type": "PAYROLL_DETAIL",
+                "id": period_id,
+                "reference": key,
+                "sync_token": "0",
+                "amount": None,
+            })
+
+        return references
+
+    def compare_remote(self, entity, record, reference):
+        drift = {
+            "type": reference["type"],
+            "id": reference["id"],
+            "reference": reference["reference"],
+            "quickbooks_entity": entity,
+            "quickbooks_reference": record["Id"],
+        }
+
+        if record.get("status") == "Deleted":
+            drift["reason"] = "deleted_in_quickbooks"
+            return drift
+
+        amount = self.parse_amount(record.get("TotalAmt"))
+        if reference["amount"] is not None and amount is not None and amount != reference["amount"]:
+            drift.update({
+                "reason": "amount_mismatch",
+                "synced_amount": str(reference["amount"]),
+                "quickbooks_amount": str(amount),
+            })
+            return drift
+
+        sync_token = record.get("SyncToken")
+        if reference["sync_token"] and sync_token and sync_token != reference["sync_token"]:
+            drift.update({
+                "reason": "modified_in_quickbooks",
+                "synced_token": reference["sync_token"],
+                "quickbooks_token": sync_token,
+            })
+            return drift
+
+        return None
+
+    def parse_amount(self, value):
+        if value is None:
+            return None
+        try:
+            return Decimal(str(value)).quantize(Decimal("0.01"))
+        except InvalidOperation:
+            return None
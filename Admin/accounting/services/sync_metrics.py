@@ -0,0 +1,304 @@
+from contextlib import contextmanager
+from django.core.cache import cache
+from urllib.parse import urlparse
+from typing import Dict, List, Tuple
+import functools
+import hashlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+SIZE_BUCKETS = [1024, 10240, 102400, 1048576]
+
+METRICS = {
+    "accounting_quickbooks_requests_total": (
+        "counter", "QuickBooks API requests by endpoint, method and status"
+    ),
+    "accounting_quickbooks_retries_total": (
+        "counter", "QuickBooks API request attempts that were retries"
+    ),
+    "accounting_quickbooks_request_duration_seconds": (
+        "histogram", "QuickBooks API request latency"
+    ),
+    "accounting_quickbooks_response_bytes": (
+        "histogram", "QuickBooks API response payload size"
+    ),
+    "accounting_quickbooks_request_bytes_total": (
+        "counter", "QuickBooks API request payload bytes sent"
+    ),
+    "accounting_quickbooks_rate_limit_wait_seconds_total": (
+        "counter", "Time spent waiting on the realm rate limiter"
+    ),
+    "accounting_sync_runs_total": ("counter", "Completed sync runs by type and status"),
+    "accounting_sync_records_total": ("counter", "Records processed by sync runs"),
+    "accounting_sync_run_duration_seconds": ("summary", "Sync run wall time"),
+}
+
+# Values that are not whole numbers are stored in thousandths so the
+# shared cache can increment them atomically.
+SCALED_SUFFIXES = ("_sum", "_seconds_total")
+SCALE = 1000
+
+
+def get_endpoint(url: str) -> str:
+    parts = [part for part in urlparse(url).path.split("/") if part]
+    if "company" in parts:
+        rest = parts[parts.index("company") + 2:]
+        return rest[0].lower() if rest else "company"
+    if "tokens" in parts:
+        return "oauth_token"
+    return parts[-1].lower() if parts else "root"
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def get_sort_key(series):
+    name, labels = series
+    return name, tuple(
+        (key, float(value.replace("+Inf", "inf")) if key == "le" else value)
+        for key, value in labels
+    )
+
+
+def get_percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 4)
+
+
+class SyncMetrics:
+    """
+    Collects per-request telemetry for one sync run. The transport records
+    every attempt; the run's totals go to the shared metrics store and a
+    summary is kept on the SyncLog.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.series = {}
+        self.latencies = {}
+        self.totals = {
+            "requests": 0,
+            "errors": 0,
+            "retries": 0,
+            "throttled": 0,
+            "request_bytes": 0,
+            "response_bytes": 0,
+            "rate_limit_wait_seconds": 0.0,
+        }
+        self.endpoints = {}
+
+    def add(self, name: str, labels: Tuple, value):
+        self.series[(name, labels)] = self.series.get((name, labels), 0) + value
+
+    def observe(self, name: str, labels: Tuple, value, buckets):
+        # Every bucket gets a series, even at zero, so histograms stay complete.
+        for bound in buckets:
+            self.add(f"{name}_bucket", labels + (("le", str(bound)),), int(value <= bound))
+        self.add(f"{name}_bucket", labels + (("le", "+Inf"),), 1)
+        self.add(f"{name}_sum", labels, value)
+        self.add(f"{name}_count", labels, 1)
+
+    def record(self, method, url, status, latency, attempt, request_bytes=0, response_bytes=0, waited=0.0):
+        endpoint = get_endpoint(url)
+        status = str(status) if status else "error"
+        failed = status == "error" or int(status) >= 400
+        labels = (("endpoint", endpoint),)
+
+        with self.lock:
+            self.add(
+                "accounting_quickbooks_requests_total",
+                labels + (("method", method.upper()), ("status", status)),
+                1,
+            )
+            if attempt:
+                self.add("accounting_quickbooks_retries_total", labels, 1)
+            self.add("accounting_quickbooks_request_bytes_total", labels, request_bytes)
+            self.add("accounting_quickbooks_rate_limit_wait_seconds_total", (), waited)
+            self.observe("accounting_quickbooks_request_duration_seconds", labels, latency, LATENCY_BUCKETS)
+            if status != "error":
+                self.observe("accounting_quickbooks_response_bytes", labels, response_bytes, SIZE_BUCKETS)
+
+            self.totals["requests"] += 1
+            self.totals["errors"] += failed
+            self.totals["retries"] += bool(attempt)
+            self.totals["throttled"] += status == "429"
+            self.totals["request_bytes"] += request_bytes
+            self.totals["response_bytes"] += response_bytes
+            self.totals["rate_limit_wait_seconds"] += waited
+
+            summary = self.endpoints.setdefault(
+                endpoint, {"requests": 0, "errors": 0, "retries": 0, "response_bytes": 0}
+            )
+            summary["requests"] += 1
+            summary["errors"] += failed
+            summary["retries"] += bool(attempt)
+            summary["response_bytes"] += response_bytes
+            self.latencies.setdefault(endpoint, []).append(latency)
+
+    def finish(self):
+        if self.finished_at is None:
+            self.finished_at = time.monotonic()
+
+    def get_duration(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def get_summary(self) -> Dict:
+        with self.lock:
+            latencies = [value for values in self.latencies.values() for value in values]
+            duration = self.get_duration()
+            summary = dict(self.totals)
+            summary["rate_limit_wait_seconds"] = round(summary["rate_limit_wait_seconds"], 3)
+            summary["duration_seconds"] = round(duration, 3)
+            summary["requests_per_minute"] = round(summary["requests"] * 60 / max(duration, 0.001), 2)
+            summary["latency"] = {
+                "p50": get_percentile(latencies, 50),
+                "p95": get_percentile(latencies, 95),
+                "p99": get_percentile(latencies, 99),
+                "max": round(max(latencies), 4) if latencies else 0.0,
+                "total": round(sum(latencies), 3),
+            }
+            summary["endpoints"] = {
+                endpoint: {
+                    **values,
+                    "latency_p50": get_percentile(self.latencies.get(endpoint, []), 50),
+                    "latency_p95": get_percentile(self.latencies.get(endpoint, []), 95),
+                    "latency_total": round(sum(self.latencies.get(endpoint, [])), 3),
+                }
+                for endpoint, values in self.endpoints.items()
+            }
+            return summary
+
+    def save(self, sync_log):
+        if sync_log is None:
+            return
+
+        summary = self.get_summary()
+        try:
+            sync_log.metrics = summary
+            sync_log.save(update_fields=["metrics"])
+        except Exception as e:
+            logger.error(f"Failed to save sync metrics for {sync_log.id}: {e}")
+
+        sync_type = (("sync_type", sync_log.sync_type),)
+        MetricsStore.add({
+            ("accounting_sync_runs_total", sync_type + (("status", sync_log.status),)): 1,
+            ("accounting_sync_records_total", sync_type + (("result", "succeeded"),)): sync_log.records_succeeded,
+            ("accounting_sync_records_total", sync_type + (("result", "failed"),)): sync_log.records_failed,
+            ("accounting_sync_run_duration_seconds_sum", sync_type): summary["duration_seconds"],
+            ("accounting_sync_run_duration_seconds_count", sync_type): 1,
+        })
+
+
+class MetricsStore:
+    """
+    Process-independent counters in the Django cache, so the metrics view
+    sees what every Celery worker recorded.
+    """
+
+    PREFIX = "accounting:metrics"
+    INDEX_KEY = f"{PREFIX}:index"
+
+    @staticmethod
+    def get_key(name: str, labels: Tuple) -> str:
+        digest = hashlib.sha1(repr((name, labels)).encode()).hexdigest()[:16]
+        return f"{MetricsStore.PREFIX}:{digest}"
+
+    @staticmethod
+    def add(series: Dict[Tuple[str, Tuple], float]):
+        try:
+            index = cache.get(MetricsStore.INDEX_KEY) or set()
+            missing = set()
+            for (name, labels), value in series.items():
+                if name.endswith(SCALED_SUFFIXES):
+                    value = value * SCALE
+                value = int(round(value))
+                key = MetricsStore.get_key(name, labels)
+                cache.add(key, 0, None)
+                try:
+                    cache.incr(key, value)
+                except ValueError:
+                    cache.set(key, value, None)
+                if (name, labels) not in index:
+                    missing.add((name, labels))
+
+            # Concurrent flushes may drop a new series from the index; the
+            # next flush for that series puts it back.
+            if missing:
+                index = cache.get(MetricsStore.INDEX_KEY) or set()
+                cache.set(MetricsStore.INDEX_KEY, index | missing, None)
+        except Exception as e:
+            logger.error(f"Failed to record sync metrics: {e}")
+
+    @staticmethod
+    def render() -> str:
+        index = sorted(cache.get(MetricsStore.INDEX_KEY) or set(), key=get_sort_key)
+        values = cache.get_many([MetricsStore.get_key(name, labels) for name, labels in index])
+
+        families = {}
+        for name, labels in index:
+            value = values.get(MetricsStore.get_key(name, labels))
+            if value is None:
+                continue
+            if name.endswith(SCALED_SUFFIXES):
+                value = value / SCALE
+            family = name
+            for suffix in ("_bucket", "_sum", "_count"):
+                if name.endswith(suffix) and name[: -len(suffix)] in METRICS:
+                    family = name[: -len(suffix)]
+            families.setdefault(family, []).append((name, labels, value))
+
+        lines = []
+        for family, samples in families.items():
+            metric_type, description = METRICS.get(family, ("untyped", ""))
+            lines.append(f"# HELP {family} {description}")
+            lines.append(f"# TYPE {family} {metric_type}")
+            for name, labels, value in samples:
+                label_text = ",".join(f'{key}="{escape_label(label)}"' for key, label in labels)
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def track_requests(transport):
+    with transport.metrics_lock:
+        outermost = transport.metrics is None
+        if outermost:
+            transport.metrics = SyncMetrics()
+    metrics = transport.metrics if outermost else None
+
+    try:
+        yield metrics
+    finally:
+        if outermost:
+            with transport.metrics_lock:
+                transport.metrics = None
+            metrics.finish()
+            MetricsStore.add(metrics.series)
+
+
+def track_sync(method):
+    """
+    Collects request telemetry for a sync entry point and summarizes it on
+    the SyncLog it returns. Nested entry points report into the outer run.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        transport = self.transport if hasattr(self, "transport") else self.connector.transport
+        with track_requests(transport) as metrics:
+            result = method(self, *args, **kwargs)
+        if metrics is not None and isinstance(result, tuple):
+            metrics.save(next((item for item in result if hasattr(item, "sync_type")), None))
+        return result
+
+    return wrapper
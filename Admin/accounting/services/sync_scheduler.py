@@ -0,0 +1,121 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.db import connection
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class SyncScheduler:
+    """
+    Fans sync jobs out to a bounded thread pool. Jobs sharing a key run in
+    submission order, and a job can wait on other futures (e.g. a bill on
+    its vendor). The realm-wide rate limit is enforced by the transport.
+    """
+
+    WORKERS = getattr(settings, "QUICKBOOKS_SYNC_WORKERS", 8)
+    PROGRESS_INTERVAL = 2.0
+
+    def __init__(self, sync_log=None, workers=None):
+        self.sync_log = sync_log
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or self.WORKERS, thread_name_prefix="qb-sync"
+        )
+        self.lock = threading.Lock()
+        self.tails = {}
+        self.futures = []
+        self.queued = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self.reported_at = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, key, func, *args, after=(), **kwargs) -> Future:
+        future = Future()
+        with self.lock:
+            prerequisites = [dependency for dependency in after if dependency is not None]
+            if key is not None and key in self.tails:
+                prerequisites.append(self.tails[key])
+            if key is not None:
+                self.tails[key] = future
+            self.futures.append(future)
+            self.queued += 1
+
+        remaining = [len(prerequisites)]
+
+        def release(_=None):
+            with self.lock:
+                remaining[0] -= 1
+                ready = remaining[0] <= 0
+            if ready:
+                self.executor.submit(self.run, future, func, args, kwargs)
+
+        if prerequisites:
+            for prerequisite in prerequisites:
+                prerequisite.add_done_callback(release)
+        else:
+            self.executor.submit(self.run, future, func, args, kwargs)
+
+        return future
+
+    def run(self, future, func, args, kwargs):
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"QuickBooks sync job {getattr(func, '__name__', func)} failed: {e}")
+            self.record(False)
+            future.set_exception(e)
+        else:
+            self.record(True)
+            future.set_result(result)
+        finally:
+            # Worker threads hold their own database connection.
+            connection.close()
+
+    def record(self, succeeded):
+        with self.lock:
+            self.queued -= 1
+            if succeeded:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            now = time.monotonic()
+            due = now - self.reported_at >= self.PROGRESS_INTERVAL or self.queued == 0
+            if due:
+                self.reported_at = now
+        if due:
+            self.report_progress()
+
+    def get_throughput(self) -> float:
+        elapsed = max(time.monotonic() - self.started_at, 0.001)
+        return round((self.succeeded + self.failed) * 60 / elapsed, 2)
+
+    def report_progress(self):
+        if not self.sync_log:
+            return
+        try:
+            self.sync_log.update_progress(self.queued, self.get_throughput())
+        except Exception as e:
+            logger.error(f"Failed to record sync progress for {self.sync_log.id}: {e}")
+
+    def join(self):
+        while True:
+            with self.lock:
+                pending = [future for future in self.futures if not future.done()]
+            if not pending:
+                break
+            wait(pending)
+        self.report_progress()
+        return self.futures
+
+    def shutdown(self):
+        self.join()
+        self.executor.shutdown(wait=True)
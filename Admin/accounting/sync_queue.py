@@ -0,0 +1,201 @@
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
+from django.db.models import ExpressionWrapper, F, Value
+from django.db.models.functions import Least
+from django.utils import timezone
+from datetime import timedelta
+from .models import SyncIntent
+from typing import Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+DRAIN_SCHEDULED_KEY = "accounting_sync_drain_scheduled"
+
+
+class SyncQueue:
+    DEBOUNCE_SECONDS = getattr(settings, "ACCOUNTING_SYNC_DEBOUNCE_SECONDS", 10)
+    MAX_DELAY = timedelta(seconds=getattr(settings, "ACCOUNTING_SYNC_MAX_DELAY_SECONDS", 120))
+    BATCH_SIZE = getattr(settings, "ACCOUNTING_SYNC_BATCH_SIZE", 200)
+    MAX_ATTEMPTS = getattr(settings, "ACCOUNTING_SYNC_MAX_ATTEMPTS", 5)
+    STALE_AFTER = timedelta(minutes=30)
+
+    @staticmethod
+    def request(entity_type: str, entity_id, reason: str = "") -> bool:
+        lookup = {"entity_type": entity_type, "entity_id": str(entity_id), "status": "PENDING"}
+        due_at = timezone.now() + timedelta(seconds=SyncQueue.DEBOUNCE_SECONDS)
+
+        try:
+            if not SyncQueue.bump(lookup, due_at, reason):
+                try:
+                    with transaction.atomic():
+                        SyncIntent.objects.create(**lookup, reason=reason, due_at=due_at)
+                except IntegrityError:
+                    SyncQueue.bump(lookup, due_at, reason)
+        except Exception as e:
+            logger.error(f"Failed to queue {entity_type} {entity_id} for sync: {e}")
+            return False
+
+        SyncQueue.schedule_drain()
+        return True
+
+    @staticmethod
+    def bump(lookup: Dict, due_at, reason: str) -> int:
+        # Each repeat pushes the sync back, but never past MAX_DELAY from the first request.
+        return SyncIntent.objects.filter(**lookup).update(
+            due_at=Least(
+                Value(due_at, output_field=models.DateTimeField()),
+                ExpressionWrapper(
+                    F("created_at") + SyncQueue.MAX_DELAY,
+                    output_field=models.DateTimeField(),
+                ),
+            ),
+            request_count=F("request_count") + 1,
+            reason=reason,
+            updated_at=timezone.now(),
+        )
+
+    @staticmethod
+    def cancel(entity_type: str, entity_id) -> int:
+        deleted, _ = SyncIntent.objects.filter(
+            entity_type=entity_type, entity_id=str(entity_id), status="PENDING"
+        ).delete()
+        return deleted
+
+    @staticmethod
+    def schedule_drain(countdown: int = None):
+        countdown = SyncQueue.DEBOUNCE_SECONDS + 1 if countdown is None else countdown
+
+        def enqueue():
+            if not cache.add(DRAIN_SCHEDULED_KEY, True, countdown):
+                return
+            try:
+                from .tasks import drain_sync_queue
+
+                drain_sync_queue.apply_async(countdown=countdown)
+            except Exception as e:
+                cache.delete(DRAIN_SCHEDULED_KEY)
+                logger.warning(f"Could not enqueue sync queue drain, leaving for sweep: {e}")
+
+        transaction.on_commit(enqueue)
+
+    @staticmethod
+    def claim(batch_size: int) -> List[SyncIntent]:
+        now = timezone.now()
+        with transaction.atomic():
+            intents = list(
+                SyncIntent.objects.select_for_update(skip_locked=True)
+                .filter(status="PENDING", due_at__lte=now)
+                .order_by("due_at")[:batch_size]
+            )
+            SyncIntent.objects.filter(id__in=[intent.id for intent in intents]).update(
+                status="PROCESSING", claimed_at=now
+            )
+        return intents
+
+    @staticmethod
+    def drain(batch_size: int = None) -> Dict[str, int]:
+        result = {"payroll": 0, "expenses": 0, "failed": 0}
+
+        SyncQueue.release_stale()
+        intents = SyncQueue.claim(batch_size or SyncQueue.BATCH_SIZE)
+        if not intents:
+            return result
+
+        try:
+            from .services.quickbooks_connector import QuickBooksConnector
+
+            connector = QuickBooksConnector()
+        except Exception as e:
+            SyncQueue.requeue(intents, str(e))
+            result["failed"] = len(intents)
+            return result
+
+        groups = defaultdict(list)
+        for intent in intents:
+            groups[intent.entity_type].append(intent)
+
+        handlers = {
+            "PAYROLL_PERIOD": ("payroll", connector.batch_sync_payroll),
+            "EXPENSE": ("expenses", connector.batch_sync_expenses),
+        }
+
+        for entity_type, group in groups.items():
+            key, sync = handlers[entity_type]
+            try:
+                success, message, sync_log = sync([intent.entity_id for intent in group])
+            except Exception as e:
+                SyncQueue.requeue(group, str(e))
+                result["failed"] += len(group)
+                continue
+
+            # A batch that failed as a whole records no per-entity errors.
+            if sync_log is not None and (not success or sync_log.status == "FAILED"):
+                SyncQueue.requeue(group, message)
+                result["failed"] += len(group)
+                continue
+
+            errors = sync_log.error_details if sync_log else {}
+            failed = [intent for intent in group if intent.entity_id in errors]
+            for intent in failed:
+                intent.last_error = str(errors[intent.entity_id])
+
+            SyncIntent.objects.filter(
+                id__in=[intent.id for intent in group if intent not in failed]
+            ).delete()
+            SyncQueue.requeue(failed)
+
+            result[key] += len(group) - len(failed)
+            result["failed"] += len(failed)
+
+        return result
+
+    @staticmethod
+    def requeue(intents: List[SyncIntent], error: str = None):
+        now = timezone.now()
+        for intent in intents:
+            # A save during processing already queued a fresh intent for this entity.
+            if SyncIntent.objects.filter(
+                entity_type=intent.entity_type, entity_id=intent.entity_id, status="PENDING"
+            ).exists():
+                intent.delete()
+                continue
+
+            intent.attempts += 1
+            intent.last_error = error or intent.last_error
+            intent.status = "FAILED" if intent.attempts >= SyncQueue.MAX_ATTEMPTS else "PENDING"
+            intent.due_at = now + timedelta(minutes=2 ** intent.attempts)
+            intent.claimed_at = None
+            intent.save(
+                update_fields=[
+                    "attempts",
+                    "last_error",
+                    "status",
+                    "due_at",
+                    "claimed_at",
+                    "updated_at",
+                ]
+            )
+
+    @staticmethod
+    def release_stale() -> int:
+        stale = list(
+            SyncIntent.objects.filter(
+                status="PROCESSING", claimed_at__lt=timezone.now() - SyncQueue.STALE_AFTER
+            )
+        )
+        if stale:
+            logger.warning(f"Requeueing {len(stale)} sync intents abandoned mid-drain")
+            SyncQueue.requeue(stale, "Abandoned while processing")
+        return len(stale)
+
+    @staticmethod
+    def get_next_due():
+        return (
+            SyncIntent.objects.filter(status="PENDING")
+            .order_by("due_at")
+            .values_list("due_at", flat=True)
+            .first()
+        )
@@ -1,17 +1,18 @@
 from celery import shared_task
 from django.utils import timezone
 from datetime import timedelta
-from django.db.models import Q
+from django.db.models import F
+import logging
 
 from accounting.models import (
     SyncConfiguration,
     SyncLog,
-    PayrollSyncStatus,
-    ExpenseSyncStatus,
 )
 from accounting.services.quickbooks_connector import QuickBooksConnector
-from payroll.models import PayrollPeriod
-from expenses.models import Expense
+from accounting.services.reconciliation import QuickBooksReconciler
+from accounting.sync_queue import SyncQueue
+
+logger = logging.getLogger(__name__)
 
 
 @shared_task
@@ -51,77 +52,60 @@ def scheduled_sync():
     if not config.scheduled_sync_enabled:
         return "Scheduled sync disabled in configuration"
 
-    connector = QuickBooksConnector()
-
-    results = {"payroll": None, "expenses": None}
-
-    if config.payroll_sync_enabled:
-        unsynced_periods = PayrollPeriod.objects.filter(
-            is_active=True, status__in=["COMPLETED", "APPROVED", "PAID"]
-        ).exclude(
-            id__in=PayrollSyncStatus.objects.filter(is_synced=True).values_list(
-                "payroll_period_id", flat=True
-            )
-        )
-
-        if unsynced_periods.exists():
-            success, message, _ = connector.batch_sync_payroll(
-                period_ids=[str(p.id) for p in unsynced_periods]
-            )
-            results["payroll"] = {"success": success, "message": message}
+    report, sync_log = QuickBooksReconciler().run()
 
-    if config.expense_sync_enabled:
-        unsynced_expenses = Expense.objects.filter(
-            is_active=True, status="APPROVED"
-        ).exclude(
-            id__in=ExpenseSyncStatus.objects.filter(is_synced=True).values_list(
-                "expense_id", flat=True
-            )
-        )
-
-        if unsynced_expenses.exists():
-            success, message, _ = connector.batch_sync_expenses(
-                expense_ids=[e.id for e in unsynced_expenses]
-            )
-            results["expenses"] = {"success": success, "message": message}
-
-    return results
+    return {
+        "sync_log": str(sync_log.id),
+        "synced": report["synced"],
+        "sync_errors": len(report["sync_errors"]),
+        "local_drift": len(report["local_drift"]),
+        "remote_drift": len(report["remote_drift"]),
+    }
 
 
 @shared_task
 def retry_failed_syncs():
     now = timezone.now()
 
-    failed_logs = SyncLog.objects.filter(
-        status="FAILED",
-        retry_count__lt=SyncConfiguration.get_active_config().max_retries,
-        next_retry_at__lte=now,
+    failed_logs = list(
+        SyncLog.objects.filter(
+            status="FAILED",
+            retry_count__lt=SyncConfiguration.get_active_config().max_retries,
+            next_retry_at__lte=now,
+        )
     )
 
+    entity_types = {
+        "PAYROLL_PERIOD": "PAYROLL_PERIOD",
+        "PAYROLL": "PAYROLL_PERIOD",
+        "EXPENSE": "EXPENSE",
+    }
+
     results = []
 
     for log in failed_logs:
-        if log.sync_type == "PAYROLL_PERIOD" and log.source_id:
-            success, message, _ = sync_payroll_period(log.source_id)
-            results.append(
-                {
-                    "id": str(log.id),
-                    "type": log.sync_type,
-                    "success": success,
-                    "message": message,
-                }
-            )
-
-        elif log.sync_type == "EXPENSE" and log.source_id:
-            success, message, _ = sync_expense(log.source_id)
-            results.append(
-                {
-                    "id": str(log.id),
-                    "type": log.sync_type,
-                    "success": success,
-                    "message": message,
-                }
-            )
+        entity_type = entity_types.get(log.sync_type)
+        if not entity_type:
+            continue
+
+        # Batch logs only retry the entities that actually failed.
+        if log.source_id:
+            entity_ids = [log.source_id]
+        else:
+            entity_ids = [
+                entity_id for entity_id in (log.error_details or {})
+                if entity_id != "details"
+            ]
+
+        queued = sum(
+            SyncQueue.request(entity_type, entity_id, "retry_failed_sync")
+            for entity_id in entity_ids
+        )
+        results.append({"id": str(log.id), "type": log.sync_type, "queued": queued})
+
+    SyncLog.objects.filter(id__in=[log.id for log in failed_logs]).update(
+        retry_count=F("retry_count") + 1, next_retry_at=None
+    )
 
     return results
 
@@ -179,6 +163,37 @@ def sync_pending_items():
     return results
 
 
+@shared_task(bind=True, max_retries=3)
+def drain_sync_queue(self, batch_size=None, max_batches=20):
+    totals = {"payroll": 0, "expenses": 0, "failed": 0}
+    try:
+        for _ in range(max_batches):
+            result = SyncQueue.drain(batch_size)
+            for key in totals:
+                totals[key] += result[key]
+            if not any(result.values()):
+                break
+
+        next_due = SyncQueue.get_next_due()
+        if next_due:
+            delay = (next_due - timezone.now()).total_seconds()
+            SyncQueue.schedule_drain(countdown=max(int(delay) + 1, 1))
+
+        return totals
+
+    except Exception as exc:
+        logger.error(f"Sync queue drain failed: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(countdown=30, exc=exc)
+        return totals
+
+
+@shared_task
+def refresh_vendor_references():
+    connector = QuickBooksConnector()
+    return connector.refresh_vendor_references()
+
+
 @shared_task
 def cleanup_old_sync_logs(days=30):
     cutoff_date = timezone.now() - timedelta(days=days)
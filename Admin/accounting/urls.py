@@ -19,7 +19,9 @@ urlpatterns = [
     path('department-mappings/<uuid:mapping_id>/delete/', views.delete_department_mapping, name='delete_department_mapping'),
     path('payroll-sync-status/', views.payroll_sync_status, name='payroll_sync_status'),
     path('expense-sync-status/', views.expense_sync_status, name='expense_sync_status'),
+    path('payroll-journal-preview/<uuid:period_id>/', views.payroll_journal_preview, name='payroll_journal_preview'),
     path('trigger-sync/payroll/<int:period_id>/', views.trigger_sync_payroll, name='trigger_sync_payroll'),
     path('trigger-sync/expense/<int:expense_id>/', views.trigger_sync_expense, name='trigger_sync_expense'),
     path('trigger-full-sync/', views.trigger_full_sync, name='trigger_full_sync'),
+    path('metrics/', views.sync_metrics, name='sync_metrics'),
 ]
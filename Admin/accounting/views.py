@@ -18,15 +18,19 @@ from accounting.models import (
     PayrollSyncStatus,
     ExpenseSyncStatus,
 )
+from accounting.services.journal_builder import PayrollJournalBuilder
 from accounting.services.quickbooks_connector import QuickBooksConnector
+from accounting.services.sync_metrics import MetricsStore
 from accounting.tasks import (
     sync_payroll_period,
     sync_expense,
     full_sync,
 )
 from expenses.models import ExpenseCategory, ExpenseType
+from payroll.models import PayrollPeriod
 from accounts.models import Department
 
+import hmac
 import json
 from datetime import datetime, timedelta
 
@@ -506,3 +510,30 @@ def trigger_full_sync(request):
     full_sync.delay()
     messages.success(request, 'Full sync triggered successfully.')
     return redirect('accounting:dashboard')
+
+
+@login_required
+@permission_required('accounting.view_payrollsyncstatus', raise_exception=True)
+def payroll_journal_preview(request, period_id):
+    payroll_period = get_object_or_404(PayrollPeriod, id=period_id)
+
+    try:
+        payload = PayrollJournalBuilder.get_payload(
+            payroll_period, refresh=request.GET.get('refresh') == '1'
+        )
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    return JsonResponse({'success': True, 'period': payroll_period.period_name, **payload})
+
+
+def sync_metrics(request):
+    # Scrapers authenticate with a bearer token; staff can view it in the browser.
+    token = getattr(settings, 'ACCOUNTING_METRICS_TOKEN', '')
+    authorized = token and hmac.compare_digest(
+        request.headers.get('Authorization', ''), f'Bearer {token}'
+    )
+    if not authorized and not (request.user.is_authenticated and request.user.is_staff):
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+
+    return HttpResponse(MetricsStore.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
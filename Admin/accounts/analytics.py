@@ -1,7 +1,50 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, models
 from django.db.models import Count, Q
 from django.utils import timezone
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import timedelta
+import logging
+import math
+import time
 from .models import CustomUser, Department, Role, UserSession
+from .widget_cache import WidgetCache
+
+logger = logging.getLogger(__name__)
+
+USER_MODEL = "accounts.CustomUser"
+DEPARTMENT_MODEL = "accounts.Department"
+ROLE_MODEL = "accounts.Role"
+SESSION_MODEL = "accounts.UserSession"
+CONFIGURATION_MODEL = "accounts.SystemConfiguration"
+PROFILE_MODEL = "employees.EmployeeProfile"
+CONTRACT_MODEL = "employees.Contract"
+
+DASHBOARD_WIDGET_MODELS = [
+    USER_MODEL,
+    DEPARTMENT_MODEL,
+    ROLE_MODEL,
+    SESSION_MODEL,
+    CONFIGURATION_MODEL,
+    PROFILE_MODEL,
+    CONTRACT_MODEL,
+]
+
+DASHBOARD_WIDGET_TIMEOUT = getattr(settings, "DASHBOARD_WIDGET_TIMEOUT", 5)
+DASHBOARD_MAX_WORKERS = getattr(settings, "DASHBOARD_MAX_WORKERS", 6)
+
+EMPLOYEE_WIDGET_DEFAULTS = {
+    "employee_stats": {"total_employees": 0, "active_employees": 0},
+    "contract_stats": {"active_contracts": 0},
+    "probation_ending": 0,
+    "contracts_expiring": 0,
+    "recent_employees": [],
+    "salary_analysis": {"average_salary": 0, "total_payroll": 0},
+    "probation_notifications": [],
+    "contract_notifications": [],
+    "birthday_notifications": [],
+}
 
 try:
     from employees.utils import (
@@ -19,79 +62,277 @@ except ImportError:
 
 class UnifiedAnalytics:
 
+    @staticmethod
+    def get_dashboard_widgets():
+        today = timezone.now().date()
+
+        widgets = [
+            (
+                "user_analytics",
+                lambda: WidgetCache.get(
+                    "user_analytics",
+                    UnifiedAnalytics.get_user_analytics,
+                    depends_on=[USER_MODEL, ROLE_MODEL, DEPARTMENT_MODEL],
+                ),
+                {},
+            ),
+            (
+                "department_analytics",
+                lambda: WidgetCache.get(
+                    "department_analytics",
+                    UnifiedAnalytics.get_department_analytics,
+                    depends_on=[USER_MODEL, DEPARTMENT_MODEL],
+                ),
+                {},
+            ),
+            (
+                "role_analytics",
+                lambda: WidgetCache.get(
+                    "role_analytics",
+                    UnifiedAnalytics.get_role_analytics,
+                    depends_on=[USER_MODEL, ROLE_MODEL],
+                ),
+                {},
+            ),
+            (
+                "session_analytics",
+                lambda: WidgetCache.get(
+                    "session_analytics",
+                    UnifiedAnalytics.get_session_analytics,
+                    depends_on=[SESSION_MODEL],
+                    timeout=60,
+                ),
+                {},
+            ),
+            (
+                "dashboard_totals",
+                lambda: WidgetCache.get(
+                    "dashboard_totals",
+                    UnifiedAnalytics.get_dashboard_totals,
+                    depends_on=[DEPARTMENT_MODEL, ROLE_MODEL],
+                ),
+                {"total_departments": 0, "total_roles": 0},
+            ),
+        ]
+
+        if not EMPLOYEES_APP_AVAILABLE:
+            return widgets + [
+                (name, lambda default=default: default, default)
+                for name, default in EMPLOYEE_WIDGET_DEFAULTS.items()
+            ]
+
+        widgets += [
+            (
+                "employee_stats",
+                lambda: WidgetCache.get(
+                    "employee_stats",
+                    EmployeeUtils.get_employee_summary_stats,
+                    depends_on=[PROFILE_MODEL, USER_MODEL],
+                ),
+                EMPLOYEE_WIDGET_DEFAULTS["employee_stats"],
+            ),
+            (
+                "contract_stats",
+                lambda: WidgetCache.get(
+                    "contract_stats",
+                    ContractUtils.get_contract_summary_stats,
+                    depends_on=[CONTRACT_MODEL],
+                    vary_on=[today],
+                ),
+                EMPLOYEE_WIDGET_DEFAULTS["contract_stats"],
+            ),
+            (
+                "probation_ending",
+                lambda: WidgetCache.get(
+                    "probation_ending",
+                    UnifiedAnalytics.get_probation_ending_count,
+                    depends_on=[PROFILE_MODEL],
+                    vary_on=[today],
+                ),
+                EMPLOYEE_WIDGET_DEFAULTS["probation_ending"],
+            ),
+            (
+                "contracts_expiring",
+                lambda: WidgetCache.get(
+                    "contracts_expiring",
+                    lambda: ContractUtils.get_expiring_contracts(30).count(),
+                    depends_on=[CONTRACT_MODEL],
+                    vary_on=[today],
+                ),
+                EMPLOYEE_WIDGET_DEFAULTS["contracts_expiring"],
+            ),
+            (
+                "recent_employees",
+                lambda: WidgetCache.get(
+                    "recent_employees",
+                    UnifiedAnalytics.get_recent_employees,
+                    depends_on=[PROFILE_MODEL, USER_MODEL, DEPARTMENT_MODEL],
+                ),
+                EMPLOYEE_WIDGET_DEFAULTS["recent_employees"],
+            ),
+            (
+                "salary_analysis",
+                lambda: WidgetCache.get(
+                    "salary_analysis",
+                    ReportUtils.generate_salary_analysis_report,
+                    depends_on=[PROFILE_MODEL, USER_MODEL, DEPARTMENT_MODEL],
+                ),
+                EMPLOYEE_WIDGET_DEFAULTS["salary_analysis"],
+            ),
+            (
+                "probation_notifications",
+                lambda: WidgetCache.get(
+                    "probation_notifications",
+                    lambda: list(NotificationUtils.get_probation_notifications()),
+                    depends_on=[PROFILE_MODEL, USER_MODEL, CONFIGURATION_MODEL],
+                    vary_on=[today],
+                ),
+                EMPLOYEE_WIDGET_DEFAULTS["probation_notifications"],
+            ),
+            (
+                "contract_notifications",
+                lambda: WidgetCache.get(
+                    "contract_notifications",
+                    lambda: list(NotificationUtils.get_contract_expiry_notifications()),
+                    depends_on=[CONTRACT_MODEL, USER_MODEL, CONFIGURATION_MODEL],
+                    vary_on=[today],
+                ),
+                EMPLOYEE_WIDGET_DEFAULTS["contract_notifications"],
+            ),
+            (
+                "birthday_notifications",
+                lambda: WidgetCache.get(
+                    "birthday_notifications",
+                    lambda: list(NotificationUtils.get_birthday_notifications()),
+                    depends_on=[USER_MODEL, PROFILE_MODEL],
+                    vary_on=[today],
+                ),
+                EMPLOYEE_WIDGET_DEFAULTS["birthday_notifications"],
+            ),
+        ]
+
+        return widgets
+
+    @staticmethod
+    def merge_widget_results(results):
+        data = {}
+        for name, value in results.items():
+            if name == "dashboard_totals":
+                data.update(value)
+            else:
+                data[name] = value
+        return data
+
+    @staticmethod
+    def run_widget(loader):
+        try:
+            return loader()
+        finally:
+            close_old_connections()
+
     @staticmethod
     def get_complete_dashboard_data():
-        data = {
-            "user_analytics": UnifiedAnalytics.get_user_analytics(),
-            "department_analytics": UnifiedAnalytics.get_department_analytics(),
-            "role_analytics": UnifiedAnalytics.get_role_analytics(),
-            "session_analytics": UnifiedAnalytics.get_session_analytics(),
+        results = {}
+        for name, loader, default in UnifiedAnalytics.get_dashboard_widgets():
+            try:
+                results[name] = loader()
+            except Exception as e:
+                logger.error(f"Dashboard widget {name} failed: {e}")
+                results[name] = default
+
+        return UnifiedAnalytics.merge_widget_results(results)
+
+    @staticmethod
+    def get_complete_dashboard_data_concurrent(timeout=DASHBOARD_WIDGET_TIMEOUT):
+        widgets = UnifiedAnalytics.get_dashboard_widgets()
+        started = {}
+
+        def run(name, loader):
+            started[name] = time.monotonic()
+            return UnifiedAnalytics.run_widget(loader)
+
+        # A pool per request, so concurrent loads never queue behind each
+        # other; each widget's timeout runs from when it starts, not from
+        # when it was queued.
+        executor = ThreadPoolExecutor(
+            max_workers=DASHBOARD_MAX_WORKERS, thread_name_prefix="dashboard-widget"
+        )
+        futures = {
+            name: executor.submit(run, name, loader) for name, loader, _ in widgets
         }
+        waves = math.ceil(len(widgets) / DASHBOARD_MAX_WORKERS)
+        give_up_at = time.monotonic() + timeout * max(waves, 1)
+        timed_out = set()
 
-        if EMPLOYEES_APP_AVAILABLE:
-            try:
-                data.update(
-                    {
-                        "employee_stats": EmployeeUtils.get_employee_summary_stats(),
-                        "contract_stats": ContractUtils.get_contract_summary_stats(),
-                        "probation_ending": EmployeeProfile.objects.filter(
-                            employment_status="PROBATION",
-                            probation_end_date__lte=timezone.now().date()
-                            + timedelta(days=30),
-                            is_active=True,
-                        ).count(),
-                        "contracts_expiring": ContractUtils.get_expiring_contracts(
-                            30
-                        ).count(),
-                        "recent_employees": EmployeeProfile.objects.filter(
-                            is_active=True
-                        )
-                        .select_related("user", "user__department")
-                        .order_by("-created_at")[:5],
-                        "salary_analysis": ReportUtils.generate_salary_analysis_report(),
-                        "probation_notifications": NotificationUtils.get_probation_notifications(),
-                        "contract_notifications": NotificationUtils.get_contract_expiry_notifications(),
-                        "birthday_notifications": NotificationUtils.get_birthday_notifications(),
-                    }
-                )
-            except:
-                data.update(
-                    {
-                        "employee_stats": {"total_employees": 0, "active_employees": 0},
-                        "contract_stats": {"active_contracts": 0},
-                        "probation_ending": 0,
-                        "contracts_expiring": 0,
-                        "recent_employees": [],
-                        "salary_analysis": {"average_salary": 0, "total_payroll": 0},
-                        "probation_notifications": [],
-                        "contract_notifications": [],
-                        "birthday_notifications": [],
-                    }
+        try:
+            pending = set(futures)
+            while pending:
+                now = time.monotonic()
+                for name in list(pending):
+                    if futures[name].done():
+                        pending.discard(name)
+                    elif now >= give_up_at or (
+                        name in started and now - started[name] >= timeout
+                    ):
+                        timed_out.add(name)
+                        pending.discard(name)
+                if not pending:
+                    break
+
+                deadlines = [give_up_at] + [
+                    started[name] + timeout for name in pending if name in started
+                ]
+                wait(
+                    [futures[name] for name in pending],
+                    timeout=max(min(deadlines) - now, 0.01),
+                    return_when=FIRST_COMPLETED,
                 )
-        else:
-            data.update(
-                {
-                    "employee_stats": {"total_employees": 0, "active_employees": 0},
-                    "contract_stats": {"active_contracts": 0},
-                    "probation_ending": 0,
-                    "contracts_expiring": 0,
-                    "recent_employees": [],
-                    "salary_analysis": {"average_salary": 0, "total_payroll": 0},
-                    "probation_notifications": [],
-                    "contract_notifications": [],
-                    "birthday_notifications": [],
-                }
-            )
+        finally:
+            # Running widgets finish on their own; nothing waits for them.
+            executor.shutdown(wait=False, cancel_futures=True)
 
-        data.update(
-            {
-                "total_departments": Department.objects.filter(is_active=True).count(),
-                "total_roles": Role.objects.filter(is_active=True).count(),
-            }
-        )
+        results = {}
+        partial_widgets = []
+        for name, _, default in widgets:
+            future = futures[name]
+            if name in timed_out:
+                logger.warning(f"Dashboard widget {name} timed out after {timeout}s")
+                partial_widgets.append(name)
+                results[name] = default
+            elif future.exception() is not None:
+                logger.error(f"Dashboard widget {name} failed: {future.exception()}")
+                partial_widgets.append(name)
+                results[name] = default
+            else:
+                results[name] = future.result()
 
+        data = UnifiedAnalytics.merge_widget_results(results)
+        data["partial_widgets"] = partial_widgets
         return data
 
+    @staticmethod
+    def get_dashboard_totals():
+        return {
+            "total_departments": Department.objects.filter(is_active=True).count(),
+            "total_roles": Role.objects.filter(is_active=True).count(),
+        }
+
+    @staticmethod
+    def get_probation_ending_count():
+        return EmployeeProfile.objects.filter(
+            employment_status="PROBATION",
+            probation_end_date__lte=timezone.now().date() + timedelta(days=30),
+            is_active=True,
+        ).count()
+
+    @staticmethod
+    def get_recent_employees():
+        return list(
+            EmployeeProfile.objects.filter(is_active=True)
+            .select_related("user", "user__department")
+            .order_by("-created_at")[:5]
+        )
+
     @staticmethod
     def get_user_analytics():
         return {
@@ -166,6 +407,22 @@ class UnifiedAnalytics:
 
     @staticmethod
     def get_quick_stats():
+        return WidgetCache.get(
+            "quick_stats",
+            UnifiedAnalytics.compute_quick_stats,
+            depends_on=[
+                USER_MODEL,
+                DEPARTMENT_MODEL,
+                ROLE_MODEL,
+                SESSION_MODEL,
+                PROFILE_MODEL,
+                CONTRACT_MODEL,
+            ],
+            vary_on=[timezone.now().date()],
+        )
+
+    @staticmethod
+    def compute_quick_stats():
         base_stats = {
             "total_users": CustomUser.objects.filter(is_active=True).count(),
             "total_departments": Department.objects.filter(is_active=True).count(),
@@ -195,3 +452,12 @@ class UnifiedAnalytics:
                 pass
 
         return base_stats
+
+
+class DashboardJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, models.Model):
+            return {"id": o.pk, "display": str(o)}
+        if isinstance(o, models.QuerySet):
+            return list(o)
+        return super().default(o)
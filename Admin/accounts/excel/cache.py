@@ -0,0 +1,126 @@
+from django.conf import settings
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import gzip
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD_VERSION = 1
+
+
+class ImportPayloadCache:
+    ROOT = Path(
+        getattr(settings, "IMPORT_CACHE_ROOT", Path(settings.MEDIA_ROOT) / "import_cache")
+    )
+    TTL = getattr(settings, "IMPORT_CACHE_TTL", 3600)
+
+    @staticmethod
+    def get_file_hash(file_obj) -> str:
+        digest = hashlib.sha256()
+
+        if isinstance(file_obj, (str, Path)):
+            with open(file_obj, "rb") as source:
+                for block in iter(lambda: source.read(1024 * 1024), b""):
+                    digest.update(block)
+            return digest.hexdigest()
+
+        position = file_obj.tell() if hasattr(file_obj, "tell") else 0
+        file_obj.seek(0)
+        if hasattr(file_obj, "chunks"):
+            for block in file_obj.chunks():
+                digest.update(block)
+        else:
+            for block in iter(lambda: file_obj.read(1024 * 1024), b""):
+                digest.update(block)
+        file_obj.seek(position)
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_key(kind: str, file_obj, **options) -> str:
+        file_hash = ImportPayloadCache.get_file_hash(file_obj)
+        options_hash = hashlib.sha256(
+            json.dumps(options, sort_keys=True, default=str).encode()
+        ).hexdigest()[:12]
+        return f"{kind}-v{PAYLOAD_VERSION}-{file_hash}-{options_hash}"
+
+    @staticmethod
+    def get_path(key: str) -> Path:
+        return ImportPayloadCache.ROOT / f"{key}.pkl.gz"
+
+    @staticmethod
+    def load(key: str) -> Optional[Dict[str, Any]]:
+        path = ImportPayloadCache.get_path(key)
+        try:
+            if time.time() - path.stat().st_mtime > ImportPayloadCache.TTL:
+                path.unlink(missing_ok=True)
+                return None
+            with gzip.open(path, "rb") as payload_file:
+                return pickle.load(payload_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load cached import payload {key}: {e}")
+            return None
+
+    @staticmethod
+    def store(key: str, payload: Dict[str, Any]) -> None:
+        ImportPayloadCache.ROOT.mkdir(parents=True, exist_ok=True)
+        path = ImportPayloadCache.get_path(key)
+        temp_path = path.with_name(f".{uuid.uuid4().hex}.tmp")
+        try:
+            with gzip.open(temp_path, "wb", compresslevel=1) as payload_file:
+                pickle.dump(payload, payload_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            logger.error(f"Failed to cache import payload {key}: {e}")
+
+    @staticmethod
+    def get_or_parse(key: str, parser: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        payload = ImportPayloadCache.load(key)
+        if payload is not None:
+            payload["cached"] = True
+            return payload
+
+        payload = parser()
+        if payload.get("cacheable", True):
+            ImportPayloadCache.store(key, payload)
+        payload["cached"] = False
+        return payload
+
+    @staticmethod
+    def cleanup_expired() -> int:
+        if not ImportPayloadCache.ROOT.exists():
+            return 0
+
+        removed = 0
+        cutoff = time.time() - ImportPayloadCache.TTL
+        for path in ImportPayloadCache.ROOT.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    @staticmethod
+    def to_columns(rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        names = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        return {name: [row.get(name) for row in rows] for name in names}
+
+    @staticmethod
+    def from_columns(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        if not columns:
+            return []
+        names = list(columns)
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
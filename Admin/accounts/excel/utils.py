@@ -1,13 +1,20 @@
 import pandas as pd
 import numpy as np
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from django.db import transaction
 from django.utils import timezone
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal, InvalidOperation
 from accounts.models import Department, Role, CustomUser, SystemConfiguration
+from accounts.signals import UserSignalHandler, employees_imported
 from employees.models import EmployeeProfile
+from .cache import ImportPayloadCache
 from datetime import datetime
 import uuid
 import logging
+import os
 from datetime import timedelta
 
 from threading import local
@@ -232,7 +239,282 @@ def map_excel_data(row, field_mapping):
     return mapped_data
 
 
-def validate_employee_data(data, row_index, update_existing=False):
+PROFILE_FIELDS = [
+    "employment_status",
+    "grade_level",
+    "basic_salary",
+    "probation_end_date",
+    "confirmation_date",
+    "bank_name",
+    "bank_account_number",
+    "bank_branch",
+    "tax_identification_number",
+    "marital_status",
+    "spouse_name",
+    "number_of_children",
+    "work_location",
+]
+
+HASH_POOL_THRESHOLD = 50
+
+
+def _hash_password(raw_password):
+    return make_password(raw_password)
+
+
+def hash_passwords(raw_passwords):
+    workers = getattr(settings, "EMPLOYEE_IMPORT_HASH_WORKERS", os.cpu_count() or 1)
+    if workers <= 1 or len(raw_passwords) < HASH_POOL_THRESHOLD:
+        return [make_password(raw_password) for raw_password in raw_passwords]
+
+    chunksize = max(1, len(raw_passwords) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=django.setup
+        ) as executor:
+            return list(
+                executor.map(_hash_password, raw_passwords, chunksize=chunksize)
+            )
+    except Exception as e:
+        logger.warning(f"Password hashing pool unavailable, hashing serially: {e}")
+        return [make_password(raw_password) for raw_password in raw_passwords]
+
+
+class EmployeeImportIndex:
+    def __init__(self, rows):
+        emails, dept_codes, manager_codes, tax_ids = set(), set(), set(), set()
+        for data in rows:
+            if data.get("email"):
+                emails.add(str(data.get("email")).strip().lower())
+            if data.get("department_code") is not None:
+                dept_codes.add(str(data.get("department_code")).strip().upper())
+            if data.get("manager_code") is not None:
+                manager_codes.add(str(data.get("manager_code")).strip().upper())
+            if data.get("tax_identification_number") is not None:
+                tax_ids.add(str(data.get("tax_identification_number")).strip())
+
+        self.users_by_email = {}
+        if emails:
+            self.users_by_email = {
+                user.email: user
+                for user in CustomUser.objects.filter(email__in=emails).select_related(
+                    "department", "role", "manager", "employee_profile"
+                )
+            }
+
+        self.departments = {}
+        if dept_codes:
+            self.departments = {
+                department.code: department
+                for department in Department.active.filter(
+                    code__in=dept_codes
+                ).select_related("manager")
+            }
+
+        self.managers = {}
+        if manager_codes:
+            self.managers = {
+                manager.employee_code: manager
+                for manager in CustomUser.active.filter(employee_code__in=manager_codes)
+            }
+
+        self.tax_ids = set()
+        if tax_ids:
+            self.tax_ids = set(
+                EmployeeProfile.objects.filter(
+                    tax_identification_number__in=tax_ids
+                ).values_list("tax_identification_number", flat=True)
+            )
+
+        self.roles = list(Role.active.all())
+        self.seen_emails = set()
+        self.seen_tax_ids = set()
+
+        try:
+            min_age = int(SystemConfiguration.get_setting("MIN_EMPLOYEE_AGE", "18"))
+            max_age = int(SystemConfiguration.get_setting("MAX_EMPLOYEE_AGE", "65"))
+        except:
+            min_age = 18
+            max_age = 65
+        self.age_limits = (min_age, max_age)
+
+    def get_existing_user(self, email):
+        return self.users_by_email.get(email)
+
+    def claim_email(self, email):
+        in_use = email in self.users_by_email or email in self.seen_emails
+        self.seen_emails.add(email)
+        return in_use
+
+    def claim_tax_id(self, tax_id):
+        in_use = tax_id in self.tax_ids or tax_id in self.seen_tax_ids
+        self.seen_tax_ids.add(tax_id)
+        return in_use
+
+    def get_department(self, code):
+        return self.departments.get(code)
+
+    def get_manager(self, code):
+        return self.managers.get(code)
+
+    def get_role(self, name):
+        lowered = name.lower()
+        matches = [role for role in self.roles if role.name.lower() == lowered]
+        if not matches:
+            matches = [role for role in self.roles if lowered in role.name.lower()]
+        if len(matches) == 1:
+            return matches[0]
+        return None
+
+
+class EmployeeImportWriter:
+    BATCH_SIZE = 500
+
+    def __init__(self, index, created_by=None, update_existing=False):
+        self.index = index
+        self.created_by = created_by
+        self.update_existing = update_existing
+        self.created_count = 0
+        self.updated_count = 0
+        self.error_count = 0
+        self.errors = []
+        self.new_users = []
+
+    def write(self, entries, progress_callback=None):
+        for start in range(0, len(entries), self.BATCH_SIZE):
+            batch = entries[start : start + self.BATCH_SIZE]
+            try:
+                with transaction.atomic():
+                    created, updated, errors = self.write_batch(batch)
+            except Exception as e:
+                logger.error(f"Error writing employee import batch: {str(e)}")
+                self.error_count += len(batch)
+                self.errors.append(
+                    f"Rows {batch[0][0]}-{batch[-1][0]}: Unexpected error - {str(e)}"
+                )
+            else:
+                self.created_count += len(created)
+                self.updated_count += len(batch) - len(created) - len(errors)
+                self.error_count += len(errors)
+                self.errors.extend(errors)
+                self.new_users.extend(
+                    {
+                        "email": user.email,
+                        "employee_code": user.employee_code,
+                        "name": user.get_full_name(),
+                        "temp_password": user._temp_password,
+                    }
+                    for user in created
+                )
+
+            if progress_callback:
+                progress_callback(start + len(batch))
+
+    def write_batch(self, batch):
+        to_create, to_update = [], []
+        for row_index, data in batch:
+            existing_user = None
+            if self.update_existing:
+                existing_user = self.index.get_existing_user(data.get("email"))
+            if existing_user:
+                to_update.append((row_index, data, existing_user))
+            else:
+                to_create.append(data)
+
+        created = self.create_users(to_create)
+        updated, errors = self.update_users(to_update)
+
+        employees_imported.send(
+            sender=CustomUser,
+            created=created,
+            updated=updated,
+            created_by=self.created_by,
+        )
+        return created, updated, errors
+
+    def create_users(self, rows):
+        if not rows:
+            return []
+
+        temp_passwords = [CustomUser.objects.make_random_password() for _ in rows]
+        hashed_passwords = hash_passwords(temp_passwords)
+
+        users, profile_rows = [], []
+        for data, temp_password, hashed_password in zip(
+            rows, temp_passwords, hashed_passwords
+        ):
+            user_fields = {k: v for k, v in data.items() if k not in PROFILE_FIELDS}
+            user_fields["is_active"] = user_fields.get("status", "ACTIVE") == "ACTIVE"
+            user_fields["is_verified"] = False
+            user_fields["must_change_password"] = True
+            user_fields["created_by"] = self.created_by
+
+            user = CustomUser(**user_fields)
+            user.password = hashed_password
+            user._temp_password = temp_password
+            users.append(user)
+            profile_rows.append({k: v for k, v in data.items() if k in PROFILE_FIELDS})
+
+        users = CustomUser.objects.bulk_create(users)
+
+        profiles = []
+        for user, profile_fields in zip(users, profile_rows):
+            profile = EmployeeProfile(
+                user=user,
+                is_active=user.is_active,
+                created_by=self.created_by,
+                **profile_fields,
+            )
+            user.employee_profile = profile
+            profiles.append(profile)
+        EmployeeProfile.objects.bulk_create(profiles)
+
+        return users
+
+    def update_users(self, rows):
+        errors = []
+        users, profiles = {}, {}
+        user_fields, profile_fields = {"updated_at"}, {"is_active", "updated_at"}
+        now = timezone.now()
+
+        for row_index, data, user in rows:
+            profile = getattr(user, "employee_profile", None)
+            if profile is None:
+                errors.append(
+                    f"Row {row_index}: Employee profile not found for {user.email}"
+                )
+                continue
+
+            if user.pk not in users:
+                user._original_values = UserSignalHandler.capture_original_values(user)
+
+            for field, value in data.items():
+                if field in PROFILE_FIELDS:
+                    setattr(profile, field, value)
+                    profile_fields.add(field)
+                else:
+                    setattr(user, field, value)
+                    user_fields.add(field)
+
+            user.updated_at = now
+            profile.is_active = user.status == "ACTIVE"
+            profile.updated_at = now
+            users[user.pk] = user
+            profiles[profile.pk] = profile
+
+        if users:
+            CustomUser.objects.bulk_update(list(users.values()), sorted(user_fields))
+            EmployeeProfile.objects.bulk_update(
+                list(profiles.values()), sorted(profile_fields)
+            )
+
+        return list(users.values()), errors
+
+
+def validate_employee_data(data, row_index, update_existing=False, index=None):
+    if index is None:
+        index = EmployeeImportIndex([data])
+
     errors = []
     validated_data = {}
 
@@ -256,7 +538,8 @@ def validate_employee_data(data, row_index, update_existing=False):
             errors.append(f"Row {row_index}: Invalid email format")
         else:
             validated_data["email"] = email
-            if not update_existing and CustomUser.objects.filter(email=email).exists():
+            in_use = index.claim_email(email)
+            if in_use and not (update_existing and index.get_existing_user(email)):
                 errors.append(f"Row {row_index}: Email {email} already exists")
 
     if "middle_name" in data and data.get("middle_name") is not None:
@@ -310,12 +593,7 @@ def validate_employee_data(data, row_index, update_existing=False):
                 - ((today.month, today.day) < (dob.month, dob.day))
             )
 
-            try:
-                min_age = int(SystemConfiguration.get_setting("MIN_EMPLOYEE_AGE", "18"))
-                max_age = int(SystemConfiguration.get_setting("MAX_EMPLOYEE_AGE", "65"))
-            except:
-                min_age = 18
-                max_age = 65
+            min_age, max_age = index.age_limits
 
             if age < min_age:
                 errors.append(
@@ -362,23 +640,15 @@ def validate_employee_data(data, row_index, update_existing=False):
 
     if "department_code" in data and data.get("department_code") is not None:
         dept_code = str(data.get("department_code")).strip().upper()
-        try:
-            department = Department.active.get(code=dept_code)
+        department = index.get_department(dept_code)
+        if department:
             validated_data["department"] = department
-        except Department.DoesNotExist:
-            pass
 
     if "role_name" in data and data.get("role_name") is not None:
         role_name = str(data.get("role_name")).strip()
-        try:
-            role = Role.active.get(name__iexact=role_name)
+        role = index.get_role(role_name)
+        if role:
             validated_data["role"] = role
-        except Role.DoesNotExist:
-            try:
-                role = Role.active.get(name__icontains=role_name)
-                validated_data["role"] = role
-            except:
-                pass
 
     if "job_title" in data and data.get("job_title") is not None:
         validated_data["job_title"] = str(data.get("job_title")).strip()
@@ -419,11 +689,9 @@ def validate_employee_data(data, row_index, update_existing=False):
 
     if "manager_code" in data and data.get("manager_code") is not None:
         manager_code = str(data.get("manager_code")).strip().upper()
-        try:
-            manager = CustomUser.active.get(employee_code=manager_code)
+        manager = index.get_manager(manager_code)
+        if manager:
             validated_data["manager"] = manager
-        except CustomUser.DoesNotExist:
-            pass
 
     if "status" in data and data.get("status") is not None:
         status = str(data.get("status")).strip().upper()
@@ -597,10 +865,7 @@ def validate_employee_data(data, row_index, update_existing=False):
         and data.get("tax_identification_number") is not None
     ):
         tax_id = str(data.get("tax_identification_number")).strip()
-        existing_tax_id = EmployeeProfile.objects.filter(
-            tax_identification_number=tax_id
-        )
-        if existing_tax_id.exists() and not update_existing:
+        if index.claim_tax_id(tax_id) and not update_existing:
             errors.append(
                 f"Row {row_index}: Tax identification number is already in use"
             )
@@ -640,6 +905,209 @@ def validate_employee_data(data, row_index, update_existing=False):
     return (len(errors) == 0, errors, validated_data)
 
 
+EMPLOYEE_FIELD_MAPPINGS = {
+    "first_name": ["first_name", "firstname", "fname", "first"],
+    "last_name": ["last_name", "lastname", "lname", "last", "surname"],
+    "middle_name": ["middle_name", "middlename", "mname", "middle"],
+    "email": ["email", "email_address", "emailaddress", "mail"],
+    "phone_number": [
+        "phone_number",
+        "phone",
+        "mobile",
+        "cell",
+        "contact",
+        "telephone",
+    ],
+    "date_of_birth": ["date_of_birth", "dob", "birth_date", "birthdate"],
+    "gender": ["gender", "sex"],
+    "address_line1": [
+        "address_line1",
+        "address1",
+        "address",
+        "street_address",
+        "primary_address",
+    ],
+    "address_line2": ["address_line2", "address2", "secondary_address"],
+    "city": ["city", "town"],
+    "state": ["state", "province", "region"],
+    "postal_code": ["postal_code", "zip", "zipcode", "zip_code", "postcode"],
+    "country": ["country", "nation"],
+    "emergency_contact_name": [
+        "emergency_contact_name",
+        "emergency_name",
+        "emergency_contact",
+    ],
+    "emergency_contact_phone": [
+        "emergency_contact_phone",
+        "emergency_phone",
+        "emergency_number",
+    ],
+    "emergency_contact_relationship": [
+        "emergency_contact_relationship",
+        "emergency_relationship",
+        "relationship",
+    ],
+    "department_code": ["department_code", "department", "dept", "dept_code"],
+    "role_name": ["role_name", "role", "position", "job_role"],
+    "job_title": ["job_title", "title", "designation"],
+    "hire_date": ["hire_date", "joining_date", "start_date", "employment_date"],
+    "manager_code": ["manager_code", "manager", "supervisor", "reports_to"],
+    "status": ["status", "employee_status", "account_status"],
+    "employment_status": ["employment_status", "emp_status", "contract_type"],
+    "grade_level": ["grade_level", "grade", "level", "pay_grade"],
+    "basic_salary": ["basic_salary", "salary", "base_salary", "monthly_salary"],
+    "probation_end_date": [
+        "probation_end_date",
+        "probation_end",
+        "end_of_probation",
+    ],
+    "confirmation_date": [
+        "confirmation_date",
+        "confirmed_date",
+        "permanent_date",
+    ],
+    "bank_name": ["bank_name", "bank"],
+    "bank_account_number": [
+        "bank_account_number",
+        "account_number",
+        "bank_account",
+        "account_no",
+    ],
+    "bank_branch": ["bank_branch", "branch", "branch_name"],
+    "tax_identification_number": [
+        "tax_identification_number",
+        "tax_id",
+        "tin",
+        "tax_number",
+    ],
+    "marital_status": ["marital_status", "marital", "marriage_status"],
+    "spouse_name": ["spouse_name", "spouse", "partner_name", "husband_wife"],
+    "number_of_children": [
+        "number_of_children",
+        "children",
+        "dependents",
+        "kids",
+    ],
+    "work_location": ["work_location", "location", "office", "workplace"],
+}
+
+
+def parse_employee_payload(file_obj):
+    df = read_excel_file(file_obj)
+
+    normalized_columns = [
+        str(col).lower().strip().replace(" ", "_") for col in df.columns
+    ]
+    df.columns = normalized_columns
+
+    field_mapping = {}
+    for system_field, possible_names in EMPLOYEE_FIELD_MAPPINGS.items():
+        for col_name in possible_names:
+            if col_name in normalized_columns:
+                field_mapping[system_field] = col_name
+                break
+
+    missing_required = [
+        field for field in ["first_name"] if field not in field_mapping
+    ]
+
+    warnings = []
+    extra_fields = [
+        col
+        for col in normalized_columns
+        if not any(
+            col in possible_names
+            for possible_names in EMPLOYEE_FIELD_MAPPINGS.values()
+        )
+    ]
+    if extra_fields:
+        warnings.append(
+            f"Extra fields found and will be ignored: {', '.join(extra_fields)}"
+        )
+
+    records = {}
+    if not missing_required:
+        columns = list(field_mapping.values())
+        mapped_frame = df[columns].astype(object).where(df[columns].notna(), None)
+        records = {
+            system_field: mapped_frame[column].tolist()
+            for system_field, column in field_mapping.items()
+        }
+
+    return {
+        "total_rows": len(df),
+        "records": records,
+        "missing_required": missing_required,
+        "warnings": warnings,
+    }
+
+
+def load_employee_payload(file_obj):
+    try:
+        key = ImportPayloadCache.get_key("employees", file_obj)
+    except Exception as e:
+        logger.warning(f"Employee upload could not be fingerprinted for caching: {e}")
+        return parse_employee_payload(file_obj)
+
+    return ImportPayloadCache.get_or_parse(key, lambda: parse_employee_payload(file_obj))
+
+
+def preview_employee_import(file_obj, update_existing=False, sample_size=20):
+    payload = load_employee_payload(file_obj)
+    preview = {
+        "total_rows": payload["total_rows"],
+        "insert_count": 0,
+        "update_count": 0,
+        "invalid_count": 0,
+        "insert_sample": [],
+        "update_sample": [],
+        "errors": [],
+        "warnings": list(payload["warnings"]),
+    }
+
+    if payload["missing_required"]:
+        preview["invalid_count"] = payload["total_rows"]
+        preview["errors"].append(
+            f"Missing required fields: {', '.join(payload['missing_required'])}"
+        )
+        return preview
+
+    mapped_rows = ImportPayloadCache.from_columns(payload["records"])
+    index = EmployeeImportIndex(mapped_rows)
+    file_emails = {
+        str(row["email"]).strip().lower() for row in mapped_rows if row.get("email")
+    }
+    existing_emails = file_emails & set(index.users_by_email)
+
+    for position, mapped_data in enumerate(mapped_rows):
+        row_index = position + 2
+        try:
+            is_valid, validation_errors, validated_data = validate_employee_data(
+                mapped_data, row_index, update_existing, index=index
+            )
+        except Exception as e:
+            is_valid, validation_errors = False, [f"Row {row_index}: Unexpected error - {str(e)}"]
+
+        if not is_valid:
+            preview["invalid_count"] += 1
+            preview["errors"].extend(validation_errors)
+            continue
+
+        email = validated_data.get("email")
+        action = "update" if email in existing_emails else "insert"
+        preview[f"{action}_count"] += 1
+        if len(preview[f"{action}_sample"]) < sample_size:
+            preview[f"{action}_sample"].append(
+                {
+                    "row": row_index,
+                    "email": email,
+                    "name": f"{validated_data.get('first_name', '')} {validated_data.get('last_name', '')}".strip(),
+                }
+            )
+
+    return preview
+
+
 def import_employees_from_excel(
     file_obj, update_existing=False, skip_errors=False, created_by=None, import_job=None
 ):
@@ -658,121 +1126,19 @@ def import_employees_from_excel(
     try:
         _thread_locals.is_bulk_import = True
 
-        df = read_excel_file(file_obj)
-        results["total_rows"] = len(df)
+        payload = load_employee_payload(file_obj)
+        results["total_rows"] = payload["total_rows"]
+        results["warnings"].extend(payload["warnings"])
 
         if import_job:
-            import_job.total_rows = len(df)
+            import_job.total_rows = payload["total_rows"]
             import_job.status = "PROCESSING"
             import_job.save()
 
-        normalized_columns = [
-            str(col).lower().strip().replace(" ", "_") for col in df.columns
-        ]
-        df.columns = normalized_columns
-
-        field_mappings = {
-            "first_name": ["first_name", "firstname", "fname", "first"],
-            "last_name": ["last_name", "lastname", "lname", "last", "surname"],
-            "middle_name": ["middle_name", "middlename", "mname", "middle"],
-            "email": ["email", "email_address", "emailaddress", "mail"],
-            "phone_number": [
-                "phone_number",
-                "phone",
-                "mobile",
-                "cell",
-                "contact",
-                "telephone",
-            ],
-            "date_of_birth": ["date_of_birth", "dob", "birth_date", "birthdate"],
-            "gender": ["gender", "sex"],
-            "address_line1": [
-                "address_line1",
-                "address1",
-                "address",
-                "street_address",
-                "primary_address",
-            ],
-            "address_line2": ["address_line2", "address2", "secondary_address"],
-            "city": ["city", "town"],
-            "state": ["state", "province", "region"],
-            "postal_code": ["postal_code", "zip", "zipcode", "zip_code", "postcode"],
-            "country": ["country", "nation"],
-            "emergency_contact_name": [
-                "emergency_contact_name",
-                "emergency_name",
-                "emergency_contact",
-            ],
-            "emergency_contact_phone": [
-                "emergency_contact_phone",
-                "emergency_phone",
-                "emergency_number",
-            ],
-            "emergency_contact_relationship": [
-                "emergency_contact_relationship",
-                "emergency_relationship",
-                "relationship",
-            ],
-            "department_code": ["department_code", "department", "dept", "dept_code"],
-            "role_name": ["role_name", "role", "position", "job_role"],
-            "job_title": ["job_title", "title", "designation"],
-            "hire_date": ["hire_date", "joining_date", "start_date", "employment_date"],
-            "manager_code": ["manager_code", "manager", "supervisor", "reports_to"],
-            "status": ["status", "employee_status", "account_status"],
-            "employment_status": ["employment_status", "emp_status", "contract_type"],
-            "grade_level": ["grade_level", "grade", "level", "pay_grade"],
-            "basic_salary": ["basic_salary", "salary", "base_salary", "monthly_salary"],
-            "probation_end_date": [
-                "probation_end_date",
-                "probation_end",
-                "end_of_probation",
-            ],
-            "confirmation_date": [
-                "confirmation_date",
-                "confirmed_date",
-                "permanent_date",
-            ],
-            "bank_name": ["bank_name", "bank"],
-            "bank_account_number": [
-                "bank_account_number",
-                "account_number",
-                "bank_account",
-                "account_no",
-            ],
-            "bank_branch": ["bank_branch", "branch", "branch_name"],
-            "tax_identification_number": [
-                "tax_identification_number",
-                "tax_id",
-                "tin",
-                "tax_number",
-            ],
-            "marital_status": ["marital_status", "marital", "marriage_status"],
-            "spouse_name": ["spouse_name", "spouse", "partner_name", "husband_wife"],
-            "number_of_children": [
-                "number_of_children",
-                "children",
-                "dependents",
-                "kids",
-            ],
-            "work_location": ["work_location", "location", "office", "workplace"],
-        }
-
-        field_mapping = {}
-        for system_field, possible_names in field_mappings.items():
-            for col_name in possible_names:
-                if col_name in normalized_columns:
-                    field_mapping[system_field] = col_name
-                    break
-
-        required_fields = ["first_name"]
-        missing_required = [
-            field for field in required_fields if field not in field_mapping
-        ]
-
-        if missing_required:
+        if payload["missing_required"]:
             results["error_count"] = results["total_rows"]
             results["errors"].append(
-                f"Missing required fields: {', '.join(missing_required)}"
+                f"Missing required fields: {', '.join(payload['missing_required'])}"
             )
             if import_job:
                 import_job.status = "FAILED"
@@ -782,204 +1148,60 @@ def import_employees_from_excel(
                 import_job.save()
             return results
 
-        extra_fields = [
-            col
-            for col in normalized_columns
-            if not any(
-                col in possible_names for possible_names in field_mappings.values()
-            )
-        ]
-        if extra_fields:
-            results["warnings"].append(
-                f"Extra fields found and will be ignored: {', '.join(extra_fields)}"
-            )
+        mapped_rows = ImportPayloadCache.from_columns(payload["records"])
 
-        for index, row in df.iterrows():
-            row_index = index + 2
+        index = EmployeeImportIndex(mapped_rows)
+        entries = []
+        for position, mapped_data in enumerate(mapped_rows):
+            row_index = position + 2
 
             try:
-                mapped_data = {}
-                for system_field, excel_field in field_mapping.items():
-                    value = row[excel_field]
-                    if pd.isna(value):
-                        mapped_data[system_field] = None
-                    else:
-                        mapped_data[system_field] = value
-
                 is_valid, validation_errors, validated_data = validate_employee_data(
-                    mapped_data, row_index, update_existing
+                    mapped_data, row_index, update_existing, index=index
                 )
-
-                if not is_valid and not skip_errors:
-                    results["error_count"] += 1
-                    results["errors"].extend(validation_errors)
-                    if import_job:
-                        import_job.processed_rows = index + 1
-                        import_job.error_count = results["error_count"]
-                        import_job.save()
-                    continue
-                elif not is_valid and skip_errors:
-                    results["skipped_count"] += 1
-                    results["errors"].extend(validation_errors)
-                    if import_job:
-                        import_job.processed_rows = index + 1
-                        import_job.error_count = results["error_count"]
-                        import_job.save()
-                    continue
-
-                with transaction.atomic():
-                    existing_user = None
-                    if update_existing:
-                        try:
-                            existing_user = CustomUser.objects.get(
-                                email=validated_data["email"]
-                            )
-                        except CustomUser.DoesNotExist:
-                            pass
-
-                    if existing_user:
-                        for field, value in validated_data.items():
-                            if field in ["department", "role", "manager"]:
-                                setattr(existing_user, field, value)
-                            elif field not in [
-                                "employment_status",
-                                "grade_level",
-                                "basic_salary",
-                                "probation_end_date",
-                                "confirmation_date",
-                                "bank_name",
-                                "bank_account_number",
-                                "bank_branch",
-                                "tax_identification_number",
-                                "marital_status",
-                                "spouse_name",
-                                "number_of_children",
-                                "work_location",
-                            ]:
-                                setattr(existing_user, field, value)
-
-                        existing_user._skip_validation = True
-                        existing_user.save()
-
-                        profile = existing_user.employee_profile
-                        profile_fields = [
-                            "employment_status",
-                            "grade_level",
-                            "basic_salary",
-                            "probation_end_date",
-                            "confirmation_date",
-                            "bank_name",
-                            "bank_account_number",
-                            "bank_branch",
-                            "tax_identification_number",
-                            "marital_status",
-                            "spouse_name",
-                            "number_of_children",
-                            "work_location",
-                        ]
-
-                        for field in profile_fields:
-                            if field in validated_data:
-                                setattr(profile, field, validated_data[field])
-
-                        profile.is_active = existing_user.status == "ACTIVE"
-                        profile.save(bypass_validation=True)
-
-                        results["updated_count"] += 1
-                        results["success_count"] += 1
-                    else:
-                        user_fields = {
-                            k: v
-                            for k, v in validated_data.items()
-                            if k
-                            not in [
-                                "employment_status",
-                                "grade_level",
-                                "basic_salary",
-                                "probation_end_date",
-                                "confirmation_date",
-                                "bank_name",
-                                "bank_account_number",
-                                "bank_branch",
-                                "tax_identification_number",
-                                "marital_status",
-                                "spouse_name",
-                                "number_of_children",
-                                "work_location",
-                            ]
-                        }
-
-                        user_fields["is_active"] = (
-                            user_fields.get("status", "ACTIVE") == "ACTIVE"
-                        )
-                        user_fields["is_verified"] = False
-                        user_fields["must_change_password"] = True
-                        user_fields["created_by"] = created_by
-
-                        temp_password = CustomUser.objects.make_random_password()
-
-                        new_user = CustomUser(**user_fields)
-                        new_user.set_password(temp_password)
-                        new_user._skip_validation = True
-                        new_user.save()
-
-                        profile_fields = {
-                            k: v
-                            for k, v in validated_data.items()
-                            if k
-                            in [
-                                "employment_status",
-                                "grade_level",
-                                "basic_salary",
-                                "probation_end_date",
-                                "confirmation_date",
-                                "bank_name",
-                                "bank_account_number",
-                                "bank_branch",
-                                "tax_identification_number",
-                                "marital_status",
-                                "spouse_name",
-                                "number_of_children",
-                                "work_location",
-                            ]
-                        }
-
-                        profile_fields["user"] = new_user
-                        profile_fields["is_active"] = new_user.is_active
-                        profile_fields["created_by"] = created_by
-
-                        profile = EmployeeProfile(**profile_fields)
-                        profile.save(bypass_validation=True)
-
-                        results["created_count"] += 1
-                        results["success_count"] += 1
-
-                        results.setdefault("new_users", []).append(
-                            {
-                                "email": new_user.email,
-                                "employee_code": new_user.employee_code,
-                                "name": new_user.get_full_name(),
-                                "temp_password": temp_password,
-                            }
-                        )
-
             except Exception as e:
                 logger.error(f"Error processing row {row_index}: {str(e)}")
                 results["error_count"] += 1
                 results["errors"].append(
                     f"Row {row_index}: Unexpected error - {str(e)}"
                 )
-                if not skip_errors:
-                    continue
+                continue
+
+            if not is_valid:
+                if skip_errors:
+                    results["skipped_count"] += 1
+                else:
+                    results["error_count"] += 1
+                results["errors"].extend(validation_errors)
+                continue
+
+            entries.append((row_index, validated_data))
+
+        validated_count = results["total_rows"] - len(entries)
+        if import_job:
+            import_job.processed_rows = validated_count
+            import_job.error_count = results["error_count"]
+            import_job.save()
+
+        writer = EmployeeImportWriter(index, created_by, update_existing)
+
+        def update_progress(written):
+            if import_job:
+                import_job.processed_rows = validated_count + written
+                import_job.success_count = writer.created_count + writer.updated_count
+                import_job.error_count = results["error_count"] + writer.error_count
+                import_job.created_count = writer.created_count
+                import_job.updated_count = writer.updated_count
+                import_job.save()
+
+        writer.write(entries, progress_callback=update_progress)
 
-            finally:
-                if import_job:
-                    import_job.processed_rows = index + 1
-                    import_job.success_count = results["success_count"]
-                    import_job.error_count = results["error_count"]
-                    import_job.created_count = results["created_count"]
-                    import_job.updated_count = results["updated_count"]
-                    import_job.save()
+        results["created_count"] = writer.created_count
+        results["updated_count"] = writer.updated_count
+        results["success_count"] = writer.created_count + writer.updated_count
+        results["error_count"] += writer.error_count
+        results["errors"].extend(writer.errors)
+        results["new_users"].extend(writer.new_users)
 
     except Exception as e:
         logger.error(f"Error during employee import: {str(e)}")
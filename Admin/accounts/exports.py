@@ -0,0 +1,465 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from decimal import Decimal
+from datetime import datetime, timedelta
+from .models import AuditLog, ExportJob, UserSession, CustomUser
+from typing import Any, Dict, Iterable, List, Optional
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_DIRECTORY = "exports"
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def _part_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class ExportRegistry:
+    _exporters: Dict[str, "BaseExporter"] = {}
+
+    @classmethod
+    def register(cls, exporter_class):
+        cls._exporters[exporter_class.name] = exporter_class()
+        return exporter_class
+
+    @classmethod
+    def get(cls, name: str) -> "BaseExporter":
+        try:
+            return cls._exporters[name]
+        except KeyError:
+            raise ValueError(f"Unknown exporter: {name}")
+
+
+class BaseExporter:
+    name = None
+    file_name = "export"
+    extension = "xlsx"
+    content_type = XLSX_CONTENT_TYPE
+
+    def has_permission(self, user, params: Dict[str, Any]) -> bool:
+        return True
+
+    def validate_params(self, params: Dict[str, Any]):
+        pass
+
+    def get_total(self, user, params: Dict[str, Any]) -> int:
+        return 0
+
+    def get_file_name(self, params: Dict[str, Any]) -> str:
+        return f"{self.file_name}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{self.extension}"
+
+    def generate(self, job: ExportJob, output_path: str):
+        raise NotImplementedError
+
+
+class QuerysetExporter(BaseExporter):
+    sheet_name = "Export"
+    chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 1000)
+
+    def get_queryset(self, user, params: Dict[str, Any]):
+        raise NotImplementedError
+
+    def get_row(self, obj) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def get_total(self, user, params):
+        return self.get_queryset(user, params).count()
+
+    def generate(self, job, output_path):
+        parts = list(job.checkpoint.get("parts", []))
+        offset = job.checkpoint.get("offset", 0)
+        last_pk = job.checkpoint.get("last_pk")
+        if last_pk is None:
+            parts, offset = [], 0
+
+        # Keyset on pk: rows written while the export runs cannot shift
+        # the chunks the way OFFSET paging does.
+        queryset = self.get_queryset(job.created_by, job.params).order_by("pk")
+
+        while True:
+            chunk = queryset.filter(pk__gt=last_pk) if last_pk is not None else queryset
+            objects = list(chunk[: self.chunk_size])
+            if not objects:
+                break
+
+            rows = [self.get_row(obj) for obj in objects]
+            parts.append(ExportJobService.write_part(job, len(parts), rows))
+            offset += len(rows)
+            last_pk = objects[-1].pk if isinstance(objects[-1].pk, int) else str(objects[-1].pk)
+            ExportJobService.save_checkpoint(
+                job, {"offset": offset, "last_pk": last_pk, "parts": parts}
+            )
+
+        self.assemble(job, parts, output_path)
+
+    def assemble(self, job, parts: List[str], output_path: str):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(self.sheet_name)
+        ws.freeze_panes = "A2"
+
+        header_font = Font(name="Arial", size=11, bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+
+        columns = None
+        for row in ExportJobService.read_parts(job, parts):
+            if columns is None:
+                columns = list(row.keys())
+                header = []
+                for column_title in columns:
+                    cell = WriteOnlyCell(ws, value=column_title)
+                    cell.font = header_font
+                    cell.fill = header_fill
+                    header.append(cell)
+                ws.append(header)
+            ws.append([row.get(column) for column in columns])
+
+        wb.save(output_path)
+
+
+class CallableExporter(BaseExporter):
+    def build(self, user, params: Dict[str, Any]) -> bytes:
+        raise NotImplementedError
+
+    def get_total(self, user, params):
+        return 1
+
+    def generate(self, job, output_path):
+        content = self.build(job.created_by, job.params)
+        with open(output_path, "wb") as output:
+            output.write(content)
+        ExportJobService.save_checkpoint(job, {"offset": 1})
+
+
+@ExportRegistry.register
+class EmployeeExporter(QuerysetExporter):
+    name = "employees"
+    file_name = "employees_export"
+    sheet_name = "Employees"
+
+    def has_permission(self, user, params):
+        from .utils import UserUtilities
+
+        return UserUtilities.check_user_permission(user, "manage_employees")
+
+    def get_queryset(self, user, params):
+        queryset = CustomUser.objects.select_related(
+            "department", "role", "manager", "employee_profile"
+        ).filter(is_active=True)
+
+        if not user.is_superuser:
+            from .permissions import EmployeeAccessMixin
+
+            accessible_employees = EmployeeAccessMixin().get_accessible_employees(user)
+            queryset = queryset.filter(
+                id__in=accessible_employees.values_list("id", flat=True)
+            )
+        return queryset
+
+    def get_row(self, obj):
+        from .utils import ExcelUtilities
+
+        return ExcelUtilities.get_user_export_row(obj)
+
+
+@ExportRegistry.register
+class AuditLogExporter(QuerysetExporter):
+    name = "audit_logs"
+    file_name = "audit_logs_export"
+    sheet_name = "Audit Logs"
+
+    def has_permission(self, user, params):
+        from .utils import UserUtilities
+
+        return UserUtilities.check_user_permission(user, "view_audit_logs")
+
+    def get_queryset(self, user, params):
+        logs = AuditLog.objects.select_related("user").all()
+
+        if params.get("action"):
+            logs = logs.filter(action=params["action"])
+
+        if params.get("user"):
+            logs = logs.filter(
+                Q(user__employee_code__icontains=params["user"])
+                | Q(user__first_name__icontains=params["user"])
+                | Q(user__last_name__icontains=params["user"])
+            )
+
+        for key, lookup in [("date_from", "timestamp__date__gte"), ("date_to", "timestamp__date__lte")]:
+            if params.get(key):
+                try:
+                    value = datetime.strptime(params[key], "%Y-%m-%d").date()
+                    logs = logs.filter(**{lookup: value})
+                except ValueError:
+                    pass
+
+        return logs
+
+    def get_row(self, obj):
+        from .utils import ExcelUtilities
+
+        return ExcelUtilities.get_audit_log_export_row(obj)
+
+
+@ExportRegistry.register
+class SessionExporter(QuerysetExporter):
+    name = "sessions"
+    file_name = "active_sessions_export"
+    sheet_name = "User Sessions"
+
+    def has_permission(self, user, params):
+        from .utils import UserUtilities
+
+        return UserUtilities.check_user_permission(user, "manage_system_settings")
+
+    def get_queryset(self, user, params):
+        return UserSession.objects.select_related("user").filter(is_active=True)
+
+    def get_row(self, obj):
+        from .utils import ExcelUtilities
+
+        return ExcelUtilities.get_session_export_row(obj)
+
+
+class ExportJobService:
+    CACHE_TTL = getattr(settings, "EXPORT_CACHE_TTL", 900)
+    ARTIFACT_TTL = getattr(settings, "EXPORT_ARTIFACT_TTL", 86400)
+    STALE_AFTER = getattr(settings, "EXPORT_STALE_AFTER", 3600)
+
+    @staticmethod
+    def get_fingerprint(exporter_name: str, user, params: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"exporter": exporter_name, "user": user.pk, "params": params},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_job_directory(job: ExportJob, relative: bool = False) -> str:
+        relative_path = os.path.join(EXPORT_DIRECTORY, str(job.id))
+        if relative:
+            return relative_path
+        return os.path.join(settings.MEDIA_ROOT, relative_path)
+
+    @staticmethod
+    def request_export(user, exporter_name: str, params: Dict[str, Any] = None) -> ExportJob:
+        params = {key: value for key, value in (params or {}).items() if value not in (None, "")}
+        exporter = ExportRegistry.get(exporter_name)
+        if not exporter.has_permission(user, params):
+            raise PermissionDenied
+        exporter.validate_params(params)
+
+        fingerprint = ExportJobService.get_fingerprint(exporter_name, user, params)
+        now = timezone.now()
+
+        # A job whose worker died never finishes; past the cutoff it is
+        # given up on instead of blocking every identical request.
+        stale_before = now - timedelta(seconds=ExportJobService.STALE_AFTER)
+        running = Q(status__in=["PENDING", "PROCESSING"])
+        stale = running & (
+            Q(started_at__lt=stale_before)
+            | Q(started_at__isnull=True, created_at__lt=stale_before)
+        )
+        ExportJob.objects.filter(stale, fingerprint=fingerprint).update(
+            status="FAILED", error_message="Abandoned before completing", completed_at=now
+        )
+
+        reusable = (
+            ExportJob.objects.filter(fingerprint=fingerprint)
+            .filter(
+                running
+                | Q(
+                    status="COMPLETED",
+                    completed_at__gte=now - timedelta(seconds=ExportJobService.CACHE_TTL),
+                    expires_at__gt=now,
+                )
+            )
+            .order_by("-created_at")
+            .first()
+        )
+        if reusable and (
+            reusable.status != "COMPLETED"
+            or (reusable.file and os.path.exists(reusable.file.path))
+        ):
+            return reusable
+
+        job = ExportJob.objects.create(
+            exporter=exporter_name,
+            params=params,
+            fingerprint=fingerprint,
+            content_type=exporter.content_type,
+            file_name=exporter.get_file_name(params),
+            created_by=user,
+        )
+
+        def enqueue():
+            from .tasks import run_export_job
+
+            run_export_job.delay(str(job.id))
+
+        transaction.on_commit(enqueue)
+        return job
+
+    @staticmethod
+    def run(job_id) -> ExportJob:
+        job = ExportJob.objects.select_related("created_by").get(pk=job_id)
+        if job.status == "COMPLETED":
+            return job
+
+        exporter = ExportRegistry.get(job.exporter)
+        job_directory = ExportJobService.get_job_directory(job)
+        os.makedirs(job_directory, exist_ok=True)
+
+        job.status = "PROCESSING"
+        job.started_at = job.started_at or timezone.now()
+        job.total_rows = exporter.get_total(job.created_by, job.params)
+        job.save(update_fields=["status", "started_at", "total_rows"])
+
+        output_path = os.path.join(job_directory, job.file_name)
+        exporter.generate(job, output_path)
+
+        shutil.rmtree(os.path.join(job_directory, "parts"), ignore_errors=True)
+
+        now = timezone.now()
+        job.file.name = os.path.join(ExportJobService.get_job_directory(job, relative=True), job.file_name)
+        job.file_size = os.path.getsize(output_path)
+        job.status = "COMPLETED"
+        job.completed_at = now
+        job.expires_at = now + timedelta(seconds=ExportJobService.ARTIFACT_TTL)
+        job.save(update_fields=["file", "file_size", "status", "completed_at", "expires_at"])
+        return job
+
+    @staticmethod
+    def mark_failed(job_id, error: str):
+        ExportJob.objects.filter(pk=job_id).update(
+            status="FAILED", error_message=error, completed_at=timezone.now()
+        )
+
+    @staticmethod
+    def write_part(job: ExportJob, index: int, rows: List[Dict[str, Any]]) -> str:
+        parts_directory = os.path.join(ExportJobService.get_job_directory(job), "parts")
+        os.makedirs(parts_directory, exist_ok=True)
+
+        part_name = f"part-{index:05d}.jsonl"
+        with open(os.path.join(parts_directory, part_name), "w", encoding="utf-8") as part:
+            for row in rows:
+                part.write(json.dumps(row, default=_part_value))
+                part.write("\n")
+        return part_name
+
+    @staticmethod
+    def read_parts(job: ExportJob, parts: List[str]) -> Iterable[Dict[str, Any]]:
+        parts_directory = os.path.join(ExportJobService.get_job_directory(job), "parts")
+        for part_name in parts:
+            with open(os.path.join(parts_directory, part_name), encoding="utf-8") as part:
+                for line in part:
+                    yield json.loads(line)
+
+    @staticmethod
+    def save_checkpoint(job: ExportJob, checkpoint: Dict[str, Any]):
+        job.checkpoint = checkpoint
+        job.processed_rows = checkpoint.get("offset", 0)
+        ExportJob.objects.filter(pk=job.pk).update(
+            checkpoint=job.checkpoint, processed_rows=job.processed_rows
+        )
+
+    @staticmethod
+    def cleanup_expired() -> int:
+        expired = ExportJob.objects.filter(
+            Q(expires_at__lt=timezone.now())
+            | Q(status="FAILED", created_at__lt=timezone.now() - timedelta(seconds=ExportJobService.ARTIFACT_TTL))
+        )
+        count = 0
+        for job in expired.iterator():
+            shutil.rmtree(ExportJobService.get_job_directory(job), ignore_errors=True)
+            count += 1
+        expired.delete()
+        return count
+
+    @staticmethod
+    def get_status(job: ExportJob) -> Dict[str, Any]:
+        from django.urls import reverse
+
+        return {
+            "id": str(job.id),
+            "exporter": job.exporter,
+            "status": job.status,
+            "progress": job.get_progress_percentage(),
+            "processed_rows": job.processed_rows,
+            "total_rows": job.total_rows,
+            "file_name": job.file_name,
+            "file_size": job.file_size,
+            "error": job.error_message,
+            "status_url": reverse("accounts:export_job_status", args=[job.id]),
+            "download_url": (
+                reverse("accounts:export_job_download", args=[job.id])
+                if job.status == "COMPLETED"
+                else None
+            ),
+        }
+
+    @staticmethod
+    def build_download_response(job: ExportJob, range_header: Optional[str] = None):
+        path = job.file.path
+        size = os.path.getsize(path)
+        disposition = f'attachment; filename="{job.file_name}"'
+
+        match = RANGE_PATTERN.match(range_header.strip()) if range_header else None
+        if not match:
+            response = FileResponse(open(path, "rb"), content_type=job.content_type)
+            response["Content-Disposition"] = disposition
+            response["Accept-Ranges"] = "bytes"
+            return response
+
+        start_text, end_text = match.groups()
+        if start_text:
+            start = int(start_text)
+            end = min(int(end_text), size - 1) if end_text else size - 1
+        elif end_text:
+            start = max(size - int(end_text), 0)
+            end = size - 1
+        else:
+            start, end = 0, -1
+
+        if start > end or start >= size:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        def read_range():
+            remaining = end - start + 1
+            with open(path, "rb") as artifact:
+                artifact.seek(start)
+                while remaining > 0:
+                    block = artifact.read(min(STREAM_BLOCK_SIZE, remaining))
+                    if not block:
+                        break
+                    remaining -= len(block)
+                    yield block
+
+        response = StreamingHttpResponse(read_range(), status=206, content_type=job.content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Disposition"] = disposition
+        response["Accept-Ranges"] = "bytes"
+        return response
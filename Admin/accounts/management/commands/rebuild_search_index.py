@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from accounts.search import EmployeeSearchIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employee search index from users and employee profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of documents written per batch",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding employee search index...")
+
+        backend = EmployeeSearchIndex.get_backend()
+        backend.setup()
+        indexed = EmployeeSearchIndex.rebuild(batch_size=options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {indexed} employees using {backend.__class__.__name__}"
+            )
+        )
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.16 on 2026-10-18 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def setup_search_backend(apps, schema_editor):
+    from accounts.search import EmployeeSearchIndex
+
+    EmployeeSearchIndex.get_backend(schema_editor.connection.vendor).setup(schema_editor)
+
+
+def teardown_search_backend(apps, schema_editor):
+    from accounts.search import EmployeeSearchIndex
+
+    EmployeeSearchIndex.get_backend(schema_editor.connection.vendor).teardown(schema_editor)
+
+
+def populate_search_documents(apps, schema_editor):
+    User = apps.get_model("accounts", "CustomUser")
+    EmployeeSearchDocument = apps.get_model("accounts", "EmployeeSearchDocument")
+
+    documents = []
+    for user in User.objects.select_related("department").iterator(chunk_size=1000):
+        full_name = " ".join(
+            part for part in [user.first_name, user.middle_name, user.last_name] if part
+        )
+        keywords = []
+        if user.department:
+            keywords.extend([user.department.name, user.department.code or ""])
+
+        documents.append(
+            EmployeeSearchDocument(
+                user_id=user.pk,
+                employee_code=(user.employee_code or "").upper(),
+                full_name=full_name[:160],
+                email=(user.email or "").lower(),
+                job_title=user.job_title or "",
+                keywords=" ".join(keyword for keyword in keywords if keyword),
+            )
+        )
+
+    EmployeeSearchDocument.objects.bulk_create(documents, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_alter_systemconfiguration_setting_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmployeeSearchDocument",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("employee_code", models.CharField(blank=True, default="", max_length=20)),
+                ("full_name", models.CharField(blank=True, default="", max_length=160)),
+                ("email", models.CharField(blank=True, default="", max_length=254)),
+                ("job_title", models.CharField(blank=True, default="", max_length=100)),
+                ("keywords", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "employee_search_documents",
+                "indexes": [
+                    models.Index(
+                        fields=["employee_code"], name="employee_se_employe_baedde_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(setup_search_backend, teardown_search_backend),
+    ]
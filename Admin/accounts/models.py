@@ -1132,6 +1132,116 @@ class ImportJob(models.Model):
         return int((self.processed_rows / self.total_rows) * 100)
 
 
+class EmployeeSearchDocument(models.Model):
+    user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    employee_code = models.CharField(max_length=20, blank=True, default="")
+    full_name = models.CharField(max_length=160, blank=True, default="")
+    email = models.CharField(max_length=254, blank=True, default="")
+    job_title = models.CharField(max_length=100, blank=True, default="")
+    keywords = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "employee_search_documents"
+        indexes = [
+            models.Index(fields=["employee_code"]),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_code} - {self.full_name}"
+
+
+class OutboxMessage(models.Model):
+    KIND_CHOICES = [
+        ("AUDIT", "Audit Log"),
+        ("EMAIL", "Email"),
+    ]
+
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("DISPATCHED", "Dispatched"),
+        ("FAILED", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "outbox_messages"
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["kind", "status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} - {self.status} - {self.created_at}"
+
+
+class ExportJob(models.Model):
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("PROCESSING", "Processing"),
+        ("COMPLETED", "Completed"),
+        ("FAILED", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    exporter = models.CharField(max_length=100)
+    params = models.JSONField(default=dict)
+    fingerprint = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING")
+    total_rows = models.IntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)
+    checkpoint = models.JSONField(default=dict)
+    file = models.FileField(upload_to="exports/", max_length=255, blank=True, null=True)
+    file_name = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    file_size = models.BigIntegerField(default=0)
+    error_message = models.TextField(blank=True, null=True)
+    created_by = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="export_jobs"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "export_jobs"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["fingerprint", "status"]),
+            models.Index(fields=["created_by", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.exporter} - {self.status} - {self.created_at}"
+
+    def get_progress_percentage(self):
+        if self.status == "COMPLETED":
+            return 100
+        if self.total_rows == 0:
+            return 0
+        return int((self.processed_rows / self.total_rows) * 100)
+
+    @property
+    def is_expired(self):
+        return bool(self.expires_at and self.expires_at <= timezone.now())
+
+
 def initialize_default_roles():
     default_roles = [
         {
@@ -0,0 +1,235 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from datetime import timedelta
+from .models import AuditLog, OutboxMessage
+from typing import Dict, List, Optional
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_SCHEDULED_KEY = "outbox_dispatch_scheduled"
+SECURITY_ACTIONS = ["LOGIN_FAILED", "ACCOUNT_LOCK", "PERMISSION_CHANGE"]
+
+
+def _json_safe(value):
+    return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+
+
+class Outbox:
+    BATCH_SIZE = getattr(settings, "OUTBOX_BATCH_SIZE", 500)
+    MAX_ATTEMPTS = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 5)
+    DISPATCH_DEBOUNCE_SECONDS = 2
+
+    @staticmethod
+    def record_audit(
+        user,
+        action,
+        model_name=None,
+        object_id=None,
+        object_repr=None,
+        changes=None,
+        ip_address=None,
+        user_agent=None,
+        session_key=None,
+        description=None,
+        additional_data=None,
+    ) -> Optional[OutboxMessage]:
+        changes_dict = dict(changes or {})
+        if description:
+            changes_dict["description"] = description
+
+        try:
+            message = OutboxMessage.objects.create(
+                kind="AUDIT",
+                payload=_json_safe(
+                    {
+                        "user_id": user.pk if user else None,
+                        "action": action,
+                        "model_name": model_name,
+                        "object_id": str(object_id) if object_id else None,
+                        "object_repr": object_repr[:200] if object_repr else object_repr,
+                        "changes": changes_dict,
+                        "ip_address": ip_address,
+                        "user_agent": user_agent,
+                        "session_key": session_key,
+                        "timestamp": timezone.now(),
+                    }
+                ),
+            )
+        except Exception as e:
+            logger.error(f"Failed to record audit entry in outbox: {e}")
+            return None
+
+        Outbox.schedule_dispatch()
+        return message
+
+    @staticmethod
+    def record_email(
+        recipients: List[str],
+        subject: str,
+        message: str,
+        priority: str = "normal",
+        from_email: str = None,
+    ) -> Optional[OutboxMessage]:
+        recipients = [recipient for recipient in recipients or [] if recipient]
+        if not recipients:
+            return None
+
+        try:
+            outbox_message = OutboxMessage.objects.create(
+                kind="EMAIL",
+                payload={
+                    "recipients": recipients,
+                    "subject": subject,
+                    "message": message,
+                    "priority": priority,
+                    "from_email": from_email or settings.DEFAULT_FROM_EMAIL,
+                },
+            )
+        except Exception as e:
+            logger.error(f"Failed to record email in outbox: {e}")
+            return None
+
+        Outbox.schedule_dispatch()
+        return outbox_message
+
+    @staticmethod
+    def schedule_dispatch():
+        def enqueue():
+            if not cache.add(DISPATCH_SCHEDULED_KEY, True, Outbox.DISPATCH_DEBOUNCE_SECONDS):
+                return
+            try:
+                from .tasks import dispatch_outbox
+
+                dispatch_outbox.apply_async(countdown=Outbox.DISPATCH_DEBOUNCE_SECONDS)
+            except Exception as e:
+                cache.delete(DISPATCH_SCHEDULED_KEY)
+                logger.warning(f"Could not enqueue outbox dispatch, leaving for sweep: {e}")
+
+        transaction.on_commit(enqueue)
+
+    @staticmethod
+    def dispatch_pending(batch_size: int = None) -> Dict[str, int]:
+        batch_size = batch_size or Outbox.BATCH_SIZE
+        result = {"audit": 0, "email": 0, "failed": 0}
+
+        # Each kind commits on its own, so an SMTP outage cannot roll back audit entries.
+        with transaction.atomic():
+            audit_messages = Outbox.claim("AUDIT", batch_size)
+            if audit_messages:
+                result["audit"] = Outbox.dispatch_audit_entries(audit_messages)
+
+        with transaction.atomic():
+            email_messages = Outbox.claim("EMAIL", batch_size)
+            if email_messages:
+                sent, failed = Outbox.dispatch_emails(email_messages)
+                result["email"] = sent
+                result["failed"] = failed
+
+        return result
+
+    @staticmethod
+    def claim(kind: str, batch_size: int) -> List[OutboxMessage]:
+        return list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(kind=kind, status="PENDING")
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=timezone.now()))
+            .order_by("created_at")[:batch_size]
+        )
+
+    @staticmethod
+    def dispatch_audit_entries(messages: List[OutboxMessage]) -> int:
+        entries = []
+        for message in messages:
+            payload = message.payload
+            entries.append(
+                AuditLog(
+                    user_id=payload.get("user_id"),
+                    action=payload.get("action"),
+                    model_name=payload.get("model_name"),
+                    object_id=payload.get("object_id"),
+                    object_repr=payload.get("object_repr"),
+                    changes=payload.get("changes") or {},
+                    ip_address=payload.get("ip_address"),
+                    user_agent=payload.get("user_agent"),
+                    session_key=payload.get("session_key"),
+                )
+            )
+
+        created = AuditLog.objects.bulk_create(entries)
+        for entry, message in zip(created, messages):
+            entry.timestamp = message.created_at
+        AuditLog.objects.bulk_update(created, ["timestamp"])
+
+        OutboxMessage.objects.filter(id__in=[message.id for message in messages]).update(
+            status="DISPATCHED", dispatched_at=timezone.now()
+        )
+
+        security_entries = [entry for entry in created if entry.action in SECURITY_ACTIONS]
+        if security_entries:
+            from .signals import SecurityMonitoringHandler
+
+            SecurityMonitoringHandler.monitor_security_events(security_entries[-1])
+
+        return len(created)
+
+    @staticmethod
+    def dispatch_emails(messages: List[OutboxMessage]):
+        connection = get_connection(fail_silently=False)
+        sent_ids = []
+        failed = 0
+
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"Could not open mail connection for outbox dispatch: {e}")
+            for message in messages:
+                Outbox.record_failure(message, e)
+            return 0, len(messages)
+
+        try:
+            for message in messages:
+                payload = message.payload
+                email = EmailMessage(
+                    subject=payload.get("subject", ""),
+                    body=payload.get("message", ""),
+                    from_email=payload.get("from_email") or settings.DEFAULT_FROM_EMAIL,
+                    to=payload.get("recipients", []),
+                    connection=connection,
+                )
+                try:
+                    email.send()
+                    sent_ids.append(message.id)
+                except Exception as e:
+                    failed += 1
+                    Outbox.record_failure(message, e)
+        finally:
+            connection.close()
+
+        OutboxMessage.objects.filter(id__in=sent_ids).update(
+            status="DISPATCHED", dispatched_at=timezone.now()
+        )
+        return len(sent_ids), failed
+
+    @staticmethod
+    def record_failure(message: OutboxMessage, error):
+        message.attempts += 1
+        message.last_error = str(error)
+        if message.attempts >= Outbox.MAX_ATTEMPTS:
+            message.status = "FAILED"
+        message.next_attempt_at = timezone.now() + timedelta(minutes=2 ** message.attempts)
+        message.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+
+    @staticmethod
+    def cleanup_dispatched(days: int = 7) -> int:
+        cutoff = timezone.now() - timezone.timedelta(days=days)
+        deleted, _ = OutboxMessage.objects.filter(
+            status="DISPATCHED", dispatched_at__lt=cutoff
+        ).delete()
+        return deleted
@@ -0,0 +1,380 @@
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Case, When, Value, FloatField, Q
+from django.db.models.expressions import RawSQL
+from .models import EmployeeSearchDocument
+from typing import Dict, List, Optional, Tuple
+import re
+import logging
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "employee_search_documents"
+SQLITE_FTS_TABLE = "employee_search_fts"
+MAX_RANKED_RESULTS = 500
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+POSTGRES_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(employee_code, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(full_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || "
+    "coalesce(job_title, '') || ' ' || coalesce(keywords, '')), 'C')"
+)
+
+SQLITE_SETUP_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        employee_code, full_name, email, job_title, keywords,
+        content='{SEARCH_TABLE}', content_rowid='user_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai AFTER INSERT ON {SEARCH_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, employee_code, full_name, email, job_title, keywords)
+        VALUES (new.user_id, new.employee_code, new.full_name, new.email, new.job_title, new.keywords);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad AFTER DELETE ON {SEARCH_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, employee_code, full_name, email, job_title, keywords)
+        VALUES ('delete', old.user_id, old.employee_code, old.full_name, old.email, old.job_title, old.keywords);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au AFTER UPDATE ON {SEARCH_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, employee_code, full_name, email, job_title, keywords)
+        VALUES ('delete', old.user_id, old.employee_code, old.full_name, old.email, old.job_title, old.keywords);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, employee_code, full_name, email, job_title, keywords)
+        VALUES (new.user_id, new.employee_code, new.full_name, new.email, new.job_title, new.keywords);
+    END
+    """,
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_TEARDOWN_SQL = [
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+]
+
+POSTGRES_SETUP_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS employee_search_vector_idx ON {SEARCH_TABLE} USING gin (({POSTGRES_VECTOR_SQL}))",
+    f"CREATE INDEX IF NOT EXISTS employee_search_name_trgm_idx ON {SEARCH_TABLE} USING gin (full_name gin_trgm_ops)",
+    f"CREATE INDEX IF NOT EXISTS employee_search_code_prefix_idx ON {SEARCH_TABLE} (employee_code varchar_pattern_ops)",
+]
+
+POSTGRES_TEARDOWN_SQL = [
+    "DROP INDEX IF EXISTS employee_search_vector_idx",
+    "DROP INDEX IF EXISTS employee_search_name_trgm_idx",
+    "DROP INDEX IF EXISTS employee_search_code_prefix_idx",
+]
+
+
+def tokenize_query(query: str) -> List[str]:
+    if not query:
+        return []
+    return [token.lower() for token in TOKEN_PATTERN.findall(query)][:8]
+
+
+class BaseSearchBackend:
+    vendor = None
+
+    def setup(self, schema_editor=None):
+        pass
+
+    def teardown(self, schema_editor=None):
+        pass
+
+    def search(self, tokens: List[str], limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        raise NotImplementedError
+
+    def match_ids(self, tokens: List[str]):
+        """Subquery of every matching user_id, for filtering without an IN list."""
+        raise NotImplementedError
+
+    def _run(self, statements, schema_editor=None):
+        if schema_editor is not None:
+            for statement in statements:
+                schema_editor.execute(statement)
+            return
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    vendor = "sqlite"
+    column_weights = (10.0, 5.0, 2.0, 1.0, 0.5)
+
+    def setup(self, schema_editor=None):
+        self._run(SQLITE_SETUP_SQL, schema_editor)
+
+    def teardown(self, schema_editor=None):
+        self._run(SQLITE_TEARDOWN_SQL, schema_editor)
+
+    def build_match(self, tokens: List[str]) -> str:
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    def match_ids(self, tokens):
+        return RawSQL(
+            f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s",
+            [self.build_match(tokens)],
+        )
+
+    def search(self, tokens, limit=None):
+        weights = ", ".join(str(weight) for weight in self.column_weights)
+        sql = (
+            f"SELECT rowid, -bm25({SQLITE_FTS_TABLE}, {weights}) AS rank "
+            f"FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s "
+            "ORDER BY rank DESC"
+        )
+        params = [self.build_match(tokens)]
+        if limit:
+            sql += " LIMIT %s"
+            params.append(limit)
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [(row[0], float(row[1])) for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    vendor = "postgresql"
+
+    def setup(self, schema_editor=None):
+        self._run(POSTGRES_SETUP_SQL, schema_editor)
+
+    def teardown(self, schema_editor=None):
+        self._run(POSTGRES_TEARDOWN_SQL, schema_editor)
+
+    def build_tsquery(self, tokens: List[str]) -> str:
+        return " & ".join(f"{token}:*" for token in tokens)
+
+    def match_ids(self, tokens):
+        tsquery = self.build_tsquery(tokens)
+        return RawSQL(
+            f"SELECT user_id FROM {SEARCH_TABLE} "
+            f"WHERE ({POSTGRES_VECTOR_SQL}) @@ to_tsquery('simple', %s) "
+            f"OR employee_code LIKE %s OR full_name %% %s",
+            [tsquery, f"{tokens[0].upper()}%", " ".join(tokens)],
+        )
+
+    def search(self, tokens, limit=None):
+        phrase = " ".join(tokens)
+        code_prefix = f"{tokens[0].upper()}%"
+        sql = (
+            f"SELECT user_id, "
+            f"ts_rank({POSTGRES_VECTOR_SQL}, to_tsquery('simple', %s)) "
+            f"+ CASE WHEN employee_code LIKE %s THEN 1.0 ELSE 0.0 END "
+            f"+ similarity(full_name, %s) AS rank "
+            f"FROM {SEARCH_TABLE} "
+            f"WHERE ({POSTGRES_VECTOR_SQL}) @@ to_tsquery('simple', %s) "
+            f"OR employee_code LIKE %s OR full_name %% %s "
+            "ORDER BY rank DESC"
+        )
+        tsquery = self.build_tsquery(tokens)
+        params = [tsquery, code_prefix, phrase, tsquery, code_prefix, phrase]
+        if limit:
+            sql += " LIMIT %s"
+            params.append(limit)
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [(row[0], float(row[1])) for row in cursor.fetchall()]
+
+
+class FallbackSearchBackend(BaseSearchBackend):
+    def get_queryset(self, tokens):
+        queryset = EmployeeSearchDocument.objects.all()
+        for token in tokens:
+            queryset = queryset.filter(
+                Q(employee_code__istartswith=token)
+                | Q(full_name__icontains=token)
+                | Q(email__icontains=token)
+                | Q(job_title__icontains=token)
+                | Q(keywords__icontains=token)
+            )
+        return queryset
+
+    def match_ids(self, tokens):
+        return self.get_queryset(tokens).values("user_id")
+
+    def search(self, tokens, limit=None):
+        queryset = self.get_queryset(tokens).annotate(
+            rank=Case(
+                When(employee_code__istartswith=tokens[0], then=Value(2.0)),
+                When(full_name__istartswith=tokens[0], then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        ).order_by("-rank", "employee_code")
+
+        if limit:
+            queryset = queryset[:limit]
+        return list(queryset.values_list("user_id", "rank"))
+
+
+class EmployeeSearchIndex:
+    backends = {
+        SQLiteFTSBackend.vendor: SQLiteFTSBackend,
+        PostgresSearchBackend.vendor: PostgresSearchBackend,
+    }
+
+    @classmethod
+    def get_backend(cls, vendor: str = None) -> BaseSearchBackend:
+        backend_class = cls.backends.get(vendor or connection.vendor, FallbackSearchBackend)
+        return backend_class()
+
+    @staticmethod
+    def build_document(user) -> Dict[str, str]:
+        keywords = []
+        if user.department_id and user.department:
+            keywords.extend([user.department.name, user.department.code or ""])
+
+        profile = getattr(user, "employee_profile", None)
+        if profile is not None and profile.work_location:
+            keywords.append(profile.work_location)
+
+        full_name = " ".join(
+            part for part in [user.first_name, user.middle_name, user.last_name] if part
+        )
+
+        return {
+            "employee_code": (user.employee_code or "").upper(),
+            "full_name": full_name[:160],
+            "email": (user.email or "").lower(),
+            "job_title": user.job_title or "",
+            "keywords": " ".join(keyword for keyword in keywords if keyword),
+        }
+
+    @classmethod
+    def update_user(cls, user):
+        try:
+            EmployeeSearchDocument.objects.update_or_create(
+                user_id=user.pk, defaults=cls.build_document(user)
+            )
+        except Exception as e:
+            logger.error(f"Failed to index user {user.pk} for search: {e}")
+
+    @classmethod
+    def update_users(cls, users):
+        if not users:
+            return
+        try:
+            with transaction.atomic():
+                EmployeeSearchDocument.objects.filter(
+                    user_id__in=[user.pk for user in users]
+                ).delete()
+                EmployeeSearchDocument.objects.bulk_create(
+                    [EmployeeSearchDocument(user_id=user.pk, **cls.build_document(user)) for user in users]
+                )
+        except Exception as e:
+            logger.error(f"Failed to index {len(users)} users for search: {e}")
+
+    @classmethod
+    def remove_user(cls, user_id):
+        EmployeeSearchDocument.objects.filter(user_id=user_id).delete()
+
+    @classmethod
+    def rebuild(cls, batch_size: int = 1000) -> int:
+        users = User.objects.select_related("department", "employee_profile").order_by("pk")
+        indexed = 0
+
+        with transaction.atomic():
+            EmployeeSearchDocument.objects.all().delete()
+            batch = []
+            for user in users.iterator(chunk_size=batch_size):
+                batch.append(EmployeeSearchDocument(user_id=user.pk, **cls.build_document(user)))
+                if len(batch) >= batch_size:
+                    EmployeeSearchDocument.objects.bulk_create(batch)
+                    indexed += len(batch)
+                    batch = []
+            if batch:
+                EmployeeSearchDocument.objects.bulk_create(batch)
+                indexed += len(batch)
+
+        return indexed
+
+    @classmethod
+    def run_search(cls, tokens: List[str], limit: Optional[int] = None):
+        backend = cls.get_backend()
+        try:
+            # A savepoint, so a failed query does not abort the caller's
+            # transaction on PostgreSQL before the fallback runs.
+            with transaction.atomic():
+                return backend, backend.search(tokens, limit=limit)
+        except Exception as e:
+            logger.warning(f"Search backend failed, falling back to basic search: {e}")
+            backend = FallbackSearchBackend()
+            return backend, backend.search(tokens, limit=limit)
+
+    @classmethod
+    def search(cls, query: str, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        tokens = tokenize_query(query)
+        if not tokens:
+            return []
+        return cls.run_search(tokens, limit=limit)[1]
+
+    @staticmethod
+    def scope_to_user(queryset, current_user, user_field: str = "id"):
+        if current_user and not current_user.is_superuser:
+            from .permissions import EmployeeAccessMixin
+
+            accessible_employees = EmployeeAccessMixin().get_accessible_employees(current_user)
+            queryset = queryset.filter(
+                **{f"{user_field}__in": accessible_employees.values_list("id", flat=True)}
+            )
+        return queryset
+
+    @classmethod
+    def filter_queryset(
+        cls,
+        queryset,
+        query: str,
+        user_field: str = "id",
+        limit: Optional[int] = None,
+        ranked: bool = True,
+    ):
+        tokens = tokenize_query(query)
+        if not tokens:
+            return queryset.none()
+
+        backend, hits = cls.run_search(tokens, limit=limit or MAX_RANKED_RESULTS + 1)
+        if not hits:
+            return queryset.none()
+
+        user_ids = [user_id for user_id, _ in hits[:MAX_RANKED_RESULTS]]
+        if limit or len(hits) <= MAX_RANKED_RESULTS:
+            queryset = queryset.filter(**{f"{user_field}__in": [user_id for user_id, _ in hits]})
+        else:
+            # Large result sets filter on the match itself; only the top
+            # MAX_RANKED_RESULTS are ordered by rank, the rest follow.
+            queryset = queryset.filter(**{f"{user_field}__in": backend.match_ids(tokens)})
+
+        if ranked:
+            queryset = queryset.annotate(
+                search_rank=Case(
+                    *[
+                        When(**{user_field: user_id}, then=Value(position))
+                        for position, user_id in enumerate(user_ids)
+                    ],
+                    default=Value(len(user_ids)),
+                    output_field=FloatField(),
+                )
+            ).order_by("search_rank", user_field)
+
+        return queryset
+
+    @classmethod
+    def autocomplete(cls, query: str, current_user=None, limit: int = 20, queryset=None) -> List:
+        if queryset is None:
+            queryset = User.objects.filter(is_active=True)
+        # Scope before limiting, so matches the user may see are never
+        # crowded out by ones they may not.
+        queryset = cls.scope_to_user(queryset, current_user)
+        return list(cls.filter_queryset(queryset, query).select_related("department")[:limit])
@@ -1,12 +1,16 @@
 from django.db.models.signals import post_save, pre_save, post_delete
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
-from django.dispatch import receiver
+from django.dispatch import receiver, Signal
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.db import transaction
 from django.conf import settings
 from .models import Department, Role, AuditLog, UserSession, SystemConfiguration
-from .utils import log_user_activity, get_client_ip, get_user_agent, create_user_session
+from .outbox import Outbox
+from .utils import get_client_ip, get_user_agent, create_user_session
+from .search import EmployeeSearchIndex
+from .widget_cache import WidgetCache, model_label
+from .analytics import DASHBOARD_WIDGET_MODELS, USER_MODEL, PROFILE_MODEL
 import logging
 import hashlib
 from datetime import timedelta
@@ -14,6 +18,8 @@ from datetime import timedelta
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+employees_imported = Signal()
+
 
 class SignalHandlerMixin:
     @staticmethod
@@ -22,28 +28,29 @@ class SignalHandlerMixin:
     
     @staticmethod
     def log_audit_action(user, action, description, request=None, additional_data=None):
-        log_user_activity(
+        additional_data = additional_data or {}
+        Outbox.record_audit(
             user=user,
             action=action,
-            description=description,
-            request=request,
-            additional_data=additional_data or {}
+            model_name=additional_data.get('model_name'),
+            object_id=additional_data.get('object_id'),
+            object_repr=description,
+            ip_address=get_client_ip(request) if request else None,
+            user_agent=get_user_agent(request) if request else None,
         )
     
     @staticmethod
     def queue_notification_email(recipients, subject, message, priority='normal'):
+        # Notification emails stay off outside DEBUG unless enabled explicitly.
+        if not getattr(settings, 'SIGNAL_NOTIFICATION_EMAILS', settings.DEBUG):
+            return
         try:
-            from django.core.mail import send_mail
-            if settings.DEBUG:
-                send_mail(
-                    subject=subject,
-                    message=message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=recipients,
-                    fail_silently=True
-                )
-            else:
-                pass
+            Outbox.record_email(
+                recipients=list(recipients),
+                subject=subject,
+                message=message,
+                priority=priority
+            )
         except Exception as e:
             logger.error(f"Failed to queue email notification: {e}")
 
@@ -145,6 +152,20 @@ Please review the user permissions and access levels.'''
         except Exception as e:
             logger.error(f"Error handling user update for {instance.employee_code}: {e}")
     
+    @staticmethod
+    def capture_original_values(original):
+        return {
+            'status': original.status,
+            'department_id': original.department.id if original.department else None,
+            'department_name': original.department.name if original.department else None,
+            'role_id': original.role.id if original.role else None,
+            'role_name': original.role.display_name if original.role else None,
+            'manager_id': original.manager.id if original.manager else None,
+            'manager_name': original.manager.get_full_name() if original.manager else None,
+            'job_title': original.job_title,
+            'password_hash': original.password
+        }
+    
     @staticmethod
     def detect_user_changes(instance):
         changes = []
@@ -209,17 +230,7 @@ def user_pre_save_handler(sender, instance, **kwargs):
         if instance.pk:
             try:
                 original = User.objects.select_related('department', 'role', 'manager').get(pk=instance.pk)
-                instance._original_values = {
-                    'status': original.status,
-                    'department_id': original.department.id if original.department else None,
-                    'department_name': original.department.name if original.department else None,
-                    'role_id': original.role.id if original.role else None,
-                    'role_name': original.role.display_name if original.role else None,
-                    'manager_id': original.manager.id if original.manager else None,
-                    'manager_name': original.manager.get_full_name() if original.manager else None,
-                    'job_title': original.job_title,
-                    'password_hash': original.password
-                }
+                instance._original_values = UserSignalHandler.capture_original_values(original)
                 
                 if original.password != instance.password and instance.password:
                     instance.password_changed_at = timezone.now()
@@ -249,6 +260,22 @@ def user_post_save_handler(sender, instance, created, **kwargs):
         logger.error(f"Error in user_post_save_handler: {e}")
 
 
+@receiver(employees_imported)
+def employees_imported_handler(sender, created, updated, created_by=None, **kwargs):
+    for instance in created:
+        UserSignalHandler.handle_user_creation(instance)
+    for instance in updated:
+        UserSignalHandler.handle_user_update(instance)
+
+    EmployeeSearchIndex.update_users(list(created) + list(updated))
+
+    for label in [model_label(USER_MODEL), model_label(PROFILE_MODEL)]:
+        try:
+            WidgetCache.bump(label)
+        except Exception as e:
+            logger.error(f"Failed to bump widget generation for {label}: {e}")
+
+
 @receiver(post_delete, sender=User)
 def user_post_delete_handler(sender, instance, **kwargs):
     try:
@@ -368,6 +395,34 @@ def role_post_delete_handler(sender, instance, **kwargs):
         logger.error(f"Error in role_post_delete_handler: {e}")
 
 
+@receiver(post_save, sender=User)
+def user_search_index_handler(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    EmployeeSearchIndex.update_user(instance)
+
+
+@receiver(post_save, sender='employees.EmployeeProfile')
+def employee_profile_search_index_handler(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    EmployeeSearchIndex.update_user(instance.user)
+
+
+@receiver(post_save, sender=Department)
+def department_search_index_handler(sender, instance, created, **kwargs):
+    if created or kwargs.get('raw'):
+        return
+    try:
+        for user in instance.employees.select_related('department', 'employee_profile'):
+            EmployeeSearchIndex.update_user(user)
+    except Exception as e:
+        logger.error(f"Error reindexing department {instance.code} for search: {e}")
+
+
+WidgetCache.watch(*DASHBOARD_WIDGET_MODELS)
+
+
 class AuthenticationSignalHandler(SignalHandlerMixin):
     @staticmethod
     def handle_successful_login(user, request):
@@ -530,7 +585,7 @@ This is an automated security notification.'''
                 AuthenticationSignalHandler.check_failed_login_threshold(user, ip_address)
                 
             except User.DoesNotExist:
-                AuditLog.log_action(
+                Outbox.record_audit(
                     user=None,
                     action='LOGIN_FAILED',
                     description=f'Failed login attempt with invalid username: {employee_code} from {ip_address}',
@@ -0,0 +1,80 @@
+from celery import shared_task
+from .outbox import Outbox
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def dispatch_outbox(self, batch_size=None, max_batches=50):
+    totals = {"audit": 0, "email": 0, "failed": 0}
+    try:
+        for _ in range(max_batches):
+            result = Outbox.dispatch_pending(batch_size)
+            for key in totals:
+                totals[key] += result[key]
+            if not any(result.values()):
+                break
+
+        if totals["failed"]:
+            logger.warning(f"Outbox dispatch left {totals['failed']} emails for retry")
+        return totals
+
+    except Exception as exc:
+        logger.error(f"Outbox dispatch failed: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(countdown=30, exc=exc)
+        return totals
+
+
+@shared_task
+def cleanup_outbox(days=7):
+    try:
+        deleted = Outbox.cleanup_dispatched(days)
+        logger.info(f"Removed {deleted} dispatched outbox messages")
+        return deleted
+    except Exception as e:
+        logger.error(f"Outbox cleanup failed: {str(e)}")
+        return 0
+
+
+@shared_task(bind=True, max_retries=3)
+def run_export_job(self, job_id):
+    from .exports import ExportJobService
+
+    try:
+        job = ExportJobService.run(job_id)
+        return {"job_id": str(job.id), "file_size": job.file_size}
+
+    except Exception as exc:
+        logger.error(f"Export job {job_id} failed: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(countdown=30, exc=exc)
+        ExportJobService.mark_failed(job_id, str(exc))
+        return {"job_id": str(job_id), "error": str(exc)}
+
+
+@shared_task
+def cleanup_export_jobs():
+    from .exports import ExportJobService
+
+    try:
+        removed = ExportJobService.cleanup_expired()
+        logger.info(f"Removed {removed} expired export jobs")
+        return removed
+    except Exception as e:
+        logger.error(f"Export job cleanup failed: {str(e)}")
+        return 0
+
+
+@shared_task
+def cleanup_import_cache():
+    from .excel.cache import ImportPayloadCache
+
+    try:
+        removed = ImportPayloadCache.cleanup_expired()
+        logger.info(f"Removed {removed} expired import payloads")
+        return removed
+    except Exception as e:
+        logger.error(f"Import cache cleanup failed: {str(e)}")
+        return 0
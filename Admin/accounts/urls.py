@@ -84,6 +84,9 @@ urlpatterns = [
     # Audit Log URLs
     path('audit-logs/', views.audit_log_view, name='audit_logs'),
     path('audit-logs/export/', views.audit_log_export_view, name='audit_log_export'),
+    path('exports/start/<str:exporter>/', views.export_job_start_view, name='export_job_start'),
+    path('exports/<uuid:job_id>/', views.export_job_status_view, name='export_job_status'),
+    path('exports/<uuid:job_id>/download/', views.export_job_download_view, name='export_job_download'),
     
     # API Key Management URLs
     path('api-keys/', views.APIKeyListView.as_view(), name='api_key_list'),
@@ -93,6 +96,7 @@ urlpatterns = [
     # AJAX & Utility URLs
     path('ajax/dashboard-widgets/', views.dashboard_widgets_ajax, name='dashboard_widgets_ajax'),
     path('ajax/quick-stats/', views.quick_stats_ajax, name='quick_stats_ajax'),
+    path('ajax/dashboard-data/', views.dashboard_data_async, name='dashboard_data_async'),
     path('ajax/employee-autocomplete/', views.employee_autocomplete_ajax, name='employee_autocomplete_ajax'),
     path('ajax/validate-employee-code/', views.validate_employee_code_ajax, name='validate_employee_code_ajax'),
     path('ajax/validate-email/', views.validate_email_ajax, name='validate_email_ajax'),
@@ -14,7 +14,7 @@ import hashlib
 import re
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
@@ -364,22 +364,10 @@ def validate_employee_data(data: Dict) -> Tuple[bool, Dict[str, List[str]]]:
 
 
 def search_users(query: str, department_id: int = None, role_id: int = None, status: str = None, current_user=None) -> List[User]:
-    queryset = User.objects.select_related('department', 'role', 'manager').filter(is_active=True)
-
-    if current_user and not current_user.is_superuser:
-        from .permissions import EmployeeAccessMixin
-        access_mixin = EmployeeAccessMixin()
-        accessible_employees = access_mixin.get_accessible_employees(current_user)
-        queryset = queryset.filter(id__in=accessible_employees.values_list("id", flat=True))
+    from .search import EmployeeSearchIndex
 
-    if query:
-        queryset = queryset.filter(
-            Q(first_name__icontains=query)
-            | Q(last_name__icontains=query)
-            | Q(employee_code__icontains=query)
-            | Q(email__icontains=query)
-            | Q(job_title__icontains=query)
-        )
+    queryset = User.objects.select_related('department', 'role', 'manager').filter(is_active=True)
+    queryset = EmployeeSearchIndex.scope_to_user(queryset, current_user)
 
     if department_id:
         queryset = queryset.filter(department_id=department_id)
@@ -390,6 +378,9 @@ def search_users(query: str, department_id: int = None, role_id: int = None, sta
     if status:
         queryset = queryset.filter(status=status)
 
+    if query:
+        return EmployeeSearchIndex.filter_queryset(queryset, query)
+
     return queryset.order_by("employee_code")
 
 
@@ -755,54 +746,105 @@ class UserUtilities:
 
 
 class ExcelUtilities:
+    @staticmethod
+    def get_user_export_row(user) -> Dict[str, Any]:
+        profile = getattr(user, 'employee_profile', None)
+
+        return {
+            "Employee Code": user.employee_code,
+            "First Name": user.first_name,
+            "Last Name": user.last_name,
+            "Middle Name": user.middle_name or "",
+            "Email": user.email,
+            "Phone Number": user.phone_number or "",
+            "Date of Birth": user.date_of_birth.strftime("%Y-%m-%d") if user.date_of_birth else "",
+            "Gender": user.get_gender_display() if hasattr(user, 'get_gender_display') else "",
+            "Address Line 1": user.address_line1 or "",
+            "Address Line 2": user.address_line2 or "",
+            "City": user.city or "",
+            "State": user.state or "",
+            "Postal Code": user.postal_code or "",
+            "Country": user.country or "",
+            "Emergency Contact Name": user.emergency_contact_name or "",
+            "Emergency Contact Phone": user.emergency_contact_phone or "",
+            "Emergency Contact Relationship": user.emergency_contact_relationship or "",
+            "Department Code": user.department.code if user.department else "",
+            "Role Name": user.role.name if user.role else "",
+            "Job Title": user.job_title or "",
+            "Hire Date": user.hire_date.strftime("%Y-%m-%d") if user.hire_date else "",
+            "Manager Code": user.manager.employee_code if user.manager else "",
+            "Status": user.get_status_display() if hasattr(user, 'get_status_display') else "",
+            "Employment Status": profile.get_employment_status_display() if profile else "",
+            "Grade Level": profile.get_grade_level_display() if profile else "",
+            "Basic Salary": profile.basic_salary if profile else "",
+            "Probation End Date": profile.probation_end_date.strftime("%Y-%m-%d") if profile and profile.probation_end_date else "",
+            "Confirmation Date": profile.confirmation_date.strftime("%Y-%m-%d") if profile and profile.confirmation_date else "",
+            "Bank Name": profile.bank_name if profile else "",
+            "Bank Account Number": profile.bank_account_number if profile else "",
+            "Bank Branch": profile.bank_branch if profile else "",
+            "Tax Identification Number": profile.tax_identification_number if profile else "",
+            "Marital Status": profile.get_marital_status_display() if profile else "",
+            "Spouse Name": profile.spouse_name if profile else "",
+            "Number of Children": profile.number_of_children if profile else "",
+            "Work Location": profile.work_location if profile else ""
+        }
+
+    @staticmethod
+    def get_session_export_row(session) -> Dict[str, Any]:
+        return {
+            "Session ID": str(session.id),
+            "Employee Code": session.user.employee_code,
+            "Employee Name": session.user.get_full_name(),
+            "Email": session.user.email,
+            "IP Address": session.ip_address,
+            "Device Type": session.device_type or "Unknown",
+            "Location": session.location or "Unknown",
+            "Login Time": session.login_time.strftime("%Y-%m-%d %H:%M:%S"),
+            "Last Activity": session.last_activity.strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
+            "Duration": str(session.last_activity - session.login_time),
+            "Status": "Active" if session.is_active else "Terminated",
+            "User Agent": (
+                session.user_agent[:100] + "..."
+                if len(session.user_agent) > 100
+                else session.user_agent
+            ),
+        }
+
+    @staticmethod
+    def get_audit_log_export_row(log) -> Dict[str, Any]:
+        return {
+            "Log ID": log.id,
+            "Employee Code": log.user.employee_code if log.user else "System",
+            "Employee Name": log.user.get_full_name() if log.user else "System",
+            "Action": log.get_action_display(),
+            "Description": log.description,
+            "IP Address": log.ip_address,
+            "Timestamp": log.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            "Module": log.module or "System",
+            "Object ID": log.object_id or "",
+            "Severity": log.severity,
+            "User Agent": (
+                log.user_agent[:100] + "..."
+                if len(log.user_agent) > 100
+                else log.user_agent
+            ),
+            "Additional Data": (
+                json.dumps(log.additional_data) if log.additional_data else ""
+            ),
+        }
+
     @staticmethod
     def export_users_to_excel(users_queryset, filename: str = None) -> bytes:
 
         if not filename:
             filename = f"employees_export_{timezone.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 
-        data = []
-        for user in users_queryset.select_related('department', 'role', 'manager', 'employee_profile'):
-            profile = getattr(user, 'employee_profile', None)
-            
-            data.append({
-                "Employee Code": user.employee_code,
-                "First Name": user.first_name,
-                "Last Name": user.last_name,
-                "Middle Name": user.middle_name or "",
-                "Email": user.email,
-                "Phone Number": user.phone_number or "",
-                "Date of Birth": user.date_of_birth.strftime("%Y-%m-%d") if user.date_of_birth else "",
-                "Gender": user.get_gender_display() if hasattr(user, 'get_gender_display') else "",
-                "Address Line 1": user.address_line1 or "",
-                "Address Line 2": user.address_line2 or "",
-                "City": user.city or "",
-                "State": user.state or "",
-                "Postal Code": user.postal_code or "",
-                "Country": user.country or "",
-                "Emergency Contact Name": user.emergency_contact_name or "",
-                "Emergency Contact Phone": user.emergency_contact_phone or "",
-                "Emergency Contact Relationship": user.emergency_contact_relationship or "",
-                "Department Code": user.department.code if user.department else "",
-                "Role Name": user.role.name if user.role else "",
-                "Job Title": user.job_title or "",
-                "Hire Date": user.hire_date.strftime("%Y-%m-%d") if user.hire_date else "",
-                "Manager Code": user.manager.employee_code if user.manager else "",
-                "Status": user.get_status_display() if hasattr(user, 'get_status_display') else "",
-                "Employment Status": profile.get_employment_status_display() if profile else "",
-                "Grade Level": profile.get_grade_level_display() if profile else "",
-                "Basic Salary": profile.basic_salary if profile else "",
-                "Probation End Date": profile.probation_end_date.strftime("%Y-%m-%d") if profile and profile.probation_end_date else "",
-                "Confirmation Date": profile.confirmation_date.strftime("%Y-%m-%d") if profile and profile.confirmation_date else "",
-                "Bank Name": profile.bank_name if profile else "",
-                "Bank Account Number": profile.bank_account_number if profile else "",
-                "Bank Branch": profile.bank_branch if profile else "",
-                "Tax Identification Number": profile.tax_identification_number if profile else "",
-                "Marital Status": profile.get_marital_status_display() if profile else "",
-                "Spouse Name": profile.spouse_name if profile else "",
-                "Number of Children": profile.number_of_children if profile else "",
-                "Work Location": profile.work_location if profile else ""
-            })
+        data = [
+            ExcelUtilities.get_user_export_row(user)
+            for user in users_queryset.select_related('department', 'role', 'manager', 'employee_profile')
+        ]
 
         df = pd.DataFrame(data)
         output = io.BytesIO()
@@ -929,30 +971,10 @@ class ExcelUtilities:
         import pandas as pd
         import io
 
-        data = []
-        for session in sessions_queryset.select_related("user"):
-            data.append(
-                {
-                    "Session ID": str(session.id),
-                    "Employee Code": session.user.employee_code,
-                    "Employee Name": session.user.get_full_name(),
-                    "Email": session.user.email,
-                    "IP Address": session.ip_address,
-                    "Device Type": session.device_type or "Unknown",
-                    "Location": session.location or "Unknown",
-                    "Login Time": session.login_time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "Last Activity": session.last_activity.strftime(
-                        "%Y-%m-%d %H:%M:%S"
-                    ),
-                    "Duration": str(session.last_activity - session.login_time),
-                    "Status": "Active" if session.is_active else "Terminated",
-                    "User Agent": (
-                        session.user_agent[:100] + "..."
-                        if len(session.user_agent) > 100
-                        else session.user_agent
-                    ),
-                }
-            )
+        data = [
+            ExcelUtilities.get_session_export_row(session)
+            for session in sessions_queryset.select_related("user")
+        ]
 
         df = pd.DataFrame(data)
         output = io.BytesIO()
@@ -968,30 +990,10 @@ class ExcelUtilities:
         import pandas as pd
         import io
 
-        data = []
-        for log in audit_logs_queryset.select_related("user"):
-            data.append(
-                {
-                    "Log ID": log.id,
-                    "Employee Code": log.user.employee_code if log.user else "System",
-                    "Employee Name": log.user.get_full_name() if log.user else "System",
-                    "Action": log.get_action_display(),
-                    "Description": log.description,
-                    "IP Address": log.ip_address,
-                    "Timestamp": log.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                    "Module": log.module or "System",
-                    "Object ID": log.object_id or "",
-                    "Severity": log.severity,
-                    "User Agent": (
-                        log.user_agent[:100] + "..."
-                        if len(log.user_agent) > 100
-                        else log.user_agent
-                    ),
-                    "Additional Data": (
-                        json.dumps(log.additional_data) if log.additional_data else ""
-                    ),
-                }
-            )
+        data = [
+            ExcelUtilities.get_audit_log_export_row(log)
+            for log in audit_logs_queryset.select_related("user")
+        ]
 
         df = pd.DataFrame(data)
         output = io.BytesIO()
@@ -23,11 +23,12 @@ from django.db.models import Q, Count, Avg
 from django.utils import timezone
 from django.urls import reverse_lazy, reverse
 from django.conf import settings
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import transaction
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
 import threading
+from asgiref.sync import sync_to_async
 from django.contrib.sessions.backends.db import SessionStore
 import hashlib
 from django.contrib.auth.views import (
@@ -52,10 +53,11 @@ from .models import (
     PasswordResetToken,
     APIKey,
     ImportJob,
+    ExportJob,
 )
 from employees.models import EmployeeProfile
 
-from .analytics import UnifiedAnalytics
+from .analytics import UnifiedAnalytics, DashboardJSONEncoder
 from .forms import (
     CustomLoginForm,
     EmployeeRegistrationForm,
@@ -70,7 +72,7 @@ from .forms import (
     AdvancedUserFilterForm,
     SystemConfigurationForm,
 )
-from accounts.excel.utils import import_employees_from_excel
+from accounts.excel.utils import import_employees_from_excel, preview_employee_import
 from .utils import (
     generate_employee_code,
     generate_secure_password,
@@ -91,6 +93,9 @@ from .utils import (
     get_user_agent,
 )
 from .permissions import EmployeeAccessMixin
+from .search import EmployeeSearchIndex
+from .exports import ExportJobService
+from .widget_cache import WidgetCache
 
 User = get_user_model()
 
@@ -184,7 +189,7 @@ def dashboard_view(request):
         "dashboard_data": dashboard_data,
         "navigation_menu": navigation_menu,
         "user_permissions": UserUtilities.get_user_permissions_list(request.user),
-        **UnifiedAnalytics.get_complete_dashboard_data(),
+        **UnifiedAnalytics.get_complete_dashboard_data_concurrent(),
     }
 
     if request.user.is_superuser or (
@@ -658,6 +663,16 @@ class BulkEmployeeUploadView(LoginRequiredMixin, TemplateView):
                 update_existing = form.cleaned_data["update_existing"]
                 skip_errors = form.cleaned_data.get("skip_errors", False)
 
+                if request.POST.get("action") == "preview":
+                    try:
+                        preview = preview_employee_import(
+                            excel_file, update_existing=update_existing
+                        )
+                        preview["errors"] = preview["errors"][:50]
+                        return JsonResponse({'success': True, 'preview': preview})
+                    except Exception as e:
+                        return JsonResponse({'success': False, 'error': str(e)})
+
                 try:
                     import_job = ImportJob.objects.create(
                         file_name=excel_file.name, created_by=request.user, status="PENDING"
@@ -900,40 +915,33 @@ def employee_search_ajax(request):
     return JsonResponse({"results": results})
 
 
-@login_required
-def employee_export_view(request):
-    if not UserUtilities.check_user_permission(request.user, "manage_employees"):
-        raise PermissionDenied
-
-    queryset = User.objects.select_related("department", "role", "manager").filter(
-        is_active=True
+def export_job_response(request, job, description):
+    log_user_activity(
+        user=request.user,
+        action="EXPORT",
+        description=description,
+        request=request,
+        additional_data={"export_job_id": str(job.id)},
     )
 
-    if not request.user.is_superuser:
-        access_mixin = EmployeeAccessMixin()
-        accessible_employees = access_mixin.get_accessible_employees(request.user)
-        queryset = queryset.filter(
-            id__in=accessible_employees.values_list("id", flat=True)
-        )
+    if job.status == "COMPLETED":
+        return redirect("accounts:export_job_download", job_id=job.id)
 
-    excel_data = ExcelUtilities.export_users_to_excel(queryset)
+    if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+        return JsonResponse(ExportJobService.get_status(job), status=202)
 
-    response = HttpResponse(
-        excel_data,
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
-    response["Content-Disposition"] = (
-        f'attachment; filename="employees_export_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
+    messages.info(
+        request,
+        f"Your export is being prepared. It will be available for download at "
+        f"{reverse('accounts:export_job_download', args=[job.id])} once complete.",
     )
+    return redirect(request.META.get("HTTP_REFERER") or "accounts:dashboard")
 
-    log_user_activity(
-        user=request.user,
-        action="EXPORT",
-        description=f"Exported {queryset.count()} employees to Excel",
-        request=request,
-    )
 
-    return response
+@login_required
+def employee_export_view(request):
+    job = ExportJobService.request_export(request.user, "employees")
+    return export_job_response(request, job, "Requested employee export to Excel")
 
 
 @login_required
@@ -2367,57 +2375,12 @@ def audit_log_view(request):
 
 @login_required
 def audit_log_export_view(request):
-    if not UserUtilities.check_user_permission(request.user, "view_audit_logs"):
-        raise PermissionDenied
-
-    logs = AuditLog.objects.select_related("user").all()
-
-    action_filter = request.GET.get("action")
-    if action_filter:
-        logs = logs.filter(action=action_filter)
-
-    user_filter = request.GET.get("user")
-    if user_filter:
-        logs = logs.filter(
-            Q(user__employee_code__icontains=user_filter)
-            | Q(user__first_name__icontains=user_filter)
-            | Q(user__last_name__icontains=user_filter)
-        )
-
-    date_from = request.GET.get("date_from")
-    if date_from:
-        try:
-            date_from = datetime.strptime(date_from, "%Y-%m-%d").date()
-            logs = logs.filter(timestamp__date__gte=date_from)
-        except ValueError:
-            pass
-
-    date_to = request.GET.get("date_to")
-    if date_to:
-        try:
-            date_to = datetime.strptime(date_to, "%Y-%m-%d").date()
-            logs = logs.filter(timestamp__date__lte=date_to)
-        except ValueError:
-            pass
-
-    excel_data = ExcelUtilities.export_audit_logs_to_excel(logs)
-
-    response = HttpResponse(
-        excel_data,
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
-    response["Content-Disposition"] = (
-        f'attachment; filename="audit_logs_export_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-    )
-
-    log_user_activity(
-        user=request.user,
-        action="EXPORT",
-        description=f"Exported {logs.count()} audit logs to Excel",
-        request=request,
-    )
-
-    return response
+    params = {
+        key: request.GET.get(key)
+        for key in ["action", "user", "date_from", "date_to"]
+    }
+    job = ExportJobService.request_export(request.user, "audit_logs", params)
+    return export_job_response(request, job, "Requested audit log export to Excel")
 
 
 @login_required
@@ -2487,28 +2450,46 @@ def terminate_user_session_view(request, session_id):
 
 @login_required
 def session_export_view(request):
-    if not UserUtilities.check_user_permission(request.user, "manage_system_settings"):
+    job = ExportJobService.request_export(request.user, "sessions")
+    return export_job_response(request, job, "Requested active session export to Excel")
+
+
+@login_required
+def export_job_start_view(request, exporter):
+    try:
+        job = ExportJobService.request_export(
+            request.user, exporter, request.GET.dict()
+        )
+    except ValidationError as e:
+        return JsonResponse({"error": "; ".join(e.messages)}, status=400)
+    except ValueError:
+        raise Http404("Unknown export")
+    return export_job_response(request, job, f"Requested {exporter} export")
+
+
+@login_required
+def export_job_status_view(request, job_id):
+    job = get_object_or_404(ExportJob, pk=job_id)
+    if job.created_by_id != request.user.id and not request.user.is_superuser:
         raise PermissionDenied
+    return JsonResponse(ExportJobService.get_status(job))
 
-    sessions = UserSession.objects.select_related("user").filter(is_active=True)
-    excel_data = ExcelUtilities.export_sessions_to_excel(sessions)
 
-    response = HttpResponse(
-        excel_data,
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
-    response["Content-Disposition"] = (
-        f'attachment; filename="active_sessions_export_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-    )
+@login_required
+def export_job_download_view(request, job_id):
+    job = get_object_or_404(ExportJob, pk=job_id)
+    if job.created_by_id != request.user.id and not request.user.is_superuser:
+        raise PermissionDenied
 
-    log_user_activity(
-        user=request.user,
-        action="EXPORT",
-        description=f"Exported {sessions.count()} active sessions to Excel",
-        request=request,
-    )
+    if job.status != "COMPLETED" or job.is_expired or not job.file:
+        raise Http404("Export is not available")
 
-    return response
+    try:
+        return ExportJobService.build_download_response(
+            job, request.headers.get("Range")
+        )
+    except FileNotFoundError:
+        raise Http404("Export file is no longer available")
 
 
 @login_required
@@ -2719,7 +2700,11 @@ def advanced_search_view(request):
         elif is_verified == "false":
             employees = employees.filter(is_verified=False)
 
-        employees = employees.order_by("employee_code")
+        search_query = request.GET.get("q", "").strip()
+        if search_query:
+            employees = EmployeeSearchIndex.filter_queryset(employees, search_query)
+        else:
+            employees = employees.order_by("employee_code")
 
     paginator = Paginator(employees, 25)
     page_number = request.GET.get("page")
@@ -2788,51 +2773,73 @@ def dashboard_widgets_ajax(request):
         ):
             return JsonResponse({"error": "Permission denied"}, status=403)
 
-        recent_employees = User.objects.filter(
-            is_active=True, created_at__gte=timezone.now() - timedelta(days=30)
-        ).order_by("-created_at")[:10]
-
-        data = []
-        for emp in recent_employees:
-            data.append(
-                {
-                    "id": emp.id,
-                    "name": emp.get_full_name(),
-                    "employee_code": emp.employee_code,
-                    "department": emp.department.name if emp.department else "",
-                    "hire_date": (
-                        emp.hire_date.strftime("%Y-%m-%d") if emp.hire_date else ""
-                    ),
-                    "created_at": emp.created_at.strftime("%Y-%m-%d %H:%M"),
-                }
+        def recent_employees_widget():
+            recent_employees = (
+                User.objects.filter(
+                    is_active=True, created_at__gte=timezone.now() - timedelta(days=30)
+                )
+                .select_related("department")
+                .order_by("-created_at")[:10]
             )
 
+            data = []
+            for emp in recent_employees:
+                data.append(
+                    {
+                        "id": emp.id,
+                        "name": emp.get_full_name(),
+                        "employee_code": emp.employee_code,
+                        "department": emp.department.name if emp.department else "",
+                        "hire_date": (
+                            emp.hire_date.strftime("%Y-%m-%d") if emp.hire_date else ""
+                        ),
+                        "created_at": emp.created_at.strftime("%Y-%m-%d %H:%M"),
+                    }
+                )
+            return data
+
+        data = WidgetCache.get(
+            "ajax_recent_employees",
+            recent_employees_widget,
+            depends_on=[User, Department],
+            vary_on=[timezone.now().date()],
+        )
+
         return JsonResponse({"employees": data})
 
     elif widget_type == "department_stats":
         if not UserUtilities.check_user_permission(request.user, "view_departments"):
             return JsonResponse({"error": "Permission denied"}, status=403)
 
-        departments = (
-            Department.objects.filter(is_active=True)
-            .annotate(
-                employee_count=Count("employees", filter=Q(employees__is_active=True))
+        def department_stats_widget():
+            departments = (
+                Department.objects.filter(is_active=True)
+                .select_related("manager")
+                .annotate(
+                    employee_count=Count("employees", filter=Q(employees__is_active=True))
+                )
+                .order_by("-employee_count")[:10]
             )
-            .order_by("-employee_count")[:10]
-        )
 
-        data = []
-        for dept in departments:
-            data.append(
-                {
-                    "name": dept.name,
-                    "code": dept.code,
-                    "employee_count": dept.employee_count,
-                    "manager": (
-                        dept.manager.get_full_name() if dept.manager else "No Manager"
-                    ),
-                }
-            )
+            data = []
+            for dept in departments:
+                data.append(
+                    {
+                        "name": dept.name,
+                        "code": dept.code,
+                        "employee_count": dept.employee_count,
+                        "manager": (
+                            dept.manager.get_full_name() if dept.manager else "No Manager"
+                        ),
+                    }
+                )
+            return data
+
+        data = WidgetCache.get(
+            "ajax_department_stats",
+            department_stats_widget,
+            depends_on=[User, Department],
+        )
 
         return JsonResponse({"departments": data})
 
@@ -2885,6 +2892,22 @@ def dashboard_widgets_ajax(request):
     return JsonResponse({"error": "Invalid widget type"}, status=400)
 
 
+async def dashboard_data_async(request):
+    def check_access():
+        return request.user.is_authenticated and UserUtilities.check_user_permission(
+            request.user, "view_department_employees"
+        )
+
+    if not await sync_to_async(check_access)():
+        return JsonResponse({"error": "Permission denied"}, status=403)
+
+    # The fan-out blocks on its own widget pool, so it runs off the event loop.
+    data = await sync_to_async(
+        UnifiedAnalytics.get_complete_dashboard_data_concurrent, thread_sensitive=False
+    )()
+    return JsonResponse(data, encoder=DashboardJSONEncoder)
+
+
 @login_required
 def quick_stats_ajax(request):
     if not UserUtilities.check_user_permission(
@@ -2892,29 +2915,41 @@ def quick_stats_ajax(request):
     ):
         return JsonResponse({"error": "Permission denied"}, status=403)
 
-    stats = {}
-
-    if request.user.is_superuser or UserUtilities.check_user_permission(
+    month_start = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    sees_all_employees = request.user.is_superuser or UserUtilities.check_user_permission(
         request.user, "manage_employees"
-    ):
-        stats["total_employees"] = User.objects.filter(is_active=True).count()
-        stats["active_employees"] = User.objects.filter(
-            is_active=True, status="ACTIVE"
-        ).count()
-        stats["new_this_month"] = User.objects.filter(
-            is_active=True, created_at__gte=timezone.now().replace(day=1)
-        ).count()
-    else:
-        access_mixin = EmployeeAccessMixin()
-        accessible_employees = access_mixin.get_accessible_employees(request.user)
-        stats["total_employees"] = accessible_employees.count()
-        stats["active_employees"] = accessible_employees.filter(status="ACTIVE").count()
-        stats["new_this_month"] = accessible_employees.filter(
-            created_at__gte=timezone.now().replace(day=1)
-        ).count()
+    )
+
+    def quick_stats_widget():
+        stats = {}
+
+        if sees_all_employees:
+            stats["total_employees"] = User.objects.filter(is_active=True).count()
+            stats["active_employees"] = User.objects.filter(
+                is_active=True, status="ACTIVE"
+            ).count()
+            stats["new_this_month"] = User.objects.filter(
+                is_active=True, created_at__gte=month_start
+            ).count()
+        else:
+            access_mixin = EmployeeAccessMixin()
+            accessible_employees = access_mixin.get_accessible_employees(request.user)
+            stats["total_employees"] = accessible_employees.count()
+            stats["active_employees"] = accessible_employees.filter(status="ACTIVE").count()
+            stats["new_this_month"] = accessible_employees.filter(
+                created_at__gte=month_start
+            ).count()
 
-    stats["departments"] = Department.objects.filter(is_active=True).count()
-    stats["roles"] = Role.objects.filter(is_active=True).count()
+        stats["departments"] = Department.objects.filter(is_active=True).count()
+        stats["roles"] = Role.objects.filter(is_active=True).count()
+        return stats
+
+    stats = WidgetCache.get(
+        "ajax_quick_stats",
+        quick_stats_widget,
+        depends_on=[User, Department, Role],
+        vary_on=["all" if sees_all_employees else request.user.pk, month_start.date()],
+    )
 
     return JsonResponse(stats)
 
@@ -2930,22 +2965,10 @@ def employee_autocomplete_ajax(request):
     if len(query) < 2:
         return JsonResponse({"results": []})
 
-    employees = User.objects.filter(
-        Q(first_name__icontains=query)
-        | Q(last_name__icontains=query)
-        | Q(employee_code__icontains=query),
-        is_active=True,
+    employees = EmployeeSearchIndex.autocomplete(
+        query, current_user=request.user, limit=20
     )
 
-    if not request.user.is_superuser:
-        access_mixin = EmployeeAccessMixin()
-        accessible_employees = access_mixin.get_accessible_employees(request.user)
-        employees = employees.filter(
-            id__in=accessible_employees.values_list("id", flat=True)
-        )
-
-    employees = employees[:20]
-
     results = []
     for emp in employees:
         results.append(
@@ -0,0 +1,133 @@
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models.signals import post_save, post_delete
+from typing import Any, Callable, Iterable, Tuple
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "widget_generation:{}"
+ENTRY_KEY = "widget_cache:{}"
+REFRESH_LOCK_KEY = "widget_refresh:{}"
+
+
+def model_label(model) -> str:
+    if isinstance(model, str):
+        return model.lower()
+    return model._meta.label_lower
+
+
+class WidgetCache:
+    DEFAULT_TIMEOUT = 300
+    STALE_TIMEOUT = 3600
+    REFRESH_LOCK_TIMEOUT = 120
+
+    @staticmethod
+    def get_generations(labels: Iterable[str]) -> Tuple[int, ...]:
+        keys = [GENERATION_KEY.format(label) for label in labels]
+        found = cache.get_many(keys)
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            seed = int(time.time() * 1000)
+            for key in missing:
+                cache.add(key, seed, None)
+            found.update(cache.get_many(missing))
+
+        return tuple(found.get(key, 0) for key in keys)
+
+    @staticmethod
+    def bump(label: str):
+        key = GENERATION_KEY.format(label)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(time.time() * 1000), None)
+
+    @staticmethod
+    def build_key(name: str, vary_on: Iterable[Any] = ()) -> str:
+        return ENTRY_KEY.format(":".join([name] + [str(part) for part in vary_on]))
+
+    @classmethod
+    def get(
+        cls,
+        name: str,
+        compute: Callable[[], Any],
+        depends_on: Iterable = (),
+        timeout: int = None,
+        vary_on: Iterable[Any] = (),
+    ) -> Any:
+        timeout = timeout or cls.DEFAULT_TIMEOUT
+        labels = sorted({model_label(model) for model in depends_on})
+        key = cls.build_key(name, vary_on)
+
+        try:
+            generations = cls.get_generations(labels)
+            entry = cache.get(key)
+        except Exception as e:
+            logger.warning(f"Widget cache unavailable for {name}: {e}")
+            return compute()
+
+        if entry is None:
+            return cls.refresh(key, compute, labels, timeout, generations)
+
+        is_current = entry["generations"] == generations
+        is_fresh = time.time() - entry["computed_at"] < timeout
+        if not (is_current and is_fresh):
+            cls.refresh_in_background(key, compute, labels, timeout)
+
+        return entry["value"]
+
+    @classmethod
+    def refresh(cls, key, compute, labels, timeout, generations=None):
+        if generations is None:
+            generations = cls.get_generations(labels)
+
+        value = compute()
+        cache.set(
+            key,
+            {
+                "value": value,
+                "generations": generations,
+                "computed_at": time.time(),
+            },
+            timeout + cls.STALE_TIMEOUT,
+        )
+        return value
+
+    @classmethod
+    def refresh_in_background(cls, key, compute, labels, timeout):
+        lock_key = REFRESH_LOCK_KEY.format(key)
+        if not cache.add(lock_key, True, cls.REFRESH_LOCK_TIMEOUT):
+            return
+
+        def run():
+            try:
+                cls.refresh(key, compute, labels, timeout)
+            except Exception as e:
+                logger.error(f"Background refresh failed for {key}: {e}")
+            finally:
+                cache.delete(lock_key)
+                close_old_connections()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    @classmethod
+    def watch(cls, *models):
+        for model in models:
+            label = model_label(model)
+
+            def invalidate(sender, label=label, **kwargs):
+                try:
+                    cls.bump(label)
+                except Exception as e:
+                    logger.error(f"Failed to bump widget generation for {label}: {e}")
+
+            post_save.connect(
+                invalidate, sender=model, weak=False, dispatch_uid=f"widget_cache_save_{label}"
+            )
+            post_delete.connect(
+                invalidate, sender=model, weak=False, dispatch_uid=f"widget_cache_delete_{label}"
+            )
@@ -86,6 +86,7 @@ def export_attendance_excel(modeladmin, request, queryset):
                     ),
                     "employee_id": employee.employee_code,
                     "name": employee.get_full_name(),
+                    "date": attendance.date,
                     "time_pairs": time_pairs,
                     "total_time": attendance.total_time,
                     "break_time": attendance.break_time,
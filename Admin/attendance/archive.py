@@ -0,0 +1,395 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from .models import Attendance, AttendanceCorrection, AttendanceLog, MonthlyAttendanceSummary
+from datetime import date, timedelta
+import calendar
+import hashlib
+import json
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "_manifest.json"
+DELETE_BATCH_SIZE = 1000
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class AttendanceArchive:
+    ROOT = Path(
+        getattr(
+            settings,
+            "ATTENDANCE_ARCHIVE_ROOT",
+            Path(settings.MEDIA_ROOT) / "archives" / "attendance",
+        )
+    )
+    CHUNK_SIZE = getattr(settings, "ATTENDANCE_ARCHIVE_CHUNK_SIZE", 50000)
+    COMPRESSION = getattr(settings, "ATTENDANCE_ARCHIVE_COMPRESSION", "zstd")
+
+    # Summaries go first, while the attendance they were generated from is still live.
+    TABLES = {
+        "summaries": MonthlyAttendanceSummary,
+        "attendance": Attendance,
+        "logs": AttendanceLog,
+    }
+
+    @staticmethod
+    def get_partition_dir(table: str, year: int, month: int) -> Path:
+        return AttendanceArchive.ROOT / table / f"year={year}" / f"month={month:02d}"
+
+    @staticmethod
+    def get_columns(table: str) -> List[str]:
+        model = AttendanceArchive.TABLES[table]
+        return [field.attname for field in model._meta.concrete_fields]
+
+    @staticmethod
+    def get_cold_months(table: str, cutoff_date: date) -> List[tuple]:
+        if table == "attendance":
+            months = Attendance.objects.filter(date__lt=cutoff_date).dates("date", "month")
+            return [(month.year, month.month) for month in months]
+
+        if table == "logs":
+            months = AttendanceLog.objects.filter(
+                timestamp__date__lt=cutoff_date
+            ).datetimes("timestamp", "month")
+            return sorted({(month.year, month.month) for month in months})
+
+        return list(
+            MonthlyAttendanceSummary.objects.filter(year__lt=cutoff_date.year)
+            .values_list("year", "month")
+            .distinct()
+            .order_by("year", "month")
+        )
+
+    @staticmethod
+    def get_partition_queryset(table: str, year: int, month: int, cutoff_date: date):
+        month_start = date(year, month, 1)
+        month_end = date(year, month, calendar.monthrange(year, month)[1])
+        last_day = min(month_end, cutoff_date - timedelta(days=1))
+
+        if table == "attendance":
+            queryset = Attendance.objects.filter(date__range=[month_start, last_day])
+        elif table == "logs":
+            queryset = AttendanceLog.objects.filter(
+                timestamp__date__range=[month_start, last_day]
+            )
+        else:
+            queryset = MonthlyAttendanceSummary.objects.filter(
+                year=year, month=month, year__lt=cutoff_date.year
+            )
+
+        return queryset.order_by("pk")
+
+    @staticmethod
+    def archive_before(cutoff_date: date, chunk_size: int = None) -> Dict[str, Dict]:
+        AttendanceArchive.require_engine()
+
+        results = {}
+        for table in AttendanceArchive.TABLES:
+            table_result = {"rows": 0, "partitions": 0, "deleted": 0}
+            for year, month in AttendanceArchive.get_cold_months(table, cutoff_date):
+                partition = AttendanceArchive.archive_partition(
+                    table, year, month, cutoff_date, chunk_size
+                )
+                table_result["rows"] += partition["rows"]
+                table_result["deleted"] += partition["deleted"]
+                table_result["partitions"] += 1
+            results[table] = table_result
+
+        return results
+
+    @staticmethod
+    def archive_partition(
+        table: str, year: int, month: int, cutoff_date: date, chunk_size: int = None
+    ) -> Dict[str, int]:
+        chunk_size = chunk_size or AttendanceArchive.CHUNK_SIZE
+        partition_dir = AttendanceArchive.get_partition_dir(table, year, month)
+        partition_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = AttendanceArchive.read_manifest(partition_dir) or {
+            "table": table,
+            "year": year,
+            "month": month,
+            "columns": AttendanceArchive.get_columns(table),
+            "parts": [],
+            "row_count": 0,
+        }
+        columns = manifest["columns"]
+        already_archived = AttendanceArchive.read_archived_ids(partition_dir, manifest)
+
+        queryset = AttendanceArchive.get_partition_queryset(table, year, month, cutoff_date)
+        archived_ids = []
+        new_parts = []
+        chunk = []
+        skipped = 0
+
+        for row in queryset.values(*columns).iterator(chunk_size=chunk_size):
+            archived_ids.append(row["id"])
+            if str(row["id"]) in already_archived:
+                skipped += 1
+                continue
+
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                new_parts.append(
+                    AttendanceArchive.write_part(
+                        partition_dir, len(manifest["parts"]) + len(new_parts), chunk, columns
+                    )
+                )
+                chunk = []
+
+        if chunk:
+            new_parts.append(
+                AttendanceArchive.write_part(
+                    partition_dir, len(manifest["parts"]) + len(new_parts), chunk, columns
+                )
+            )
+
+        written = sum(part["rows"] for part in new_parts)
+        expected = len(archived_ids) - skipped
+        if written != expected:
+            raise ArchiveError(
+                f"{table} {year}-{month:02d}: wrote {written} rows, expected {expected}"
+            )
+
+        if new_parts:
+            manifest["parts"].extend(new_parts)
+            manifest["row_count"] += written
+            manifest["updated_at"] = timezone.now().isoformat()
+            AttendanceArchive.write_manifest(partition_dir, manifest)
+
+        deleted = AttendanceArchive.delete_archived(table, archived_ids)
+
+        logger.info(
+            f"Archived {written} {table} rows for {year}-{month:02d} "
+            f"({len(new_parts)} parts, {deleted} deleted)"
+        )
+
+        return {"rows": written, "parts": len(new_parts), "deleted": deleted}
+
+    @staticmethod
+    def write_part(partition_dir: Path, sequence: int, rows: List[Dict], columns: List[str]) -> Dict:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        file_name = f"part-{sequence:05d}-{uuid.uuid4().hex[:8]}.parquet"
+        final_path = partition_dir / file_name
+        temp_path = partition_dir / f".{file_name}.tmp"
+
+        normalized = [AttendanceArchive.normalize_row(row) for row in rows]
+        table = pa.Table.from_pylist(normalized).select(columns)
+        pq.write_table(table, temp_path, compression=AttendanceArchive.COMPRESSION)
+
+        ids_checksum = AttendanceArchive.get_ids_checksum(row["id"] for row in normalized)
+        written = pq.read_table(temp_path, columns=["id"]).column("id").to_pylist()
+        if len(written) != len(rows) or AttendanceArchive.get_ids_checksum(written) != ids_checksum:
+            temp_path.unlink(missing_ok=True)
+            raise ArchiveError(f"Verification failed for {final_path}")
+
+        os.replace(temp_path, final_path)
+
+        return {
+            "file": file_name,
+            "rows": len(rows),
+            "sha256": AttendanceArchive.get_file_checksum(final_path),
+            "ids_sha256": ids_checksum,
+        }
+
+    @staticmethod
+    def normalize_row(row: Dict) -> Dict:
+        normalized = {}
+        for key, value in row.items():
+            if isinstance(value, uuid.UUID):
+                value = str(value)
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value, default=str)
+            normalized[key] = value
+        return normalized
+
+    @staticmethod
+    def delete_archived(table: str, archived_ids: List) -> int:
+        return AttendanceArchive.delete_rows(AttendanceArchive.TABLES[table], archived_ids)
+
+    @staticmethod
+    def delete_rows(model, ids: List) -> int:
+        deleted = 0
+
+        # Raw deletes skip the post_delete handlers, which would regenerate summaries
+        # from the rows being archived and write an audit entry per row.
+        with transaction.atomic():
+            for start in range(0, len(ids), DELETE_BATCH_SIZE):
+                batch = ids[start : start + DELETE_BATCH_SIZE]
+                if model is Attendance:
+                    corrections = AttendanceCorrection.objects.filter(attendance_id__in=batch)
+                    corrections._raw_delete(corrections.db)
+                elif model is MonthlyAttendanceSummary:
+                    from payroll.models import Payslip
+
+                    Payslip.objects.filter(monthly_summary_id__in=batch).update(
+                        monthly_summary=None
+                    )
+                queryset = model.objects.filter(pk__in=batch)
+                deleted += queryset._raw_delete(queryset.db)
+
+        return deleted
+
+    @staticmethod
+    def verify_partition(partition_dir: Path, manifest: Dict = None) -> bool:
+        manifest = manifest or AttendanceArchive.read_manifest(partition_dir)
+        if not manifest:
+            return False
+
+        for part in manifest["parts"]:
+            path = partition_dir / part["file"]
+            if not path.exists() or AttendanceArchive.get_file_checksum(path) != part["sha256"]:
+                logger.error(f"Archive part {path} is missing or corrupted")
+                return False
+        return True
+
+    @staticmethod
+    def read_archived_ids(partition_dir: Path, manifest: Dict) -> set:
+        if not manifest["parts"]:
+            return set()
+
+        if not AttendanceArchive.verify_partition(partition_dir, manifest):
+            raise ArchiveError(f"Existing archive partition {partition_dir} failed verification")
+
+        import pyarrow.parquet as pq
+
+        archived = set()
+        for part in manifest["parts"]:
+            table = pq.read_table(partition_dir / part["file"], columns=["id"])
+            archived.update(table.column("id").to_pylist())
+        return archived
+
+    @staticmethod
+    def read_manifest(partition_dir: Path) -> Optional[Dict]:
+        manifest_path = partition_dir / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None
+        with open(manifest_path) as manifest_file:
+            return json.load(manifest_file)
+
+    @staticmethod
+    def write_manifest(partition_dir: Path, manifest: Dict):
+        temp_path = partition_dir / f".{MANIFEST_NAME}.tmp"
+        with open(temp_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2, default=str)
+        os.replace(temp_path, partition_dir / MANIFEST_NAME)
+
+    @staticmethod
+    def get_file_checksum(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as archive_file:
+            for block in iter(lambda: archive_file.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_ids_checksum(ids: Iterable) -> str:
+        digest = hashlib.sha256()
+        for row_id in sorted(str(row_id) for row_id in ids):
+            digest.update(row_id.encode())
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    @staticmethod
+    def require_engine():
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ArchiveError("Attendance archiving requires the pyarrow module")
+
+    @staticmethod
+    def get_partitions(table: str, start_date: date, end_date: date) -> List[Path]:
+        table_dir = AttendanceArchive.ROOT / table
+        if not table_dir.exists():
+            return []
+
+        first = (start_date.year, start_date.month)
+        last = (end_date.year, end_date.month)
+        partitions = []
+
+        for year_dir in table_dir.glob("year=*"):
+            year = int(year_dir.name.split("=")[1])
+            if not first[0] <= year <= last[0]:
+                continue
+            for month_dir in year_dir.glob("month=*"):
+                month = int(month_dir.name.split("=")[1])
+                if first <= (year, month) <= last and (month_dir / MANIFEST_NAME).exists():
+                    partitions.append(month_dir)
+
+        return sorted(partitions)
+
+    @staticmethod
+    def read_rows(
+        table: str, start_date: date, end_date: date, filters: List[tuple] = None
+    ) -> List[Dict]:
+        partitions = AttendanceArchive.get_partitions(table, start_date, end_date)
+        if not partitions:
+            return []
+
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            logger.error(f"Cannot read archived {table} rows: {e}")
+            return []
+
+        rows = []
+        for partition_dir in partitions:
+            manifest = AttendanceArchive.read_manifest(partition_dir)
+            for part in manifest["parts"]:
+                archived = pq.read_table(
+                    partition_dir / part["file"], filters=filters or None
+                )
+                rows.extend(archived.to_pylist())
+
+        return rows
+
+    @staticmethod
+    def to_instances(table: str, rows: List[Dict]) -> List:
+        model = AttendanceArchive.TABLES[table]
+        json_fields = {
+            field.attname
+            for field in model._meta.concrete_fields
+            if field.get_internal_type() == "JSONField"
+        }
+
+        instances = []
+        for row in rows:
+            for field_name in json_fields:
+                if isinstance(row.get(field_name), str):
+                    row[field_name] = json.loads(row[field_name])
+            instances.append(model.from_db(None, list(row.keys()), list(row.values())))
+        return instances
+
+    @staticmethod
+    def get_attendance(employee, start_date: date, end_date: date) -> List[Attendance]:
+        rows = AttendanceArchive.read_rows(
+            "attendance",
+            start_date,
+            end_date,
+            [
+                ("employee_id", "==", employee.pk),
+                ("date", ">=", start_date),
+                ("date", "<=", end_date),
+            ],
+        )
+        records = AttendanceArchive.to_instances("attendance", rows)
+        return sorted(records, key=lambda record: record.date)
+
+    @staticmethod
+    def get_monthly_summary(employee, year: int, month: int) -> Optional[MonthlyAttendanceSummary]:
+        month_start = date(year, month, 1)
+        rows = AttendanceArchive.read_rows(
+            "summaries", month_start, month_start, [("employee_id", "==", employee.pk)]
+        )
+        summaries = AttendanceArchive.to_instances("summaries", rows)
+        return summaries[0] if summaries else None
@@ -0,0 +1,304 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+from .models import Attendance, AttendanceLog, MonthlyAttendanceSummary
+from datetime import datetime, timedelta
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+
+class BackupError(Exception):
+    pass
+
+
+class AttendanceBackup:
+    ROOT = Path(
+        getattr(
+            settings,
+            "ATTENDANCE_BACKUP_ROOT",
+            Path(settings.MEDIA_ROOT) / "backups" / "attendance",
+        )
+    )
+    CHUNK_SIZE = getattr(settings, "ATTENDANCE_BACKUP_CHUNK_SIZE", 2000)
+    FULL_INTERVAL_DAYS = getattr(settings, "ATTENDANCE_BACKUP_FULL_INTERVAL_DAYS", 7)
+    KEEP_FULL = getattr(settings, "ATTENDANCE_BACKUP_KEEP_FULL", 4)
+    OVERLAP = timedelta(minutes=5)
+
+    # Each model is keyed by the timestamp fields that move when a row changes.
+    MODELS = [
+        (Attendance, ["updated_at"]),
+        (AttendanceLog, ["created_at", "processed_at"]),
+        (MonthlyAttendanceSummary, ["updated_at"]),
+    ]
+
+    @staticmethod
+    def create_snapshot(kind: str = "incremental") -> Dict:
+        if kind not in ("full", "incremental"):
+            raise BackupError(f"Unknown snapshot kind: {kind}")
+
+        snapshots = AttendanceBackup.list_snapshots()
+        previous = snapshots[-1] if snapshots else None
+
+        if kind == "incremental" and AttendanceBackup.needs_full(snapshots):
+            kind = "full"
+
+        until = timezone.now()
+        since = None
+        if kind == "incremental":
+            since = datetime.fromisoformat(previous["until"]) - AttendanceBackup.OVERLAP
+
+        snapshot_id = f"{until:%Y%m%dT%H%M%S}-{kind}"
+        final_dir = AttendanceBackup.ROOT / snapshot_id
+        temp_dir = AttendanceBackup.ROOT / f".{snapshot_id}.tmp"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = {
+            "id": snapshot_id,
+            "kind": kind,
+            "parent": previous["id"] if kind == "incremental" else None,
+            "since": since.isoformat() if since else None,
+            "until": until.isoformat(),
+            "models": {},
+        }
+
+        try:
+            for model, change_fields in AttendanceBackup.MODELS:
+                queryset = model.objects.filter(
+                    AttendanceBackup.get_change_filter(change_fields, since, until)
+                )
+                manifest["models"][model._meta.label] = AttendanceBackup.write_model(
+                    temp_dir, model, queryset
+                )
+
+            with open(temp_dir / MANIFEST_NAME, "w") as manifest_file:
+                json.dump(manifest, manifest_file, indent=2)
+
+            os.replace(temp_dir, final_dir)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        AttendanceBackup.prune()
+
+        manifest["path"] = str(final_dir)
+        manifest["size"] = sum(entry["size"] for entry in manifest["models"].values())
+        return manifest
+
+    @staticmethod
+    def get_change_filter(change_fields: List[str], since, until) -> Q:
+        if since is None:
+            return Q()
+
+        changed = Q()
+        for field in change_fields:
+            changed |= Q(**{f"{field}__gt": since, f"{field}__lte": until})
+        return changed
+
+    @staticmethod
+    def needs_full(snapshots: List[Dict]) -> bool:
+        fulls = [snapshot for snapshot in snapshots if snapshot["kind"] == "full"]
+        if not fulls:
+            return True
+
+        last_full = datetime.fromisoformat(fulls[-1]["until"])
+        return timezone.now() - last_full >= timedelta(days=AttendanceBackup.FULL_INTERVAL_DAYS)
+
+    @staticmethod
+    def write_model(snapshot_dir: Path, model, queryset) -> Dict:
+        fields = [field.attname for field in model._meta.concrete_fields]
+        file_name = f"{model._meta.db_table}.ndjson.gz"
+        path = snapshot_dir / file_name
+        rows = 0
+
+        with gzip.open(path, "wt", encoding="utf-8") as backup_file:
+            for row in queryset.order_by("pk").values(*fields).iterator(
+                chunk_size=AttendanceBackup.CHUNK_SIZE
+            ):
+                backup_file.write(json.dumps(row, cls=DjangoJSONEncoder, separators=(",", ":")))
+                backup_file.write("\n")
+                rows += 1
+
+        return {
+            "file": file_name,
+            "rows": rows,
+            "size": path.stat().st_size,
+            "sha256": AttendanceBackup.get_file_checksum(path),
+        }
+
+    @staticmethod
+    def list_snapshots() -> List[Dict]:
+        if not AttendanceBackup.ROOT.exists():
+            return []
+
+        snapshots = []
+        for snapshot_dir in sorted(AttendanceBackup.ROOT.iterdir()):
+            manifest_path = snapshot_dir / MANIFEST_NAME
+            if snapshot_dir.name.startswith(".") or not manifest_path.exists():
+                continue
+            with open(manifest_path) as manifest_file:
+                snapshots.append(json.load(manifest_file))
+
+        return snapshots
+
+    @staticmethod
+    def get_restore_chain(target: str = None) -> List[Dict]:
+        snapshots = AttendanceBackup.list_snapshots()
+        if target:
+            ids = [snapshot["id"] for snapshot in snapshots]
+            if target not in ids:
+                raise BackupError(f"Snapshot {target} not found")
+            snapshots = snapshots[: ids.index(target) + 1]
+
+        base_index = None
+        for index, snapshot in enumerate(snapshots):
+            if snapshot["kind"] == "full":
+                base_index = index
+
+        if base_index is None:
+            raise BackupError("No full snapshot available to restore from")
+
+        return snapshots[base_index:]
+
+    @staticmethod
+    def read_rows(snapshot_id: str, entry: Dict) -> Iterator[Dict]:
+        path = AttendanceBackup.ROOT / snapshot_id / entry["file"]
+        if AttendanceBackup.get_file_checksum(path) != entry["sha256"]:
+            raise BackupError(f"Checksum mismatch for {path}")
+
+        with gzip.open(path, "rt", encoding="utf-8") as backup_file:
+            for line in backup_file:
+                yield json.loads(line)
+
+    @staticmethod
+    def restore(
+        target: str = None, labels: List[str] = None, dry_run: bool = False, prune: bool = False
+    ) -> Dict:
+        chain = AttendanceBackup.get_restore_chain(target)
+        restored = {}
+        deleted = {}
+
+        for snapshot in chain:
+            for model, change_fields in AttendanceBackup.MODELS:
+                label = model._meta.label
+                entry = snapshot["models"].get(label)
+                if not entry or (labels and label not in labels):
+                    continue
+
+                rows = AttendanceBackup.read_rows(snapshot["id"], entry)
+                if dry_run:
+                    count = sum(1 for _ in rows)
+                else:
+                    # A full snapshot held the whole table, so rows it lacks that have
+                    # not changed since were deleted before it was taken.
+                    prune_before = None
+                    if prune and snapshot["kind"] == "full":
+                        prune_before = (change_fields, datetime.fromisoformat(snapshot["until"]))
+                    count, removed = AttendanceBackup.replay_rows(model, rows, prune_before)
+                    if removed:
+                        deleted[label] = deleted.get(label, 0) + removed
+                restored[label] = restored.get(label, 0) + count
+
+            logger.info(f"Replayed attendance snapshot {snapshot['id']}")
+
+        return {
+            "snapshots": [snapshot["id"] for snapshot in chain],
+            "rows": restored,
+            "deleted": deleted,
+        }
+
+    @staticmethod
+    def replay_rows(model, rows: Iterator[Dict], prune_before: Tuple = None) -> Tuple[int, int]:
+        fields = {field.attname: field for field in model._meta.concrete_fields}
+        update_fields = [field.name for field in model._meta.concrete_fields if not field.primary_key]
+        count = 0
+        removed = 0
+        kept = set()
+        batch = []
+
+        def flush():
+            model.objects.bulk_create(
+                batch,
+                update_conflicts=True,
+                unique_fields=[model._meta.pk.name],
+                update_fields=update_fields,
+            )
+
+        with transaction.atomic():
+            for row in rows:
+                batch.append(
+                    model(
+                        **{
+                            name: fields[name].to_python(value)
+                            for name, value in row.items()
+                            if name in fields
+                        }
+                    )
+                )
+                kept.add(batch[-1].pk)
+                if len(batch) >= AttendanceBackup.CHUNK_SIZE:
+                    flush()
+                    count += len(batch)
+                    batch = []
+
+            if batch:
+                flush()
+                count += len(batch)
+
+            if prune_before:
+                removed = AttendanceBackup.delete_missing(model, kept, *prune_before)
+
+        return count, removed
+
+    @staticmethod
+    def delete_missing(model, kept: set, change_fields: List[str], until) -> int:
+        from .archive import AttendanceArchive
+
+        # Rows written after the snapshot are not in it and must survive the restore.
+        changed_after = Q()
+        for field in change_fields:
+            changed_after |= Q(**{f"{field}__gt": until})
+
+        missing = [
+            pk
+            for pk in model.objects.exclude(changed_after)
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=AttendanceBackup.CHUNK_SIZE)
+            if pk not in kept
+        ]
+        return AttendanceArchive.delete_rows(model, missing)
+
+    @staticmethod
+    def prune() -> int:
+        snapshots = AttendanceBackup.list_snapshots()
+        full_indexes = [
+            index for index, snapshot in enumerate(snapshots) if snapshot["kind"] == "full"
+        ]
+        if len(full_indexes) <= AttendanceBackup.KEEP_FULL:
+            return 0
+
+        oldest_kept = full_indexes[-AttendanceBackup.KEEP_FULL]
+        for snapshot in snapshots[:oldest_kept]:
+            shutil.rmtree(AttendanceBackup.ROOT / snapshot["id"], ignore_errors=True)
+
+        return oldest_kept
+
+    @staticmethod
+    def get_file_checksum(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as backup_file:
+            for block in iter(lambda: backup_file.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
@@ -7,14 +7,33 @@ from django.utils import timezone
 from django.db import transaction
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from accounts.excel.cache import ImportPayloadCache
 from ..models import Attendance
-from ..utils import get_current_date
+from ..signals import attendance_records_imported
+from ..utils import AttendanceBatchCalculator, get_current_date
 from io import BytesIO
 import time as time_module
 
 User = get_user_model()
 
+DATE_FORMATS = {
+    "DMY_TEXT": ["%d-%b-%y", "%d-%B-%y", "%d-%b-%Y", "%d-%B-%Y"],
+    "DMY": ["%d/%m/%Y", "%d-%m-%Y"],
+    "MDY": ["%m/%d/%Y", "%m-%d-%Y"],
+    "YMD": ["%Y/%m/%d", "%Y-%m-%d"],
+}
+TIME_FORMATS = ["%H:%M:%S", "%H:%M", "%I:%M:%S %p", "%I:%M %p"]
+DURATION_COLUMNS = [
+    ("Total Time", "total_time"),
+    ("Out Time", "break_time"),
+    ("Work Time", "work_time"),
+    ("Over Time", "overtime"),
+]
+DURATION_PATTERN = r"^\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*:\s*([+-]?\d+)\s*$"
+
 class ExcelAttendanceImporter:
+    PROGRESS_INTERVAL = 2.0
+
     def __init__(
         self,
         file_path,
@@ -38,6 +57,8 @@ class ExcelAttendanceImporter:
         self.processed_data = []
         self.total_rows = 0
         self.processed_rows = 0
+        self.invalid_cells = []
+        self.last_progress_at = 0.0
 
     def read_excel(self):
         try:
@@ -197,24 +218,262 @@ class ExcelAttendanceImporter:
 
         return None
 
+    @staticmethod
+    def truthy_cells(series):
+        return series.astype(object).astype(bool)
+
+    @staticmethod
+    def classify_cells(series):
+        kinds = series.map(type)
+        labels = {}
+        for kind in kinds.unique():
+            if issubclass(kind, str):
+                labels[kind] = "text"
+            elif issubclass(kind, (bool, np.bool_)):
+                labels[kind] = "other"
+            elif issubclass(kind, datetime):
+                labels[kind] = "datetime"
+            elif issubclass(kind, date):
+                labels[kind] = "date"
+            elif issubclass(kind, time):
+                labels[kind] = "time"
+            elif issubclass(kind, (int, float, np.integer, np.floating)):
+                labels[kind] = "number"
+            else:
+                labels[kind] = "other"
+        return kinds.map(labels)
+
+    @staticmethod
+    def parse_text_formats(text, formats):
+        parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+        for fmt in formats:
+            pending = parsed.isna()
+            if not pending.any():
+                break
+            parsed.loc[pending] = pd.to_datetime(
+                text[pending], format=fmt, errors="coerce"
+            )
+        return parsed[parsed.notna()]
+
+    def parse_date_column(self, series):
+        kinds = self.classify_cells(series)
+        present = self.truthy_cells(series)
+        parsed = {}
+
+        native_dates = series[present & (kinds == "date")]
+        parsed.update(zip(native_dates.index, native_dates))
+
+        native_datetimes = series[present & (kinds == "datetime")]
+        if len(native_datetimes):
+            converted = pd.to_datetime(native_datetimes, errors="coerce").dropna()
+            parsed.update(zip(converted.index, converted.dt.date))
+
+        text = series[present & (kinds == "text")]
+        formats = DATE_FORMATS.get(self.date_format, [])
+        if len(text) and formats:
+            converted = self.parse_text_formats(text.str.strip(), formats)
+            parsed.update(zip(converted.index, converted.dt.date))
+
+        return parsed
+
+    def parse_time_column(self, series):
+        kinds = self.classify_cells(series)
+        present = self.truthy_cells(series)
+        parsed = {}
+
+        native_times = series[present & (kinds == "time")]
+        parsed.update(zip(native_times.index, native_times))
+
+        native_datetimes = series[present & (kinds == "datetime")]
+        if len(native_datetimes):
+            converted = pd.to_datetime(native_datetimes, errors="coerce").dropna()
+            parsed.update(zip(converted.index, converted.dt.time))
+
+        text = series[present & (kinds == "text")]
+        if len(text):
+            converted = self.parse_text_formats(text.str.strip(), TIME_FORMATS)
+            parsed.update(zip(converted.index, converted.dt.time))
+
+        numbers = series[present & (kinds == "number")].astype(float)
+        if len(numbers):
+            seconds = np.trunc(numbers * 24 * 60 * 60)
+            seconds = seconds[
+                np.isfinite(seconds) & (seconds >= 0) & (seconds < 24 * 60 * 60)
+            ]
+            converted = pd.to_datetime(seconds.astype(np.int64), unit="s")
+            parsed.update(zip(converted.index, converted.dt.time))
+
+        self.collect_invalid_cells(series, present, parsed)
+        return parsed
+
+    def parse_duration_column(self, series):
+        present = self.truthy_cells(series)
+        parts = series[present].astype(str).str.extract(DURATION_PATTERN)
+        parts = parts[parts.notna().all(axis=1)]
+        if parts.empty:
+            self.collect_invalid_cells(series, present, {})
+            return {}
+
+        parts = parts.apply(pd.to_numeric)
+        seconds = parts[0] * 3600 + parts[1] * 60 + parts[2]
+        parsed = dict(
+            zip(
+                seconds.index,
+                pd.to_timedelta(seconds, unit="s").dt.to_pytimedelta(),
+            )
+        )
+
+        self.collect_invalid_cells(series, present, parsed)
+        return parsed
+
+    def collect_invalid_cells(self, series, present, parsed):
+        for index in series.index[present.to_numpy()]:
+            if index not in parsed:
+                self.invalid_cells.append(
+                    {
+                        "row": int(index) + 2,
+                        "column": series.name,
+                        "value": str(series[index]),
+                    }
+                )
+
+    def get_cell_columns(self):
+        columns = []
+        for i in range(1, 7):
+            in_col = "In" if i == 1 else f"{i}/In"
+            out_col = "Out" if i == 1 else f"{i}/Out"
+            columns.append((in_col, f"check_in_{i}", self.parse_time_column))
+            columns.append((out_col, f"check_out_{i}", self.parse_time_column))
+
+        for column, field in DURATION_COLUMNS:
+            columns.append((column, field, self.parse_duration_column))
+
+        return [
+            (column, field, parser)
+            for column, field, parser in columns
+            if column in self.df.columns
+        ]
+
+    def update_progress(self, force=False):
+        if not self.import_job:
+            return
+
+        now = time_module.monotonic()
+        if not force and now - self.last_progress_at < self.PROGRESS_INTERVAL:
+            return
+
+        self.last_progress_at = now
+        self.import_job.processed_rows = self.processed_rows
+        self.import_job.save(update_fields=["processed_rows"])
+
+    def get_payload_key(self):
+        try:
+            return ImportPayloadCache.get_key(
+                "attendance",
+                self.file_path,
+                date_format=self.date_format,
+                sheet_name=self.sheet_name,
+                today=get_current_date(),
+            )
+        except Exception as e:
+            self.warnings.append(f"Upload could not be fingerprinted for caching: {str(e)}")
+            return None
+
+    def build_payload(self):
+        parsed = self.parse_rows()
+        return {
+            "cacheable": parsed,
+            "total_rows": self.total_rows,
+            "records": ImportPayloadCache.to_columns(self.processed_data),
+            "errors": list(self.errors),
+            "warnings": list(self.warnings),
+            "error_count": self.error_count,
+            "invalid_cells": list(self.invalid_cells),
+        }
+
+    def load_payload(self, payload):
+        self.total_rows = payload["total_rows"]
+        self.processed_rows = self.total_rows
+        self.processed_data = ImportPayloadCache.from_columns(payload["records"])
+        self.errors.extend(payload["errors"])
+        self.warnings.extend(payload["warnings"])
+        self.error_count += payload["error_count"]
+        self.invalid_cells.extend(payload["invalid_cells"])
+
+        if self.import_job:
+            self.import_job.total_rows = self.total_rows
+            self.import_job.processed_rows = self.processed_rows
+            self.import_job.status = "PROCESSING"
+            self.import_job.save()
+
     def process_data(self):
+        key = self.get_payload_key()
+        if not key:
+            return self.parse_rows()
+
+        payload = ImportPayloadCache.get_or_parse(key, self.build_payload)
+        if payload["cached"]:
+            self.load_payload(payload)
+        return len(self.processed_data) > 0
+
+    def preview(self):
+        self.process_data()
+        writer = AttendanceImportWriter(user=self.user, update_existing=self.update_existing)
+        diff = writer.diff(self.processed_data)
+        diff.update(
+            {
+                "total_rows": self.total_rows,
+                "parsed_rows": len(self.processed_data),
+                "error_count": self.error_count,
+                "errors": self.errors,
+                "warnings": self.warnings,
+                "invalid_cells": self.invalid_cells,
+            }
+        )
+        return diff
+
+    def parse_rows(self):
         if not self.read_excel() or not self.validate_excel_structure():
             return False
 
+        self.df = self.df.reset_index(drop=True)
+        row_count = len(self.df)
+
+        try:
+            employee_ids = self.df["ID"].tolist()
+            has_employee_id = self.truthy_cells(self.df["ID"]).tolist()
+            dates = self.parse_date_column(self.df["Date"])
+            divisions = (
+                self.df["Division"].tolist()
+                if "Division" in self.df.columns
+                else [None] * row_count
+            )
+            notes = (
+                self.df["Notes"].tolist()
+                if "Notes" in self.df.columns
+                else [""] * row_count
+            )
+            cell_values = [
+                (field, parser(self.df[column]))
+                for column, field, parser in self.get_cell_columns()
+            ]
+        except Exception as e:
+            self.error_count += 1
+            self.errors.append(f"Error parsing attendance columns: {str(e)}")
+            return False
+
+        today = get_current_date()
         self.processed_rows = 0
-        for _, row in self.df.iterrows():
-            try:
-                self.processed_rows += 1
-                if self.import_job and self.processed_rows % 5 == 0:
-                    self.import_job.processed_rows = self.processed_rows
-                    self.import_job.save()
+        for index in range(row_count):
+            self.processed_rows += 1
+            self.update_progress()
 
-                employee_id = row.get("ID")
-                if not employee_id:
+            try:
+                if not has_employee_id[index]:
                     continue
 
-                employee_id = str(employee_id).strip()
-                date_value = self.parse_date(row.get("Date"))
+                employee_id = str(employee_ids[index]).strip()
+                date_value = dates.get(index)
 
                 if not date_value:
                     self.warnings.append(
@@ -222,7 +481,7 @@ class ExcelAttendanceImporter:
                     )
                     continue
 
-                if date_value > get_current_date():
+                if date_value > today:
                     self.warnings.append(
                         f"Future date {date_value} for employee ID {employee_id} will be skipped"
                     )
@@ -231,79 +490,14 @@ class ExcelAttendanceImporter:
                 attendance_data = {
                     "employee_id": employee_id,
                     "date": date_value,
-                    "division": row.get("Division"),
-                    "notes": row.get("Notes", ""),
+                    "division": divisions[index],
+                    "notes": notes[index],
                 }
 
-                for i in range(1, 7):
-                    in_col = f"In"
-                    out_col = f"Out"
-
-                    if i > 1:
-                        in_col = f"{i}/{in_col}"
-                        out_col = f"{i}/{out_col}"
-
-                    if in_col in self.df.columns:
-                        check_in = self.parse_time(row.get(in_col))
-                        if check_in:
-                            attendance_data[f"check_in_{i}"] = check_in
-
-                    if out_col in self.df.columns:
-                        check_out = self.parse_time(row.get(out_col))
-                        if check_out:
-                            attendance_data[f"check_out_{i}"] = check_out
-
-                if "Total Time" in self.df.columns:
-                    total_time_str = row.get("Total Time")
-                    if total_time_str:
-                        try:
-                            hours, minutes, seconds = map(
-                                int, str(total_time_str).split(":")
-                            )
-                            attendance_data["total_time"] = timedelta(
-                                hours=hours, minutes=minutes, seconds=seconds
-                            )
-                        except (ValueError, AttributeError):
-                            pass
-
-                if "Out Time" in self.df.columns:
-                    break_time_str = row.get("Out Time")
-                    if break_time_str:
-                        try:
-                            hours, minutes, seconds = map(
-                                int, str(break_time_str).split(":")
-                            )
-                            attendance_data["break_time"] = timedelta(
-                                hours=hours, minutes=minutes, seconds=seconds
-                            )
-                        except (ValueError, AttributeError):
-                            pass
-
-                if "Work Time" in self.df.columns:
-                    work_time_str = row.get("Work Time")
-                    if work_time_str:
-                        try:
-                            hours, minutes, seconds = map(
-                                int, str(work_time_str).split(":")
-                            )
-                            attendance_data["work_time"] = timedelta(
-                                hours=hours, minutes=minutes, seconds=seconds
-                            )
-                        except (ValueError, AttributeError):
-                            pass
-
-                if "Over Time" in self.df.columns:
-                    overtime_str = row.get("Over Time")
-                    if overtime_str:
-                        try:
-                            hours, minutes, seconds = map(
-                                int, str(overtime_str).split(":")
-                            )
-                            attendance_data["overtime"] = timedelta(
-                                hours=hours, minutes=minutes, seconds=seconds
-                            )
-                        except (ValueError, AttributeError):
-                            pass
+                for field, values in cell_values:
+                    value = values.get(index)
+                    if value is not None:
+                        attendance_data[field] = value
 
                 self.processed_data.append(attendance_data)
 
@@ -311,9 +505,7 @@ class ExcelAttendanceImporter:
                 self.error_count += 1
                 self.errors.append(f"Error processing row: {str(e)}")
 
-        if self.import_job:
-            self.import_job.processed_rows = self.processed_rows
-            self.import_job.save()
+        self.update_progress(force=True)
 
         return len(self.processed_data) > 0
 
@@ -321,87 +513,47 @@ class ExcelAttendanceImporter:
         if not self.processed_data and not self.process_data():
             return False
 
-        batch_size = 50
-        total_batches = (len(self.processed_data) + batch_size - 1) // batch_size
-
-        for batch_num in range(total_batches):
-            start_idx = batch_num * batch_size
-            end_idx = min((batch_num + 1) * batch_size, len(self.processed_data))
-            batch = self.processed_data[start_idx:end_idx]
-
-            with transaction.atomic():
-                for data in batch:
-                    try:
-                        employee_id = data.pop("employee_id")
-                        date_value = data.pop("date")
-                        division = data.pop("division", None)
-
-                        employee = User.objects.filter(
-                            employee_code=employee_id
-                        ).first()
-                        if not employee:
-                            self.warnings.append(
-                                f"Employee with ID {employee_id} not found"
-                            )
-                            continue
-
-                        attendance, created = Attendance.objects.get_or_create(
-                            employee=employee,
-                            date=date_value,
-                            defaults={"is_manual_entry": True, "created_by": self.user},
-                        )
-
-                        if not created and not self.update_existing:
-                            self.warnings.append(
-                                f"Skipping existing record for {employee.get_full_name()} on {date_value}"
-                            )
-                            continue
-
-                        for field, value in data.items():
-                            if value is not None:
-                                setattr(attendance, field, value)
-
-                        attendance.is_manual_entry = True
-                        if self.user:
-                            attendance._attendance_changed_by = self.user
-                            if created:
-                                attendance.created_by = self.user
-
-                        attendance.save()
-
-                        if created:
-                            self.success_count += 1
-                        else:
-                            self.update_count += 1
-
-                    except ValidationError as e:
-                        self.error_count += 1
-                        self.errors.append(
-                            f"Validation error for {employee_id} on {date_value}: {str(e)}"
-                        )
-                    except Exception as e:
-                        self.error_count += 1
-                        self.errors.append(f"Error importing data: {str(e)}")
-
-            if self.import_job:
-                self.import_job.success_count = self.success_count
-                self.import_job.error_count = self.error_count
-                self.import_job.processed_rows = end_idx
-                self.import_job.created_count = self.success_count
-                self.import_job.save()
+        writer = AttendanceImportWriter(
+            user=self.user,
+            update_existing=self.update_existing,
+            progress_callback=self.update_import_progress,
+        )
+        writer.write(self.processed_data)
 
-            time_module.sleep(
-                0.1
-            )  
+        self.success_count += writer.created_count
+        self.update_count += writer.updated_count
+        self.error_count += len(writer.errors)
+        self.errors.extend(writer.errors)
+        self.warnings.extend(writer.warnings)
 
         if self.import_job:
+            self.import_job.success_count = self.success_count
+            self.import_job.error_count = self.error_count
+            self.import_job.created_count = self.success_count
+            self.import_job.updated_count = self.update_count
             self.import_job.status = "COMPLETED"
             self.import_job.completed_at = timezone.now()
-            self.import_job.created_count = self.success_count
             self.import_job.save()
 
         return True
 
+    def update_import_progress(self, processed, writer):
+        if not self.import_job:
+            return
+
+        self.import_job.processed_rows = processed
+        self.import_job.success_count = self.success_count + writer.created_count
+        self.import_job.error_count = self.error_count + len(writer.errors)
+        self.import_job.created_count = self.success_count + writer.created_count
+        self.import_job.save(
+            update_fields=[
+                "processed_rows",
+                "success_count",
+                "error_count",
+                "created_count",
+            ]
+        )
+
     def get_results(self):
         return {
             "success_count": self.success_count,
@@ -409,6 +561,7 @@ class ExcelAttendanceImporter:
             "error_count": self.error_count,
             "errors": self.errors,
             "warnings": self.warnings,
+            "invalid_cells": self.invalid_cells,
         }
 
     @staticmethod
@@ -429,6 +582,327 @@ class ExcelAttendanceImporter:
 
         return importer.get_results()
 
+    @staticmethod
+    def preview_attendance_import(
+        file_path,
+        date_format="DMY_TEXT",
+        sheet_name=None,
+        update_existing=True,
+        user=None,
+    ):
+        importer = ExcelAttendanceImporter(
+            file_path, date_format, sheet_name, update_existing, user
+        )
+        return importer.preview()
+
+class AttendanceImportAborted(Exception):
+    def __init__(self, failures):
+        self.failures = failures
+        super().__init__(failures[0]["message"])
+
+
+class AttendanceImportWriter:
+    BATCH_SIZE = 2000
+    FAILED_STATUSES = ("missing", "error")
+    CHECK_FIELDS = [
+        f"check_{direction}_{i}" for i in range(1, 7) for direction in ("in", "out")
+    ]
+    COMPUTED_FIELDS = [
+        "shift",
+        "is_weekend",
+        "is_holiday",
+        "total_time",
+        "break_time",
+        "work_time",
+        "overtime",
+        "undertime",
+        "weekend_work_time",
+        "first_in_time",
+        "last_out_time",
+        "status",
+        "late_minutes",
+        "early_departure_minutes",
+        "is_excessive_lunch_break",
+        "is_other_staff_special_late",
+    ]
+    UPDATE_FIELDS = CHECK_FIELDS + COMPUTED_FIELDS + [
+        "notes",
+        "is_manual_entry",
+        "updated_at",
+    ]
+
+    def __init__(self, user=None, update_existing=True, progress_callback=None, stop_on_error=False):
+        self.user = user
+        self.update_existing = update_existing
+        self.progress_callback = progress_callback
+        self.stop_on_error = stop_on_error
+        self.created_count = 0
+        self.updated_count = 0
+        self.skipped_count = 0
+        self.missing_count = 0
+        self.duplicate_count = 0
+        self.created_keys = set()
+        self.results = []
+        self.errors = []
+        self.warnings = []
+
+    def load_employees(self, records):
+        employee_codes = {record["employee_id"] for record in records}
+        return {
+            employee.employee_code: employee
+            for employee in User.objects.filter(
+                employee_code__in=employee_codes
+            ).select_related("department", "role")
+        }
+
+    def load_existing(self, employees, start_date, end_date):
+        employee_map = {employee.id: employee for employee in employees.values()}
+        existing = {}
+        for attendance in Attendance.objects.filter(
+            employee_id__in=employee_map.keys(), date__range=(start_date, end_date)
+        ):
+            attendance.employee = employee_map[attendance.employee_id]
+            existing[(attendance.employee_id, attendance.date)] = attendance
+        return existing
+
+    def diff(self, records, sample_size=20):
+        records = [record for record in records if record.get("date")]
+        result = {
+            "insert_count": 0,
+            "update_count": 0,
+            "skip_count": 0,
+            "duplicate_count": 0,
+            "unknown_employees": [],
+            "insert_sample": [],
+            "update_sample": [],
+            "skip_sample": [],
+        }
+        if not records:
+            return result
+
+        employees = self.load_employees(records)
+        codes_by_id = {employee.id: code for code, employee in employees.items()}
+        file_keys = set()
+        unknown = set()
+
+        for record in records:
+            employee = employees.get(record["employee_id"])
+            if not employee:
+                unknown.add(record["employee_id"])
+                continue
+            key = (employee.id, record["date"])
+            if key in file_keys:
+                result["duplicate_count"] += 1
+            file_keys.add(key)
+
+        existing = set()
+        if file_keys:
+            existing = set(
+                Attendance.objects.filter(
+                    employee_id__in=codes_by_id.keys(),
+                    date__range=(
+                        min(key[1] for key in file_keys),
+                        max(key[1] for key in file_keys),
+                    ),
+                ).values_list("employee_id", "date")
+            )
+
+        inserts = file_keys - existing
+        matched = file_keys & existing
+        updates = matched if self.update_existing else set()
+        skips = set() if self.update_existing else matched
+
+        def sample(keys):
+            return [
+                {"employee_id": codes_by_id[employee_id], "date": str(date_value)}
+                for employee_id, date_value in sorted(keys, key=lambda key: (key[1], key[0]))[
+                    :sample_size
+                ]
+            ]
+
+        result.update(
+            {
+                "insert_count": len(inserts),
+                "update_count": len(updates),
+                "skip_count": len(skips),
+                "unknown_employees": sorted(unknown),
+                "insert_sample": sample(inserts),
+                "update_sample": sample(updates),
+                "skip_sample": sample(skips),
+            }
+        )
+        return result
+
+    def snapshot(self, attendance):
+        return {
+            field.attname: getattr(attendance, field.attname)
+            for field in (
+                Attendance._meta.get_field(name) for name in self.UPDATE_FIELDS
+            )
+        }
+
+    def restore(self, attendance, snapshot):
+        for attname, value in snapshot.items():
+            setattr(attendance, attname, value)
+
+    def write(self, records):
+        records = [record for record in records if record.get("date")]
+        if not records:
+            return self
+
+        employees = self.load_employees(records)
+        start_date = min(record["date"] for record in records)
+        end_date = max(record["date"] for record in records)
+
+        existing = self.load_existing(employees, start_date, end_date)
+        calculator = AttendanceBatchCalculator(
+            [employee.id for employee in employees.values()], start_date, end_date
+        )
+
+        for start in range(0, len(records), self.BATCH_SIZE):
+            batch = records[start : start + self.BATCH_SIZE]
+            with transaction.atomic():
+                self.write_batch(batch, employees, existing, calculator)
+
+            if self.progress_callback:
+                self.progress_callback(start + len(batch), self)
+
+        return self
+
+    def write_batch(self, batch, employees, existing, calculator):
+        """
+        Every row gets a result ({"row", "employee_id", "date", "status",
+        "message"}) before anything is written. With ``stop_on_error`` a
+        batch containing a missing employee or an invalid row is rejected
+        whole, with nothing saved.
+        """
+        to_create = {}
+        to_update = {}
+        results = []
+        counts = {"created": 0, "updated": 0, "skipped": 0, "missing": 0, "duplicate": 0}
+        messages = {"errors": [], "warnings": []}
+        now = timezone.now()
+
+        def add_result(status, message=None):
+            results.append(
+                {
+                    "row": row,
+                    "employee_id": employee_id,
+                    "date": date_value,
+                    "status": status,
+                    "message": message,
+                }
+            )
+            if status in counts:
+                counts[status] += 1
+
+        for record in batch:
+            data = dict(record)
+            row = data.pop("row", None)
+            employee_id = data.pop("employee_id")
+            date_value = data.pop("date")
+            data.pop("division", None)
+
+            employee = employees.get(employee_id)
+            if not employee:
+                message = f"Employee with ID {employee_id} not found"
+                messages["warnings"].append(message)
+                add_result("missing", message)
+                continue
+
+            key = (employee.id, date_value)
+            attendance = existing.get(key) or to_create.get(key)
+            created = attendance is None
+
+            if created:
+                attendance = Attendance(
+                    employee=employee,
+                    date=date_value,
+                    is_manual_entry=True,
+                    created_by=self.user,
+                )
+            elif not self.update_existing:
+                message = f"Skipping existing record for {employee.get_full_name()} on {date_value}"
+                messages["warnings"].append(message)
+                add_result("skipped", message)
+                continue
+
+            previous = None if created else self.snapshot(attendance)
+
+            try:
+                for field, value in data.items():
+                    if value is not None:
+                        setattr(attendance, field, value)
+
+                attendance.is_manual_entry = True
+                calculator.recalculate(attendance)
+
+            except ValidationError as e:
+                if previous:
+                    self.restore(attendance, previous)
+                message = f"Validation error for {employee_id} on {date_value}: {str(e)}"
+                messages["errors"].append(message)
+                add_result("error", message)
+                continue
+            except Exception as e:
+                if previous:
+                    self.restore(attendance, previous)
+                message = f"Error importing data: {str(e)}"
+                messages["errors"].append(message)
+                add_result("error", message)
+                continue
+
+            if created:
+                to_create[key] = attendance
+                add_result("created")
+            elif key in to_create or key in self.created_keys:
+                # A repeat of a row this import created; nothing existed
+                # before, so it is not an update.
+                if key not in to_create:
+                    attendance.updated_at = now
+                    to_update[key] = attendance
+                add_result("duplicate")
+            else:
+                if key not in to_update:
+                    attendance._old_status = previous["status"]
+                    attendance._old_work_time = previous["work_time"]
+                attendance.updated_at = now
+                to_update[key] = attendance
+                add_result("updated")
+
+        failures = [result for result in results if result["status"] in self.FAILED_STATUSES]
+        if failures and self.stop_on_error:
+            raise AttendanceImportAborted(failures)
+
+        self.results.extend(results)
+        self.created_count += counts["created"]
+        self.updated_count += counts["updated"]
+        self.skipped_count += counts["skipped"]
+        self.missing_count += counts["missing"]
+        self.duplicate_count += counts["duplicate"]
+        self.errors.extend(messages["errors"])
+        self.warnings.extend(messages["warnings"])
+        self.created_keys.update(to_create)
+
+        if to_create:
+            Attendance.objects.bulk_create(
+                list(to_create.values()), batch_size=self.BATCH_SIZE
+            )
+            existing.update(to_create)
+
+        if to_update:
+            Attendance.objects.bulk_update(
+                list(to_update.values()), self.UPDATE_FIELDS, batch_size=self.BATCH_SIZE
+            )
+
+        attendance_records_imported.send(
+            sender=Attendance,
+            created=list(to_create.values()),
+            updated=list(to_update.values()),
+            changed_by=self.user,
+        )
+
+
 class ExcelAttendanceValidator:
     @staticmethod
     def validate_file(file):
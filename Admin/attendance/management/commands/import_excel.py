@@ -7,6 +7,7 @@ from accounts.models import CustomUser, SystemConfiguration
 from attendance.models import Attendance, AttendanceDevice
 from attendance.services import ExcelService, AttendanceService
 from attendance.tasks import import_attendance_from_excel
+from attendance.excel.utils import AttendanceImportAborted, AttendanceImportWriter
 from attendance.utils import (
     ValidationHelper,
     EmployeeDataManager,
@@ -56,7 +57,7 @@ class Command(BaseCommand):
         parser.add_argument(
             "--batch-size",
             type=int,
-            default=50,
+            default=1000,
             help="Number of records to process in each batch",
         )
 
@@ -92,7 +93,7 @@ class Command(BaseCommand):
         self.verbosity = options.get("verbosity", 1)
         self.verbose = options.get("verbose", False)
         self.dry_run = options.get("dry_run", False)
-        self.batch_size = options.get("batch_size", 50)
+        self.batch_size = options.get("batch_size", 1000)
         self.skip_errors = options.get("skip_errors", False)
         self.overwrite = options.get("overwrite", False)
 
@@ -266,7 +267,7 @@ class Command(BaseCommand):
 
         return errors
     
-        def run_async_import(self, file_path, user, options):
+    def run_async_import(self, file_path, user, options):
         try:
             with open(file_path, 'rb') as file:
                 file_content = file.read()
@@ -403,19 +404,31 @@ class Command(BaseCommand):
         self.stdout.write(f"   🔄 Overwrite mode: {'Yes' if self.overwrite else 'No'}")
 
     def count_existing_records(self, df):
-        existing_count = 0
-        
-        for index, row in df.iterrows():
-            employee_code = ValidationHelper.sanitize_employee_code(str(row.get('ID', '')))
-            attendance_date = safe_date_conversion(row.get('Date'))
-            
+        keys = set()
+        for employee_id, date_value in zip(df['ID'].tolist(), df['Date'].tolist()):
+            employee_code = ValidationHelper.sanitize_employee_code(str(employee_id))
+            attendance_date = safe_date_conversion(date_value)
             if employee_code and attendance_date:
-                employee = EmployeeDataManager.get_employee_by_code(employee_code)
-                if employee:
-                    if Attendance.objects.filter(employee=employee, date=attendance_date).exists():
-                        existing_count += 1
-        
-        return existing_count
+                keys.add((employee_code, attendance_date))
+
+        if not keys:
+            return 0
+
+        employee_ids = dict(
+            CustomUser.objects.filter(
+                employee_code__in={code for code, _ in keys}, is_active=True
+            ).values_list('id', 'employee_code')
+        )
+        dates = [attendance_date for _, attendance_date in keys]
+        existing = {
+            (employee_ids[employee_id], attendance_date)
+            for employee_id, attendance_date in Attendance.objects.filter(
+                employee_id__in=employee_ids.keys(),
+                date__range=(min(dates), max(dates)),
+            ).values_list('employee_id', 'date')
+        }
+
+        return len(keys & existing)
 
     def process_import_batches(self, df, user, total_rows):
         imported_count = 0
@@ -463,92 +476,65 @@ class Command(BaseCommand):
         self.display_import_summary(imported_count, error_count, skipped_count, errors_list, user)
 
     def process_batch(self, batch_df, user):
-        imported = 0
         errors = 0
-        skipped = 0
         error_details = []
-        
+        records = []
+
         for index, row in batch_df.iterrows():
-            try:
-                result = self.process_single_record(row, user, index + 2)
-                
-                if result['status'] == 'imported':
-                    imported += 1
-                elif result['status'] == 'skipped':
-                    skipped += 1
-                    if self.verbose:
-                        self.stdout.write(f"   ⏭️  Row {index + 2}: {result['message']}")
-                elif result['status'] == 'error':
-                    errors += 1
-                    error_details.append(f"Row {index + 2}: {result['message']}")
-                    
-                    if not self.skip_errors:
-                        raise Exception(result['message'])
-                
-            except Exception as e:
+            employee_code = ValidationHelper.sanitize_employee_code(str(row.get('ID', '')))
+            attendance_date = safe_date_conversion(row.get('Date'))
+
+            message = None
+            if not employee_code:
+                message = 'Missing employee ID'
+            elif not attendance_date:
+                message = 'Invalid date'
+
+            if message:
                 errors += 1
-                error_message = f"Row {index + 2}: {str(e)}"
-                error_details.append(error_message)
-                
+                error_details.append(f"Row {index + 2}: {message}")
                 if not self.skip_errors:
-                    raise Exception(error_message)
-        
+                    raise Exception(f"Row {index + 2}: {message}")
+                continue
+
+            record = {'row': index + 2, 'employee_id': employee_code, 'date': attendance_date}
+            for i in range(1, 7):
+                in_time = safe_time_conversion(row.get(f'In{i}'))
+                out_time = safe_time_conversion(row.get(f'Out{i}'))
+
+                if in_time:
+                    record[f'check_in_{i}'] = in_time
+                if out_time:
+                    record[f'check_out_{i}'] = out_time
+
+            records.append(record)
+
+        # Without --skip-errors the writer rejects a batch with any failed
+        # row before saving it.
+        writer = AttendanceImportWriter(
+            user=user, update_existing=self.overwrite, stop_on_error=not self.skip_errors
+        )
+        try:
+            writer.write(records)
+        except AttendanceImportAborted as e:
+            failure = e.failures[0]
+            raise Exception(f"Row {failure['row']}: {failure['message']}")
+
+        for result in writer.results:
+            if result['status'] in AttendanceImportWriter.FAILED_STATUSES:
+                errors += 1
+                error_details.append(f"Row {result['row']}: {result['message']}")
+            elif result['status'] == 'skipped' and self.verbose:
+                self.stdout.write(f"   ⏭️  {result['message']}")
+
         return {
-            'imported': imported,
+            'imported': writer.created_count + writer.updated_count + writer.duplicate_count,
             'errors': errors,
-            'skipped': skipped,
+            'skipped': writer.skipped_count,
             'error_details': error_details
         }
 
-    def process_single_record(self, row, user, row_number):
-        employee_code = ValidationHelper.sanitize_employee_code(str(row.get('ID', '')))
-        attendance_date = safe_date_conversion(row.get('Date'))
-        
-        if not employee_code:
-            return {'status': 'error', 'message': 'Missing employee ID'}
-        
-        if not attendance_date:
-            return {'status': 'error', 'message': 'Invalid date'}
-        
-        employee = EmployeeDataManager.get_employee_by_code(employee_code)
-        if not employee:
-            return {'status': 'error', 'message': f'Employee {employee_code} not found'}
-        
-        existing_attendance = Attendance.objects.filter(
-            employee=employee,
-            date=attendance_date
-        ).first()
-        
-        if existing_attendance and not self.overwrite:
-            return {'status': 'skipped', 'message': 'Record already exists'}
-        
-        attendance_data = {
-            'employee': employee,
-            'date': attendance_date,
-            'is_manual_entry': True,
-            'created_by': user
-        }
-        
-        for i in range(1, 7):
-            in_time = safe_time_conversion(row.get(f'In{i}'))
-            out_time = safe_time_conversion(row.get(f'Out{i}'))
-            
-            if in_time:
-                attendance_data[f'check_in_{i}'] = in_time
-            if out_time:
-                attendance_data[f'check_out_{i}'] = out_time
-        
-        if existing_attendance:
-            for key, value in attendance_data.items():
-                if key != 'employee' and key != 'date':
-                    setattr(existing_attendance, key, value)
-            existing_attendance.save()
-        else:
-            Attendance.objects.create(**attendance_data)
-        
-        return {'status': 'imported', 'message': 'Success'}
-    
-        def display_import_summary(self, imported_count, error_count, skipped_count, errors_list, user):
+    def display_import_summary(self, imported_count, error_count, skipped_count, errors_list, user):
         total_processed = imported_count + error_count + skipped_count
         
         self.stdout.write(
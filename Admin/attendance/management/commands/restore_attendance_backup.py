@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+from attendance.backups import AttendanceBackup, BackupError
+
+
+class Command(BaseCommand):
+    help = "Replays attendance backup snapshots (latest full plus later incrementals)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--until", type=str, help="Optional: Snapshot id to stop at (inclusive)"
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="Optional: Model label to restore, e.g. attendance.Attendance",
+        )
+        parser.add_argument(
+            "--list", action="store_true", help="List available snapshots and exit"
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete rows missing from the full snapshot that have not changed since it",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Verify checksums and count rows without writing",
+        )
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for snapshot in AttendanceBackup.list_snapshots():
+                rows = sum(entry["rows"] for entry in snapshot["models"].values())
+                self.stdout.write(f"{snapshot['id']}  {snapshot['kind']:<11}  {rows} rows")
+            return
+
+        try:
+            chain = AttendanceBackup.get_restore_chain(options.get("until"))
+            self.stdout.write(
+                f"Replaying {len(chain)} snapshots: {chain[0]['id']} -> {chain[-1]['id']}"
+            )
+            result = AttendanceBackup.restore(
+                target=options.get("until"),
+                labels=options.get("models"),
+                dry_run=options["dry_run"],
+                prune=options["prune"],
+            )
+        except BackupError as e:
+            raise CommandError(str(e))
+
+        for label, count in result["rows"].items():
+            self.stdout.write(f"  {label}: {count} rows")
+        for label, count in result["deleted"].items():
+            self.stdout.write(f"  {label}: {count} rows deleted")
+
+        verb = "Verified" if options["dry_run"] else "Restored"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {sum(result['rows'].values())} rows")
+        )
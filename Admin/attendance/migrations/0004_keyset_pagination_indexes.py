@@ -0,0 +1,25 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0003_attendance_is_excessive_lunch_break_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(
+                fields=["-date", "employee", "id"], name="attendance__date_8932e9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attendancelog",
+            index=models.Index(
+                fields=["-timestamp", "-id"], name="attendance__timesta_32d7b8_idx"
+            ),
+        ),
+    ]
@@ -380,6 +380,7 @@ class AttendanceLog(models.Model):
             models.Index(fields=["processing_status"]),
             models.Index(fields=["log_type"]),
             models.Index(fields=["timestamp"]),
+            models.Index(fields=["-timestamp", "-id"]),
         ]
 
     def __str__(self):
@@ -1021,6 +1022,7 @@ class Attendance(models.Model):
             models.Index(fields=["date"]),
             models.Index(fields=["status"]),
             models.Index(fields=["is_manual_entry"]),
+            models.Index(fields=["-date", "employee", "id"]),
         ]
         unique_together = ["employee", "date"]
 
@@ -1200,11 +1202,11 @@ class Attendance(models.Model):
             is_active=True,
         ).first()
 
-    def calculate_attendance_metrics(self):
-        time_pairs = self.get_time_pairs()
-        metrics = AttendanceCalculator.calculate_attendance_metrics(
-            time_pairs, self.employee, self.date
-        )
+    def calculate_attendance_metrics(self, metrics=None):
+        if metrics is None:
+            metrics = AttendanceCalculator.calculate_attendance_metrics(
+                self.get_time_pairs(), self.employee, self.date
+            )
 
         self.total_time = metrics["total_time"]
         self.break_time = metrics["break_time"]
@@ -1221,7 +1223,9 @@ class Attendance(models.Model):
             self.weekend_work_time = self.work_time
             self.overtime = self.work_time
 
-    def apply_role_based_status(self):
+    def apply_role_based_status(self, config=None, on_leave=None):
+        config = config or SystemConfiguration
+
         if self.is_holiday:
             self.status = "HOLIDAY"
             self.total_time = timedelta(0)
@@ -1231,12 +1235,15 @@ class Attendance(models.Model):
             self.undertime = timedelta(0)
             return
 
-        if LeaveRequest.objects.filter(
-            employee=self.employee,
-            start_date__lte=self.date,
-            end_date__gte=self.date,
-            status="APPROVED",
-        ).exists():
+        if on_leave is None:
+            on_leave = LeaveRequest.objects.filter(
+                employee=self.employee,
+                start_date__lte=self.date,
+                end_date__gte=self.date,
+                status="APPROVED",
+            ).exists()
+
+        if on_leave:
             self.status = "LEAVE"
             self.total_time = timedelta(0)
             self.break_time = timedelta(0)
@@ -1250,14 +1257,14 @@ class Attendance(models.Model):
             return
 
         role_name = self.employee.role.name if self.employee.role else "OTHER_STAFF"
-        expected_time = SystemConfiguration.get_role_reporting_time(role_name)
+        expected_time = config.get_role_reporting_time(role_name)
         expected_time_obj = safe_time_conversion(expected_time)
 
         work_end_time = safe_time_conversion(
-            SystemConfiguration.get_setting("WORK_END_TIME")
+            config.get_setting("WORK_END_TIME")
         )
         min_work_hours = Decimal(
-            SystemConfiguration.get_setting("MINIMUM_WORK_HOURS_FULL_DAY")
+            config.get_setting("MINIMUM_WORK_HOURS_FULL_DAY")
         )
         min_work_duration = timedelta(hours=float(min_work_hours))
 
@@ -1266,7 +1273,7 @@ class Attendance(models.Model):
         self.is_other_staff_special_late = False
 
         if role_name == "OTHER_STAFF":
-            grace_period = SystemConfiguration.get_int_setting(
+            grace_period = config.get_int_setting(
                 "OTHER_STAFF_GRACE_PERIOD_MINUTES"
             )
             grace_end = (
@@ -1289,7 +1296,7 @@ class Attendance(models.Model):
                 )
         elif role_name == "OFFICE_WORKER":
             office_cutoff = safe_time_conversion(
-                SystemConfiguration.get_setting(
+                config.get_setting(
                     "OFFICE_WORKER_REPORTING_TIME"
                 )
             )
@@ -39,8 +39,10 @@ from .permissions import (
     ReportPermission,
     check_attendance_permission,
 )
+from collections import Counter
 from datetime import datetime, date, time, timedelta
 from decimal import Decimal
+import calendar
 import socket
 import json
 
@@ -142,10 +144,18 @@ class AttendanceService:
 
     @staticmethod
     def get_employee_attendance_summary(employee, start_date, end_date):
+        from .archive import AttendanceArchive
+
         attendance_records = Attendance.objects.filter(
             employee=employee, date__range=[start_date, end_date]
         ).order_by("date")
 
+        archived_records = AttendanceArchive.get_attendance(employee, start_date, end_date)
+        if archived_records:
+            attendance_records = sorted(
+                archived_records + list(attendance_records), key=lambda record: record.date
+            )
+
         total_days = (end_date - start_date).days + 1
         working_days = sum(
             1
@@ -153,12 +163,13 @@ class AttendanceService:
             if (start_date + timedelta(days=d)).weekday() < 5
         )
 
-        present_days = attendance_records.filter(status__in=["PRESENT", "LATE"]).count()
-        absent_days = attendance_records.filter(status="ABSENT").count()
-        half_days = attendance_records.filter(status="HALF_DAY").count()
-        late_days = attendance_records.filter(status="LATE").count()
-        leave_days = attendance_records.filter(status="LEAVE").count()
-        holiday_days = attendance_records.filter(status="HOLIDAY").count()
+        status_counts = Counter(record.status for record in attendance_records)
+        present_days = status_counts["PRESENT"] + status_counts["LATE"]
+        absent_days = status_counts["ABSENT"]
+        half_days = status_counts["HALF_DAY"]
+        late_days = status_counts["LATE"]
+        leave_days = status_counts["LEAVE"]
+        holiday_days = status_counts["HOLIDAY"]
 
         total_work_time = sum(
             (record.work_time for record in attendance_records if record.work_time),
@@ -678,10 +689,15 @@ class ReportService:
                 "You don't have permission to view this employee's attendance"
             )
 
+        from .archive import AttendanceArchive
+
         summary = MonthlyAttendanceSummary.objects.filter(
             employee=employee, year=year, month=month
         ).first()
 
+        if not summary:
+            summary = AttendanceArchive.get_monthly_summary(employee, year, month)
+
         if not summary:
             summary = MonthlyAttendanceSummary.generate_for_employee_month(
                 employee, year, month
@@ -691,6 +707,14 @@ class ReportService:
             employee=employee, date__year=year, date__month=month
         ).order_by("date")
 
+        month_start = date(year, month, 1)
+        month_end = date(year, month, calendar.monthrange(year, month)[1])
+        archived_records = AttendanceArchive.get_attendance(employee, month_start, month_end)
+        if archived_records:
+            attendance_records = sorted(
+                archived_records + list(attendance_records), key=lambda record: record.date
+            )
+
         return {
             "employee": employee,
             "year": year,
@@ -974,55 +998,72 @@ class ExcelService:
         if not ReportPermission.can_export_attendance_data(user):
             raise ValidationError("You don't have permission to export attendance data")
 
-        attendance_data = []
+        employee_ids = [employee.pk for employee in employees]
+        employees_by_id = CustomUser.objects.select_related("department").in_bulk(
+            employee_ids
+        )
+        employees = [
+            employees_by_id[employee_id]
+            for employee_id in employee_ids
+            if employee_id in employees_by_id
+        ]
 
-        current_date = start_date
-        while current_date <= end_date:
-            for employee in employees:
-                try:
-                    attendance = Attendance.objects.get(
-                        employee=employee, date=current_date
-                    )
+        employees.sort(key=lambda employee: employee.pk)
+        dates = [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+        ]
+        empty_pairs = [(None, None)] * 6
 
-                    time_pairs = attendance.get_time_pairs()
+        records = (
+            Attendance.objects.filter(
+                employee_id__in=employee_ids, date__range=(start_date, end_date)
+            )
+            .only(
+                "employee",
+                "date",
+                *[f"check_{kind}_{index}" for index in range(1, 7) for kind in ("in", "out")],
+                "total_time",
+                "break_time",
+                "work_time",
+                "overtime",
+            )
+            .order_by("employee_id", "date")
+            .iterator(chunk_size=2000)
+        )
 
-                    data = {
-                        "division": (
-                            employee.department.name if employee.department else "N/A"
-                        ),
-                        "employee_id": employee.employee_code,
-                        "name": employee.get_full_name(),
-                        "date": current_date,
-                        "time_pairs": time_pairs,
-                        "total_time": attendance.total_time,
-                        "break_time": attendance.break_time,
-                        "work_time": attendance.work_time,
-                        "overtime": attendance.overtime,
-                    }
+        def attendance_rows():
+            pending = next(records, None)
+            for employee in employees:
+                while pending is not None and pending.employee_id < employee.pk:
+                    pending = next(records, None)
 
-                    attendance_data.append(data)
+                employee_days = {}
+                while pending is not None and pending.employee_id == employee.pk:
+                    employee_days[pending.date] = pending
+                    pending = next(records, None)
 
-                except Attendance.DoesNotExist:
-                    data = {
-                        "division": (
-                            employee.department.name if employee.department else "N/A"
-                        ),
+                division = employee.department.name if employee.department else "N/A"
+                name = employee.get_full_name()
+
+                for current_date in dates:
+                    attendance = employee_days.get(current_date)
+                    yield {
+                        "division": division,
                         "employee_id": employee.employee_code,
-                        "name": employee.get_full_name(),
+                        "name": name,
                         "date": current_date,
-                        "time_pairs": [(None, None)] * 6,
-                        "total_time": timedelta(0),
-                        "break_time": timedelta(0),
-                        "work_time": timedelta(0),
-                        "overtime": timedelta(0),
+                        "time_pairs": (
+                            attendance.get_time_pairs() if attendance else empty_pairs
+                        ),
+                        "total_time": attendance.total_time if attendance else None,
+                        "break_time": attendance.break_time if attendance else None,
+                        "work_time": attendance.work_time if attendance else None,
+                        "overtime": attendance.overtime if attendance else None,
                     }
 
-                    attendance_data.append(data)
-
-            current_date += timedelta(days=1)
-
         excel_buffer = ExcelProcessor.create_attendance_excel(
-            attendance_data, start_date.month, start_date.year
+            attendance_rows(), start_date.month, start_date.year, group_by_employee=True
         )
 
         return excel_buffer
@@ -1,8 +1,9 @@
 from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
-from django.dispatch import receiver
+from django.dispatch import receiver, Signal
 from django.utils import timezone
 from django.db import transaction
 from accounts.models import CustomUser, Department, AuditLog
+from accounts.signals import employees_imported
 from employees.models import EmployeeProfile, Contract
 from .models import (
     Attendance,
@@ -27,12 +28,17 @@ from .utils import (
 )
 from datetime import timedelta
 from decimal import Decimal
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 from threading import local
 
 _thread_locals = local()
 
+attendance_records_imported = Signal()
+
 
 @receiver(post_save, sender=CustomUser)
 def handle_employee_creation(sender, instance, created, **kwargs):
@@ -61,6 +67,17 @@ def handle_employee_profile_update(sender, instance, created, **kwargs):
     CacheManager.invalidate_employee_cache(instance.user.id)
 
 
+@receiver(employees_imported)
+def handle_employees_import(sender, created, updated, created_by=None, **kwargs):
+    try:
+        create_initial_leave_balances_bulk(created)
+    except Exception as e:
+        pass
+
+    for employee in list(created) + list(updated):
+        CacheManager.invalidate_employee_cache(employee.id)
+
+
 @receiver(post_save, sender=AttendanceLog)
 def process_attendance_log(sender, instance, created, **kwargs):
     if created and instance.processing_status == "PENDING":
@@ -80,6 +97,37 @@ def handle_attendance_update(sender, instance, created, **kwargs):
             log_attendance_modification(instance, instance._attendance_changed_by)
 
 
+@receiver(attendance_records_imported)
+def handle_attendance_import(sender, created, updated, changed_by=None, **kwargs):
+    employees = {}
+    for attendance in list(created) + list(updated):
+        employees[attendance.employee_id] = attendance.employee
+
+    for employee_id in employees:
+        CacheManager.invalidate_employee_cache(employee_id)
+
+    affected_months = {}
+    for attendance in list(created) + list(updated):
+        affected_months[
+            (attendance.employee_id, attendance.date.year, attendance.date.month)
+        ] = attendance.employee
+
+    for attendance in updated:
+        invalidate_related_caches(attendance)
+
+        if changed_by:
+            log_attendance_modification(attendance, changed_by)
+
+    for (employee_id, year, month), employee in affected_months.items():
+        try:
+            MonthlyAttendanceSummary.generate_for_employee_month(employee, year, month)
+        except Exception as e:
+            logger.error(
+                f"Error regenerating monthly summary for employee {employee_id} "
+                f"({year}-{month:02d}) after import: {str(e)}"
+            )
+
+
 @receiver(pre_save, sender=Attendance)
 def capture_attendance_changes(sender, instance, **kwargs):
     if instance.pk:
@@ -218,6 +266,40 @@ def create_initial_leave_balances(employee):
         )
 
 
+def create_initial_leave_balances_bulk(employees):
+    if not employees:
+        return
+
+    current_year = get_current_date().year
+    active_leave_types = list(LeaveType.active.all())
+
+    balances = []
+    for employee in employees:
+        profile = getattr(employee, "employee_profile", None)
+        for leave_type in active_leave_types:
+            if leave_type.applicable_after_probation_only:
+                if profile and profile.employment_status == "PROBATION":
+                    continue
+
+            if leave_type.gender_specific != "A":
+                if employee.gender != leave_type.gender_specific:
+                    continue
+
+            balances.append(
+                LeaveBalance(
+                    employee=employee,
+                    leave_type=leave_type,
+                    year=current_year,
+                    allocated_days=Decimal(str(leave_type.days_allowed_per_year)),
+                    used_days=Decimal("0.00"),
+                    carried_forward_days=Decimal("0.00"),
+                    adjustment_days=Decimal("0.00"),
+                )
+            )
+
+    LeaveBalance.objects.bulk_create(balances, ignore_conflicts=True)
+
+
 def process_single_attendance_log(log_instance):
     if not log_instance.employee:
         employee = EmployeeDataManager.get_employee_by_code(log_instance.employee_code)
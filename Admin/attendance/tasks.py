@@ -854,43 +854,24 @@ def generate_dashboard_statistics():
 @shared_task(bind=True, max_retries=3)
 def backup_attendance_data(self, backup_type="daily"):
     try:
-        from django.core.management import call_command
-        import os
-        from django.conf import settings
-
-        backup_date = get_current_date().strftime("%Y%m%d")
-        backup_filename = f"attendance_backup_{backup_type}_{backup_date}.json"
-        backup_path = os.path.join(settings.MEDIA_ROOT, "backups", backup_filename)
-
-        os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-
-        if backup_type == "daily":
-            yesterday = get_current_date() - timedelta(days=1)
-            attendance_data = Attendance.objects.filter(date=yesterday)
-        elif backup_type == "weekly":
-            week_ago = get_current_date() - timedelta(days=7)
-            attendance_data = Attendance.objects.filter(date__gte=week_ago)
-        else:
-            month_ago = get_current_date() - timedelta(days=30)
-            attendance_data = Attendance.objects.filter(date__gte=month_ago)
-
-        backup_count = attendance_data.count()
-
-        with open(backup_path, "w") as backup_file:
-            from django.core import serializers
+        from .backups import AttendanceBackup
 
-            serializers.serialize("json", attendance_data, stream=backup_file)
+        kind = "full" if backup_type == "full" else "incremental"
+        snapshot = AttendanceBackup.create_snapshot(kind)
+        backup_count = sum(entry["rows"] for entry in snapshot["models"].values())
 
         logger.info(
-            f"Backup completed: {backup_count} records backed up to {backup_filename}"
+            f"Backup completed: {backup_count} changed records in {snapshot['kind']} snapshot {snapshot['id']}"
         )
 
         return {
             "success": True,
             "backup_type": backup_type,
-            "backup_filename": backup_filename,
+            "snapshot_id": snapshot["id"],
+            "snapshot_kind": snapshot["kind"],
             "records_backed_up": backup_count,
-            "backup_path": backup_path,
+            "backup_size": snapshot["size"],
+            "backup_path": snapshot["path"],
         }
 
     except Exception as exc:
@@ -1256,54 +1237,31 @@ def generate_employee_performance_report(
 @shared_task(bind=True, max_retries=2)
 def archive_old_attendance_records(self, cutoff_years=3):
     try:
+        from .archive import AttendanceArchive
+
         cutoff_date = get_current_date().replace(
             year=get_current_date().year - cutoff_years
         )
 
-        old_attendance = Attendance.objects.filter(date__lt=cutoff_date)
-        old_logs = AttendanceLog.objects.filter(timestamp__date__lt=cutoff_date)
-        old_summaries = MonthlyAttendanceSummary.objects.filter(
-            year__lt=cutoff_date.year
-        )
-
-        attendance_count = old_attendance.count()
-        logs_count = old_logs.count()
-        summaries_count = old_summaries.count()
-
-        archive_data = {
-            "cutoff_date": str(cutoff_date),
-            "attendance_records": attendance_count,
-            "log_records": logs_count,
-            "summary_records": summaries_count,
-            "archived_at": str(get_current_datetime()),
+        results = AttendanceArchive.archive_before(cutoff_date)
+        archived_records = {
+            "attendance": results["attendance"]["rows"],
+            "logs": results["logs"]["rows"],
+            "summaries": results["summaries"]["rows"],
         }
 
-        archive_filename = f"attendance_archive_{cutoff_date.year}_{get_current_datetime().strftime('%Y%m%d')}.json"
-        archive_path = f"/tmp/{archive_filename}"
-
-        with open(archive_path, "w") as archive_file:
-            json.dump(archive_data, archive_file, indent=2, default=str)
-
-        if attendance_count > 0:
-            old_attendance.delete()
-        if logs_count > 0:
-            old_logs.delete()
-        if summaries_count > 0:
-            old_summaries.delete()
-
         logger.info(
-            f"Archived {attendance_count + logs_count + summaries_count} old records"
+            f"Archived {sum(archived_records.values())} old records to {AttendanceArchive.ROOT}"
         )
 
         return {
             "success": True,
             "cutoff_date": str(cutoff_date),
-            "archived_records": {
-                "attendance": attendance_count,
-                "logs": logs_count,
-                "summaries": summaries_count,
+            "archived_records": archived_records,
+            "partitions": {
+                table: result["partitions"] for table, result in results.items()
             },
-            "archive_filename": archive_filename,
+            "archive_root": str(AttendanceArchive.ROOT),
         }
 
     except Exception as exc:
@@ -1,6 +1,6 @@
 from django.utils import timezone
 from django.db.models import Q, Sum, Count
-from django.core.exceptions import ValidationError
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from accounts.models import CustomUser, SystemConfiguration
 from employees.models import EmployeeProfile, Contract
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
@@ -11,12 +11,14 @@ import json
 import logging
 import hashlib
 import uuid
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Iterable
 import pandas as pd
 import openpyxl
-from openpyxl.styles import Font, Alignment, Border, Side
+from openpyxl.styles import Font, Alignment, Border, Side, NamedStyle
+from openpyxl.cell import WriteOnlyCell
 import io
 import base64
+from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
@@ -345,28 +347,15 @@ class AttendanceCalculator:
         schedule = EmployeeDataManager.get_employee_work_schedule(employee)
         standard_work_time = schedule['standard_work_time']
         
-        time_calculations = TimeCalculator.calculate_multiple_periods(time_pairs)
-        
-        total_time = time_calculations['total_time']
-        break_time = time_calculations['break_time']
-        work_time = time_calculations['work_time']
-        
-        overtime = timedelta(0)
-        if work_time > standard_work_time:
-            overtime = work_time - standard_work_time
-        
-        undertime = timedelta(0)
-        if work_time < standard_work_time:
-            undertime = standard_work_time - work_time
-        
-        first_in = None
-        last_out = None
+        time_metrics = AttendanceCalculator.calculate_time_metrics(time_pairs, standard_work_time)
         
-        for in_time, out_time in time_pairs:
-            if in_time and first_in is None:
-                first_in = in_time
-            if out_time:
-                last_out = out_time
+        total_time = time_metrics['total_time']
+        break_time = time_metrics['break_time']
+        work_time = time_metrics['work_time']
+        overtime = time_metrics['overtime']
+        undertime = time_metrics['undertime']
+        first_in = time_metrics['first_in_time']
+        last_out = time_metrics['last_out_time']
         
         late_minutes = AttendanceCalculator.calculate_late_minutes(
             first_in, schedule['reporting_time']
@@ -398,6 +387,39 @@ class AttendanceCalculator:
             'is_excessive_lunch_break': is_excessive_lunch_break
         }
     
+    @staticmethod
+    def calculate_time_metrics(time_pairs: List[Tuple[Optional[time], Optional[time]]],
+                               standard_work_time: timedelta) -> Dict[str, Any]:
+        time_calculations = TimeCalculator.calculate_multiple_periods(time_pairs)
+        work_time = time_calculations['work_time']
+        
+        overtime = timedelta(0)
+        if work_time > standard_work_time:
+            overtime = work_time - standard_work_time
+        
+        undertime = timedelta(0)
+        if work_time < standard_work_time:
+            undertime = standard_work_time - work_time
+        
+        first_in = None
+        last_out = None
+        
+        for in_time, out_time in time_pairs:
+            if in_time and first_in is None:
+                first_in = in_time
+            if out_time:
+                last_out = out_time
+        
+        return {
+            'total_time': time_calculations['total_time'],
+            'break_time': time_calculations['break_time'],
+            'work_time': work_time,
+            'overtime': overtime,
+            'undertime': undertime,
+            'first_in_time': first_in,
+            'last_out_time': last_out,
+        }
+    
     @staticmethod
     def determine_attendance_status(time_pairs: List[Tuple[Optional[time], Optional[time]]], 
                                   first_in: Optional[time], last_out: Optional[time],
@@ -482,6 +504,135 @@ class AttendanceCalculator:
         percentage = (work_time.total_seconds() / standard_work_time.total_seconds()) * 100
         return Decimal(str(min(percentage, 100.0))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
+class SettingsSnapshot:
+    def __init__(self):
+        self.values = dict(
+            SystemConfiguration.objects.filter(is_active=True).values_list('key', 'value')
+        )
+
+    def get_setting(self, key, default=None):
+        value = self.values.get(key.upper())
+        if value is None:
+            if default is None:
+                raise ValueError(f"Setting {key} not found in system configuration")
+            return default
+        return value
+
+    def get_int_setting(self, key, default=None):
+        try:
+            return int(self.get_setting(key, default))
+        except (ValueError, TypeError):
+            raise ValueError(f"Setting {key} is not a valid integer")
+
+    def get_float_setting(self, key, default=None):
+        try:
+            return float(self.get_setting(key, default))
+        except (ValueError, TypeError):
+            raise ValueError(f"Setting {key} is not a valid float")
+
+    def get_bool_setting(self, key, default=None):
+        value = str(self.get_setting(key, default))
+        return value.lower() in ["true", "1", "yes", "on", "enabled"]
+
+    def get_role_reporting_time(self, role_name):
+        return self.get_setting(f"{role_name.upper()}_REPORTING_TIME")
+
+
+class AttendanceBatchCalculator:
+    def __init__(self, employee_ids: List[int], start_date: date, end_date: date):
+        from .models import EmployeeShift, Holiday, LeaveRequest
+
+        self.config = SettingsSnapshot()
+
+        standard_hours = self.config.get_float_setting('WORKING_HOURS_PER_DAY', 9.25)
+        self.standard_work_time = timedelta(
+            hours=int(standard_hours), minutes=int((standard_hours % 1) * 60)
+        )
+
+        self.shifts = defaultdict(list)
+        employee_shifts = EmployeeShift.objects.filter(
+            employee_id__in=employee_ids,
+            effective_from__lte=end_date,
+            is_active=True,
+        ).filter(
+            Q(effective_to__isnull=True) | Q(effective_to__gte=start_date)
+        ).select_related('shift').order_by('-effective_from')
+        for employee_shift in employee_shifts:
+            self.shifts[employee_shift.employee_id].append(employee_shift)
+
+        self.holidays = defaultdict(list)
+        holidays = Holiday.active.filter(
+            date__range=(start_date, end_date)
+        ).prefetch_related('applicable_departments')
+        for holiday in holidays:
+            self.holidays[holiday.date].append((
+                {department.id for department in holiday.applicable_departments.all()},
+                holiday.applicable_locations or [],
+            ))
+
+        self.leaves = defaultdict(list)
+        leave_periods = LeaveRequest.objects.filter(
+            employee_id__in=employee_ids,
+            status='APPROVED',
+            start_date__lte=end_date,
+            end_date__gte=start_date,
+        ).values_list('employee_id', 'start_date', 'end_date')
+        for employee_id, leave_start, leave_end in leave_periods:
+            self.leaves[employee_id].append((leave_start, leave_end))
+
+    def get_shift(self, employee_id: int, attendance_date: date):
+        candidates = [
+            employee_shift for employee_shift in self.shifts.get(employee_id, [])
+            if employee_shift.effective_from <= attendance_date
+        ]
+
+        for employee_shift in candidates:
+            if employee_shift.effective_to and employee_shift.effective_to >= attendance_date:
+                return employee_shift.shift
+
+        for employee_shift in candidates:
+            if employee_shift.effective_to is None:
+                return employee_shift.shift
+
+        return None
+
+    def is_holiday(self, attendance_date: date, department=None, location=None) -> bool:
+        for department_ids, locations in self.holidays.get(attendance_date, []):
+            if department and department_ids and department.id not in department_ids:
+                continue
+            if location and locations and location not in locations:
+                continue
+            return True
+        return False
+
+    def is_on_leave(self, employee_id: int, attendance_date: date) -> bool:
+        return any(
+            leave_start <= attendance_date <= leave_end
+            for leave_start, leave_end in self.leaves.get(employee_id, [])
+        )
+
+    def recalculate(self, attendance):
+        if not attendance.shift_id:
+            attendance.shift = self.get_shift(attendance.employee_id, attendance.date)
+
+        attendance.is_weekend = attendance.date.weekday() >= 5
+        attendance.is_holiday = self.is_holiday(
+            attendance.date, attendance.employee.department, attendance.location
+        )
+
+        attendance.calculate_attendance_metrics(
+            AttendanceCalculator.calculate_time_metrics(
+                attendance.get_time_pairs(), self.standard_work_time
+            )
+        )
+        attendance.apply_role_based_status(
+            config=self.config,
+            on_leave=self.is_on_leave(attendance.employee_id, attendance.date),
+        )
+        attendance.clean()
+        return attendance
+
+
 class MonthlyCalculator:
     @staticmethod
     def calculate_monthly_summary(employee: CustomUser, year: int, month: int) -> Dict[str, Any]:
@@ -606,57 +757,122 @@ class MonthlyCalculator:
         return max(score, Decimal('0.00'))
 
 class ExcelProcessor:
-    @staticmethod
-    def create_attendance_excel(employee_data: List[Dict[str, Any]], month: int, year: int) -> io.BytesIO:
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = f"Attendance_{year}_{month:02d}"
-
-        headers = [
-            'Division', 'ID', 'Name', 'In1', 'Out1', 'In2', 'Out2', 'In3', 'Out3',
-            'In4', 'Out4', 'In5', 'Out5', 'In6', 'Out6', 'Total', 'Break', 'Work', 'Over'
-        ]
+    HEADERS = [
+        'Division', 'ID', 'Name', 'Date', 'In1', 'Out1', 'In2', 'Out2', 'In3', 'Out3',
+        'In4', 'Out4', 'In5', 'Out5', 'In6', 'Out6', 'Total', 'Break', 'Work', 'Over'
+    ]
+    DURATION_KEYS = ('total_time', 'break_time', 'work_time', 'overtime')
+    FIRST_DURATION_COLUMN = 17
 
-        header_font = Font(bold=True, size=12)
-        header_alignment = Alignment(horizontal='center', vertical='center')
+    @staticmethod
+    def register_attendance_styles(wb: openpyxl.Workbook) -> None:
         border = Border(
             left=Side(style='thin'),
             right=Side(style='thin'),
             top=Side(style='thin'),
             bottom=Side(style='thin')
         )
+        alignment = Alignment(horizontal='center', vertical='center')
+        formats = {
+            'attendance_header': ('General', Font(bold=True, size=12)),
+            'attendance_text': ('General', Font()),
+            'attendance_date': ('yyyy-mm-dd', Font()),
+            'attendance_time': ('hh:mm:ss', Font()),
+            'attendance_duration': ('[h]:mm:ss', Font()),
+            'attendance_total': ('[h]:mm:ss', Font(bold=True)),
+            'attendance_total_label': ('General', Font(bold=True)),
+        }
+        for name, (number_format, font) in formats.items():
+            wb.add_named_style(
+                NamedStyle(
+                    name=name,
+                    font=font,
+                    border=border,
+                    alignment=alignment,
+                    number_format=number_format,
+                )
+            )
 
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.alignment = header_alignment
-            cell.border = border
-
-        for row, data in enumerate(employee_data, 2):
-            ws.cell(row=row, column=1, value=data.get('division', ''))
-            ws.cell(row=row, column=2, value=data.get('employee_id', ''))
-            ws.cell(row=row, column=3, value=data.get('name', ''))
-
-            time_pairs = data.get('time_pairs', [])
-            for i, (in_time, out_time) in enumerate(time_pairs):
-                in_col = 4 + (i * 2)
-                out_col = 5 + (i * 2)
-
-                ws.cell(row=row, column=in_col, value=in_time.strftime('%H:%M:%S') if in_time else '')
-                ws.cell(row=row, column=out_col, value=out_time.strftime('%H:%M:%S') if out_time else '')
+    @staticmethod
+    def create_attendance_excel(
+        employee_data: Iterable[Dict[str, Any]], month: int, year: int, group_by_employee: bool = False
+    ) -> io.BytesIO:
+        """
+        With ``group_by_employee`` the rows must arrive ordered by employee;
+        each employee's run of rows is closed by a SUBTOTAL row.
+        """
+        wb = openpyxl.Workbook(write_only=True)
+        ExcelProcessor.register_attendance_styles(wb)
+        ws = wb.create_sheet(title=f"Attendance_{year}_{month:02d}")
+        ws.freeze_panes = 'A2'
+
+        for col in range(1, len(ExcelProcessor.HEADERS) + 1):
+            ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 12
 
-            ws.cell(row=row, column=16, value=TimeCalculator.format_duration_to_excel_time(data.get('total_time', timedelta(0))))
-            ws.cell(row=row, column=17, value=TimeCalculator.format_duration_to_excel_time(data.get('break_time', timedelta(0))))
-            ws.cell(row=row, column=18, value=TimeCalculator.format_duration_to_excel_time(data.get('work_time', timedelta(0))))
-            ws.cell(row=row, column=19, value=TimeCalculator.format_duration_to_excel_time(data.get('overtime', timedelta(0))))
+        def cell(value, style):
+            styled = WriteOnlyCell(ws, value=value)
+            styled.style = style
+            return styled
 
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.border = border
-                cell.alignment = Alignment(horizontal='center', vertical='center')
+        duration_columns = [
+            openpyxl.utils.get_column_letter(ExcelProcessor.FIRST_DURATION_COLUMN + offset)
+            for offset in range(len(ExcelProcessor.DURATION_KEYS))
+        ]
 
-        for col in range(1, len(headers) + 1):
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 12
+        def total_row(label, first_row, last_row):
+            row = [cell(None, 'attendance_text') for _ in range(2)]
+            row.append(cell(label, 'attendance_total_label'))
+            row += [cell(None, 'attendance_text') for _ in range(13)]
+            row += [
+                cell(f'=SUBTOTAL(9,{column}{first_row}:{column}{last_row})', 'attendance_total')
+                for column in duration_columns
+            ]
+            return row
+
+        ws.append([cell(header, 'attendance_header') for header in ExcelProcessor.HEADERS])
+
+        row_number = 1
+        section_key = None
+        section_start = None
+        section_name = ''
+
+        for data in employee_data:
+            employee_key = data.get('employee_id', '')
+            if group_by_employee and section_key is not None and employee_key != section_key:
+                row_number += 1
+                ws.append(total_row(f'{section_name} Total', section_start, row_number - 1))
+                section_start = None
+
+            if section_start is None:
+                section_key = employee_key
+                section_name = data.get('name', '')
+                section_start = row_number + 1
+
+            values = [
+                cell(data.get('division', ''), 'attendance_text'),
+                cell(employee_key, 'attendance_text'),
+                cell(data.get('name', ''), 'attendance_text'),
+                cell(data.get('date'), 'attendance_date'),
+            ]
+
+            time_pairs = list(data.get('time_pairs', []))[:6]
+            time_pairs += [(None, None)] * (6 - len(time_pairs))
+            for in_time, out_time in time_pairs:
+                values.append(cell(in_time, 'attendance_time'))
+                values.append(cell(out_time, 'attendance_time'))
+
+            for key in ExcelProcessor.DURATION_KEYS:
+                values.append(cell(data.get(key) or timedelta(0), 'attendance_duration'))
+
+            ws.append(values)
+            row_number += 1
+
+        if group_by_employee and section_key is not None:
+            row_number += 1
+            ws.append(total_row(f'{section_name} Total', section_start, row_number - 1))
+
+        if row_number > 1:
+            ws.append(total_row('Grand Total', 2, row_number))
 
         buffer = io.BytesIO()
         wb.save(buffer)
@@ -879,7 +1095,7 @@ class AuditHelper:
     @staticmethod
     def log_attendance_change(user: CustomUser, action: str, employee: CustomUser, 
                             attendance_date: date, changes: Dict[str, Any], request=None):
-        from accounts.models import AuditLog
+        from accounts.outbox import Outbox
 
         ip_address = '127.0.0.1'
         user_agent = 'System'
@@ -897,7 +1113,7 @@ class AuditHelper:
             'module': 'attendance'
         }
 
-        AuditLog.log_action(
+        Outbox.record_audit(
             user=user,
             action=f'ATTENDANCE_{action.upper()}',
             description=description,
@@ -908,7 +1124,7 @@ class AuditHelper:
 
     @staticmethod
     def log_device_sync(user: CustomUser, device_id: str, sync_result: Dict[str, Any], request=None):
-        from accounts.models import AuditLog
+        from accounts.outbox import Outbox
 
         ip_address = '127.0.0.1'
         user_agent = 'System'
@@ -925,7 +1141,7 @@ class AuditHelper:
             'module': 'attendance'
         }
 
-        AuditLog.log_action(
+        Outbox.record_audit(
             user=user,
             action='DEVICE_SYNC',
             description=description,
@@ -1013,6 +1229,186 @@ class ReportGenerator:
         return f"{sign}{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
+class KeysetPage:
+    def __init__(self, object_list: List[Any], has_next: bool, has_previous: bool,
+                 next_cursor: Optional[str], previous_cursor: Optional[str],
+                 estimated_total: Optional[int] = None):
+        self.object_list = object_list
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.estimated_total = estimated_total
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.has_next_page
+
+    def has_previous(self) -> bool:
+        return self.has_previous_page
+
+    def has_other_pages(self) -> bool:
+        return self.has_next_page or self.has_previous_page
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'has_next': self.has_next_page,
+            'has_previous': self.has_previous_page,
+            'next_cursor': self.next_cursor,
+            'previous_cursor': self.previous_cursor,
+            'estimated_total': self.estimated_total,
+        }
+
+
+class KeysetPaginator:
+    NEXT = 'n'
+    PREVIOUS = 'p'
+    ESTIMATE_CACHE_TIMEOUT = 300
+
+    def __init__(self, queryset, ordering: List[str], per_page: int = 25,
+                 estimate_total: bool = True):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+        self.estimate_total = estimate_total
+
+    @staticmethod
+    def encode_cursor(values: List[Any], direction: str) -> str:
+        values = [
+            value.isoformat() if isinstance(value, (date, datetime, time))
+            else str(value) if isinstance(value, (uuid.UUID, Decimal))
+            else value
+            for value in values
+        ]
+        payload = json.dumps({'v': values, 'd': direction}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[Optional[List[Any]], str]:
+        if not cursor:
+            return None, KeysetPaginator.NEXT
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            return payload['v'], payload.get('d', KeysetPaginator.NEXT)
+        except (ValueError, KeyError, TypeError):
+            return None, KeysetPaginator.NEXT
+
+    def _fields(self) -> List[Tuple[str, bool]]:
+        return [(field.lstrip('-'), field.startswith('-')) for field in self.ordering]
+
+    def _clean_values(self, values: Any) -> Optional[List[Any]]:
+        # Cursors come from the client; anything that does not convert to
+        # the ordering fields' types restarts from the first page.
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            return None
+
+        cleaned = []
+        try:
+            for (path, _), value in zip(self._fields(), values):
+                if value is None:
+                    return None
+                model = self.queryset.model
+                parts = path.split('__')
+                for part in parts[:-1]:
+                    model = model._meta.get_field(part).related_model
+                cleaned.append(model._meta.get_field(parts[-1]).to_python(value))
+        except (ValidationError, FieldDoesNotExist, AttributeError, TypeError, ValueError):
+            return None
+        return cleaned
+
+    def _seek_filter(self, values: List[Any], forward: bool) -> Q:
+        seek = Q()
+        equal = Q()
+        for (field, descending), value in zip(self._fields(), values):
+            lookup = 'lt' if descending == forward else 'gt'
+            seek |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return seek
+
+    def _row_values(self, obj) -> List[Any]:
+        values = []
+        for field, _ in self._fields():
+            value = obj
+            for attr in field.split('__'):
+                value = getattr(value, attr, None) if value is not None else None
+            values.append(value)
+        return values
+
+    def estimated_count(self) -> Optional[int]:
+        from django.core.cache import cache
+        from django.db import connections
+
+        queryset = self.queryset.order_by()
+        connection = connections[queryset.db]
+
+        try:
+            if connection.vendor == 'postgresql':
+                sql, params = queryset.query.sql_with_params()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                    plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]['Plan']['Plan Rows'])
+
+            cache_key = CacheManager.get_cache_key('keyset_count', str(queryset.query))
+            count = cache.get(cache_key)
+            if count is None:
+                count = queryset.count()
+                cache.set(cache_key, count, self.ESTIMATE_CACHE_TIMEOUT)
+            return count
+        except Exception as e:
+            logger.warning(f"Could not estimate queryset count: {e}")
+            return None
+
+    def get_page(self, cursor: Optional[str] = None) -> KeysetPage:
+        values, direction = self.decode_cursor(cursor)
+        forward = direction != self.PREVIOUS
+
+        queryset = self.queryset
+        values = self._clean_values(values)
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, forward))
+        else:
+            forward = True
+
+        if forward:
+            ordering = self.ordering
+        else:
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+
+        rows = list(queryset.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if not forward:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        next_cursor = self.encode_cursor(self._row_values(rows[-1]), self.NEXT) if rows and has_next else None
+        previous_cursor = self.encode_cursor(self._row_values(rows[0]), self.PREVIOUS) if rows and has_previous else None
+
+        return KeysetPage(
+            rows,
+            has_next=has_next,
+            has_previous=has_previous,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor,
+            estimated_total=self.estimated_count() if self.estimate_total else None,
+        )
+
+
 def get_system_timezone():
     return timezone.get_current_timezone()
 
@@ -60,6 +60,7 @@ from .utils import (
     ValidationHelper,
     AuditHelper,
     CacheManager,
+    KeysetPaginator,
     get_current_date,
     get_current_datetime,
 )
@@ -133,11 +134,34 @@ class AttendanceView(LoginRequiredMixin, View):
                 | Q(employee__employee_code__icontains=search_query)
             )
 
-        paginator = Paginator(
-            attendance_records.order_by("-date", "employee__employee_code"), 25
+        paginator = KeysetPaginator(
+            attendance_records.select_related("employee"),
+            ["-date", "employee_id", "id"],
+            per_page=25,
         )
-        page_number = request.GET.get("page", 1)
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginator.get_page(request.GET.get("cursor"))
+
+        if request.GET.get("format") == "json":
+            return JsonResponse(
+                {
+                    "results": [
+                        {
+                            "id": str(attendance.id),
+                            "employee_id": attendance.employee_id,
+                            "employee_code": attendance.employee.employee_code,
+                            "employee_name": attendance.employee.get_full_name(),
+                            "date": attendance.date.isoformat(),
+                            "status": attendance.status,
+                            "first_in_time": attendance.first_in_time.isoformat() if attendance.first_in_time else None,
+                            "last_out_time": attendance.last_out_time.isoformat() if attendance.last_out_time else None,
+                            "work_time": str(attendance.work_time),
+                            "late_minutes": attendance.late_minutes,
+                        }
+                        for attendance in page_obj
+                    ],
+                    **page_obj.to_dict(),
+                }
+            )
 
         departments = Department.objects.filter(is_active=True).order_by("name")
         status_choices = Attendance._meta.get_field("status").choices
@@ -476,11 +500,30 @@ class Logs(LoginRequiredMixin, View):
                 Q(employee__last_name__icontains=search_query)
             )
         
-        logs = logs.order_by('-timestamp')
-        
-        paginator = Paginator(logs, 50)
-        page_number = request.GET.get('page', 1)
-        page_obj = paginator.get_page(page_number)
+        paginator = KeysetPaginator(
+            logs.select_related('employee', 'device'),
+            ['-timestamp', '-id'],
+            per_page=50,
+        )
+        page_obj = paginator.get_page(request.GET.get('cursor'))
+
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'results': [
+                    {
+                        'id': str(log.id),
+                        'employee_code': log.employee_code,
+                        'employee_name': log.employee.get_full_name() if log.employee else None,
+                        'device': log.device.device_name if log.device else None,
+                        'timestamp': log.timestamp.isoformat(),
+                        'log_type': log.log_type,
+                        'processing_status': log.processing_status,
+                        'error_message': log.error_message,
+                    }
+                    for log in page_obj
+                ],
+                **page_obj.to_dict(),
+            })
         
         devices = AttendanceDevice.objects.filter(is_active=True).order_by('device_name')
         status_choices = AttendanceLog._meta.get_field('processing_status').choices
@@ -2262,6 +2305,21 @@ class AttendanceImportView(LoginRequiredMixin, TemplateView):
             if form.is_valid():
                 excel_file = form.cleaned_data["excel_file"]
                 update_existing = form.cleaned_data["update_existing"]
+
+                if request.POST.get("action") == "preview":
+                    try:
+                        preview = ExcelAttendanceImporter.preview_attendance_import(
+                            excel_file,
+                            update_existing=update_existing,
+                            user=request.user,
+                        )
+                        preview["errors"] = preview["errors"][:50]
+                        preview["warnings"] = preview["warnings"][:50]
+                        preview["invalid_cells"] = preview["invalid_cells"][:50]
+                        return JsonResponse({'success': True, 'preview': preview})
+                    except Exception as e:
+                        return JsonResponse({'success': False, 'error': str(e)})
+
                 try:
                     import_job = ImportJob.objects.create(
                         file_name=excel_file.name, created_by=request.user, status="PENDING",
@@ -1,9 +1,8 @@
 from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
-from accounts.models import CustomUser, AuditLog, SystemConfiguration
+from accounts.models import CustomUser, SystemConfiguration
+from accounts.outbox import Outbox
 from .models import EmployeeProfile, Education, Contract
 from datetime import timedelta
 
@@ -23,7 +22,7 @@ def create_employee_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=EmployeeProfile)
 def log_employee_profile_changes(sender, instance, created, **kwargs):
     if created:
-        AuditLog.log_action(
+        Outbox.record_audit(
             user=instance.created_by or instance.user,
             action="USER_CREATED",
             description=f"Employee profile created for {instance.user.get_full_name()}",
@@ -35,7 +34,7 @@ def log_employee_profile_changes(sender, instance, created, **kwargs):
             },
         )
     else:
-        AuditLog.log_action(
+        Outbox.record_audit(
             user=instance.user,
             action="PROFILE_UPDATE",
             description=f"Employee profile updated for {instance.user.get_full_name()}",
@@ -71,7 +70,7 @@ def handle_employment_status_change(sender, instance, **kwargs):
 @receiver(post_save, sender=Education)
 def log_education_changes(sender, instance, created, **kwargs):
     action = "EDUCATION_ADDED" if created else "EDUCATION_UPDATED"
-    AuditLog.log_action(
+    Outbox.record_audit(
         user=instance.created_by or instance.employee,
         action=action,
         description=f"Education record {action.lower()} for {instance.employee.get_full_name()}",
@@ -87,7 +86,7 @@ def log_education_changes(sender, instance, created, **kwargs):
 @receiver(post_save, sender=Contract)
 def handle_contract_changes(sender, instance, created, **kwargs):
     if created:
-        AuditLog.log_action(
+        Outbox.record_audit(
             user=instance.created_by or instance.employee,
             action="CONTRACT_CREATED",
             description=f"Contract {instance.contract_number} created for {instance.employee.get_full_name()}",
@@ -105,7 +104,7 @@ def handle_contract_changes(sender, instance, created, **kwargs):
     else:
         old_instance = Contract.objects.get(pk=instance.pk)
         if old_instance.status != instance.status:
-            AuditLog.log_action(
+            Outbox.record_audit(
                 user=instance.employee,
                 action="CONTRACT_STATUS_CHANGED",
                 description=f"Contract {instance.contract_number} status changed from {old_instance.status} to {instance.status}",
@@ -143,7 +142,7 @@ def update_employee_profile_on_contract_activation(sender, instance, **kwargs):
 
 @receiver(post_delete, sender=EmployeeProfile)
 def log_employee_profile_deletion(sender, instance, **kwargs):
-    AuditLog.log_action(
+    Outbox.record_audit(
         user=None,
         action="USER_DELETED",
         description=f"Employee profile deleted for {instance.user.get_full_name()}",
@@ -181,12 +180,10 @@ def send_employment_status_notification(employee_profile, old_status):
             HR Department
             """
 
-        send_mail(
+        Outbox.record_email(
+            recipients=[employee_profile.user.email],
             subject=subject,
             message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[employee_profile.user.email],
-            fail_silently=True,
         )
     except Exception:
         pass
@@ -226,12 +223,10 @@ def send_contract_notification(contract, notification_type):
             HR Department
             """
 
-        send_mail(
+        Outbox.record_email(
+            recipients=[contract.employee.email],
             subject=subject,
             message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[contract.employee.email],
-            fail_silently=True,
         )
     except Exception:
         pass
@@ -263,12 +258,10 @@ def send_probation_ending_reminders():
             HR Department
             """
 
-            send_mail(
+            Outbox.record_email(
+                recipients=[employee_profile.user.email],
                 subject=subject,
                 message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[employee_profile.user.email],
-                fail_silently=True,
             )
 
             if employee_profile.user.manager:
@@ -284,12 +277,10 @@ def send_probation_ending_reminders():
                 HR Department
                 """
 
-                send_mail(
+                Outbox.record_email(
+                    recipients=[employee_profile.user.manager.email],
                     subject=manager_subject,
                     message=manager_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[employee_profile.user.manager.email],
-                    fail_silently=True,
                 )
         except Exception:
             continue
@@ -319,12 +310,10 @@ def send_contract_expiry_reminders():
             HR Department
             """
 
-            send_mail(
+            Outbox.record_email(
+                recipients=[contract.employee.email],
                 subject=subject,
                 message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[contract.employee.email],
-                fail_silently=True,
             )
 
             hr_subject = f"Contract Expiring - {contract.contract_number}"
@@ -339,12 +328,10 @@ def send_contract_expiry_reminders():
             ).values_list("email", flat=True)
 
             if hr_emails:
-                send_mail(
+                Outbox.record_email(
+                    recipients=list(hr_emails),
                     subject=hr_subject,
                     message=hr_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=list(hr_emails),
-                    fail_silently=True,
                 )
         except Exception:
             continue
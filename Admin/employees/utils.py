@@ -1,8 +1,11 @@
 from django.db.models import Q, Count, Avg, Sum
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from django.http import HttpResponse
 from accounts.models import CustomUser, Department, SystemConfiguration
+from accounts.search import EmployeeSearchIndex
 from .models import EmployeeProfile, Education, Contract
 from decimal import Decimal
 import csv
@@ -33,20 +36,24 @@ class EmployeeUtils:
         else:
             prefix = "EMP"
 
-        existing_ids = EmployeeProfile.objects.filter(
-            employee_id__startswith=prefix
-        ).values_list("employee_id", flat=True)
+        return EmployeeUtils.generate_employee_ids(1, prefix)[0]
+
+    @staticmethod
+    def generate_employee_ids(count, prefix="EMP"):
+        existing_codes = CustomUser.objects.filter(
+            employee_code__startswith=prefix
+        ).values_list("employee_code", flat=True)
 
         numbers = []
-        for emp_id in existing_ids:
+        for code in existing_codes:
             try:
-                number = int(emp_id.replace(prefix, ""))
+                number = int(code.replace(prefix, ""))
                 numbers.append(number)
             except ValueError:
                 continue
 
         next_number = max(numbers) + 1 if numbers else 1
-        return f"{prefix}{next_number:04d}"
+        return [f"{prefix}{number:04d}" for number in range(next_number, next_number + count)]
 
     @staticmethod
     def calculate_years_of_service(hire_date):
@@ -126,12 +133,8 @@ class EmployeeUtils:
         queryset = EmployeeProfile.objects.filter(is_active=True)
 
         if query:
-            queryset = queryset.filter(
-                Q(employee_id__icontains=query)
-                | Q(user__first_name__icontains=query)
-                | Q(user__last_name__icontains=query)
-                | Q(user__email__icontains=query)
-                | Q(user__employee_code__icontains=query)
+            queryset = EmployeeSearchIndex.filter_queryset(
+                queryset, query, user_field="user_id", ranked=False
             )
 
         if department:
@@ -444,56 +447,105 @@ class ImportUtils:
                 )
                 return results
 
-            for row_num, row in enumerate(csv_data, 2):
+            from accounts.excel.utils import EmployeeImportIndex
+            from accounts.signals import UserSignalHandler, employees_imported
+
+            rows = list(csv_data)
+            index = EmployeeImportIndex(rows)
+
+            to_create, to_update = [], {}
+            for row_num, row in enumerate(rows, 2):
                 try:
-                    department = Department.objects.get(
-                        code=row["department_code"], is_active=True
+                    department = index.get_department(
+                        str(row["department_code"]).strip().upper()
                     )
+                    if department is None:
+                        raise ValueError(
+                            f"Department {row['department_code']} not found"
+                        )
+
+                    email = str(row["email"]).strip().lower()
+                    existing_user = index.get_existing_user(email)
+                    if index.claim_email(email) and not (
+                        update_existing and existing_user
+                    ):
+                        raise ValueError(f"Email {email} already exists")
 
                     user_data = {
                         "first_name": row["first_name"],
                         "last_name": row["last_name"],
-                        "email": row["email"],
+                        "email": email,
                         "department": department,
-                        "hire_date": row["hire_date"],
+                        "hire_date": date.fromisoformat(row["hire_date"]),
+                    }
+                    profile_data = {
+                        "employment_status": row["employment_status"],
+                        "grade_level": row["grade_level"],
+                        "basic_salary": Decimal(row["basic_salary"]),
                     }
 
-                    if update_existing and "employee_id" in row:
-                        try:
-                            profile = EmployeeProfile.objects.get(
-                                employee_id=row["employee_id"]
+                    if existing_user:
+                        profile = getattr(existing_user, "employee_profile", None)
+                        if profile is None:
+                            raise ValueError(f"Employee profile not found for {email}")
+                        if existing_user.pk not in to_update:
+                            existing_user._original_values = (
+                                UserSignalHandler.capture_original_values(existing_user)
                             )
-                            for key, value in user_data.items():
-                                setattr(profile.user, key, value)
-                            profile.user.save()
-
-                            profile.employment_status = row["employment_status"]
-                            profile.grade_level = row["grade_level"]
-                            profile.basic_salary = Decimal(row["basic_salary"])
-                            profile.save()
-
-                            results["success"] += 1
-                            continue
-                        except EmployeeProfile.DoesNotExist:
-                            pass
-
-                    user = CustomUser.objects.create_user(
-                        employee_code=EmployeeUtils.generate_employee_id(), **user_data
-                    )
-
-                    EmployeeProfile.objects.create(
-                        user=user,
-                        employment_status=row["employment_status"],
-                        grade_level=row["grade_level"],
-                        basic_salary=Decimal(row["basic_salary"]),
-                    )
-
-                    results["success"] += 1
+                        for key, value in user_data.items():
+                            setattr(existing_user, key, value)
+                        for key, value in profile_data.items():
+                            setattr(profile, key, value)
+                        to_update[existing_user.pk] = existing_user
+                    else:
+                        to_create.append((user_data, profile_data))
 
                 except Exception as e:
                     results["errors"] += 1
                     results["error_details"].append(f"Row {row_num}: {str(e)}")
 
+            with transaction.atomic():
+                employee_codes = EmployeeUtils.generate_employee_ids(len(to_create))
+                users = CustomUser.objects.bulk_create(
+                    [
+                        CustomUser(
+                            employee_code=employee_code,
+                            username=employee_code,
+                            password=make_password(None),
+                            **user_data,
+                        )
+                        for employee_code, (user_data, _) in zip(employee_codes, to_create)
+                    ]
+                )
+                profiles = [
+                    EmployeeProfile(user=user, **profile_data)
+                    for user, (_, profile_data) in zip(users, to_create)
+                ]
+                EmployeeProfile.objects.bulk_create(profiles)
+                for user, profile in zip(users, profiles):
+                    user.employee_profile = profile
+
+                updated = list(to_update.values())
+                if updated:
+                    now = timezone.now()
+                    for user in updated:
+                        user.updated_at = now
+                        user.employee_profile.updated_at = now
+                    CustomUser.objects.bulk_update(
+                        updated,
+                        ["first_name", "last_name", "email", "department", "hire_date", "updated_at"],
+                    )
+                    EmployeeProfile.objects.bulk_update(
+                        [user.employee_profile for user in updated],
+                        ["employment_status", "grade_level", "basic_salary", "updated_at"],
+                    )
+
+                employees_imported.send(
+                    sender=CustomUser, created=users, updated=updated
+                )
+
+            results["success"] += len(users) + len(updated)
+
         except Exception as e:
             results["error_details"].append(f"File processing error: {str(e)}")
 
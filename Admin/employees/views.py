@@ -33,6 +33,7 @@ from payroll.models import PayrollPeriod
 
 from accounts.models import CustomUser, Department, Role, SystemConfiguration
 from accounts.utils import log_user_activity
+from accounts.search import EmployeeSearchIndex
 from .models import EmployeeProfile, Education, Contract
 from .forms import (
     DepartmentForm,
@@ -79,7 +80,7 @@ def is_admin_user(user):
 def dashboard_view(request):
     if is_admin_user(request.user):
         template_name = "employee/employees-analytics.html"
-        context = UnifiedAnalytics.get_complete_dashboard_data()
+        context = UnifiedAnalytics.get_complete_dashboard_data_concurrent()
     else:
         template_name = "index.html"
         if hasattr(request.user, "employee_profile"):
@@ -1345,12 +1346,9 @@ def employee_autocomplete_ajax(request):
     if len(query) < 2:
         return JsonResponse({"results": []})
 
-    employees = CustomUser.active.filter(
-        Q(first_name__icontains=query)
-        | Q(last_name__icontains=query)
-        | Q(employee_code__icontains=query)
-        | Q(email__icontains=query)
-    ).select_related("employee_profile")[:10]
+    employees = EmployeeSearchIndex.autocomplete(
+        query, current_user=request.user, limit=10, queryset=CustomUser.active.all()
+    )
 
     results = []
     for emp in employees:
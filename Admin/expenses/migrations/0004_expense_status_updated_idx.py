@@ -0,0 +1,19 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("expenses", "0003_expenseapprovalstep_description_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(
+                fields=["status", "updated_at"], name="expenses_status_updated_idx"
+            ),
+        ),
+    ]
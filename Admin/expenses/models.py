@@ -330,6 +330,7 @@ class Expense(models.Model):
             models.Index(fields=["payment_status"]),
             models.Index(fields=["payroll_status"]),
             models.Index(fields=["is_active"]),
+            models.Index(fields=["status", "updated_at"], name="expenses_status_updated_idx"),
         ]
 
     def __str__(self):
@@ -977,6 +978,41 @@ class EmployeeDeductionThreshold(models.Model):
                 "minimum_salary_protection_percent": global_threshold.minimum_salary_protection_percent,
             }
 
+    @classmethod
+    def get_employee_thresholds(cls, employee_ids, date=None):
+        """
+        Effective thresholds for many employees in one query, falling back to
+        the global default. A null protection percent inherits the default.
+        """
+        if date is None:
+            date = timezone.now().date()
+
+        global_threshold = ExpenseDeductionThreshold.get_current_threshold()
+        default = {
+            "threshold_amount": global_threshold.default_threshold_amount,
+            "minimum_salary_protection_percent": global_threshold.minimum_salary_protection_percent,
+            "is_default": True,
+        }
+        thresholds = {employee_id: dict(default) for employee_id in employee_ids}
+
+        # Ascending effective_from, so the latest effective row wins.
+        for threshold in (
+            cls.active.filter(employee_id__in=list(thresholds), effective_from__lte=date)
+            .filter(models.Q(effective_to__isnull=True) | models.Q(effective_to__gte=date))
+            .order_by("effective_from", "id")
+        ):
+            thresholds[threshold.employee_id] = {
+                "threshold_amount": threshold.threshold_amount,
+                "minimum_salary_protection_percent": (
+                    threshold.minimum_salary_protection_percent
+                    if threshold.minimum_salary_protection_percent is not None
+                    else default["minimum_salary_protection_percent"]
+                ),
+                "is_default": False,
+            }
+
+        return thresholds
+
 
 class PayrollExpenseIntegration(models.Model):
     id = models.AutoField(primary_key=True)
@@ -1,72 +1,170 @@
 from decimal import Decimal
+import calendar
 from django.utils import timezone
 from django.db import transaction
 
 from .models import Expense, ExpenseAuditTrail, PayrollExpenseIntegration
 from .utils import PayrollStatus, PayrollEffect
 
+PENDING_PAYROLL_STATUSES = [
+    PayrollStatus.PENDING_PAYROLL_PROCESSING.value,
+    PayrollStatus.PARTIALLY_PROCESSED.value,
+]
+
 
 class ExpensePayrollService:
     @staticmethod
-    def get_payroll_amounts(employee_id):
-        pending_expenses = Expense.active.filter(
-            employee_id=employee_id,
-            status="APPROVED",
-            add_to_payroll=True,
-            payroll_status=PayrollStatus.PENDING_PAYROLL_PROCESSING.value,
-        )
+    def get_period_label(payroll_period):
+        return f"{calendar.month_name[payroll_period.month]} {payroll_period.year}"
 
-        addition_expenses = pending_expenses.filter(
-            payroll_effect=PayrollEffect.ADD_TO_NEXT_PAYROLL.value
-        )
-        addition_amount = sum(
-            expense.installment_amount or expense.total_amount
-            for expense in addition_expenses
+    @staticmethod
+    def get_outstanding_amount(expense):
+        if expense.payroll_status == PayrollStatus.PARTIALLY_PROCESSED.value:
+            return expense.remaining_amount or Decimal("0.00")
+        return expense.remaining_amount or expense.total_amount
+
+    @staticmethod
+    def get_settlement_amount(expense):
+        outstanding = ExpensePayrollService.get_outstanding_amount(expense)
+        return min(expense.installment_amount or outstanding, outstanding)
+
+    @staticmethod
+    def get_period_amounts(employee_ids):
+        amounts = {
+            employee_id: {
+                "employee_id": employee_id,
+                "addition_amount": Decimal("0.00"),
+                "deduction_amount": Decimal("0.00"),
+                "expense_ids": [],
+                "addition_ids": [],
+                "deductions": [],
+                "has_pending_expenses": False,
+            }
+            for employee_id in employee_ids
+        }
+
+        # One read for every employee; the rows are kept so settlement
+        # processes exactly the expenses the totals were built from.
+        # Partially processed expenses carry their remainder forward.
+        pending_expenses = (
+            Expense.active.filter(
+                employee_id__in=list(amounts),
+                status="APPROVED",
+                add_to_payroll=True,
+                payroll_status__in=PENDING_PAYROLL_STATUSES,
+            )
+            .only(
+                "id",
+                "employee_id",
+                "payroll_effect",
+                "payroll_status",
+                "total_amount",
+                "installment_amount",
+                "remaining_amount",
+            )
+            .order_by("request_date", "id")
         )
 
-        deduction_expenses = pending_expenses.filter(
-            payroll_effect=PayrollEffect.DEDUCT_FROM_NEXT_PAYROLL.value
+        for expense in pending_expenses:
+            data = amounts[expense.employee_id]
+            amount = ExpensePayrollService.get_settlement_amount(expense)
+            if amount <= Decimal("0.00"):
+                continue
+            if expense.payroll_effect == PayrollEffect.ADD_TO_NEXT_PAYROLL.value:
+                data["addition_amount"] += amount
+                data["addition_ids"].append(expense.id)
+            else:
+                data["deduction_amount"] += amount
+                data["deductions"].append((expense.id, amount))
+            data["expense_ids"].append(expense.id)
+            data["has_pending_expenses"] = True
+
+        return amounts
+
+    @staticmethod
+    def get_payroll_amounts(employee_id):
+        return ExpensePayrollService.get_period_amounts([employee_id])[employee_id]
+
+    @staticmethod
+    def apply_settlement(expense, processed_at, processed_amount=None):
+        if processed_amount is None:
+            processed_amount = ExpensePayrollService.get_settlement_amount(expense)
+
+        remaining = max(
+            Decimal("0.00"),
+            ExpensePayrollService.get_outstanding_amount(expense) - processed_amount,
         )
-        deduction_amount = sum(
-            expense.installment_amount or expense.total_amount
-            for expense in deduction_expenses
+
+        if expense.payroll_effect == PayrollEffect.ADD_TO_NEXT_PAYROLL.value:
+            operation = "ADD"
+            settled_status = PayrollStatus.ADDED_TO_PAYROLL.value
+        else:
+            operation = "DEDUCT"
+            settled_status = PayrollStatus.DEDUCTED_FROM_PAYROLL.value
+
+        expense.payroll_status = (
+            settled_status
+            if remaining <= Decimal("0.00")
+            else PayrollStatus.PARTIALLY_PROCESSED.value
         )
+        expense.last_payroll_sync = processed_at
+        expense.last_processed_amount = processed_amount
+        expense.remaining_amount = remaining
 
-        return {
-            "employee_id": employee_id,
-            "addition_amount": addition_amount,
-            "deduction_amount": deduction_amount,
-            "expense_ids": list(pending_expenses.values_list("id", flat=True)),
-            "has_pending_expenses": pending_expenses.exists(),
-        }
+        return processed_amount, remaining, operation
 
     @staticmethod
     @transaction.atomic
-    def mark_as_processed(expense_ids, payroll_reference, payroll_period):
-        processed_date = timezone.now().date()
+    def settle_period(settlements, payroll_period, amounts=None):
+        """
+        Settles expenses for many payslips at once. ``settlements`` maps each
+        payroll reference to the expense IDs it absorbed; ``amounts`` can
+        override the processed amount per expense ID.
+        """
+        amounts = amounts or {}
+        processed_at = timezone.now()
+        processed_date = processed_at.date()
         results = {"success_count": 0, "failed_count": 0, "details": []}
 
-        for expense_id in expense_ids:
-            try:
-                expense = Expense.active.get(id=expense_id)
+        references = {
+            expense_id: payroll_reference
+            for payroll_reference, expense_ids in settlements.items()
+            for expense_id in expense_ids
+        }
+        # Re-checked under the lock: an overlapping calculation may already
+        # have settled some of these, or taken this period's installment
+        # of a partially processed one, since their amounts were read.
+        expenses = {
+            expense.id: expense
+            for expense in Expense.active.select_for_update()
+            .filter(id__in=list(references), payroll_status__in=PENDING_PAYROLL_STATUSES)
+            .exclude(payroll_integrations__payroll_period=payroll_period)
+        }
 
-                processed_amount = expense.installment_amount or expense.total_amount
+        integrations = []
+        audit_trails = []
+        settled = []
 
-                remaining = max(
-                    Decimal("0.00"), expense.total_amount - processed_amount
-                )
-                if expense.remaining_amount:
-                    remaining = max(
-                        Decimal("0.00"), expense.remaining_amount - processed_amount
-                    )
-
-                operation = (
-                    "ADD"
-                    if expense.payroll_effect == PayrollEffect.ADD_TO_NEXT_PAYROLL.value
-                    else "DEDUCT"
+        for expense_id, payroll_reference in references.items():
+            expense = expenses.get(expense_id)
+            if expense is None:
+                results["failed_count"] += 1
+                results["details"].append(
+                    {
+                        "expense_id": expense_id,
+                        "success": False,
+                        "message": "Expense not found or already processed",
+                    }
                 )
+                continue
 
-                integration = PayrollExpenseIntegration.objects.create(
+            processed_amount, remaining, operation = ExpensePayrollService.apply_settlement(
+                expense, processed_at, amounts.get(expense_id)
+            )
+            settled.append(expense)
+
+            integrations.append(
+                PayrollExpenseIntegration(
                     expense=expense,
                     payroll_period=payroll_period,
                     payroll_date=processed_date,
@@ -76,32 +174,9 @@ class ExpensePayrollService:
                     status="PROCESSED",
                     payroll_reference=payroll_reference,
                 )
-
-                if expense.payroll_effect == PayrollEffect.ADD_TO_NEXT_PAYROLL.value:
-                    expense.payroll_status = (
-                        PayrollStatus.ADDED_TO_PAYROLL.value
-                        if remaining <= Decimal("0.00")
-                        else PayrollStatus.PARTIALLY_PROCESSED.value
-                    )
-                else:
-                    expense.payroll_status = (
-                        PayrollStatus.DEDUCTED_FROM_PAYROLL.value
-                        if remaining <= Decimal("0.00")
-                        else PayrollStatus.PARTIALLY_PROCESSED.value
-                    )
-                expense.last_payroll_sync = timezone.now()
-                expense.last_processed_amount = processed_amount
-                expense.remaining_amount = remaining
-                expense.save(
-                    update_fields=[
-                        "payroll_status",
-                        "last_payroll_sync",
-                        "last_processed_amount",
-                        "remaining_amount",
-                    ]
-                )
-
-                ExpenseAuditTrail.objects.create(
+            )
+            audit_trails.append(
+                ExpenseAuditTrail(
                     expense=expense,
                     action=f"Processed in payroll for period {payroll_period}",
                     current_state={
@@ -113,30 +188,30 @@ class ExpensePayrollService:
                         "operation": operation,
                     },
                 )
-
-                results["success_count"] += 1
-                results["details"].append(
-                    {
-                        "expense_id": expense_id,
-                        "success": True,
-                        "processed_amount": str(processed_amount),
-                        "remaining_amount": str(remaining),
-                    }
-                )
-
-            except Expense.DoesNotExist:
-                results["failed_count"] += 1
-                results["details"].append(
-                    {
-                        "expense_id": expense_id,
-                        "success": False,
-                        "message": "Expense not found",
-                    }
-                )
-            except Exception as e:
-                results["failed_count"] += 1
-                results["details"].append(
-                    {"expense_id": expense_id, "success": False, "message": str(e)}
-                )
+            )
+
+            results["success_count"] += 1
+            results["details"].append(
+                {
+                    "expense_id": expense_id,
+                    "success": True,
+                    "processed_amount": str(processed_amount),
+                    "remaining_amount": str(remaining),
+                }
+            )
+
+        PayrollExpenseIntegration.objects.bulk_create(integrations, batch_size=500)
+        Expense.objects.bulk_update(
+            settled,
+            ["payroll_status", "last_payroll_sync", "last_processed_amount", "remaining_amount"],
+            batch_size=500,
+        )
+        ExpenseAuditTrail.objects.bulk_create(audit_trails, batch_size=500)
 
         return results
+
+    @staticmethod
+    def mark_as_processed(expense_ids, payroll_reference, payroll_period, amounts=None):
+        return ExpensePayrollService.settle_period(
+            {payroll_reference: expense_ids}, payroll_period, amounts
+        )
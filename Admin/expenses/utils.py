@@ -1,6 +1,6 @@
 from django.utils import timezone
-from django.db.models import Sum, Q
-from django.http import HttpResponse
+from django.db.models import Sum, Q, Prefetch
+from django.http import HttpResponse, StreamingHttpResponse, FileResponse
 from decimal import Decimal, ROUND_UP
 import uuid
 from datetime import datetime, date, timedelta
@@ -8,6 +8,7 @@ from enum import Enum
 import math
 import csv
 import json
+import tempfile
 
 from accounts.models import CustomUser, Department
 
@@ -858,235 +859,281 @@ def export_report_as_pdf(report_data, report_title, include_details):
     return response
 
 
-def export_expenses_as_csv(queryset, include_details, include_audit_trail):
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="expenses_export.csv"'
+EXPORT_CHUNK_SIZE = 500
+PDF_ROWS_PER_PAGE = 24
+PDF_FIRST_PAGE_ROWS = 21
 
-    writer = csv.writer(response)
-    writer.writerow(["Expense Export"])
-    writer.writerow(
-        [
-            "Reference",
-            "Date",
-            "Employee",
-            "Department",
-            "Category",
-            "Type",
-            "Description",
-            "Amount",
-            "Status",
-            "Payment Status",
-        ]
+EXPENSE_EXPORT_COLUMNS = [
+    "Reference",
+    "Date",
+    "Employee",
+    "Department",
+    "Category",
+    "Type",
+    "Description",
+    "Amount",
+    "Status",
+    "Payment Status",
+]
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def iterate_expenses_for_export(
+    queryset, include_details=False, include_audit_trail=False, chunk_size=EXPORT_CHUNK_SIZE
+):
+    from .models import (
+        ExpenseAuditTrail,
+        ExpenseInstallment,
+        ExpenseInstallmentPlan,
+        PurchaseItem,
     )
 
-    for expense in queryset:
-        writer.writerow(
-            [
-                expense.reference,
-                expense.date_incurred,
-                f"{expense.employee.first_name} {expense.employee.last_name}",
-                expense.department.name if expense.department else "",
-                expense.expense_category.name,
-                expense.expense_type.name,
-                expense.description,
-                expense.total_amount,
-                expense.status,
-                expense.payment_status,
-            ]
+    prefetches = []
+    if include_details:
+        prefetches.append(
+            Prefetch(
+                "purchase_items",
+                queryset=PurchaseItem.objects.filter(is_active=True),
+                to_attr="export_purchase_items",
+            )
         )
-
-        if include_details:
-            # Purchase items
-            if hasattr(expense, "purchase_items") and expense.purchase_items.exists():
-                writer.writerow(["", "Purchase Items:"])
-                writer.writerow(["", "Item", "Quantity", "Unit Price", "Total"])
-
-                for item in expense.purchase_items.filter(is_active=True):
-                    writer.writerow(
-                        [
-                            "",
-                            item.item_description,
-                            item.quantity,
-                            item.unit_price,
-                            item.total_price,
-                        ]
+        prefetches.append(
+            Prefetch(
+                "installment_plans",
+                queryset=ExpenseInstallmentPlan.objects.filter(
+                    is_active=True
+                ).prefetch_related(
+                    Prefetch(
+                        "installments",
+                        queryset=ExpenseInstallment.objects.filter(
+                            is_active=True
+                        ).order_by("installment_number"),
+                        to_attr="export_installments",
                     )
+                ),
+                to_attr="export_installment_plans",
+            )
+        )
+    if include_audit_trail:
+        prefetches.append(
+            Prefetch(
+                "audit_trail",
+                queryset=ExpenseAuditTrail.objects.select_related("user").order_by(
+                    "timestamp"
+                ),
+                to_attr="export_audit_trail",
+            )
+        )
 
-            # Installment plans
-            if (
-                hasattr(expense, "installment_plans")
-                and expense.installment_plans.filter(is_active=True).exists()
-            ):
-                plan = expense.installment_plans.filter(is_active=True).first()
-                writer.writerow(["", "Installment Plan:"])
-                writer.writerow(
-                    [
+    return (
+        queryset.select_related(
+            "employee", "department", "expense_category", "expense_type"
+        )
+        .prefetch_related(*prefetches)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def get_expense_export_row(expense):
+    return [
+        expense.reference,
+        expense.date_incurred,
+        f"{expense.employee.first_name} {expense.employee.last_name}",
+        expense.department.name if expense.department else "",
+        expense.expense_category.name,
+        expense.expense_type.name,
+        expense.description,
+        expense.total_amount,
+        expense.status,
+        expense.payment_status,
+    ]
+
+
+def generate_expense_csv_rows(queryset, include_details, include_audit_trail):
+    yield ["Expense Export"]
+    yield EXPENSE_EXPORT_COLUMNS
+
+    for expense in iterate_expenses_for_export(
+        queryset, include_details, include_audit_trail
+    ):
+        yield get_expense_export_row(expense)
+
+        if include_details:
+            if expense.export_purchase_items:
+                yield ["", "Purchase Items:"]
+                yield ["", "Item", "Quantity", "Unit Price", "Total"]
+                for item in expense.export_purchase_items:
+                    yield [
                         "",
-                        "Total Amount",
-                        "Installment Amount",
-                        "Number of Installments",
-                        "Start Date",
+                        item.item_description,
+                        item.quantity,
+                        item.unit_cost,
+                        item.total_cost,
                     ]
-                )
-                writer.writerow(
-                    [
+
+            if expense.export_installment_plans:
+                plan = expense.export_installment_plans[0]
+                yield ["", "Installment Plan:"]
+                yield [
+                    "",
+                    "Total Amount",
+                    "Installment Amount",
+                    "Number of Installments",
+                    "Start Date",
+                ]
+                yield [
+                    "",
+                    plan.total_amount,
+                    plan.installment_amount,
+                    plan.number_of_installments,
+                    plan.start_date,
+                ]
+
+                if plan.export_installments:
+                    yield ["", "Installments:"]
+                    yield [
                         "",
-                        plan.total_amount,
-                        plan.installment_amount,
-                        plan.number_of_installments,
-                        plan.start_date,
+                        "Number",
+                        "Date",
+                        "Amount",
+                        "Remaining Balance",
+                        "Processed",
                     ]
-                )
-
-                if hasattr(plan, "installments") and plan.installments.exists():
-                    writer.writerow(["", "Installments:"])
-                    writer.writerow(
-                        [
+                    for installment in plan.export_installments:
+                        yield [
                             "",
-                            "Number",
-                            "Date",
-                            "Amount",
-                            "Remaining Balance",
-                            "Processed",
+                            installment.installment_number,
+                            installment.scheduled_date,
+                            installment.amount,
+                            installment.remaining_balance,
+                            "Yes" if installment.is_processed else "No",
                         ]
-                    )
 
-                    for installment in plan.installments.filter(
-                        is_active=True
-                    ).order_by("installment_number"):
-                        writer.writerow(
-                            [
-                                "",
-                                installment.installment_number,
-                                installment.scheduled_date,
-                                installment.amount,
-                                installment.remaining_balance,
-                                "Yes" if installment.is_processed else "No",
-                            ]
-                        )
-
-        if include_audit_trail:
-            audit_entries = ExpenseAuditTrail.objects.filter(expense=expense).order_by(
-                "timestamp"
-            )
+        if include_audit_trail and expense.export_audit_trail:
+            yield ["", "Audit Trail:"]
+            yield ["", "Date", "User", "Action", "Notes"]
+            for entry in expense.export_audit_trail:
+                yield [
+                    "",
+                    entry.timestamp,
+                    f"{entry.user.first_name} {entry.user.last_name}" if entry.user else "",
+                    entry.action,
+                    entry.notes,
+                ]
 
-            if audit_entries.exists():
-                writer.writerow(["", "Audit Trail:"])
-                writer.writerow(["", "Date", "User", "Action", "Notes"])
+        yield []
 
-                for entry in audit_entries:
-                    writer.writerow(
-                        [
-                            "",
-                            entry.timestamp,
-                            f"{entry.user.first_name} {entry.user.last_name}",
-                            entry.action,
-                            entry.notes,
-                        ]
-                    )
-
-        writer.writerow([])
 
+def export_expenses_as_csv(queryset, include_details, include_audit_trail):
+    writer = csv.writer(Echo())
+    response = StreamingHttpResponse(
+        (
+            writer.writerow(row)
+            for row in generate_expense_csv_rows(
+                queryset, include_details, include_audit_trail
+            )
+        ),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = 'attachment; filename="expenses_export.csv"'
     return response
 
+
 def export_expenses_as_excel(queryset, include_details, include_audit_trail):
     try:
-        import xlwt
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
     except ImportError:
         return None
 
-    response = HttpResponse(content_type="application/ms-excel")
-    response["Content-Disposition"] = 'attachment; filename="expenses_export.xls"'
-
-    wb = xlwt.Workbook(encoding="utf-8")
-    ws = wb.add_sheet("Expenses")
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Expenses")
+
+    header_font = Font(bold=True)
+    header = []
+    for column_title in EXPENSE_EXPORT_COLUMNS:
+        cell = WriteOnlyCell(ws, value=column_title)
+        cell.font = header_font
+        header.append(cell)
+    ws.append(header)
+
+    for expense in iterate_expenses_for_export(queryset):
+        row = get_expense_export_row(expense)
+        row[1] = expense.date_incurred.strftime("%Y-%m-%d")
+        row[7] = float(expense.total_amount)
+        ws.append(row)
+
+    output = tempfile.TemporaryFile()
+    wb.save(output)
+    output.seek(0)
+
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename="expenses_export.xlsx",
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
 
-    row_num = 0
 
-    font_style = xlwt.XFStyle()
-    font_style.font.bold = True
+def export_expenses_as_pdf(queryset, include_details, include_audit_trail):
+    try:
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter, landscape
+        from reportlab.lib.units import inch
+        from reportlab.pdfgen import canvas
+        from reportlab.platypus import Table, TableStyle, Paragraph
+        from reportlab.lib.styles import getSampleStyleSheet
+    except ImportError:
+        return None
 
-    columns = [
+    header = [
         "Reference",
         "Date",
         "Employee",
-        "Department",
         "Category",
-        "Type",
         "Description",
         "Amount",
         "Status",
-        "Payment Status",
     ]
-
-    for col_num, column_title in enumerate(columns):
-        ws.write(row_num, col_num, column_title, font_style)
-
-    font_style = xlwt.XFStyle()
-
-    for expense in queryset:
-        row_num += 1
-
-        row = [
-            expense.reference,
-            expense.date_incurred.strftime("%Y-%m-%d"),
-            f"{expense.employee.first_name} {expense.employee.last_name}",
-            expense.department.name if expense.department else "",
-            expense.expense_category.name,
-            expense.expense_type.name,
-            expense.description,
-            float(expense.total_amount),
-            expense.status,
-            expense.payment_status,
-        ]
-
-        for col_num, cell_value in enumerate(row):
-            ws.write(row_num, col_num, cell_value, font_style)
-
-    wb.save(response)
-    return response
-
-def export_expenses_as_pdf(queryset, include_details, include_audit_trail):
-    try:
-        from reportlab.lib import colors
-        from reportlab.lib.pagesizes import letter, landscape
-        from reportlab.platypus import (
-            SimpleDocTemplate,
-            Table,
-            TableStyle,
-            Paragraph,
-            Spacer,
-        )
-        from reportlab.lib.styles import getSampleStyleSheet
-    except ImportError:
-        return None
-
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = 'attachment; filename="expenses_export.pdf"'
-
-    doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-    elements = []
-
-    styles = getSampleStyleSheet()
-    title_style = styles["Heading1"]
-
-    elements.append(Paragraph("Expense Export", title_style))
-    elements.append(Spacer(1, 12))
-
-    data = [
+    table_style = TableStyle(
         [
-            "Reference",
-            "Date",
-            "Employee",
-            "Category",
-            "Description",
-            "Amount",
-            "Status",
+            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+            ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+            ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+            ("GRID", (0, 0), (-1, -1), 1, colors.black),
         ]
-    ]
+    )
 
-    for expense in queryset:
-        data.append(
+    output = tempfile.TemporaryFile()
+    page_width, page_height = landscape(letter)
+    pdf = canvas.Canvas(output, pagesize=(page_width, page_height))
+    title = Paragraph("Expense Export", getSampleStyleSheet()["Heading1"])
+
+    def draw_page(rows, first_page):
+        top = page_height - inch
+        if first_page:
+            _, title_height = title.wrapOn(pdf, page_width - 2 * inch, page_height)
+            title.drawOn(pdf, inch, top - title_height)
+            top -= title_height + 12
+
+        table = Table([header] + rows)
+        table.setStyle(table_style)
+        table_width, table_height = table.wrapOn(pdf, page_width - 2 * inch, top - inch)
+        table.drawOn(pdf, (page_width - table_width) / 2, top - table_height)
+        pdf.showPage()
+
+    rows = []
+    first_page = True
+    for expense in iterate_expenses_for_export(queryset):
+        rows.append(
             [
                 expense.reference,
                 expense.date_incurred.strftime("%Y-%m-%d"),
@@ -1097,23 +1144,20 @@ def export_expenses_as_pdf(queryset, include_details, include_audit_trail):
                 expense.status,
             ]
         )
-
-    table = Table(data)
-    table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-            ]
-        )
+        if len(rows) >= (PDF_FIRST_PAGE_ROWS if first_page else PDF_ROWS_PER_PAGE):
+            draw_page(rows, first_page)
+            rows = []
+            first_page = False
+
+    if rows or first_page:
+        draw_page(rows, first_page)
+
+    pdf.save()
+    output.seek(0)
+
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename="expenses_export.pdf",
+        content_type="application/pdf",
     )
-
-    elements.append(table)
-    doc.build(elements)
-
-    return response
@@ -1438,19 +1438,14 @@ class PayrollProcessingView(LoginRequiredMixin, ListView):
         
         default_threshold = ExpenseDeductionThreshold.get_current_threshold()
         
-        employee_thresholds = {}
-        for employee_threshold in EmployeeDeductionThreshold.active.filter(
-            employee__in=[data['employee'] for data in expenses_by_employee.values()],
-            effective_from__lte=timezone.now().date()
-        ).filter(
-            Q(effective_to__isnull=True) | Q(effective_to__gte=timezone.now().date())
-        ):
-            employee_thresholds[employee_threshold.employee.id] = employee_threshold.threshold_amount
-        
+        employee_thresholds = EmployeeDeductionThreshold.get_employee_thresholds(
+            [data['employee'].id for data in expenses_by_employee.values()]
+        )
+
         for employee_data in expenses_by_employee.values():
             employee_id = employee_data['employee'].id
-            threshold = employee_thresholds.get(employee_id, default_threshold.default_threshold_amount if default_threshold else Decimal('5000.00'))
-            
+            threshold = employee_thresholds[employee_id]['threshold_amount']
+
             total_deductions = employee_data['total_deductions']
             this_cycle_deduction, remaining_deduction = apply_threshold_based_deduction(
                 total_deductions, threshold
@@ -1564,7 +1559,7 @@ class ExpenseExportView(LoginRequiredMixin, FormView):
             )
             if excel_response:
                 return excel_response
-            messages.error(self.request, "Excel export requires xlwt module.")
+            messages.error(self.request, "Excel export requires openpyxl module.")
             return redirect("expenses:export")
         elif export_format == "pdf":
             pdf_response = export_expenses_as_pdf(
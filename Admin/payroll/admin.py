@@ -29,6 +29,7 @@ from .utils import (
     PayrollDeductionCalculator,
     PayrollTaxCalculator,
     PayrollAdvanceCalculator,
+    PayrollDeductionSolver,
     safe_payroll_calculation,
     log_payroll_activity,
 )
@@ -755,10 +756,26 @@ class PayslipAdmin(admin.ModelAdmin):
     status_badge.short_description = "Status"
 
     def calculate_payslips(self, request, queryset):
-        for payslip in queryset:
+        payslips = list(queryset.select_related("employee", "payroll_period"))
+
+        # One solver per period, settled once after all its payslips.
+        periods = {}
+        for payslip in payslips:
+            if payslip.status == "DRAFT":
+                periods.setdefault(
+                    payslip.payroll_period_id, (payslip.payroll_period, [])
+                )[1].append(payslip.employee_id)
+        deduction_solvers = {
+            period_id: PayrollDeductionSolver(period, employee_ids)
+            for period_id, (period, employee_ids) in periods.items()
+        }
+
+        for payslip in payslips:
             try:
                 if payslip.status == "DRAFT":
-                    payslip.calculate_payroll()
+                    payslip.calculate_payroll(
+                        deduction_solvers[payslip.payroll_period_id], settle_expenses=False
+                    )
                     payslip.calculated_by = request.user
                     payslip.save()
                     messages.success(
@@ -776,6 +793,9 @@ class PayslipAdmin(admin.ModelAdmin):
                     f"Error calculating {payslip.employee.get_full_name()}: {str(e)}",
                 )
 
+        for deduction_solver in deduction_solvers.values():
+            deduction_solver.settle()
+
     calculate_payslips.short_description = "Calculate selected payslips"
 
     def approve_payslips(self, request, queryset):
@@ -2469,16 +2489,22 @@ class PayrollBulkOperationsAdmin(admin.ModelAdmin):
 
         successful = 0
         failed = 0
+        payslips = list(payslips)
+        deduction_solver = PayrollDeductionSolver(
+            period, [payslip.employee_id for payslip in payslips]
+        )
 
         for payslip in payslips:
             try:
-                payslip.calculate_payroll()
+                payslip.calculate_payroll(deduction_solver, settle_expenses=False)
                 payslip.calculated_by = user
                 payslip.save()
                 successful += 1
             except Exception:
                 failed += 1
 
+        deduction_solver.settle()
+
         return {"successful": successful, "failed": failed}
 
     def _bulk_approve_payslips(self, payslip_ids, user):
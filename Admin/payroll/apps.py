@@ -16,6 +16,8 @@ class PayrollConfig(AppConfig):
 
             initialize_payroll_signal_handlers()
 
+            import payroll.exports
+
         except ImportError as e:
             import logging
 
@@ -0,0 +1,116 @@
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.exceptions import ValidationError
+from django.http import HttpRequest
+from accounts.exports import CallableExporter, ExportRegistry
+from .permissions import PayrollPermissionMixin, PayrollPermissions
+
+PDF_CONTENT_TYPE = "application/pdf"
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class PayrollReportExporter(CallableExporter, PayrollPermissionMixin):
+    view_method = None
+    url_params = []
+
+    def has_permission(self, user, params):
+        return self.has_payroll_permission(user, PayrollPermissions.EXPORT_PAYROLL)
+
+    def validate_params(self, params):
+        missing = [param for param in self.url_params if not params.get(param)]
+        if missing:
+            raise ValidationError(f"Missing export parameters: {', '.join(missing)}")
+
+    def get_file_name(self, params):
+        suffix = "_".join(str(params.get(param, "")) for param in self.url_params)
+        return f"{self.file_name}_{suffix}.{self.extension}"
+
+    def build(self, user, params):
+        from .views import DashboardView
+
+        self.validate_params(params)
+
+        request = HttpRequest()
+        request.method = "GET"
+        request.user = user
+        request._messages = CookieStorage(request)
+
+        kwargs = {param: params[param] for param in self.url_params}
+        response = getattr(DashboardView(), self.view_method)(request, **kwargs)
+
+        if response.status_code != 200 or not response.has_header("Content-Disposition"):
+            errors = "; ".join(str(message) for message in request._messages)
+            raise ValueError(errors or f"{self.view_method} returned {response.status_code}")
+
+        return response.content
+
+
+@ExportRegistry.register
+class DepartmentSummaryPdfExporter(PayrollReportExporter):
+    name = "payroll_department_summary_pdf"
+    view_method = "export_department_summary_pdf"
+    url_params = ["period_id"]
+    file_name = "department_summary"
+    extension = "pdf"
+    content_type = PDF_CONTENT_TYPE
+
+
+@ExportRegistry.register
+class DepartmentSummaryExcelExporter(PayrollReportExporter):
+    name = "payroll_department_summary_excel"
+    view_method = "export_department_summary_excel"
+    url_params = ["period_id"]
+    file_name = "department_summary"
+
+
+@ExportRegistry.register
+class TaxReportPdfExporter(PayrollReportExporter):
+    name = "payroll_tax_report_pdf"
+    view_method = "export_tax_report_pdf"
+    url_params = ["year", "report_type"]
+    file_name = "tax_report"
+    extension = "pdf"
+    content_type = PDF_CONTENT_TYPE
+
+
+@ExportRegistry.register
+class TaxReportExcelExporter(PayrollReportExporter):
+    name = "payroll_tax_report_excel"
+    view_method = "export_tax_report_excel"
+    url_params = ["year", "report_type"]
+    file_name = "tax_report"
+
+
+@ExportRegistry.register
+class YearToDatePdfExporter(PayrollReportExporter):
+    name = "payroll_ytd_report_pdf"
+    view_method = "export_ytd_report_pdf"
+    url_params = ["employee_id", "year"]
+    file_name = "ytd_report"
+    extension = "pdf"
+    content_type = PDF_CONTENT_TYPE
+
+
+@ExportRegistry.register
+class YearToDateExcelExporter(PayrollReportExporter):
+    name = "payroll_ytd_report_excel"
+    view_method = "export_ytd_report_excel"
+    url_params = ["employee_id", "year"]
+    file_name = "ytd_report"
+
+
+@ExportRegistry.register
+class ComparisonPdfExporter(PayrollReportExporter):
+    name = "payroll_comparison_report_pdf"
+    view_method = "export_comparison_report_pdf"
+    url_params = ["period1_id", "period2_id"]
+    file_name = "payroll_comparison"
+    extension = "pdf"
+    content_type = PDF_CONTENT_TYPE
+
+
+@ExportRegistry.register
+class ComparisonExcelExporter(PayrollReportExporter):
+    name = "payroll_comparison_report_excel"
+    view_method = "export_comparison_report_excel"
+    url_params = ["period1_id", "period2_id"]
+    file_name = "payroll_comparison"
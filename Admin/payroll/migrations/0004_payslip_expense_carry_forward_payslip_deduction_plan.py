@@ -0,0 +1,31 @@
+# Generated by Django 4.2.16 on 2026-10-18 16:00
+
+from decimal import Decimal
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payroll", "0003_payslip_expense_additions_payslip_expense_deductions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payslip",
+            name="expense_carry_forward",
+            field=models.DecimalField(
+                decimal_places=2, default=Decimal("0.00"), max_digits=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="payslip",
+            name="deduction_plan",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                encoder=django.core.serializers.json.DjangoJSONEncoder,
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db.models import Sum, Count, Avg
@@ -44,11 +45,11 @@ from .utils import (
     PayrollDeductionCalculator,
     PayrollTaxCalculator,
     PayrollAdvanceCalculator,
+    PayrollDeductionSolver,
     PayrollCacheManager,
     safe_payroll_calculation,
     log_payroll_activity,
 )
-from expenses.services import ExpensePayrollService 
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +78,10 @@ class PayslipManager(models.Manager):
 
         calculated_payslips = []
         failed_employees = []
+        employees = list(employees)
+        deduction_solver = PayrollDeductionSolver(
+            payroll_period, [employee.id for employee in employees]
+        )
 
         for employee in employees:
             is_valid, message = PayrollValidationHelper.validate_employee_for_payroll(
@@ -95,7 +100,7 @@ class PayslipManager(models.Manager):
                 )
 
                 if created or payslip.status == "DRAFT":
-                    payslip.calculate_payroll()
+                    payslip.calculate_payroll(deduction_solver, settle_expenses=False)
                     calculated_payslips.append(payslip)
 
             except Exception as e:
@@ -105,6 +110,8 @@ class PayslipManager(models.Manager):
                 failed_employees.append(f"{employee.employee_code}: {str(e)}")
                 continue
 
+        deduction_solver.settle()
+
         if failed_employees:
             logger.warning(
                 f"Failed to calculate payroll for: {'; '.join(failed_employees)}"
@@ -606,6 +613,8 @@ class Payslip(models.Model):
     )
     expense_additions = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
     expense_deductions = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
+    expense_carry_forward = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
+    deduction_plan = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
 
     monthly_summary = models.ForeignKey(
         MonthlyAttendanceSummary,
@@ -704,15 +713,14 @@ class Payslip(models.Model):
         return self.regular_overtime + self.friday_overtime
 
 
-    def calculate_payroll(self):
+    def calculate_payroll(self, deduction_solver=None, settle_expenses=True):
         self.calculate_basic_components()
         self.calculate_role_specific_allowances()
         self.calculate_overtime_pay()
         
-        expense_data = ExpensePayrollService.get_payroll_amounts(self.employee.id)
-        self.expense_additions = expense_data["addition_amount"]
-        self.expense_deductions = expense_data["deduction_amount"]
-        expense_ids = expense_data["expense_ids"]
+        if deduction_solver is None:
+            deduction_solver = PayrollDeductionSolver(self.payroll_period, [self.employee_id])
+        self.expense_additions = deduction_solver.get_expense_data(self.employee_id)["addition_amount"]
         
         self.gross_salary = (
             self.basic_salary
@@ -725,7 +733,7 @@ class Payslip(models.Model):
             + self.expense_additions
         )
         
-        self.calculate_deductions()
+        self.calculate_deductions(deduction_solver)
         
         self.total_deductions = (
             self.leave_deduction
@@ -743,16 +751,9 @@ class Payslip(models.Model):
         self.status = "CALCULATED"
         self.save()
         
-        if expense_ids:
-            try:
-                payroll_period = f"{calendar.month_name[self.payroll_period.month]} {self.payroll_period.year}"
-                result = ExpensePayrollService.mark_as_processed(
-                    expense_ids=expense_ids,
-                    payroll_reference=self.reference_number,
-                    payroll_period=payroll_period,
-                )
-            except Exception as e:
-                import traceback
+        deduction_solver.record(self.reference_number, self.deduction_plan)
+        if settle_expenses:
+            deduction_solver.settle()
         
         log_payroll_activity(
             self.calculated_by,
@@ -804,7 +805,7 @@ class Payslip(models.Model):
             + overtime_data["weekend_overtime_hours"]
         )
 
-    def calculate_deductions(self):
+    def calculate_deductions(self, deduction_solver=None):
         basic_components = PayrollCalculator.calculate_basic_salary_components(
             self.employee, self.monthly_summary
         )
@@ -832,11 +833,6 @@ class Payslip(models.Model):
             self.employee, self.payroll_period.year, self.payroll_period.month, daily_salary
         )
 
-        advance_data = PayrollAdvanceCalculator.calculate_advance_deduction(
-            self.employee, self.payroll_period.year, self.payroll_period.month
-        )
-        self.advance_deduction = advance_data["total_advance_deduction"]
-
         epf_data = PayrollTaxCalculator.calculate_epf_contributions(
             self.gross_salary, self.basic_salary + self.bonus_1 + self.bonus_2
         )
@@ -851,6 +847,22 @@ class Payslip(models.Model):
         tax_data = PayrollTaxCalculator.calculate_income_tax(annual_income, self.employee)
         self.income_tax = tax_data["monthly_tax"]
 
+        if deduction_solver is None:
+            deduction_solver = PayrollDeductionSolver(self.payroll_period, [self.employee_id])
+        plan = deduction_solver.plan(
+            self.employee_id,
+            self.gross_salary,
+            self.leave_deduction
+            + self.late_penalty
+            + self.lunch_violation_penalty
+            + self.employee_epf_contribution
+            + self.income_tax,
+        )
+        self.advance_deduction = plan["advance_deduction"]
+        self.expense_deductions = plan["expense_deduction"]
+        self.expense_carry_forward = plan["carry_forward_amount"]
+        self.deduction_plan = plan
+
     def calculate_totals(self):
         self.gross_salary = (
             self.basic_salary
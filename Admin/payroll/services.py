@@ -20,6 +20,7 @@ from .utils import (
     PayrollDeductionCalculator,
     PayrollTaxCalculator,
     PayrollAdvanceCalculator,
+    PayrollDeductionSolver,
     PayrollDataProcessor,
     PayrollValidationHelper,
     PayrollUtilityHelper,
@@ -217,7 +218,9 @@ class PayslipCalculationService:
             raise ValidationError(f"Failed to calculate payslip: {str(e)}")
 
     @staticmethod
-    def _perform_calculation(payslip: Payslip, user: CustomUser):
+    def _perform_calculation(
+        payslip: Payslip, user: CustomUser, deduction_solver=None, settle_expenses=True
+    ):
         monthly_summary = PayrollDataProcessor.get_employee_monthly_summary(
             payslip.employee, payslip.payroll_period.year, payslip.payroll_period.month
         )
@@ -228,7 +231,7 @@ class PayslipCalculationService:
             )
 
         payslip.monthly_summary = monthly_summary
-        payslip.calculate_payroll()
+        payslip.calculate_payroll(deduction_solver, settle_expenses)
         payslip.calculated_by = user
 
         log_payroll_activity(
@@ -261,10 +264,16 @@ class PayslipCalculationService:
                 payslips_query = payslips_query.filter(employee__id__in=employee_ids)
 
             results = {"successful": [], "failed": []}
+            payslips = list(payslips_query.select_related("employee", "payroll_period"))
+            deduction_solver = PayrollDeductionSolver(
+                period, [payslip.employee_id for payslip in payslips]
+            )
 
-            for payslip in payslips_query:
+            for payslip in payslips:
                 try:
-                    PayslipCalculationService._perform_calculation(payslip, user)
+                    PayslipCalculationService._perform_calculation(
+                        payslip, user, deduction_solver, settle_expenses=False
+                    )
                     results["successful"].append(payslip.employee.employee_code)
                 except Exception as e:
                     results["failed"].append(
@@ -274,6 +283,10 @@ class PayslipCalculationService:
                         }
                     )
 
+            expense_settlement = deduction_solver.settle()
+            if expense_settlement:
+                results["expense_settlement"] = expense_settlement
+
             return results
 
         except PayrollPeriod.DoesNotExist:
@@ -9,6 +9,7 @@ from accounts.models import CustomUser, SystemConfiguration, AuditLog
 from employees.models import EmployeeProfile, Contract
 from attendance.models import MonthlyAttendanceSummary, Attendance, LeaveRequest
 from attendance.utils import MonthlyCalculator, EmployeeDataManager
+from attendance.signals import attendance_records_imported
 from .models import (
     PayrollPeriod,
     Payslip,
@@ -196,33 +197,49 @@ def handle_monthly_summary_update_for_payroll(sender, instance, created, **kwarg
 @receiver(post_save, sender=Attendance)
 def handle_attendance_update_for_payroll(sender, instance, created, **kwargs):
     if not created:
-        try:
-            current_payslip = Payslip.objects.filter(
-                employee=instance.employee,
-                payroll_period__year=instance.date.year,
-                payroll_period__month=instance.date.month,
-                status__in=["DRAFT", "CALCULATED"],
-            ).first()
+        refresh_payslip_for_attendance_month(
+            instance.employee, instance.date.year, instance.date.month
+        )
 
-            if current_payslip:
-                PayrollCacheManager.invalidate_payroll_cache(
-                    instance.employee.id, instance.date.year, instance.date.month
-                )
 
-                if current_payslip.status == "CALCULATED":
-                    current_payslip.status = "DRAFT"
-                    current_payslip.save(update_fields=["status"])
+@receiver(attendance_records_imported)
+def handle_attendance_import_for_payroll(sender, created, updated, **kwargs):
+    affected_months = {}
+    for attendance in list(created) + list(updated):
+        affected_months[
+            (attendance.employee_id, attendance.date.year, attendance.date.month)
+        ] = attendance.employee
 
-                monthly_summary = MonthlyCalculator.calculate_monthly_summary(
-                    instance.employee, instance.date.year, instance.date.month
-                )
+    for (employee_id, year, month), employee in affected_months.items():
+        refresh_payslip_for_attendance_month(employee, year, month)
 
-                if monthly_summary:
-                    current_payslip.monthly_summary = monthly_summary
-                    current_payslip.save(update_fields=["monthly_summary"])
 
-        except Exception as e:
-            logger.error(f"Error handling attendance update for payroll: {str(e)}")
+def refresh_payslip_for_attendance_month(employee, year, month):
+    try:
+        current_payslip = Payslip.objects.filter(
+            employee=employee,
+            payroll_period__year=year,
+            payroll_period__month=month,
+            status__in=["DRAFT", "CALCULATED"],
+        ).first()
+
+        if current_payslip:
+            PayrollCacheManager.invalidate_payroll_cache(employee.id, year, month)
+
+            if current_payslip.status == "CALCULATED":
+                current_payslip.status = "DRAFT"
+                current_payslip.save(update_fields=["status"])
+
+            monthly_summary = MonthlyCalculator.calculate_monthly_summary(
+                employee, year, month
+            )
+
+            if monthly_summary:
+                current_payslip.monthly_summary = monthly_summary
+                current_payslip.save(update_fields=["monthly_summary"])
+
+    except Exception as e:
+        logger.error(f"Error handling attendance update for payroll: {str(e)}")
 
 
 @receiver(post_save, sender=LeaveRequest)
@@ -805,6 +805,10 @@ class PayrollAdvanceCalculator:
             employee=employee, status="ACTIVE", outstanding_amount__gt=0
         )
 
+        return PayrollAdvanceCalculator.summarize_advances(active_advances)
+
+    @staticmethod
+    def summarize_advances(active_advances) -> Dict[str, Any]:
         total_deduction = Decimal("0.00")
         advance_details = []
 
@@ -831,6 +835,134 @@ class PayrollAdvanceCalculator:
         }
 
 
+class PayrollDeductionSolver:
+    """
+    Plans a payroll period's deductions in one pass. Effective thresholds,
+    active salary advances and pending expense deductions are loaded for
+    every employee up front; each payslip then gets a plan that keeps net
+    salary above the employee's protected minimum and carries the expense
+    deductions that do not fit forward to the next period.
+    """
+
+    def __init__(self, payroll_period, employee_ids):
+        from expenses.models import EmployeeDeductionThreshold
+        from expenses.services import ExpensePayrollService
+
+        self.payroll_period = payroll_period
+        employee_ids = list(dict.fromkeys(employee_ids))
+        self.thresholds = EmployeeDeductionThreshold.get_employee_thresholds(
+            employee_ids, payroll_period.end_date
+        )
+        self.advances = self.load_advances(employee_ids)
+        self.expenses = ExpensePayrollService.get_period_amounts(employee_ids)
+        self.plans = {}
+        self.settlements = {}
+
+    @staticmethod
+    def load_advances(employee_ids) -> Dict[Any, Dict[str, Any]]:
+        from .models import SalaryAdvance
+
+        grouped = {employee_id: [] for employee_id in employee_ids}
+        for advance in SalaryAdvance.objects.filter(
+            employee_id__in=employee_ids, status="ACTIVE", outstanding_amount__gt=0
+        ).order_by("created_at"):
+            grouped[advance.employee_id].append(advance)
+
+        return {
+            employee_id: PayrollAdvanceCalculator.summarize_advances(advances)
+            for employee_id, advances in grouped.items()
+        }
+
+    def get_advance_deduction(self, employee_id) -> Dict[str, Any]:
+        return self.advances.get(employee_id) or PayrollAdvanceCalculator.summarize_advances([])
+
+    def get_expense_data(self, employee_id) -> Dict[str, Any]:
+        return self.expenses[employee_id]
+
+    def plan(self, employee_id, gross_salary: Decimal, committed_deductions: Decimal) -> Dict[str, Any]:
+        """
+        ``committed_deductions`` are the statutory and attendance deductions
+        already on the payslip. Advances are contractual and always taken;
+        expense deductions are allocated oldest first into what is left
+        above the protected net salary, capped by the employee's threshold.
+        """
+        threshold = self.thresholds[employee_id]
+        advances = self.get_advance_deduction(employee_id)
+        expense_data = self.get_expense_data(employee_id)
+
+        protection_percent = threshold["minimum_salary_protection_percent"]
+        protected_net_salary = (gross_salary * protection_percent / 100).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+        capacity = max(
+            Decimal("0.00"),
+            gross_salary
+            - committed_deductions
+            - advances["total_advance_deduction"]
+            - protected_net_salary,
+        )
+        available = min(threshold["threshold_amount"], capacity)
+
+        allocations = {}
+        for expense_id, amount in expense_data["deductions"]:
+            if available <= Decimal("0.00"):
+                break
+            allocated = min(amount, available)
+            allocations[expense_id] = allocated
+            available -= allocated
+
+        expense_deduction = sum(allocations.values(), Decimal("0.00"))
+        plan = {
+            "employee_id": employee_id,
+            "threshold_amount": threshold["threshold_amount"],
+            "minimum_salary_protection_percent": protection_percent,
+            "uses_default_threshold": threshold["is_default"],
+            "protected_net_salary": protected_net_salary,
+            "deduction_capacity": capacity,
+            "advance_deduction": advances["total_advance_deduction"],
+            "advance_details": advances["advance_details"],
+            "expense_addition": expense_data["addition_amount"],
+            "requested_expense_deduction": expense_data["deduction_amount"],
+            "expense_deduction": expense_deduction,
+            "carry_forward_amount": expense_data["deduction_amount"] - expense_deduction,
+            "expense_allocations": allocations,
+            "settled_expense_ids": expense_data["addition_ids"] + list(allocations),
+        }
+        self.plans[employee_id] = plan
+        return plan
+
+    def record(self, payroll_reference, plan):
+        if plan["settled_expense_ids"]:
+            self.settlements[payroll_reference] = plan
+
+    def settle(self) -> Optional[Dict[str, Any]]:
+        from expenses.services import ExpensePayrollService
+
+        if not self.settlements:
+            return None
+
+        amounts = {}
+        for plan in self.settlements.values():
+            amounts.update(plan["expense_allocations"])
+
+        try:
+            return ExpensePayrollService.settle_period(
+                {
+                    reference: plan["settled_expense_ids"]
+                    for reference, plan in self.settlements.items()
+                },
+                ExpensePayrollService.get_period_label(self.payroll_period),
+                amounts,
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to settle expenses for {self.payroll_period.period_name}: {str(e)}"
+            )
+            return None
+        finally:
+            self.settlements = {}
+
+
 class PayrollReportDataProcessor:
     @staticmethod
     def prepare_individual_payslip_data(
@@ -72,6 +72,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "urbix.wsgi.application"
+ASGI_APPLICATION = "urbix.asgi.application"
 
 if config("DATABASE_URL", default=None):
     DATABASES = {"default": dj_database_url.parse(config("DATABASE_URL"))}
@@ -160,6 +161,76 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {
+    "dispatch-outbox": {
+        "task": "accounts.tasks.dispatch_outbox",
+        "schedule": 60.0,
+    },
+    "cleanup-outbox": {
+        "task": "accounts.tasks.cleanup_outbox",
+        "schedule": 86400.0,
+    },
+    "cleanup-export-jobs": {
+        "task": "accounts.tasks.cleanup_export_jobs",
+        "schedule": 3600.0,
+    },
+    "cleanup-import-cache": {
+        "task": "accounts.tasks.cleanup_import_cache",
+        "schedule": 3600.0,
+    },
+    "drain-accounting-sync-queue": {
+        "task": "accounting.tasks.drain_sync_queue",
+        "schedule": 60.0,
+    },
+    "refresh-quickbooks-vendor-references": {
+        "task": "accounting.tasks.refresh_vendor_references",
+        "schedule": 900.0,
+    },
+}
+
+OUTBOX_BATCH_SIZE = config("OUTBOX_BATCH_SIZE", default=500, cast=int)
+OUTBOX_MAX_ATTEMPTS = config("OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+SIGNAL_NOTIFICATION_EMAILS = config("SIGNAL_NOTIFICATION_EMAILS", default=DEBUG, cast=bool)
+
+EMPLOYEE_IMPORT_HASH_WORKERS = config("EMPLOYEE_IMPORT_HASH_WORKERS", default=4, cast=int)
+
+EXPORT_CACHE_TTL = config("EXPORT_CACHE_TTL", default=900, cast=int)
+EXPORT_ARTIFACT_TTL = config("EXPORT_ARTIFACT_TTL", default=86400, cast=int)
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=1000, cast=int)
+EXPORT_STALE_AFTER = config("EXPORT_STALE_AFTER", default=3600, cast=int)
+
+IMPORT_CACHE_ROOT = config("IMPORT_CACHE_ROOT", default=str(MEDIA_ROOT / "import_cache"))
+IMPORT_CACHE_TTL = config("IMPORT_CACHE_TTL", default=3600, cast=int)
+
+ATTENDANCE_ARCHIVE_ROOT = config(
+    "ATTENDANCE_ARCHIVE_ROOT", default=str(MEDIA_ROOT / "archives" / "attendance")
+)
+ATTENDANCE_ARCHIVE_CHUNK_SIZE = config("ATTENDANCE_ARCHIVE_CHUNK_SIZE", default=50000, cast=int)
+ATTENDANCE_ARCHIVE_COMPRESSION = config("ATTENDANCE_ARCHIVE_COMPRESSION", default="zstd")
+
+ATTENDANCE_BACKUP_ROOT = config(
+    "ATTENDANCE_BACKUP_ROOT", default=str(MEDIA_ROOT / "backups" / "attendance")
+)
+ATTENDANCE_BACKUP_FULL_INTERVAL_DAYS = config(
+    "ATTENDANCE_BACKUP_FULL_INTERVAL_DAYS", default=7, cast=int
+)
+ATTENDANCE_BACKUP_KEEP_FULL = config("ATTENDANCE_BACKUP_KEEP_FULL", default=4, cast=int)
+
+QUICKBOOKS_BASE_URL = config("QUICKBOOKS_BASE_URL", default="")
+QUICKBOOKS_TOKEN_URL = config("QUICKBOOKS_TOKEN_URL", default="")
+QUICKBOOKS_CONNECT_TIMEOUT = config("QUICKBOOKS_CONNECT_TIMEOUT", default=5, cast=int)
+QUICKBOOKS_READ_TIMEOUT = config("QUICKBOOKS_READ_TIMEOUT", default=60, cast=int)
+QUICKBOOKS_MAX_RETRIES = config("QUICKBOOKS_MAX_RETRIES", default=5, cast=int)
+QUICKBOOKS_POOL_SIZE = config("QUICKBOOKS_POOL_SIZE", default=10, cast=int)
+QUICKBOOKS_RATE_LIMIT_PER_MINUTE = config("QUICKBOOKS_RATE_LIMIT_PER_MINUTE", default=500, cast=int)
+QUICKBOOKS_MAX_CONCURRENCY = config("QUICKBOOKS_MAX_CONCURRENCY", default=10, cast=int)
+QUICKBOOKS_SYNC_WORKERS = config("QUICKBOOKS_SYNC_WORKERS", default=8, cast=int)
+
+ACCOUNTING_SYNC_DEBOUNCE_SECONDS = config("ACCOUNTING_SYNC_DEBOUNCE_SECONDS", default=10, cast=int)
+ACCOUNTING_SYNC_MAX_DELAY_SECONDS = config("ACCOUNTING_SYNC_MAX_DELAY_SECONDS", default=120, cast=int)
+ACCOUNTING_SYNC_BATCH_SIZE = config("ACCOUNTING_SYNC_BATCH_SIZE", default=200, cast=int)
+ACCOUNTING_JOURNAL_CACHE_TTL = config("ACCOUNTING_JOURNAL_CACHE_TTL", default=86400, cast=int)
+ACCOUNTING_METRICS_TOKEN = config("ACCOUNTING_METRICS_TOKEN", default="")
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = config("EMAIL_HOST", default="smtp.gmail.com")
@@ -290,6 +361,9 @@ PAYROLL_SETTINGS = {
     "MINIMUM_WAGE": 15000,
 }
 
+DASHBOARD_WIDGET_TIMEOUT = config("DASHBOARD_WIDGET_TIMEOUT", default=5, cast=int)
+DASHBOARD_MAX_WORKERS = config("DASHBOARD_MAX_WORKERS", default=6, cast=int)
+
 HR_SETTINGS = {
     "EMPLOYEE_CODE_PREFIX": "EMP",
     "EMPLOYEE_CODE_LENGTH": 6,